@@ -10,6 +10,7 @@ from database.session import Base
 
 # Import all models for autogenerate support
 from database.event import Event
+from database.event_archive import EventArchive
 
 """
 Alembic Environment Module
@@ -0,0 +1,166 @@
+"""partition events by month and add events_archive
+
+Revision ID: 0001_partition_events
+Revises:
+Create Date: 2026-10-18 09:00:00.000000
+
+Converts `events` into a table declaratively partitioned by RANGE on
+`created_at` with one partition per month, plus a DEFAULT partition as a
+safety net. Existing rows (if the table already exists unpartitioned) are
+copied into the new layout. Also creates `events_archive`, the compressed
+destination for finished events moved out by the retention job.
+
+Partitioned tables require the partition key in every unique constraint, so
+the primary key becomes (id, created_at). Event IDs are UUIDv1 values and
+remain unique in practice; the ORM continues to address rows by `id`.
+"""
+from datetime import datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001_partition_events"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Number of future monthly partitions created up front. The retention job
+# keeps this window rolling forward.
+PARTITION_MONTHS_AHEAD = 2
+
+EVENT_COLUMNS = "id, workflow_type, data, task_context, created_at, updated_at"
+
+
+def _month_start(value: datetime) -> datetime:
+    return datetime(value.year, value.month, 1)
+
+
+def _add_months(value: datetime, months: int) -> datetime:
+    month_index = value.month - 1 + months
+    return datetime(value.year + month_index // 12, month_index % 12 + 1, 1)
+
+
+def _create_month_partition(month_start: datetime) -> None:
+    next_month = _add_months(month_start, 1)
+    op.execute(
+        f"CREATE TABLE IF NOT EXISTS events_y{month_start.year:04d}m{month_start.month:02d} "
+        f"PARTITION OF events FOR VALUES FROM ('{month_start:%Y-%m-%d}') "
+        f"TO ('{next_month:%Y-%m-%d}')"
+    )
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+
+    relkind = None
+    if inspector.has_table("events"):
+        relkind = bind.execute(
+            sa.text("SELECT relkind FROM pg_class WHERE oid = 'public.events'::regclass")
+        ).scalar()
+
+    if relkind != "p":
+        legacy_exists = relkind is not None
+        if legacy_exists:
+            op.rename_table("events", "events_unpartitioned")
+
+        op.execute(
+            """
+            CREATE TABLE events (
+                id UUID NOT NULL,
+                workflow_type VARCHAR(150) NOT NULL,
+                data JSON,
+                task_context JSON,
+                created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT now(),
+                updated_at TIMESTAMP WITHOUT TIME ZONE DEFAULT now(),
+                PRIMARY KEY (id, created_at)
+            ) PARTITION BY RANGE (created_at)
+            """
+        )
+        op.execute("CREATE TABLE IF NOT EXISTS events_default PARTITION OF events DEFAULT")
+
+        first_month = _month_start(datetime.now())
+        if legacy_exists:
+            oldest = bind.execute(
+                sa.text("SELECT min(created_at) FROM events_unpartitioned")
+            ).scalar()
+            if oldest is not None:
+                first_month = min(first_month, _month_start(oldest))
+
+        last_month = _add_months(_month_start(datetime.now()), PARTITION_MONTHS_AHEAD)
+        month = first_month
+        while month <= last_month:
+            _create_month_partition(month)
+            month = _add_months(month, 1)
+
+        if legacy_exists:
+            op.execute(
+                f"INSERT INTO events ({EVENT_COLUMNS}) "
+                f"SELECT id, workflow_type, data, task_context, "
+                f"COALESCE(created_at, now()), updated_at FROM events_unpartitioned"
+            )
+            op.drop_table("events_unpartitioned")
+
+        op.execute("CREATE INDEX IF NOT EXISTS ix_events_id ON events (id)")
+        op.execute("CREATE INDEX IF NOT EXISTS ix_events_updated_at ON events (updated_at DESC)")
+        op.execute(
+            "CREATE INDEX IF NOT EXISTS ix_events_project_id_updated_at ON events "
+            "(((task_context -> 'metadata' ->> 'project_id')), updated_at DESC)"
+        )
+
+    op.create_table(
+        "events_archive",
+        sa.Column("id", sa.dialects.postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("workflow_type", sa.String(length=150), nullable=False),
+        sa.Column("data", sa.JSON(), nullable=True),
+        sa.Column("task_context", sa.JSON(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.Column("archived_at", sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        if_not_exists=True,
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_events_archive_project_id_updated_at ON events_archive "
+        "(((task_context -> 'metadata' ->> 'project_id')), updated_at DESC)"
+    )
+    # lz4 TOAST compression needs PostgreSQL 14+ built with lz4; fall back to
+    # the default pglz compression everywhere else.
+    op.execute(
+        """
+        DO $$
+        BEGIN
+            ALTER TABLE events_archive ALTER COLUMN data SET COMPRESSION lz4;
+            ALTER TABLE events_archive ALTER COLUMN task_context SET COMPRESSION lz4;
+        EXCEPTION WHEN others THEN
+            RAISE NOTICE 'lz4 compression unavailable, using default TOAST compression';
+        END
+        $$;
+        """
+    )
+
+
+def downgrade() -> None:
+    op.rename_table("events", "events_partitioned")
+    op.execute(
+        """
+        CREATE TABLE events (
+            id UUID PRIMARY KEY,
+            workflow_type VARCHAR(150) NOT NULL,
+            data JSON,
+            task_context JSON,
+            created_at TIMESTAMP WITHOUT TIME ZONE,
+            updated_at TIMESTAMP WITHOUT TIME ZONE
+        )
+        """
+    )
+    op.execute(f"INSERT INTO events ({EVENT_COLUMNS}) SELECT {EVENT_COLUMNS} FROM events_partitioned")
+    op.execute(
+        f"INSERT INTO events ({EVENT_COLUMNS}) SELECT {EVENT_COLUMNS} FROM events_archive "
+        f"ON CONFLICT (id) DO NOTHING"
+    )
+    # Dropping the parent drops every attached partition with it.
+    op.execute("DROP TABLE events_partitioned")
+    op.drop_table("events_archive")
@@ -0,0 +1,42 @@
+"""extend project history indexes with id for keyset pagination
+
+Revision ID: 0002_history_keyset_index
+Revises: 0001_partition_events
+Create Date: 2026-10-18 12:00:00.000000
+
+Execution history pages are ordered by (updated_at, id) and continue from a
+cursor on the same pair. Adding `id` to the per-project index lets every page
+be read straight off the index without sorting ties. The new index covers
+every query served by the old one, which is dropped.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002_history_keyset_index"
+down_revision: Union[str, None] = "0001_partition_events"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PROJECT_ID_EXPRESSION = "((task_context -> 'metadata' ->> 'project_id'))"
+TABLES = ("events", "events_archive")
+
+
+def upgrade() -> None:
+    for table in TABLES:
+        op.execute(
+            f"CREATE INDEX IF NOT EXISTS ix_{table}_project_id_updated_at_id ON {table} "
+            f"({PROJECT_ID_EXPRESSION}, updated_at DESC, id DESC)"
+        )
+        op.execute(f"DROP INDEX IF EXISTS ix_{table}_project_id_updated_at")
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        op.execute(
+            f"CREATE INDEX IF NOT EXISTS ix_{table}_project_id_updated_at ON {table} "
+            f"({PROJECT_ID_EXPRESSION}, updated_at DESC)"
+        )
+        op.execute(f"DROP INDEX IF EXISTS ix_{table}_project_id_updated_at_id")
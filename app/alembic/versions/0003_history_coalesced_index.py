@@ -0,0 +1,42 @@
+"""order project history by updated_at falling back to created_at
+
+Revision ID: 0003_history_coalesced_index
+Revises: 0002_history_keyset_index
+Create Date: 2026-10-18 18:00:00.000000
+
+Events that were never updated have a NULL updated_at, which broke the
+(updated_at, id) keyset cursor. Execution history now orders and continues on
+(COALESCE(updated_at, created_at), id); the per-project index is rebuilt on
+that expression so pages stay bounded index range scans.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003_history_coalesced_index"
+down_revision: Union[str, None] = "0002_history_keyset_index"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PROJECT_ID_EXPRESSION = "((task_context -> 'metadata' ->> 'project_id'))"
+TABLES = ("events", "events_archive")
+
+
+def upgrade() -> None:
+    for table in TABLES:
+        op.execute(
+            f"CREATE INDEX IF NOT EXISTS ix_{table}_project_id_history ON {table} "
+            f"({PROJECT_ID_EXPRESSION}, (COALESCE(updated_at, created_at)) DESC, id DESC)"
+        )
+        op.execute(f"DROP INDEX IF EXISTS ix_{table}_project_id_updated_at_id")
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        op.execute(
+            f"CREATE INDEX IF NOT EXISTS ix_{table}_project_id_updated_at_id ON {table} "
+            f"({PROJECT_ID_EXPRESSION}, updated_at DESC, id DESC)"
+        )
+        op.execute(f"DROP INDEX IF EXISTS ix_{table}_project_id_history")
@@ -8,6 +8,7 @@ from .endpoints import (
     health,
     public,
     devteam_automation,
+    execution_logs,
     websocket,
 )
 
@@ -26,6 +27,13 @@ api_router.include_router(
     tags=["devteam-automation"]
 )
 
+# Execution log endpoints
+api_router.include_router(
+    execution_logs.router,
+    prefix="/devteam/automation",
+    tags=["devteam-automation"]
+)
+
 # WebSocket endpoints
 api_router.include_router(
     websocket.router,
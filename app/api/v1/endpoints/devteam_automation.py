@@ -17,11 +17,12 @@ import json
 import logging
 import time
 import uuid
+from contextlib import nullcontext
 from datetime import datetime
 from http import HTTPStatus
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Header
+from fastapi import APIRouter, Depends, HTTPException, Header, Query
 from sqlalchemy.orm import Session
 from starlette.responses import Response
 
@@ -29,7 +30,7 @@ from core.structured_logging import get_structured_logger, get_transformation_lo
 from core.performance_monitoring import record_queue_latency
 from database.event import Event
 from database.repository import GenericRepository
-from database.session import db_session
+from database.session import db_primary_read_session, db_read_session, db_session
 from schemas.devteam_automation_schema import (
     DevTeamAutomationInitializeRequest,
     DevTeamAutomationInitializeResponse,
@@ -37,6 +38,9 @@ from schemas.devteam_automation_schema import (
     DevTeamAutomationStatusResponse,
     DevTeamStatusSuccessResponse,
     DevTeamStatusNotFoundResponse,
+    DevTeamAutomationBatchStatusRequest,
+    DevTeamAutomationBatchStatusResponse,
+    DevTeamBatchStatusSuccessResponse,
     DevTeamAutomationPauseResponse,
     DevTeamPauseSuccessResponse,
     DevTeamPauseConflictResponse,
@@ -57,6 +61,7 @@ from schemas.event_schema import (
 )
 from worker.config import celery_app
 from services.status_projection_service import get_status_projection_service
+from services.status_waiters import get_status_waiters
 from core.exceptions import (
     RepositoryError,
     APIError,
@@ -617,6 +622,52 @@ async def initialize_devteam_automation(
         )
 
 
+def _status_cache_headers(etag: str) -> dict:
+    """
+    Caching headers of a status response with the given strong ETag.
+
+    Status is per-user data: only the client may keep it, and it revalidates
+    with If-None-Match before every reuse.
+    """
+    return {
+        "ETag": etag,
+        "Cache-Control": "private, no-cache"
+    }
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """Check an If-None-Match header against an ETag (weak comparison, RFC 9110)."""
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (candidate.strip() for candidate in if_none_match.split(","))
+    return any(candidate.removeprefix("W/") == etag for candidate in candidates)
+
+
+def _build_status_response(status_projection) -> DevTeamAutomationStatusResponse:
+    """Convert a StatusProjection to the status response format with complete field mapping."""
+    return DevTeamAutomationStatusResponse(
+        status=status_projection.status.value if hasattr(status_projection.status, 'value') else str(status_projection.status),
+        progress=status_projection.progress,
+        current_task=status_projection.current_task,
+        totals={
+            "completed": status_projection.totals.completed,
+            "total": status_projection.totals.total
+        },
+        execution_id=status_projection.execution_id,
+        project_id=status_projection.project_id,  # Required field from StatusProjection
+        customer_id=status_projection.customer_id,  # Optional field from StatusProjection
+        branch=status_projection.branch,
+        artifacts={
+            "repo_path": status_projection.artifacts.repo_path,
+            "branch": status_projection.artifacts.branch,
+            "logs": status_projection.artifacts.logs,
+            "files_modified": status_projection.artifacts.files_modified
+        } if status_projection.artifacts else None,  # Complete artifacts mapping
+        started_at=status_projection.started_at.isoformat() if status_projection.started_at else None,
+        updated_at=status_projection.updated_at.isoformat() if status_projection.updated_at else None
+    )
+
+
 @router.get(
     "/status/{project_id}",
     response_model=DevTeamStatusSuccessResponse,
@@ -636,6 +687,8 @@ async def initialize_devteam_automation(
     - Performance monitoring (≤200ms target)
     - Comprehensive structured logging
     - Proper error handling for non-existent projects
+    - Conditional GET: strong ETag from the event version, 304 on If-None-Match
+    - Long-poll: `?wait=30&since=<version>` blocks until the version changes
     
     **Response Format:**
     Returns JSON state with {status, progress, currentTask, totals, executionId}
@@ -643,6 +696,7 @@ async def initialize_devteam_automation(
     
     **Response:**
     - 200 OK: Status retrieved successfully
+    - 304 Not Modified: Status unchanged since the ETag in If-None-Match or since
     - 404 Not Found: No automation status found for project
     - 422 Validation Error: Invalid project ID format
     - 500 Internal Server Error: System error
@@ -710,7 +764,12 @@ async def initialize_devteam_automation(
 )
 async def get_devteam_automation_status(
     project_id: str,
-    session: Session = Depends(db_session)
+    response: Response,
+    session: Session = Depends(db_read_session),
+    primary_session: Session = Depends(db_primary_read_session),
+    if_none_match: Optional[str] = Header(None, alias="If-None-Match"),
+    wait: Optional[int] = Query(None, ge=0, le=60, description="Seconds to wait for a change of the 'since' version"),
+    since: Optional[str] = Query(None, description="Status version (ETag) already held by the client")
 ) -> DevTeamStatusSuccessResponse:
     """
     Get DevTeam automation status for a project.
@@ -721,10 +780,17 @@ async def get_devteam_automation_status(
     
     Args:
         project_id: Project identifier in format 'customer-id/project-id'
-        session: Database session injected by FastAPI dependency
+        response: Outgoing response used to set ETag and Cache-Control headers
+        session: Read-only database session (replica-routed) injected by FastAPI dependency
+        primary_session: Read-only primary session, used once a long-poll is woken by a change
+        if_none_match: Optional If-None-Match header for conditional requests
+        wait: Optional long-poll timeout in seconds (requires since)
+        since: Optional status version the client already has; with wait, the
+               request is parked until the version changes or wait elapses
         
     Returns:
-        DevTeamStatusSuccessResponse: 200 response with status information
+        DevTeamStatusSuccessResponse: 200 response with status information,
+        or a bare 304 response when If-None-Match or since matches the current version
         
     Raises:
         HTTPException: 404 for non-existent projects, 422 for validation errors,
@@ -771,6 +837,69 @@ async def get_devteam_automation_status(
             correlation_id=correlation_id
         )
         
+        since_version = since.strip().strip('"') if isinstance(since, str) and since.strip() else None
+        long_poll_seconds = wait if isinstance(wait, int) and since_version else 0
+        
+        # Register the long-poll watch before reading the version so that a
+        # change notified in between is not missed
+        watch_context = get_status_waiters().watch(project_id) if long_poll_seconds else nullcontext()
+        with watch_context as status_watch:
+            status_version = status_service.get_status_version_by_project_id(project_id)
+            
+            if status_watch is not None and status_version and status_version["version"] == since_version:
+                wait_start = time.monotonic()
+                deadline = wait_start + long_poll_seconds
+                # Release the pooled connection while parked; idle watchers only cost memory
+                session.close()
+                while status_version and status_version["version"] == since_version:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0 or not await status_watch.wait(remaining):
+                        break
+                    # Woken by a change a lagging replica may not show yet: the
+                    # version and the status are read from the primary from here on
+                    if session is not primary_session:
+                        session = primary_session
+                        status_service = get_status_projection_service(
+                            session=session,
+                            correlation_id=correlation_id
+                        )
+                    status_version = status_service.get_status_version_by_project_id(project_id)
+                    session.close()
+                logger.info(
+                    "DevTeam automation status long-poll finished",
+                    extra={
+                        "correlation_id": correlation_id,
+                        "project_id": project_id,
+                        "operation": "devteam_automation_get_status",
+                        "long_poll_changed": not status_version or status_version["version"] != since_version,
+                        "long_poll_wait_ms": round((time.monotonic() - wait_start) * 1000, 2)
+                    }
+                )
+        
+        # Answer conditional requests from the event version alone,
+        # without projecting or serializing the status
+        etag = f'"{status_version["version"]}"' if status_version else None
+        not_modified = since_version == status_version["version"] if status_version else False
+        if etag and isinstance(if_none_match, str) and _etag_matches(if_none_match, etag):
+            not_modified = True
+        if not_modified:
+            duration_ms = (time.time() - start_time) * 1000
+            logger.info(
+                "DevTeam automation status not modified",
+                extra={
+                    "correlation_id": correlation_id,
+                    "project_id": project_id,
+                    "operation": "devteam_automation_get_status",
+                    "response_status": "304_not_modified",
+                    "duration_ms": round(duration_ms, 2),
+                    "performance_target_met": duration_ms <= 200
+                }
+            )
+            return Response(
+                status_code=HTTPStatus.NOT_MODIFIED,
+                headers=_status_cache_headers(etag)
+            )
+        
         # Retrieve status projection by project ID
         status_projection = status_service.get_status_by_project_id(
             project_id=project_id
@@ -805,27 +934,7 @@ async def get_devteam_automation_status(
             )
         
         # Convert StatusProjection to response format with complete field mapping
-        response_data = DevTeamAutomationStatusResponse(
-            status=status_projection.status.value if hasattr(status_projection.status, 'value') else str(status_projection.status),
-            progress=status_projection.progress,
-            current_task=status_projection.current_task,
-            totals={
-                "completed": status_projection.totals.completed,
-                "total": status_projection.totals.total
-            },
-            execution_id=status_projection.execution_id,
-            project_id=status_projection.project_id,  # Required field from StatusProjection
-            customer_id=status_projection.customer_id,  # Optional field from StatusProjection
-            branch=status_projection.branch,
-            artifacts={
-                "repo_path": status_projection.artifacts.repo_path,
-                "branch": status_projection.artifacts.branch,
-                "logs": status_projection.artifacts.logs,
-                "files_modified": status_projection.artifacts.files_modified
-            } if status_projection.artifacts else None,  # Complete artifacts mapping
-            started_at=status_projection.started_at.isoformat() if status_projection.started_at else None,
-            updated_at=status_projection.updated_at.isoformat() if status_projection.updated_at else None
-        )
+        response_data = _build_status_response(status_projection)
         
         # Calculate performance metrics
         duration_ms = (time.time() - start_time) * 1000
@@ -847,6 +956,12 @@ async def get_devteam_automation_status(
             }
         )
         
+        # Only tag the response when it was projected from the versioned event
+        if status_version and status_version["event_id"] == status_projection.execution_id:
+            response.headers.update(_status_cache_headers(etag))
+        else:
+            response.headers["Cache-Control"] = "no-cache"
+        
         # Return 200 OK response
         return DevTeamStatusSuccessResponse(
             success=True,
@@ -921,6 +1036,122 @@ async def get_devteam_automation_status(
         )
 
 
+@router.post(
+    "/status/batch",
+    response_model=DevTeamBatchStatusSuccessResponse,
+    status_code=HTTPStatus.OK,
+    summary="Get DevTeam Automation Status for Many Projects",
+    description="""
+    Get the current automation status and progress for a list of projects.
+    
+    Dashboards covering many projects can use this endpoint instead of one
+    status request per project. The latest event of every project is fetched
+    with a single indexed query and projected in one pass.
+    
+    **Features:**
+    - Up to 100 project IDs per request, duplicates ignored
+    - One database round trip regardless of list size
+    - Reuses cached projections of unchanged executions
+    - Projects without automation status map to null
+    
+    **Response:**
+    - 200 OK: Statuses retrieved successfully
+    - 422 Validation Error: Invalid project ID list
+    - 500 Internal Server Error: System error
+    """,
+    tags=["devteam-automation"]
+)
+async def get_devteam_automation_status_batch(
+    request: DevTeamAutomationBatchStatusRequest,
+    session: Session = Depends(db_read_session)
+) -> DevTeamBatchStatusSuccessResponse:
+    """
+    Get DevTeam automation status for many projects at once.
+    
+    Args:
+        request: Batch status request with the project IDs to look up
+        session: Read-only database session (replica-routed) injected by FastAPI dependency
+        
+    Returns:
+        DevTeamBatchStatusSuccessResponse: 200 response with statuses by project ID
+        
+    Raises:
+        HTTPException: 422 for validation errors, 500 for internal server errors
+    """
+    start_time = time.time()
+    correlation_id = f"corr_{uuid.uuid4()}"
+    
+    try:
+        logger.info(
+            "DevTeam automation batch status request started",
+            extra={
+                "correlation_id": correlation_id,
+                "project_count": len(request.project_ids),
+                "operation": "devteam_automation_get_status_batch"
+            }
+        )
+        
+        status_service = get_status_projection_service(
+            session=session,
+            correlation_id=correlation_id
+        )
+        status_projections = status_service.get_status_by_project_ids(
+            project_ids=request.project_ids
+        )
+        
+        statuses = {
+            project_id: _build_status_response(status_projection) if status_projection else None
+            for project_id, status_projection in status_projections.items()
+        }
+        not_found = [project_id for project_id, status in statuses.items() if status is None]
+        
+        duration_ms = (time.time() - start_time) * 1000
+        logger.info(
+            "DevTeam automation batch status retrieved successfully",
+            extra={
+                "correlation_id": correlation_id,
+                "project_count": len(statuses),
+                "not_found_count": len(not_found),
+                "operation": "devteam_automation_get_status_batch",
+                "response_status": "200_ok",
+                "duration_ms": round(duration_ms, 2),
+                "performance_target_met": duration_ms <= 200
+            }
+        )
+        
+        return DevTeamBatchStatusSuccessResponse(
+            success=True,
+            data=DevTeamAutomationBatchStatusResponse(
+                statuses=statuses,
+                not_found=not_found
+            ),
+            message="DevTeam automation statuses retrieved successfully"
+        )
+        
+    except RepositoryError as re:
+        duration_ms = (time.time() - start_time) * 1000
+        logger.error(
+            "Repository error while retrieving DevTeam automation batch status",
+            extra={
+                "correlation_id": correlation_id,
+                "error": str(re),
+                "error_type": "RepositoryError",
+                "operation": "devteam_automation_get_status_batch",
+                "response_status": "500_internal_error",
+                "duration_ms": round(duration_ms, 2)
+            },
+            exc_info=True
+        )
+        raise HTTPException(
+            status_code=500,
+            detail={
+                "success": False,
+                "message": "Database error occurred while retrieving automation statuses",
+                "error_code": "REPOSITORY_ERROR"
+            }
+        )
+
+
 @router.post(
     "/pause/{project_id}",
     response_model=DevTeamPauseSuccessResponse,
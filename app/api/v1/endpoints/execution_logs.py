@@ -0,0 +1,162 @@
+"""
+Execution Log API Endpoints
+
+This module serves the durable execution logs written by ExecutionLogService
+so clients joining late or refreshing can read what already happened, then
+continue from live execution-log frames by `log_seq`.
+
+Logs are NDJSON (one execution-log entry per line) and are always streamed
+from the ExecutionLogStore segments, never loaded whole:
+- `Range: bytes=<start>-<end>` reads a byte range of the log (206 Partial Content)
+- `?from_seq=&to_seq=` reads the entries of a log_seq range (inclusive)
+"""
+
+import re
+from http import HTTPStatus
+from typing import Optional, Tuple
+
+from fastapi import APIRouter, Header, HTTPException, Query
+from starlette.responses import Response, StreamingResponse
+
+from core.structured_logging import get_structured_logger
+from services.execution_log_store import ExecutionLogNotFound, get_execution_log_store
+
+
+router = APIRouter()
+structured_logger = get_structured_logger(__name__)
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+BYTE_RANGE_PATTERN = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def _parse_byte_range(range_header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    Inclusive (first, last) byte positions of a single-range Range header.
+
+    Returns None for headers that are not a single byte range, which are
+    ignored as allowed by RFC 9110.
+
+    Raises:
+        ValueError: If the range cannot be satisfied
+    """
+    match = BYTE_RANGE_PATTERN.match(range_header.strip())
+    if match is None or match.groups() == ("", ""):
+        return None
+    first, last = match.groups()
+    if first == "":
+        # Suffix range: the last N bytes
+        length = int(last)
+        if length == 0 or size == 0:
+            raise ValueError("Unsatisfiable suffix range")
+        return max(0, size - length), size - 1
+    first = int(first)
+    last = min(int(last), size - 1) if last else size - 1
+    if first >= size or last < first:
+        raise ValueError("Unsatisfiable range")
+    return first, last
+
+
+@router.get(
+    "/logs/{project_id:path}/{execution_id}",
+    status_code=HTTPStatus.OK,
+    summary="Read Execution Log",
+    description="""
+    Stream the stored execution log of an execution as NDJSON. The project ID
+    may contain slashes (`/logs/customer-123/project-abc/<execution_id>`).
+
+    **Ranges:**
+    - `Range: bytes=0-65535`, `bytes=65536-` or `bytes=-4096`: a byte range of the
+      log, answered with 206 Partial Content and Content-Range
+    - `from_seq` / `to_seq`: the entries with log_seq in the range (inclusive)
+    - Neither: the whole log
+
+    **Response:**
+    - 200 OK / 206 Partial Content: NDJSON execution-log entries
+    - 404 Not Found: No stored log for the execution
+    - 416 Range Not Satisfiable: Byte range outside the log
+    - 422 Validation Error: Invalid identifiers or sequence range
+    """,
+    response_class=StreamingResponse,
+    tags=["devteam-automation"]
+)
+async def read_execution_log(
+    project_id: str,
+    execution_id: str,
+    range_header: Optional[str] = Header(None, alias="Range"),
+    from_seq: int = Query(1, ge=1, description="First log_seq to return"),
+    to_seq: Optional[int] = Query(None, ge=1, description="Last log_seq to return")
+) -> Response:
+    """
+    Stream a byte or log_seq range of an execution's stored log.
+
+    Args:
+        project_id: Project identifier (may contain slashes)
+        execution_id: Execution identifier
+        range_header: Optional HTTP Range header (single byte range)
+        from_seq: First log_seq to return
+        to_seq: Optional last log_seq to return
+
+    Returns:
+        StreamingResponse of NDJSON lines or bytes
+    """
+    store = get_execution_log_store()
+    try:
+        size = store.size(project_id, execution_id)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=422,
+            detail={"success": False, "message": str(e), "error_code": "VALIDATION_ERROR"}
+        )
+    except ExecutionLogNotFound:
+        raise HTTPException(
+            status_code=404,
+            detail={
+                "success": False,
+                "data": {"project_id": project_id, "execution_id": execution_id},
+                "message": "No execution log found for the specified execution"
+            }
+        )
+
+    headers = {"Accept-Ranges": "bytes"}
+    byte_range = None
+    if range_header:
+        try:
+            byte_range = _parse_byte_range(range_header, size)
+        except ValueError:
+            return Response(
+                status_code=HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE,
+                headers={**headers, "Content-Range": f"bytes */{size}"}
+            )
+
+    if byte_range is not None:
+        first, last = byte_range
+        structured_logger.debug(
+            "Streaming execution log byte range",
+            project_id=project_id,
+            execution_id=execution_id,
+            first_byte=first,
+            last_byte=last,
+            size_bytes=size
+        )
+        return StreamingResponse(
+            store.read_bytes(project_id, execution_id, first, last + 1),
+            status_code=HTTPStatus.PARTIAL_CONTENT,
+            media_type=NDJSON_MEDIA_TYPE,
+            headers={
+                **headers,
+                "Content-Range": f"bytes {first}-{last}/{size}",
+                "Content-Length": str(last - first + 1)
+            }
+        )
+
+    if to_seq is not None and to_seq < from_seq:
+        raise HTTPException(
+            status_code=422,
+            detail={"success": False, "message": "to_seq must not be below from_seq", "error_code": "VALIDATION_ERROR"}
+        )
+
+    return StreamingResponse(
+        store.read_entries(project_id, execution_id, from_seq, to_seq),
+        media_type=NDJSON_MEDIA_TYPE,
+        headers=headers
+    )
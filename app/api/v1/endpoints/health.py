@@ -7,7 +7,7 @@ import time
 from datetime import datetime
 from typing import Any, Dict
 
-from database.session import db_session
+from database.session import db_read_session, db_session
 from fastapi import APIRouter, Depends
 from schemas.common import APIResponse, DetailedHealthStatus, HealthStatus
 from sqlalchemy import text
@@ -17,7 +17,7 @@ router = APIRouter()
 
 
 @router.get("/", response_model=APIResponse[HealthStatus])
-async def health_check(db: Session = Depends(db_session)) -> APIResponse[HealthStatus]:
+async def health_check(db: Session = Depends(db_read_session)) -> APIResponse[HealthStatus]:
     """
     Basic health check endpoint.
 
@@ -43,7 +43,7 @@ async def health_check(db: Session = Depends(db_session)) -> APIResponse[HealthS
 
 @router.get("/detailed", response_model=APIResponse[DetailedHealthStatus])
 async def detailed_health_check(
-    db: Session = Depends(db_session),
+    db: Session = Depends(db_read_session),
 ) -> APIResponse[DetailedHealthStatus]:
     """
     Detailed health check with system information.
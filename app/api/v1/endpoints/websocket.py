@@ -23,7 +23,7 @@ import logging
 import time
 import uuid
 from datetime import datetime
-from typing import Dict, Set
+from typing import Dict, Optional, Set, Tuple
 from urllib.parse import parse_qs
 
 from fastapi import WebSocket, WebSocketDisconnect, HTTPException, Query
@@ -34,7 +34,38 @@ from auth.dependencies import verify_token_manually
 from auth.exceptions import AuthenticationError
 from auth.models import UserContext
 from core.structured_logging import get_structured_logger
-from schemas.websocket_envelope import create_envelope, create_error_envelope, MessageType
+from core.performance_monitoring import (
+    record_websocket_connection_evicted,
+    record_websocket_connection_rejected,
+    record_websocket_connections,
+    record_websocket_queue_depth,
+)
+from core.websocket_bus import RedisMessageBus, get_message_bus
+from core.websocket_codecs import (
+    DEFAULT_MAX_DECODED_BYTES,
+    Frame,
+    FrameCodec,
+    FrameDecoder,
+    get_codec,
+    negotiate_subprotocol,
+)
+from core.websocket_lifecycle import (
+    CONNECTION_LIMIT_CLOSE_CODE,
+    EVICTION_CLOSE_CODES,
+    ConnectionLifecycle,
+    ConnectionLimitExceeded,
+)
+from core.websocket_replay import ReplayBufferRegistry
+from core.websocket_send_queue import ConnectionSendQueue
+from core.websocket_subscriptions import SubscriberIndex, Subscription, apply_subscription_update
+from schemas.websocket_envelope import (
+    create_envelope,
+    create_error_envelope,
+    create_replay_gap_envelope,
+    create_subscription_updated_envelope,
+    MessageType,
+)
+from services.status_waiters import get_status_waiters
 
 # Configure structured logging
 logger = logging.getLogger(__name__)
@@ -48,6 +79,24 @@ class ConnectionManager:
     Manages active WebSocket connections with project-based routing and
     user authentication. Provides methods for connecting, disconnecting,
     and broadcasting messages to specific projects or all connections.
+    
+    Every connection has a bounded send queue drained by its own writer
+    task. Messages are serialized once and queued for each target, so a slow
+    client never delays the broadcast or other clients.
+    
+    Broadcast frames carrying a bus sequence number are kept in per-project
+    replay buffers so reconnecting clients can catch up.
+    
+    Each connection speaks the subprotocol negotiated at connect time; a
+    broadcast is encoded once per subprotocol in use.
+    
+    Connections receive the broadcasts matching their subscription (all by
+    default). Per-project subscriber indexes resolve the recipients of a
+    broadcast without visiting uninterested connections.
+    
+    While connections are open, a sweeper task pings silent connections and
+    evicts dead or idle ones; per-user and per-project caps are enforced
+    before a connection is accepted (see core.websocket_lifecycle).
     """
     
     def __init__(self):
@@ -55,13 +104,32 @@ class ConnectionManager:
         self.active_connections: Dict[str, Dict[str, tuple[WebSocket, UserContext]]] = {}
         # Connection metadata for logging and management
         self.connection_metadata: Dict[str, dict] = {}
+        # Outbound send queues: {connection_id: ConnectionSendQueue}
+        self.send_queues: Dict[str, ConnectionSendQueue] = {}
+        # Recent sequenced broadcasts per project, read from Redis with the Redis bus
+        bus = get_message_bus()
+        self.replay_buffers = ReplayBufferRegistry(
+            shared_reader=bus.read_replay if isinstance(bus, RedisMessageBus) else None
+        )
+        # Frame codecs of connections: {connection_id: FrameCodec}
+        self.connection_codecs: Dict[str, FrameCodec] = {}
+        # Broadcast filters of connections: {connection_id: Subscription}
+        self.subscriptions: Dict[str, Subscription] = {}
+        # Subscribers per project: {project_id: SubscriberIndex}
+        self.subscriber_indexes: Dict[str, SubscriberIndex] = {}
+        # Heartbeats, eviction and connection caps
+        self.lifecycle = ConnectionLifecycle()
+        self._sweeper: Optional[asyncio.Task] = None
     
     async def connect(
         self,
         websocket: WebSocket,
         project_id: str,
         user_context: UserContext,
-        connection_id: str | None = None
+        connection_id: str | None = None,
+        subprotocol: str | None = None,
+        subscription: Subscription | None = None,
+        heartbeat: bool = False
     ) -> str:
         """
         Accept a WebSocket connection and add it to the manager.
@@ -71,15 +139,26 @@ class ConnectionManager:
             project_id: Project identifier for routing
             user_context: Authenticated user context
             connection_id: Optional connection identifier (generated if not provided)
+            subprotocol: Negotiated subprotocol (JSON text frames if not provided)
+            subscription: Initial broadcast filters (all broadcasts if not provided)
+            heartbeat: Whether the client answers pings (opts in to heartbeat eviction)
             
         Returns:
             str: The connection identifier
+            
+        Raises:
+            ConnectionLimitExceeded: If the user or project is at its connection cap
         """
         if connection_id is None:
             connection_id = f"conn_{uuid.uuid4()}"
         
-        # Accept the WebSocket connection
-        await websocket.accept()
+        # Enforce connection caps, then accept the WebSocket connection
+        self.lifecycle.admit(connection_id, project_id, user_context.user_id, heartbeat=heartbeat)
+        try:
+            await websocket.accept(subprotocol=subprotocol)
+        except Exception:
+            self.lifecycle.release(connection_id)
+            raise
         
         # Initialize project connections if not exists
         if project_id not in self.active_connections:
@@ -88,10 +167,23 @@ class ConnectionManager:
         # Store the connection
         self.active_connections[project_id][connection_id] = (websocket, user_context)
         
+        # Start the connection's writer
+        send_queue = ConnectionSendQueue(websocket, connection_id, project_id, on_close=self.disconnect)
+        send_queue.start()
+        self.send_queues[connection_id] = send_queue
+        self.connection_codecs[connection_id] = get_codec(subprotocol)
+        
+        # Register for broadcasts
+        subscription = subscription or Subscription()
+        self.subscriptions[connection_id] = subscription
+        self.subscriber_indexes.setdefault(project_id, SubscriberIndex()).add(connection_id, subscription)
+        
         # Store connection metadata
         self.connection_metadata[connection_id] = {
             "project_id": project_id,
             "user_id": user_context.user_id,
+            "subprotocol": self.connection_codecs[connection_id].subprotocol,
+            "subscription": subscription.to_payload(),
             "connected_at": datetime.utcnow().isoformat(),
             "last_activity": datetime.utcnow().isoformat()
         }
@@ -108,6 +200,7 @@ class ConnectionManager:
             }
         )
         
+        self._ensure_sweeper()
         return connection_id
     
     def disconnect(self, connection_id: str):
@@ -135,6 +228,23 @@ class ConnectionManager:
         # Remove metadata
         del self.connection_metadata[connection_id]
         
+        # Unregister from broadcasts and the lifecycle sweeper
+        self.lifecycle.release(connection_id)
+        if not self.connection_metadata:
+            self._stop_sweeper()
+        self.subscriptions.pop(connection_id, None)
+        subscriber_index = self.subscriber_indexes.get(project_id)
+        if subscriber_index is not None:
+            subscriber_index.remove(connection_id)
+            if not len(subscriber_index):
+                del self.subscriber_indexes[project_id]
+        
+        # Stop the writer
+        self.connection_codecs.pop(connection_id, None)
+        send_queue = self.send_queues.pop(connection_id, None)
+        if send_queue is not None:
+            send_queue.close()
+        
         logger.info(
             "WebSocket connection closed",
             extra={
@@ -151,80 +261,284 @@ class ConnectionManager:
         """
         Send a message to a specific connection.
         
+        The message is queued behind earlier messages of the connection.
+        
         Args:
             message: The message to send
             connection_id: The target connection identifier
         """
-        if connection_id not in self.connection_metadata:
+        send_queue = self.send_queues.get(connection_id)
+        if send_queue is None:
             return
         
-        metadata = self.connection_metadata[connection_id]
-        project_id = metadata["project_id"]
-        
-        if project_id in self.active_connections and connection_id in self.active_connections[project_id]:
-            websocket, _ = self.active_connections[project_id][connection_id]
-            try:
-                await websocket.send_text(json.dumps(message))
-                # Update last activity
+        if send_queue.enqueue(self._codec(connection_id).encode(message)):
+            # Update last activity
+            self.lifecycle.mark_activity(connection_id)
+            if connection_id in self.connection_metadata:
                 self.connection_metadata[connection_id]["last_activity"] = datetime.utcnow().isoformat()
-            except Exception as e:
-                logger.error(
-                    "Failed to send personal message",
-                    extra={
-                        "connection_id": connection_id,
-                        "project_id": project_id,
-                        "error": str(e),
-                        "operation": "websocket_send_personal"
-                    }
-                )
+    
+    def update_subscription(self, connection_id: str, action: str, payload: dict) -> Subscription | None:
+        """
+        Apply a subscribe or unsubscribe control message to a connection.
+        
+        Args:
+            connection_id: The connection identifier
+            action: "subscribe" or "unsubscribe"
+            payload: Control message payload (types, execution_ids, min_log_level)
+            
+        Returns:
+            The updated subscription, or None if the connection is gone
+            
+        Raises:
+            ValueError: If the control message is invalid
+        """
+        metadata = self.connection_metadata.get(connection_id)
+        if metadata is None:
+            return None
+        
+        subscription = apply_subscription_update(self.subscriptions[connection_id], action, payload)
+        self.subscriptions[connection_id] = subscription
+        self.subscriber_indexes[metadata["project_id"]].add(connection_id, subscription)
+        metadata["subscription"] = subscription.to_payload()
+        
+        logger.info(
+            "WebSocket subscription updated",
+            extra={
+                "connection_id": connection_id,
+                "project_id": metadata["project_id"],
+                "action": action,
+                "subscription": metadata["subscription"],
+                "operation": "websocket_subscription_updated"
+            }
+        )
+        
+        return subscription
     
     async def broadcast_to_project(self, message: dict, project_id: str):
         """
-        Broadcast a message to all connections for a specific project.
+        Broadcast a message to the subscribed connections of a project.
+        
+        The message is serialized once and queued for every subscriber;
+        delivery happens on the connections' writer tasks. Execution updates
+        are snapshots and are conflated per execution (latest wins), except
+        terminal ones.
         
         Args:
             message: The message to broadcast
             project_id: The target project identifier
         """
-        if project_id not in self.active_connections:
+        seq = message.get("seq")
+        if project_id not in self.active_connections and seq is None:
             return
         
-        connections = self.active_connections[project_id].copy()
-        failed_connections = []
+        # Encoded once per subprotocol: {subprotocol: frame}
+        frames = {}
+        if seq is not None:
+            # Buffered even without local connections, for clients reconnecting here
+            json_codec = get_codec()
+            frames[json_codec.subprotocol] = json_codec.encode(message)
+            self.replay_buffers.record(project_id, seq, frames[json_codec.subprotocol])
+        subscriber_index = self.subscriber_indexes.get(project_id)
+        if subscriber_index is None:
+            return
         
-        for connection_id, (websocket, _) in connections.items():
-            try:
-                await websocket.send_text(json.dumps(message))
-                # Update last activity
-                if connection_id in self.connection_metadata:
-                    self.connection_metadata[connection_id]["last_activity"] = datetime.utcnow().isoformat()
-            except Exception as e:
-                logger.error(
-                    "Failed to broadcast to connection",
-                    extra={
-                        "connection_id": connection_id,
-                        "project_id": project_id,
-                        "error": str(e),
-                        "operation": "websocket_broadcast"
-                    }
-                )
-                failed_connections.append(connection_id)
+        connection_ids = subscriber_index.targets(message)
+        coalesce_key = _coalesce_key(message)
+        terminal = coalesce_key is not None and _is_terminal_update(message)
+        last_activity = datetime.utcnow().isoformat()
+        now = time.monotonic()
+        rejected_connections = 0
+        max_depth = 0
         
-        # Clean up failed connections
-        for connection_id in failed_connections:
-            self.disconnect(connection_id)
+        for connection_id in connection_ids:
+            send_queue = self.send_queues.get(connection_id)
+            if send_queue is None:
+                rejected_connections += 1
+                continue
+            codec = self._codec(connection_id)
+            frame = frames.get(codec.subprotocol)
+            if frame is None:
+                frame = frames[codec.subprotocol] = codec.encode(message)
+            if not send_queue.enqueue(frame, coalesce_key, terminal):
+                rejected_connections += 1
+                continue
+            max_depth = max(max_depth, send_queue.depth)
+            # Update last activity
+            self.lifecycle.mark_activity(connection_id, now)
+            if connection_id in self.connection_metadata:
+                self.connection_metadata[connection_id]["last_activity"] = last_activity
+        
+        record_websocket_queue_depth(project_id, max_depth)
         
         logger.info(
             "Message broadcast to project",
             extra={
                 "project_id": project_id,
-                "target_connections": len(connections),
-                "failed_connections": len(failed_connections),
-                "successful_connections": len(connections) - len(failed_connections),
+                "project_connections": len(subscriber_index),
+                "target_connections": len(connection_ids),
+                "failed_connections": rejected_connections,
+                "successful_connections": len(connection_ids) - rejected_connections,
+                "max_queue_depth": max_depth,
                 "operation": "websocket_broadcast_project"
             }
         )
     
+    async def replay_missed(self, connection_id: str, resume_from: int) -> Optional[int]:
+        """
+        Queue the project frames a reconnecting client missed.
+        
+        Only frames matching the connection's subscription are replayed. When
+        the frames are no longer buffered, or would not fit into the
+        connection's send queue, a replay-gap message is queued instead and the
+        client should refetch the current status.
+        
+        Args:
+            connection_id: The reconnected connection identifier
+            resume_from: Sequence number of the last frame the client received
+            
+        Returns:
+            Number of replayed frames, or None when a gap was signalled
+        """
+        send_queue = self.send_queues.get(connection_id)
+        if send_queue is None:
+            return None
+        project_id = send_queue.project_id
+        
+        # Shared buffers are read from Redis, off the event loop
+        if self.replay_buffers.shared_reader is not None:
+            frames, oldest_seq, latest_seq = await asyncio.to_thread(
+                self.replay_buffers.read, project_id, resume_from
+            )
+        else:
+            frames, oldest_seq, latest_seq = self.replay_buffers.read(project_id, resume_from)
+        if send_queue is not self.send_queues.get(connection_id):
+            # Disconnected while reading
+            return None
+        subscription = self.subscriptions.get(connection_id)
+        messages = None
+        if frames and subscription is not None and not subscription.is_default:
+            messages = [json.loads(frame) for frame in frames]
+            kept = [index for index, message in enumerate(messages) if subscription.matches(message)]
+            frames = [frames[index] for index in kept]
+            messages = [messages[index] for index in kept]
+        if frames is None or len(frames) > send_queue.max_size - send_queue.depth:
+            send_queue.enqueue(self._codec(connection_id).encode(create_replay_gap_envelope(
+                project_id=project_id,
+                resume_from=resume_from,
+                oldest_seq=oldest_seq,
+                latest_seq=latest_seq
+            )))
+            logger.info(
+                "WebSocket replay gap signalled",
+                extra={
+                    "connection_id": connection_id,
+                    "project_id": project_id,
+                    "resume_from": resume_from,
+                    "oldest_seq": oldest_seq,
+                    "latest_seq": latest_seq,
+                    "operation": "websocket_replay_gap"
+                }
+            )
+            return None
+        
+        # Buffered frames are JSON; other subprotocols re-encode them
+        codec = self._codec(connection_id)
+        for index, frame in enumerate(frames):
+            if codec.binary:
+                frame = codec.encode(messages[index] if messages is not None else json.loads(frame))
+            send_queue.enqueue(frame)
+        
+        logger.info(
+            "WebSocket frames replayed",
+            extra={
+                "connection_id": connection_id,
+                "project_id": project_id,
+                "resume_from": resume_from,
+                "replayed_frames": len(frames),
+                "operation": "websocket_replay"
+            }
+        )
+        return len(frames)
+    
+    def mark_alive(self, connection_id: str) -> None:
+        """Record a frame received from a connection (answers pending pings)."""
+        self.lifecycle.mark_received(connection_id)
+    
+    def mark_active(self, connection_id: str) -> None:
+        """Record an application message received from a connection."""
+        self.lifecycle.mark_activity(connection_id)
+    
+    def sweep_connections(self) -> None:
+        """
+        Evict dead and idle connections, ping silent ones and record
+        connection gauges by state.
+        """
+        to_ping, to_evict = self.lifecycle.sweep()
+        
+        for connection_id, reason in to_evict:
+            metadata = self.connection_metadata.get(connection_id, {})
+            logger.warning(
+                "WebSocket connection evicted",
+                extra={
+                    "connection_id": connection_id,
+                    "project_id": metadata.get("project_id"),
+                    "user_id": metadata.get("user_id"),
+                    "reason": reason.value,
+                    "operation": "websocket_evict"
+                }
+            )
+            record_websocket_connection_evicted(metadata.get("project_id", "unknown"), reason.value)
+            send_queue = self.send_queues.get(connection_id)
+            if send_queue is not None:
+                # Closes the socket and disconnects through on_close
+                send_queue.disconnect(EVICTION_CLOSE_CODES[reason], reason.value)
+            else:
+                self.disconnect(connection_id)
+        
+        # Pings are encoded once per project and subprotocol
+        pings: Dict[Tuple[str, str], Frame] = {}
+        for connection_id in to_ping:
+            send_queue = self.send_queues.get(connection_id)
+            if send_queue is None:
+                continue
+            codec = self._codec(connection_id)
+            key = (send_queue.project_id, codec.subprotocol)
+            if key not in pings:
+                pings[key] = codec.encode(create_envelope(MessageType.PING, send_queue.project_id, {}))
+            send_queue.enqueue(pings[key])
+        
+        record_websocket_connections(self.lifecycle.state_counts())
+    
+    def _ensure_sweeper(self) -> None:
+        """Start the sweeper task on the running loop if it is not running there."""
+        if self.lifecycle.sweep_interval <= 0:
+            return
+        loop = asyncio.get_running_loop()
+        if self._sweeper is None or self._sweeper.done() or self._sweeper.get_loop() is not loop:
+            self._sweeper = loop.create_task(self._sweep_loop())
+    
+    def _stop_sweeper(self) -> None:
+        """Stop the sweeper task once no connection is left."""
+        if self._sweeper is not None and not self._sweeper.get_loop().is_closed():
+            self._sweeper.cancel()
+        self._sweeper = None
+    
+    async def _sweep_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.lifecycle.sweep_interval)
+            try:
+                self.sweep_connections()
+            except Exception as e:
+                logger.error(
+                    "WebSocket connection sweep failed",
+                    extra={"error": str(e), "operation": "websocket_sweep"},
+                    exc_info=True
+                )
+    
+    def _codec(self, connection_id: str) -> FrameCodec:
+        """Frame codec of a connection."""
+        return self.connection_codecs.get(connection_id) or get_codec()
+    
     def get_total_connections(self) -> int:
         """Get the total number of active connections."""
         return sum(len(connections) for connections in self.active_connections.values())
@@ -248,6 +562,40 @@ class ConnectionManager:
             return 0.0
 
 
+# Execution statuses after which no further update follows
+TERMINAL_EXECUTION_STATUSES = frozenset({"completed", "error", "stopped"})
+
+
+def _coalesce_key(message: dict) -> str | None:
+    """Key under which a queued message may be superseded by a newer one."""
+    if message.get("type") != MessageType.EXECUTION_UPDATE.value:
+        return None
+    execution_id = (message.get("payload") or {}).get("execution_id")
+    if execution_id is None:
+        return None
+    return f"{MessageType.EXECUTION_UPDATE.value}:{execution_id}"
+
+
+def _is_terminal_update(message: dict) -> bool:
+    """Whether an execution-update carries a terminal status."""
+    return (message.get("payload") or {}).get("status") in TERMINAL_EXECUTION_STATUSES
+
+
+async def receive_frame(websocket: WebSocket) -> str | bytes:
+    """
+    Receive the next text or binary frame from a client.
+    
+    Raises:
+        WebSocketDisconnect: If the client disconnected
+    """
+    message = await websocket.receive()
+    if message["type"] == "websocket.disconnect":
+        raise WebSocketDisconnect(message.get("code", 1000), message.get("reason"))
+    if message.get("text") is not None:
+        return message["text"]
+    return message.get("bytes") or b""
+
+
 # Message schemas for validation
 class WebSocketMessage(BaseModel):
     """Base WebSocket message schema following ADD Profile C envelope format."""
@@ -305,7 +653,12 @@ router = APIRouter()
 @router.websocket("/devteam")
 async def websocket_devteam_endpoint(
     websocket: WebSocket,
-    project_id: str = Query(..., description="Project identifier for routing")
+    project_id: str = Query(..., description="Project identifier for routing"),
+    resume_from: Optional[int] = Query(None, ge=0, description="Sequence number of the last received frame"),
+    types: Optional[str] = Query(None, description="Comma-separated message types to receive"),
+    execution_ids: Optional[str] = Query(None, description="Comma-separated execution IDs to receive messages of"),
+    min_log_level: Optional[str] = Query(None, description="Lowest execution-log level to receive"),
+    heartbeat: bool = Query(False, description="Whether the client answers server pings")
 ):
     """
     WebSocket endpoint for DevTeam automation real-time communication.
@@ -322,12 +675,50 @@ async def websocket_devteam_endpoint(
     
     **Message Format:**
     All messages follow the envelope format: { type, ts, projectId, payload }
+    Broadcast messages also carry a per-project sequence number `seq`. Live
+    execution updates may be conflated, so `seq` can skip numbers.
+    
+    **Subprotocols:**
+    Clients may request `clarity.json+deflate`, `clarity.msgpack` or
+    `clarity.msgpack+deflate` (msgpack when installed on the server) to get
+    binary, optionally compressed and chunked frames; see core.websocket_codecs.
+    Without a supported subprotocol, frames are JSON text. Clients may send
+    JSON text frames with any subprotocol, or binary frames encoded for the
+    negotiated one.
+    
+    **Resuming:**
+    A reconnecting client passes `resume_from=<last seq>` and receives the
+    broadcasts it missed, or a `replay-gap` message when they are no longer
+    available and it should refetch the status over REST.
+    
+    **Subscriptions:**
+    Connections receive every broadcast unless they narrow it with a
+    `subscribe` message whose payload holds any of `types`, `execution_ids`
+    and `min_log_level` (null resets a filter to all). `unsubscribe` removes
+    the listed `types` or `execution_ids`, or stops all broadcasts without
+    either. The server confirms with a `subscription-updated` message. The
+    same filters can be passed as query parameters to apply from the start,
+    including to replayed broadcasts.
+    
+    **Heartbeats:**
+    Clients that pass `heartbeat=true` are pinged with a `ping` message
+    after a heartbeat interval of silence and answer with `pong` (any
+    message counts); those silent past the heartbeat timeout are closed
+    with code 4009. Listen-only clients are never pinged; protocol-level
+    liveness is left to the server's WebSocket pings. Connections without
+    application messages in either direction past the idle timeout are
+    closed with 4010. Connections over the per-user or per-project cap are refused with
+    4029.
     
     **Supported Message Types:**
     - execution-update: Status and progress updates
-    - execution-log: Log entries and debug information  
+    - execution-log: Log entries and debug information (batched frames carry an `entries` array)
     - error: Error notifications and alerts
     - completion: Task and workflow completion events
+    - replay-gap: Missed broadcasts can no longer be replayed
+    - subscribe / unsubscribe: Client broadcast filters
+    - subscription-updated: Effective broadcast filters
+    - ping / pong: Heartbeats
     
     **Security:**
     - JWT validation on connection establishment
@@ -338,6 +729,11 @@ async def websocket_devteam_endpoint(
     Args:
         websocket: The WebSocket connection
         project_id: Project identifier for routing messages
+        resume_from: Sequence number to resume broadcasts after
+        types: Initial message type filter
+        execution_ids: Initial execution filter
+        min_log_level: Initial execution-log level filter
+        heartbeat: Whether the client answers server pings
     """
     connection_id = None
     start_time = time.time()
@@ -410,11 +806,56 @@ async def websocket_devteam_endpoint(
             )
             return
         
+        # Initial broadcast filters
+        initial_filters = {}
+        if types:
+            initial_filters["types"] = [value.strip() for value in types.split(",") if value.strip()]
+        if execution_ids:
+            initial_filters["execution_ids"] = [value.strip() for value in execution_ids.split(",") if value.strip()]
+        if min_log_level:
+            initial_filters["min_log_level"] = min_log_level
+        try:
+            subscription = apply_subscription_update(Subscription(), MessageType.SUBSCRIBE.value, initial_filters)
+        except ValueError as e:
+            await websocket.close(code=4005, reason="Invalid subscription")
+            logger.warning(
+                "WebSocket connection rejected - invalid subscription",
+                extra={
+                    "project_id": project_id,
+                    "error": str(e),
+                    "remote_addr": websocket.client.host if websocket.client else "unknown",
+                    "operation": "websocket_validation_failed"
+                }
+            )
+            return
+        
         # Calculate handshake duration
         handshake_duration = (time.time() - start_time) * 1000
         
-        # Connect to the manager
-        connection_id = await manager.connect(websocket, project_id, user_context)
+        # Negotiate the frame encoding; JSON text frames unless the client asks otherwise
+        subprotocol = negotiate_subprotocol(websocket.scope.get("subprotocols", []))
+        
+        # Connect to the manager, unless a connection cap is reached
+        try:
+            connection_id = await manager.connect(
+                websocket, project_id, user_context,
+                subprotocol=subprotocol, subscription=subscription, heartbeat=heartbeat
+            )
+        except ConnectionLimitExceeded as e:
+            await websocket.close(code=CONNECTION_LIMIT_CLOSE_CODE, reason=str(e))
+            record_websocket_connection_rejected(project_id, e.reason)
+            logger.warning(
+                "WebSocket connection rejected - connection limit reached",
+                extra={
+                    "project_id": project_id,
+                    "user_id": user_context.user_id,
+                    "reason": e.reason,
+                    "limit": e.limit,
+                    "remote_addr": websocket.client.host if websocket.client else "unknown",
+                    "operation": "websocket_connection_limit"
+                }
+            )
+            return
         
         # Log successful connection with performance metrics
         logger.info(
@@ -423,6 +864,7 @@ async def websocket_devteam_endpoint(
                 "connection_id": connection_id,
                 "project_id": project_id,
                 "user_id": user_context.user_id,
+                "subprotocol": subprotocol,
                 "handshake_duration_ms": round(handshake_duration, 2),
                 "performance_target_met": handshake_duration <= 300,
                 "remote_addr": websocket.client.host if websocket.client else "unknown",
@@ -437,34 +879,46 @@ async def websocket_devteam_endpoint(
             payload={
                 "connection_id": connection_id,
                 "user_id": user_context.user_id,
+                "subprotocol": manager.get_connection_info(connection_id).get("subprotocol"),
+                "subscription": subscription.to_payload(),
                 "message": "WebSocket connection established successfully"
             }
         )
         await manager.send_personal_message(welcome_message, connection_id)
         
+        # Catch up on broadcasts missed while disconnected
+        if resume_from is not None:
+            await manager.replay_missed(connection_id, resume_from)
+        
         # Listen for messages
+        decoder = FrameDecoder(subprotocol)
         while True:
             try:
                 # Receive message with timeout for performance monitoring
                 message_start = time.time()
-                data = await websocket.receive_text()
+                data = await receive_frame(websocket)
+                manager.mark_alive(connection_id)
                 
-                # Validate message size (basic check, gateway should enforce limits)
-                if len(data) > 10000:  # 10KB limit
+                # Validate frame size; the decoder bounds the reassembled and
+                # decompressed message to the same limit
+                if len(data) > DEFAULT_MAX_DECODED_BYTES:
                     error_message = create_error_envelope(
                         project_id=project_id,
                         error_code="MESSAGE_TOO_LARGE",
                         message="Message exceeds size limit",
-                        details=f"Max size: 10000, received: {len(data)}"
+                        details=f"Max size: {DEFAULT_MAX_DECODED_BYTES}, received: {len(data)}"
                     )
                     await manager.send_personal_message(error_message, connection_id)
                     continue
                 
                 # Parse and validate message
                 try:
-                    message_data = json.loads(data)
+                    message_data = decoder.decode(data)
+                    if message_data is None:
+                        # Further chunks of a binary message pending
+                        continue
                     message = WebSocketMessage(**message_data)
-                except (json.JSONDecodeError, ValidationError) as e:
+                except (ValueError, TypeError, ValidationError) as e:
                     error_message = create_error_envelope(
                         project_id=project_id,
                         error_code="INVALID_MESSAGE_FORMAT",
@@ -474,6 +928,11 @@ async def websocket_devteam_endpoint(
                     await manager.send_personal_message(error_message, connection_id)
                     continue
                 
+                # Heartbeat answers are not application traffic
+                if message.type == MessageType.PONG.value:
+                    continue
+                manager.mark_active(connection_id)
+                
                 # Calculate message processing time
                 processing_duration = (time.time() - message_start) * 1000
                 
@@ -491,6 +950,26 @@ async def websocket_devteam_endpoint(
                     }
                 )
                 
+                # Apply subscription changes instead of echoing them
+                if message.type in (MessageType.SUBSCRIBE.value, MessageType.UNSUBSCRIBE.value):
+                    try:
+                        updated = manager.update_subscription(connection_id, message.type, message.payload)
+                    except ValueError as e:
+                        error_message = create_error_envelope(
+                            project_id=project_id,
+                            error_code="INVALID_SUBSCRIPTION",
+                            message="Subscription update rejected",
+                            details=str(e)
+                        )
+                        await manager.send_personal_message(error_message, connection_id)
+                        continue
+                    if updated is not None:
+                        await manager.send_personal_message(
+                            create_subscription_updated_envelope(project_id, updated.to_payload()),
+                            connection_id
+                        )
+                    continue
+                
                 # Echo message back using standardized envelope
                 echo_message = create_envelope(
                     message_type=MessageType.MESSAGE_RECEIVED,
@@ -570,13 +1049,34 @@ async def broadcast_to_project(message: dict, project_id: str):
     """
     Utility function to broadcast a message to all connections for a project.
     
+    The message is published on the WebSocket bus, so it reaches connections
+    held by every API process, including when called from a Celery worker.
+    
     Args:
         message: The message to broadcast
         project_id: The target project identifier
     """
+    await get_message_bus().publish(project_id, message)
+
+
+async def deliver_to_local_connections(project_id: str, message: dict, published_at: float):
+    """
+    Bus subscriber fanning a published message out to this process's connections.
+    
+    Args:
+        project_id: The target project identifier
+        message: The published message
+        published_at: Publish timestamp (epoch seconds)
+    """
+    # Log lines do not change the status; anything else wakes status long-polls
+    if message.get("type") != MessageType.EXECUTION_LOG.value:
+        get_status_waiters().notify(project_id)
     await manager.broadcast_to_project(message, project_id)
 
 
+get_message_bus().subscribe(deliver_to_local_connections)
+
+
 async def send_to_connection(message: dict, connection_id: str):
     """
     Utility function to send a message to a specific connection.
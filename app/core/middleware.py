@@ -9,6 +9,7 @@ from typing import Callable, Optional
 
 from fastapi import Request, Response
 from fastapi.responses import JSONResponse
+from database.read_routing import read_client_key
 from pydantic import ValidationError
 from schemas.common import APIResponse
 from sqlalchemy.exc import SQLAlchemyError
@@ -255,6 +256,23 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
         return response
 
 
+class ReadRoutingMiddleware(BaseHTTPMiddleware):
+    """Middleware identifying the client for read-your-writes replica routing."""
+
+    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+        user = getattr(request.state, "user", None)
+        if user is not None and getattr(user, "user_id", None):
+            client_key = f"user:{user.user_id}"
+        else:
+            client_key = f"ip:{request.client.host}" if request.client else None
+
+        token = read_client_key.set(client_key)
+        try:
+            return await call_next(request)
+        finally:
+            read_client_key.reset(token)
+
+
 class RateLimitingMiddleware(BaseHTTPMiddleware):
     """Simple in-memory rate limiting middleware."""
 
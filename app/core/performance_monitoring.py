@@ -58,6 +58,8 @@ class MetricType(Enum):
     QUEUE_LATENCY = "queue_latency"
     VERIFICATION_DURATION = "verification_duration"
     SUCCESS_RATE = "success_rate"
+    FLUSH_LAG = "flush_lag"
+    CACHE_HIT_RATE = "cache_hit_rate"
 
 
 class ThresholdType(Enum):
@@ -244,6 +246,27 @@ class PerformanceMonitor:
                 severity=AlertSeverity.HIGH,
                 description="Queue latency exceeding 5 seconds"
             ),
+            AlertThreshold(
+                metric_name="task_context_flush_lag",
+                threshold_value=1000.0,  # 1 second
+                threshold_type=ThresholdType.GREATER_THAN,
+                severity=AlertSeverity.HIGH,
+                description="Task context persisted more than 1 second after node completion"
+            ),
+            AlertThreshold(
+                metric_name="websocket_delivery_latency",
+                threshold_value=500.0,  # 500ms
+                threshold_type=ThresholdType.GREATER_THAN,
+                severity=AlertSeverity.MEDIUM,
+                description="WebSocket message delivered more than 500ms after publish"
+            ),
+            AlertThreshold(
+                metric_name="websocket_send_latency",
+                threshold_value=500.0,  # 500ms
+                threshold_type=ThresholdType.GREATER_THAN,
+                severity=AlertSeverity.MEDIUM,
+                description="WebSocket frame written more than 500ms after it was queued"
+            ),
             AlertThreshold(
                 metric_name="verification_duration",
                 threshold_value=30000.0,  # 30 seconds
@@ -918,4 +941,286 @@ def setup_default_alert_callback():
 
 
 # Initialize default alert callback
-setup_default_alert_callback()
\ No newline at end of file
+setup_default_alert_callback()
+
+
+def record_task_context_flush(
+    flush_lags_ms: Dict[str, float],
+    duration_ms: float,
+    terminal: bool = False,
+    correlation_id: Optional[str] = None
+):
+    """
+    Record metrics for one write-behind flush of buffered task_context updates.
+
+    Args:
+        flush_lags_ms: Mapping of execution ID to the time between the oldest
+            unflushed node completion and the flush commit, in milliseconds
+        duration_ms: Time spent executing and committing the batched update
+        terminal: Whether the flush was triggered by a terminal status
+        correlation_id: Optional correlation ID for distributed tracing
+    """
+    tags = {"terminal": str(terminal)}
+
+    for execution_id, lag_ms in flush_lags_ms.items():
+        _performance_monitor.record_metric(
+            name="task_context_flush_lag",
+            value=lag_ms,
+            metric_type=MetricType.FLUSH_LAG,
+            correlation_id=correlation_id,
+            execution_id=execution_id,
+            tags=tags
+        )
+
+    _performance_monitor.record_metric(
+        name="task_context_flush_batch_size",
+        value=float(len(flush_lags_ms)),
+        metric_type=MetricType.THROUGHPUT,
+        correlation_id=correlation_id,
+        tags=tags
+    )
+
+    _performance_monitor.record_metric(
+        name="task_context_flush_duration",
+        value=duration_ms,
+        metric_type=MetricType.LATENCY,
+        correlation_id=correlation_id,
+        tags=tags
+    )
+
+
+def record_read_routing(
+    target: str,
+    reason: str,
+    replica: Optional[str] = None,
+    correlation_id: Optional[str] = None
+):
+    """
+    Record where a read-only database session was routed.
+
+    Args:
+        target: "replica" or "primary"
+        reason: Why the target was chosen (e.g. "routed", "read_your_writes", "replica_lag")
+        replica: Optional index of the chosen replica
+        correlation_id: Optional correlation ID for distributed tracing
+    """
+    tags = {"target": target, "reason": reason}
+    if replica is not None:
+        tags["replica"] = replica
+
+    _performance_monitor.record_metric(
+        name="db_reads_routed" if target == "replica" else "db_reads_fallback",
+        value=1.0,
+        metric_type=MetricType.THROUGHPUT,
+        correlation_id=correlation_id,
+        tags=tags
+    )
+
+
+def record_cache_lookup(
+    cache_name: str,
+    hit: bool,
+    tier: Optional[str] = None,
+    correlation_id: Optional[str] = None
+):
+    """
+    Record a cache lookup as a hit (1.0) or miss (0.0).
+
+    The mean of the metric window is the hit rate of the cache tier.
+
+    Args:
+        cache_name: Name of the cache (e.g. "status_projection")
+        hit: Whether the lookup was served from the cache
+        tier: Optional cache tier (e.g. "local", "redis")
+        correlation_id: Optional correlation ID for distributed tracing
+    """
+    tags = {"cache": cache_name, "result": "hit" if hit else "miss"}
+    if tier:
+        tags["tier"] = tier
+
+    _performance_monitor.record_metric(
+        name=f"{cache_name}_cache_{tier}_hit" if tier else f"{cache_name}_cache_hit",
+        value=1.0 if hit else 0.0,
+        metric_type=MetricType.CACHE_HIT_RATE,
+        correlation_id=correlation_id,
+        tags=tags
+    )
+
+
+def record_websocket_delivery(
+    latency_ms: float,
+    project_id: str,
+    transport: str,
+    correlation_id: Optional[str] = None
+):
+    """
+    Record the publish-to-deliver latency of one WebSocket bus message.
+
+    Args:
+        latency_ms: Time between publish and local fan-out, in milliseconds
+        project_id: Project the message was published to
+        transport: Bus transport ("redis" or "memory")
+        correlation_id: Optional correlation ID for distributed tracing
+    """
+    _performance_monitor.record_metric(
+        name="websocket_delivery_latency",
+        value=latency_ms,
+        metric_type=MetricType.LATENCY,
+        correlation_id=correlation_id,
+        tags={"project_id": project_id, "transport": transport}
+    )
+
+
+def record_websocket_queue_depth(project_id: str, depth: int):
+    """
+    Record the deepest per-connection send queue of a project after a broadcast.
+
+    Recorded both overall and per project (websocket_queue_depth.<project_id>).
+
+    Args:
+        project_id: Project the message was broadcast to
+        depth: Largest send queue depth among the project's connections
+    """
+    for name in ("websocket_queue_depth", f"websocket_queue_depth.{project_id}"):
+        _performance_monitor.record_metric(
+            name=name,
+            value=float(depth),
+            metric_type=MetricType.QUEUE_DEPTH,
+            tags={"project_id": project_id}
+        )
+
+
+def record_websocket_send_latency(project_id: str, latency_ms: float):
+    """
+    Record the enqueue-to-written latency of one WebSocket frame.
+
+    Recorded both overall and per project (websocket_send_latency.<project_id>).
+
+    Args:
+        project_id: Project of the receiving connection
+        latency_ms: Time the frame spent queued and being written, in milliseconds
+    """
+    for name in ("websocket_send_latency", f"websocket_send_latency.{project_id}"):
+        _performance_monitor.record_metric(
+            name=name,
+            value=latency_ms,
+            metric_type=MetricType.LATENCY,
+            tags={"project_id": project_id}
+        )
+
+
+def record_websocket_send_overflow(project_id: str, policy: str):
+    """
+    Record a frame arriving at a full WebSocket send queue.
+
+    Args:
+        project_id: Project of the slow connection
+        policy: Overflow policy applied ("drop_oldest", "coalesce" or "disconnect")
+    """
+    _performance_monitor.record_metric(
+        name="websocket_send_overflow",
+        value=1.0,
+        metric_type=MetricType.THROUGHPUT,
+        tags={"project_id": project_id, "policy": policy}
+    )
+
+
+def record_websocket_frames_conflated(project_id: str):
+    """
+    Record a status snapshot superseded before it was queued for a connection.
+
+    Args:
+        project_id: Project of the connection
+    """
+    _performance_monitor.record_metric(
+        name="websocket_frames_conflated",
+        value=1.0,
+        metric_type=MetricType.THROUGHPUT,
+        tags={"project_id": project_id}
+    )
+
+
+def record_websocket_frame_encoded(subprotocol: str, wire_bytes: int, encode_ms: float):
+    """
+    Record the size and encoding time of one encoded WebSocket message.
+
+    Recorded per subprotocol (websocket_frame_bytes.<subprotocol>,
+    websocket_encode_time.<subprotocol>) so encodings can be compared.
+
+    Args:
+        subprotocol: Subprotocol the message was encoded for
+        wire_bytes: Bytes of all frames of the message
+        encode_ms: Time spent serializing, compressing and chunking, in milliseconds
+    """
+    tags = {"subprotocol": subprotocol}
+
+    _performance_monitor.record_metric(
+        name=f"websocket_frame_bytes.{subprotocol}",
+        value=float(wire_bytes),
+        metric_type=MetricType.THROUGHPUT,
+        tags=tags
+    )
+
+    _performance_monitor.record_metric(
+        name=f"websocket_encode_time.{subprotocol}",
+        value=encode_ms,
+        metric_type=MetricType.LATENCY,
+        tags=tags
+    )
+
+
+def record_websocket_connections(state_counts: Dict[str, int]):
+    """
+    Record gauges of open WebSocket connections by lifecycle state.
+
+    Recorded as a total (websocket_connections) and per state
+    (websocket_connections.<state>).
+
+    Args:
+        state_counts: Number of connections per state
+    """
+    _performance_monitor.record_metric(
+        name="websocket_connections",
+        value=float(sum(state_counts.values())),
+        metric_type=MetricType.RESOURCE_USAGE
+    )
+
+    for state, count in state_counts.items():
+        _performance_monitor.record_metric(
+            name=f"websocket_connections.{state}",
+            value=float(count),
+            metric_type=MetricType.RESOURCE_USAGE,
+            tags={"state": state}
+        )
+
+
+def record_websocket_connection_evicted(project_id: str, reason: str):
+    """
+    Record a WebSocket connection closed by the lifecycle sweeper.
+
+    Args:
+        project_id: Project of the evicted connection
+        reason: Eviction reason ("heartbeat_timeout" or "idle_timeout")
+    """
+    _performance_monitor.record_metric(
+        name="websocket_connection_evicted",
+        value=1.0,
+        metric_type=MetricType.THROUGHPUT,
+        tags={"project_id": project_id, "reason": reason}
+    )
+
+
+def record_websocket_connection_rejected(project_id: str, reason: str):
+    """
+    Record a WebSocket connection refused by a connection cap.
+
+    Args:
+        project_id: Project the connection was for
+        reason: Cap that was reached ("user_limit" or "project_limit")
+    """
+    _performance_monitor.record_metric(
+        name="websocket_connection_rejected",
+        value=1.0,
+        metric_type=MetricType.THROUGHPUT,
+        tags={"project_id": project_id, "reason": reason}
+    )
@@ -0,0 +1,362 @@
+"""
+WebSocket Message Bus Module for Clarity Local Runner
+
+This module provides the cross-process fan-out layer for WebSocket messages:
+- Publishers (API handlers, Celery workers) publish project messages to the bus
+- Every API process subscribes and fans messages out to its local connections
+- Redis pub/sub with one channel per project in deployed environments
+- In-memory stand-in delivering within the process for local runs and tests
+- Per-project sequence numbers (`seq`) shared by every process, for replay
+- Recent sequenced messages kept in Redis for replay on any process
+- Publish-to-deliver latency measured against the 500ms real-time target
+
+Primary Responsibility: Deliver project messages to sockets held by any process
+"""
+
+import asyncio
+import json
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+# Make redis optional; without it the in-memory bus is used
+try:
+    import redis
+    import redis.asyncio as redis_asyncio
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+    redis = None  # type: ignore
+    redis_asyncio = None  # type: ignore
+
+from core.structured_logging import get_structured_logger
+from core.performance_monitoring import record_websocket_delivery
+from core.websocket_replay import replay_limits
+from schemas.websocket_envelope import SerializedEnvelope, with_seq
+
+
+logger = get_structured_logger(__name__)
+
+# Subscriber callback: (project_id, message, published_at)
+MessageHandler = Callable[[str, Dict[str, Any], float], Awaitable[None]]
+
+
+class InMemoryMessageBus:
+    """
+    Process-local message bus.
+
+    Publishing delivers directly to the subscribers of this process, which is
+    the behaviour of a single API process without Redis. Sequence numbers
+    come from a per-project counter of this process.
+    """
+
+    transport = "memory"
+
+    def __init__(self):
+        self._handlers: List[MessageHandler] = []
+        self._sequences: Dict[str, int] = {}
+
+    def subscribe(self, handler: MessageHandler) -> None:
+        """Register a handler receiving every published message."""
+        if handler not in self._handlers:
+            self._handlers.append(handler)
+
+    async def start(self) -> None:
+        """Start receiving messages (nothing to do in-process)."""
+
+    async def stop(self) -> None:
+        """Stop receiving messages (nothing to do in-process)."""
+
+    async def publish(self, project_id: str, message: Dict[str, Any]) -> None:
+        """
+        Publish a message to every subscriber of a project.
+
+        Subscribers receive a copy of the message carrying the project's next
+        sequence number as `seq`.
+
+        Args:
+            project_id: Target project identifier
+            message: JSON-serializable WebSocket envelope
+        """
+        seq = self._sequences.get(project_id, 0) + 1
+        self._sequences[project_id] = seq
+        await self._deliver(project_id, with_seq(message, seq), time.time())
+
+    async def _deliver(self, project_id: str, message: Dict[str, Any], published_at: float) -> None:
+        for handler in list(self._handlers):
+            try:
+                await handler(project_id, message, published_at)
+            except Exception as e:
+                logger.error(
+                    "WebSocket bus handler failed",
+                    project_id=project_id,
+                    transport=self.transport,
+                    error=e
+                )
+        record_websocket_delivery(
+            latency_ms=(time.time() - published_at) * 1000,
+            project_id=project_id,
+            transport=self.transport
+        )
+
+
+class RedisMessageBus(InMemoryMessageBus):
+    """
+    Redis pub/sub message bus with one channel per project.
+
+    publish() works from any process (API or worker). start() subscribes to
+    every project channel in an API process and delivers received messages to
+    the local subscribers; it reconnects with backoff if Redis goes away.
+    When a publish fails the message is delivered locally without a sequence
+    number, and publishing is skipped for PUBLISH_RETRY_SECONDS, so
+    single-process setups keep working.
+
+    Sequence numbers are assigned by Redis (INCR) in the same script that
+    publishes, so every subscriber sees them in delivery order. Channel
+    payloads are "<seq>|<json envelope>".
+
+    The script also appends each payload to the project's replay buffer, a
+    sorted set scored by seq and capped by frame count and bytes like the
+    process buffers (see core.websocket_replay). The buffer expires after
+    the replay TTL without broadcasts.
+    """
+
+    transport = "redis"
+
+    CHANNEL_PREFIX = "ws:project:"
+    SEQUENCE_PREFIX = "ws:seq:"
+    REPLAY_PREFIX = "ws:replay:"
+    REPLAY_BYTES_PREFIX = "ws:replay-bytes:"
+    PUBLISH_SCRIPT = """
+local seq = redis.call('INCR', KEYS[1])
+local entry = seq .. '|' .. ARGV[2]
+redis.call('PUBLISH', ARGV[1], entry)
+local max_frames = tonumber(ARGV[3])
+local max_bytes = tonumber(ARGV[4])
+if max_frames > 0 and max_bytes > 0 then
+  if seq == 1 then
+    redis.call('DEL', KEYS[2], KEYS[3])
+  end
+  redis.call('ZADD', KEYS[2], seq, entry)
+  local bytes = redis.call('INCRBY', KEYS[3], #entry)
+  local count = redis.call('ZCARD', KEYS[2])
+  while count > 0 and (count > max_frames or bytes > max_bytes) do
+    local evicted = redis.call('ZPOPMIN', KEYS[2])
+    bytes = redis.call('DECRBY', KEYS[3], #evicted[1])
+    count = count - 1
+  end
+  redis.call('EXPIRE', KEYS[2], ARGV[5])
+  redis.call('EXPIRE', KEYS[3], ARGV[5])
+end
+return seq
+"""
+    SOCKET_TIMEOUT_SECONDS = 1.0
+    PUBLISH_RETRY_SECONDS = 5.0
+    RECONNECT_MAX_SECONDS = 10.0
+
+    def __init__(self, redis_url: str, redis_client: Any = None, subscriber_client: Any = None):
+        """
+        Initialize Redis message bus.
+
+        Args:
+            redis_url: Redis URL used by the publisher and the subscriber
+            redis_client: Pre-built synchronous client used for publishing
+            subscriber_client: Pre-built redis.asyncio client used for subscribing
+        """
+        super().__init__()
+        self._redis_url = redis_url
+        self._client = redis_client
+        self._subscriber_client = subscriber_client
+        self._listener: Optional[asyncio.Task] = None
+        self._publish_disabled_until = 0.0
+        self._publish_script: Any = None
+        self._replay_max_frames, self._replay_max_bytes, self._replay_ttl_seconds = replay_limits()
+
+    async def start(self) -> None:
+        """Subscribe to all project channels and deliver messages locally."""
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.get_running_loop().create_task(self._listen())
+
+    async def stop(self) -> None:
+        """Stop the subscription task."""
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._listener = None
+
+    async def publish(self, project_id: str, message: Dict[str, Any]) -> None:
+        """
+        Publish a message on the project's channel.
+
+        Args:
+            project_id: Target project identifier
+            message: JSON-serializable WebSocket envelope
+        """
+        published_at = time.time()
+        if published_at < self._publish_disabled_until:
+            await self._deliver(project_id, message, published_at)
+            return
+        
+        if isinstance(message, SerializedEnvelope):
+            # Same text as json.dumps of the wrapper, without re-serializing the envelope
+            payload = _bus_payload_prefix(project_id, published_at) + message.json_text + "}"
+        else:
+            payload = json.dumps({"project_id": project_id, "published_at": published_at, "message": message})
+        try:
+            # The synchronous client works from any event loop (API or worker)
+            await asyncio.to_thread(
+                self._publisher(),
+                keys=[
+                    self.SEQUENCE_PREFIX + project_id,
+                    self.REPLAY_PREFIX + project_id,
+                    self.REPLAY_BYTES_PREFIX + project_id
+                ],
+                args=[
+                    self.CHANNEL_PREFIX + project_id,
+                    payload,
+                    self._replay_max_frames,
+                    self._replay_max_bytes,
+                    max(1, self._replay_ttl_seconds)
+                ]
+            )
+        except Exception as e:
+            self._publish_disabled_until = time.time() + self.PUBLISH_RETRY_SECONDS
+            logger.warn(
+                "WebSocket bus publish failed, delivering locally",
+                project_id=project_id,
+                retry_in_seconds=self.PUBLISH_RETRY_SECONDS,
+                error_message=str(e)
+            )
+            await self._deliver(project_id, message, published_at)
+
+    async def _listen(self) -> None:
+        backoff = 0.5
+        while True:
+            pubsub = None
+            try:
+                client = self._subscriber_client or redis_asyncio.Redis.from_url(self._redis_url)
+                pubsub = client.pubsub()
+                await pubsub.psubscribe(self.CHANNEL_PREFIX + "*")
+                logger.info("WebSocket bus subscribed", channel_pattern=self.CHANNEL_PREFIX + "*")
+                backoff = 0.5
+                async for raw in pubsub.listen():
+                    if raw.get("type") == "pmessage":
+                        await self._dispatch(raw.get("data"))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warn(
+                    "WebSocket bus subscription lost, reconnecting",
+                    retry_in_seconds=backoff,
+                    error_message=str(e)
+                )
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, self.RECONNECT_MAX_SECONDS)
+            finally:
+                if pubsub is not None:
+                    try:
+                        await pubsub.aclose()
+                    except Exception:
+                        pass
+
+    def read_replay(self, project_id: str, seq: int) -> Tuple[Optional[int], Optional[int], List[str]]:
+        """
+        Read a project's replay buffer in Redis.
+
+        Args:
+            project_id: Project identifier
+            seq: Sequence number of the last message the reader has
+
+        Returns:
+            (oldest buffered seq, latest seq, JSON frames published after `seq`)
+        """
+        client = self._sync_client()
+        replay_key = self.REPLAY_PREFIX + project_id
+        pipeline = client.pipeline(transaction=True)
+        pipeline.zrange(replay_key, 0, 0, withscores=True)
+        pipeline.get(self.SEQUENCE_PREFIX + project_id)
+        pipeline.zrangebyscore(replay_key, f"({seq}", "+inf")
+        oldest, latest, entries = pipeline.execute()
+
+        frames = []
+        for entry in entries:
+            try:
+                frames.append(_parse_entry(entry)[1].json_text)
+            except Exception as e:
+                logger.warn("Skipping unreadable WebSocket replay entry", project_id=project_id, error_message=str(e))
+        return (
+            int(oldest[0][1]) if oldest else None,
+            int(latest) if latest is not None else None,
+            frames
+        )
+
+    async def _dispatch(self, data: Any) -> None:
+        try:
+            project_id, message, published_at = _parse_entry(data)
+        except Exception as e:
+            logger.warn("Discarding unreadable WebSocket bus message", error_message=str(e))
+            return
+        await self._deliver(project_id, message, published_at)
+
+    def _sync_client(self) -> Any:
+        if self._client is None:
+            self._client = redis.Redis.from_url(
+                self._redis_url,
+                socket_connect_timeout=self.SOCKET_TIMEOUT_SECONDS,
+                socket_timeout=self.SOCKET_TIMEOUT_SECONDS
+            )
+        return self._client
+
+    def _publisher(self) -> Any:
+        """Sequence-and-publish script bound to the synchronous client."""
+        if self._publish_script is None:
+            self._publish_script = self._sync_client().register_script(self.PUBLISH_SCRIPT)
+        return self._publish_script
+
+
+def _parse_entry(data: Any) -> Tuple[str, SerializedEnvelope, float]:
+    """(project_id, sequenced message, published_at) of a "<seq>|<json envelope>" payload."""
+    if isinstance(data, bytes):
+        data = data.decode("utf-8")
+    seq, _, data = data.partition("|")
+    envelope = json.loads(data)
+    project_id = envelope["project_id"]
+    prefix = _bus_payload_prefix(project_id, envelope["published_at"])
+    # Keep the published JSON text so local fan-out does not serialize again
+    message_text = data[len(prefix):-1] if data.startswith(prefix) else None
+    message = SerializedEnvelope(envelope["message"], message_text).with_seq(int(seq))
+    return project_id, message, float(envelope["published_at"])
+
+
+def _bus_payload_prefix(project_id: str, published_at: float) -> str:
+    return '{"project_id": %s, "published_at": %s, "message": ' % (json.dumps(project_id), json.dumps(published_at))
+
+
+def _resolve_redis_url() -> Optional[str]:
+    """Redis URL of the bus, or None when no Redis is configured."""
+    redis_url = os.getenv("WEBSOCKET_BUS_REDIS_URL")
+    if redis_url:
+        return redis_url
+    if os.getenv("PROJECT_NAME"):
+        from worker.config import get_redis_url
+        return get_redis_url()
+    return None
+
+
+# Global message bus instance
+_message_bus: Optional[InMemoryMessageBus] = None
+
+
+def get_message_bus() -> InMemoryMessageBus:
+    """Get the global WebSocket message bus (Redis when configured, else in-memory)."""
+    global _message_bus
+    if _message_bus is None:
+        redis_url = _resolve_redis_url()
+        if redis_url and REDIS_AVAILABLE:
+            _message_bus = RedisMessageBus(redis_url)
+        else:
+            _message_bus = InMemoryMessageBus()
+    return _message_bus
@@ -0,0 +1,299 @@
+"""
+WebSocket Codec Module for Clarity Local Runner
+
+This module encodes WebSocket envelopes for the negotiated subprotocol:
+- clarity.json: JSON text frames (default, also without a subprotocol)
+- clarity.json+deflate: binary frames of zlib-compressed JSON
+- clarity.msgpack: binary frames of msgpack-encoded envelopes
+- clarity.msgpack+deflate: binary frames of zlib-compressed msgpack
+
+Binary frames start with a flags byte (FLAG_CHUNKED, FLAG_DEFLATED). Bodies
+larger than the chunk size are split into several frames; chunked frames
+carry a (message_id, index, count) header after the flags byte. Compression
+applies to the whole body before chunking and only to bodies of at least
+WEBSOCKET_COMPRESSION_MIN_BYTES. Frames received from clients are decoded
+within limits on the reassembled, decompressed message size and on the
+chunked messages pending per connection.
+
+Transport-level permessage-deflate is negotiated by the ASGI server; the
++deflate subprotocols compress in the application with a configurable level
+(WEBSOCKET_COMPRESSION_LEVEL), so clients choosing them should not also
+offer permessage-deflate.
+
+Primary Responsibility: Encode and decode WebSocket envelopes per subprotocol
+"""
+
+import itertools
+import json
+import os
+import struct
+import time
+import zlib
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+# Make msgpack optional; without it the msgpack subprotocols are not offered
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+    msgpack = None  # type: ignore
+
+from core.performance_monitoring import record_websocket_frame_encoded
+from schemas.websocket_envelope import SerializedEnvelope
+
+
+JSON_SUBPROTOCOL = "clarity.json"
+JSON_DEFLATE_SUBPROTOCOL = "clarity.json+deflate"
+MSGPACK_SUBPROTOCOL = "clarity.msgpack"
+MSGPACK_DEFLATE_SUBPROTOCOL = "clarity.msgpack+deflate"
+
+FLAG_CHUNKED = 0x01
+FLAG_DEFLATED = 0x02
+
+# Chunk header after the flags byte: message id, chunk index, chunk count
+CHUNK_HEADER = struct.Struct(">IHH")
+
+DEFAULT_COMPRESSION_LEVEL = 6
+DEFAULT_COMPRESSION_MIN_BYTES = 512
+DEFAULT_CHUNK_BYTES = 64 * 1024
+
+# Limits of frames received from clients: decoded size of one message and
+# chunked messages reassembled at once per connection
+DEFAULT_MAX_DECODED_BYTES = 10000
+DEFAULT_MAX_PENDING_MESSAGES = 4
+
+# An encoded message: one text frame, one binary frame or several binary chunks
+Frame = Union[str, bytes, List[bytes]]
+
+
+def _env_int(name: str, default: int, minimum: int, maximum: Optional[int] = None) -> int:
+    try:
+        value = int(os.getenv(name, default))
+    except ValueError:
+        return default
+    value = max(minimum, value)
+    return min(maximum, value) if maximum is not None else value
+
+
+class FrameCodec:
+    """
+    Encoder of WebSocket envelopes for one subprotocol.
+
+    Args:
+        subprotocol: Subprotocol name
+        serializer: "json" or "msgpack"
+        deflate: Whether bodies are zlib-compressed
+        compression_level: zlib level (WEBSOCKET_COMPRESSION_LEVEL, default 6)
+        compression_min_bytes: Smallest body compressed (WEBSOCKET_COMPRESSION_MIN_BYTES, default 512)
+        chunk_bytes: Largest body part per binary frame (WEBSOCKET_CHUNK_BYTES, default 64 KiB)
+    """
+
+    _message_ids = itertools.count(1)
+
+    def __init__(
+        self,
+        subprotocol: str,
+        serializer: str = "json",
+        deflate: bool = False,
+        compression_level: Optional[int] = None,
+        compression_min_bytes: Optional[int] = None,
+        chunk_bytes: Optional[int] = None
+    ):
+        self.subprotocol = subprotocol
+        self.serializer = serializer
+        self.deflate = deflate
+        self.compression_level = compression_level if compression_level is not None else _env_int(
+            "WEBSOCKET_COMPRESSION_LEVEL", DEFAULT_COMPRESSION_LEVEL, 0, 9
+        )
+        self.compression_min_bytes = compression_min_bytes if compression_min_bytes is not None else _env_int(
+            "WEBSOCKET_COMPRESSION_MIN_BYTES", DEFAULT_COMPRESSION_MIN_BYTES, 0
+        )
+        self.chunk_bytes = chunk_bytes if chunk_bytes is not None else _env_int(
+            "WEBSOCKET_CHUNK_BYTES", DEFAULT_CHUNK_BYTES, 1024
+        )
+
+    @property
+    def binary(self) -> bool:
+        """Whether frames are sent as binary frames."""
+        return self.serializer != "json" or self.deflate
+
+    def encode(self, message: Dict[str, Any]) -> Frame:
+        """
+        Encode an envelope into the frame(s) of this subprotocol.
+
+        Encoded size and duration are recorded per subprotocol.
+        """
+        start_time = time.perf_counter()
+
+        # Trusted envelopes carry their JSON text already
+        json_text = message.json_text if isinstance(message, SerializedEnvelope) else None
+
+        if not self.binary:
+            frame = json_text if json_text is not None else json.dumps(message)
+            record_websocket_frame_encoded(self.subprotocol, len(frame), (time.perf_counter() - start_time) * 1000)
+            return frame
+
+        if self.serializer == "msgpack":
+            body = msgpack.packb(message, use_bin_type=True)
+        else:
+            body = (json_text if json_text is not None else json.dumps(message)).encode("utf-8")
+
+        flags = 0
+        if self.deflate and len(body) >= self.compression_min_bytes:
+            body = zlib.compress(body, self.compression_level)
+            flags |= FLAG_DEFLATED
+
+        if len(body) <= self.chunk_bytes:
+            frame = bytes((flags,)) + body
+            wire_bytes = len(frame)
+        else:
+            frame = self._chunk(flags | FLAG_CHUNKED, body)
+            wire_bytes = sum(len(part) for part in frame)
+
+        record_websocket_frame_encoded(self.subprotocol, wire_bytes, (time.perf_counter() - start_time) * 1000)
+        return frame
+
+    def _chunk(self, flags: int, body: bytes) -> List[bytes]:
+        message_id = next(self._message_ids) & 0xFFFFFFFF
+        parts = [body[offset:offset + self.chunk_bytes] for offset in range(0, len(body), self.chunk_bytes)]
+        prefix = bytes((flags,))
+        return [
+            prefix + CHUNK_HEADER.pack(message_id, index, len(parts)) + part
+            for index, part in enumerate(parts)
+        ]
+
+
+class FrameDecoder:
+    """
+    Decoder of received frames for one connection, reassembling chunks.
+
+    Client frames are untrusted: reassembled and decompressed bodies are
+    bounded by max_decoded_bytes, and at most max_pending_messages chunked
+    messages are held at once.
+
+    Args:
+        subprotocol: Negotiated subprotocol (None or clarity.json for JSON text)
+        max_decoded_bytes: Largest message body, after reassembly and decompression
+        max_pending_messages: Most chunked messages awaiting further chunks
+    """
+
+    def __init__(
+        self,
+        subprotocol: Optional[str] = None,
+        max_decoded_bytes: int = DEFAULT_MAX_DECODED_BYTES,
+        max_pending_messages: int = DEFAULT_MAX_PENDING_MESSAGES
+    ):
+        self.serializer = "msgpack" if subprotocol in (MSGPACK_SUBPROTOCOL, MSGPACK_DEFLATE_SUBPROTOCOL) else "json"
+        self.max_decoded_bytes = max_decoded_bytes
+        self.max_pending_messages = max_pending_messages
+        # {message_id: {chunk index: part}} and reassembled bytes per message
+        self._chunks: Dict[int, Dict[int, bytes]] = {}
+        self._chunk_bytes: Dict[int, int] = {}
+
+    def decode(self, frame: Union[str, bytes]) -> Optional[Dict[str, Any]]:
+        """
+        Decode one received frame.
+
+        Returns:
+            The envelope, or None while a chunked message is incomplete
+
+        Raises:
+            ValueError: If the frame is malformed or the message exceeds a limit
+        """
+        if isinstance(frame, str):
+            self._check_size(len(frame))
+            return json.loads(frame)
+        try:
+            return self._decode_binary(frame)
+        except (IndexError, struct.error, zlib.error) as e:
+            raise ValueError(f"Malformed binary frame: {e}") from e
+
+    def _check_size(self, size: int) -> None:
+        if size > self.max_decoded_bytes:
+            raise ValueError(f"Message exceeds {self.max_decoded_bytes} bytes")
+
+    def _add_chunk(self, body: bytes) -> Optional[bytes]:
+        """Store one chunk; the reassembled body once every chunk arrived."""
+        message_id, index, count = CHUNK_HEADER.unpack_from(body)
+        if index >= count:
+            raise ValueError(f"Chunk index {index} out of range for {count} chunks")
+        if message_id not in self._chunks and len(self._chunks) >= self.max_pending_messages:
+            raise ValueError(f"More than {self.max_pending_messages} chunked messages pending")
+
+        parts = self._chunks.setdefault(message_id, {})
+        part = body[CHUNK_HEADER.size:]
+        size = self._chunk_bytes.get(message_id, 0) - len(parts.get(index, b"")) + len(part)
+        if size > self.max_decoded_bytes:
+            self._discard(message_id)
+            raise ValueError(f"Message exceeds {self.max_decoded_bytes} bytes")
+        parts[index] = part
+        self._chunk_bytes[message_id] = size
+        if len(parts) < count:
+            return None
+        self._discard(message_id)
+        return b"".join(parts[position] for position in range(count))
+
+    def _discard(self, message_id: int) -> None:
+        self._chunks.pop(message_id, None)
+        self._chunk_bytes.pop(message_id, None)
+
+    def _decompress(self, body: bytes) -> bytes:
+        """Inflate a body without producing more than max_decoded_bytes."""
+        decompressor = zlib.decompressobj()
+        data = decompressor.decompress(body, self.max_decoded_bytes + 1)
+        self._check_size(len(data))
+        if decompressor.unconsumed_tail or not decompressor.eof:
+            raise ValueError("Truncated or oversized compressed body")
+        return data
+
+    def _decode_binary(self, frame: bytes) -> Optional[Dict[str, Any]]:
+        flags, body = frame[0], frame[1:]
+        if flags & FLAG_CHUNKED:
+            body = self._add_chunk(body)
+            if body is None:
+                return None
+
+        if flags & FLAG_DEFLATED:
+            body = self._decompress(body)
+        self._check_size(len(body))
+        if self.serializer == "msgpack":
+            return msgpack.unpackb(body, raw=False)
+        return json.loads(body)
+
+
+def supported_subprotocols() -> List[str]:
+    """Subprotocols this server can speak, in preference order."""
+    subprotocols = [JSON_SUBPROTOCOL, JSON_DEFLATE_SUBPROTOCOL]
+    if MSGPACK_AVAILABLE:
+        subprotocols += [MSGPACK_SUBPROTOCOL, MSGPACK_DEFLATE_SUBPROTOCOL]
+    return subprotocols
+
+
+def negotiate_subprotocol(requested: Iterable[str]) -> Optional[str]:
+    """First subprotocol requested by the client that the server supports, if any."""
+    supported = supported_subprotocols()
+    for subprotocol in requested:
+        if subprotocol in supported:
+            return subprotocol
+    return None
+
+
+_CODEC_SETTINGS: Dict[str, Tuple[str, bool]] = {
+    JSON_SUBPROTOCOL: ("json", False),
+    JSON_DEFLATE_SUBPROTOCOL: ("json", True),
+    MSGPACK_SUBPROTOCOL: ("msgpack", False),
+    MSGPACK_DEFLATE_SUBPROTOCOL: ("msgpack", True),
+}
+
+_codecs: Dict[str, FrameCodec] = {}
+
+
+def get_codec(subprotocol: Optional[str] = None) -> FrameCodec:
+    """Shared codec of a subprotocol (JSON text when None)."""
+    subprotocol = subprotocol or JSON_SUBPROTOCOL
+    codec = _codecs.get(subprotocol)
+    if codec is None:
+        serializer, deflate = _CODEC_SETTINGS[subprotocol]
+        codec = _codecs[subprotocol] = FrameCodec(subprotocol, serializer=serializer, deflate=deflate)
+    return codec
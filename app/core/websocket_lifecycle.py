@@ -0,0 +1,243 @@
+"""
+WebSocket Lifecycle Module for Clarity Local Runner
+
+This module keeps the connections of a ConnectionManager proportional to live
+clients:
+- Server-driven heartbeats for connections that opt in: those silent for a
+  heartbeat interval are pinged and must answer (with pong or any other
+  message); listen-only clients that never answer are not pinged
+- Eviction of heartbeat connections silent past the heartbeat timeout and of
+  idle connections without application traffic past the idle timeout
+- Per-user and per-project connection caps checked before a connection is
+  accepted
+- Connection counts by state for gauges
+
+Settings (seconds or counts; 0 disables, and the heartbeat timeout only
+applies to connections that opted in while heartbeats are sent):
+- WEBSOCKET_HEARTBEAT_INTERVAL, default 30
+- WEBSOCKET_HEARTBEAT_TIMEOUT, default 90
+- WEBSOCKET_IDLE_TIMEOUT, default 3600
+- WEBSOCKET_MAX_CONNECTIONS_PER_USER, default 25
+- WEBSOCKET_MAX_CONNECTIONS_PER_PROJECT, default 500
+
+Primary Responsibility: Decide which connections to ping, evict or refuse
+"""
+
+import os
+import time
+from enum import Enum
+from typing import Dict, List, Optional, Set, Tuple
+
+
+DEFAULT_HEARTBEAT_INTERVAL = 30.0
+DEFAULT_HEARTBEAT_TIMEOUT = 90.0
+DEFAULT_IDLE_TIMEOUT = 3600.0
+DEFAULT_MAX_CONNECTIONS_PER_USER = 25
+DEFAULT_MAX_CONNECTIONS_PER_PROJECT = 500
+
+# Close codes of connections evicted or refused
+HEARTBEAT_TIMEOUT_CLOSE_CODE = 4009
+IDLE_TIMEOUT_CLOSE_CODE = 4010
+CONNECTION_LIMIT_CLOSE_CODE = 4029
+
+
+class ConnectionState(str, Enum):
+    """Lifecycle state of an open connection."""
+    ACTIVE = "active"
+    IDLE = "idle"
+    AWAITING_PONG = "awaiting_pong"
+
+
+class EvictionReason(str, Enum):
+    """Why the sweeper closed a connection."""
+    HEARTBEAT_TIMEOUT = "heartbeat_timeout"
+    IDLE_TIMEOUT = "idle_timeout"
+
+
+EVICTION_CLOSE_CODES: Dict[EvictionReason, int] = {
+    EvictionReason.HEARTBEAT_TIMEOUT: HEARTBEAT_TIMEOUT_CLOSE_CODE,
+    EvictionReason.IDLE_TIMEOUT: IDLE_TIMEOUT_CLOSE_CODE,
+}
+
+
+class ConnectionLimitExceeded(Exception):
+    """Raised when accepting a connection would exceed a connection cap."""
+
+    def __init__(self, reason: str, limit: int):
+        self.reason = reason
+        self.limit = limit
+        super().__init__(f"Connection limit reached ({reason}: {limit})")
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return max(0.0, float(os.getenv(name, default)))
+    except ValueError:
+        return default
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(0, int(os.getenv(name, default)))
+    except ValueError:
+        return default
+
+
+class ConnectionLifecycle:
+    """
+    Liveness and admission bookkeeping of WebSocket connections.
+
+    Times are monotonic. A heartbeat connection is alive while it sent a
+    frame within the heartbeat timeout; other connections are only subject
+    to the idle timeout. A connection is active while application messages
+    flowed in either direction within the heartbeat interval.
+
+    Args:
+        heartbeat_interval: Silence after which a connection is pinged
+        heartbeat_timeout: Silence after which a connection is dead
+        idle_timeout: Time without application messages after which a connection is evicted
+        max_connections_per_user: Cap of concurrent connections of one user
+        max_connections_per_project: Cap of concurrent connections of one project
+    """
+
+    def __init__(
+        self,
+        heartbeat_interval: Optional[float] = None,
+        heartbeat_timeout: Optional[float] = None,
+        idle_timeout: Optional[float] = None,
+        max_connections_per_user: Optional[int] = None,
+        max_connections_per_project: Optional[int] = None
+    ):
+        self.heartbeat_interval = heartbeat_interval if heartbeat_interval is not None else _env_float(
+            "WEBSOCKET_HEARTBEAT_INTERVAL", DEFAULT_HEARTBEAT_INTERVAL
+        )
+        self.heartbeat_timeout = heartbeat_timeout if heartbeat_timeout is not None else _env_float(
+            "WEBSOCKET_HEARTBEAT_TIMEOUT", DEFAULT_HEARTBEAT_TIMEOUT
+        )
+        self.idle_timeout = idle_timeout if idle_timeout is not None else _env_float(
+            "WEBSOCKET_IDLE_TIMEOUT", DEFAULT_IDLE_TIMEOUT
+        )
+        self.max_connections_per_user = max_connections_per_user if max_connections_per_user is not None else _env_int(
+            "WEBSOCKET_MAX_CONNECTIONS_PER_USER", DEFAULT_MAX_CONNECTIONS_PER_USER
+        )
+        self.max_connections_per_project = (
+            max_connections_per_project if max_connections_per_project is not None else _env_int(
+                "WEBSOCKET_MAX_CONNECTIONS_PER_PROJECT", DEFAULT_MAX_CONNECTIONS_PER_PROJECT
+            )
+        )
+
+        # {connection_id: (project_id, user_id)}
+        self._owners: Dict[str, Tuple[str, str]] = {}
+        self._user_connections: Dict[str, Set[str]] = {}
+        self._project_connections: Dict[str, Set[str]] = {}
+        # Monotonic times per connection
+        self._last_received: Dict[str, float] = {}
+        self._last_activity: Dict[str, float] = {}
+        self._ping_sent: Dict[str, float] = {}
+        # Connections answering pings
+        self._heartbeat_connections: Set[str] = set()
+
+    @property
+    def sweep_interval(self) -> float:
+        """Seconds between sweeps (0 when nothing is swept)."""
+        intervals = [value for value in (self.heartbeat_interval, self.idle_timeout) if value > 0]
+        return min(intervals) if intervals else 0.0
+
+    def __len__(self) -> int:
+        return len(self._owners)
+
+    def admit(self, connection_id: str, project_id: str, user_id: str, heartbeat: bool = False) -> None:
+        """
+        Register a connection about to be accepted.
+
+        Args:
+            connection_id: Connection identifier
+            project_id: Project of the connection
+            user_id: User of the connection
+            heartbeat: Whether the client answers pings (opts in to heartbeat eviction)
+
+        Raises:
+            ConnectionLimitExceeded: If the user or project is at its cap
+        """
+        user_connections = self._user_connections.get(user_id, ())
+        if self.max_connections_per_user and len(user_connections) >= self.max_connections_per_user:
+            raise ConnectionLimitExceeded("user_limit", self.max_connections_per_user)
+        project_connections = self._project_connections.get(project_id, ())
+        if self.max_connections_per_project and len(project_connections) >= self.max_connections_per_project:
+            raise ConnectionLimitExceeded("project_limit", self.max_connections_per_project)
+
+        self._owners[connection_id] = (project_id, user_id)
+        self._user_connections.setdefault(user_id, set()).add(connection_id)
+        self._project_connections.setdefault(project_id, set()).add(connection_id)
+        now = time.monotonic()
+        self._last_received[connection_id] = now
+        self._last_activity[connection_id] = now
+        if heartbeat:
+            self._heartbeat_connections.add(connection_id)
+
+    def release(self, connection_id: str) -> None:
+        """Unregister a connection."""
+        owner = self._owners.pop(connection_id, None)
+        if owner is None:
+            return
+        project_id, user_id = owner
+        for index, key in ((self._user_connections, user_id), (self._project_connections, project_id)):
+            members = index.get(key)
+            if members is not None:
+                members.discard(connection_id)
+                if not members:
+                    del index[key]
+        self._last_received.pop(connection_id, None)
+        self._last_activity.pop(connection_id, None)
+        self._ping_sent.pop(connection_id, None)
+        self._heartbeat_connections.discard(connection_id)
+
+    def mark_received(self, connection_id: str, now: Optional[float] = None) -> None:
+        """Record a frame from the client, proving the connection alive."""
+        if connection_id in self._last_received:
+            self._last_received[connection_id] = now if now is not None else time.monotonic()
+            self._ping_sent.pop(connection_id, None)
+
+    def mark_activity(self, connection_id: str, now: Optional[float] = None) -> None:
+        """Record an application message to or from the client."""
+        if connection_id in self._last_activity:
+            self._last_activity[connection_id] = now if now is not None else time.monotonic()
+
+    def sweep(self, now: Optional[float] = None) -> Tuple[List[str], List[Tuple[str, EvictionReason]]]:
+        """
+        Decide which connections to ping and which to evict.
+
+        Returns:
+            (connections to ping, (connection, reason) pairs to evict)
+        """
+        now = now if now is not None else time.monotonic()
+        to_ping: List[str] = []
+        to_evict: List[Tuple[str, EvictionReason]] = []
+
+        for connection_id, last_received in self._last_received.items():
+            silence = now - last_received
+            heartbeat = self.heartbeat_interval and connection_id in self._heartbeat_connections
+            if heartbeat and self.heartbeat_timeout and silence >= self.heartbeat_timeout:
+                to_evict.append((connection_id, EvictionReason.HEARTBEAT_TIMEOUT))
+            elif self.idle_timeout and now - self._last_activity[connection_id] >= self.idle_timeout:
+                to_evict.append((connection_id, EvictionReason.IDLE_TIMEOUT))
+            elif heartbeat and silence >= self.heartbeat_interval:
+                to_ping.append(connection_id)
+
+        for connection_id in to_ping:
+            self._ping_sent.setdefault(connection_id, now)
+        return to_ping, to_evict
+
+    def state_counts(self, now: Optional[float] = None) -> Dict[str, int]:
+        """Number of connections per ConnectionState."""
+        now = now if now is not None else time.monotonic()
+        counts = {state.value: 0 for state in ConnectionState}
+        for connection_id, last_activity in self._last_activity.items():
+            if connection_id in self._ping_sent:
+                state = ConnectionState.AWAITING_PONG
+            elif self.heartbeat_interval and now - last_activity >= self.heartbeat_interval:
+                state = ConnectionState.IDLE
+            else:
+                state = ConnectionState.ACTIVE
+            counts[state.value] += 1
+        return counts
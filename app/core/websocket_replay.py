@@ -0,0 +1,246 @@
+"""
+WebSocket Replay Module for Clarity Local Runner
+
+This module keeps recent project broadcasts for reconnecting clients:
+- One ring buffer of serialized frames per project, keyed by sequence number
+- Bounded by frame count and by bytes
+- Frames missed since a client's last sequence number, or a gap when evicted
+- Buffers of projects without broadcasts for the replay TTL are dropped
+
+Sequence numbers are assigned per project by the WebSocket bus, so every API
+process buffers the same frames under the same numbers. With the Redis bus
+the frames are also kept in Redis by the publish script, so replay survives
+API restarts and works on whichever replica a client reconnects to; the
+process buffers only serve while Redis cannot be read.
+
+Primary Responsibility: Replay frames missed while a client was disconnected
+"""
+
+import os
+import sys
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+from core.structured_logging import get_structured_logger
+
+
+DEFAULT_REPLAY_MAX_FRAMES = 1000
+DEFAULT_REPLAY_MAX_BYTES = 1024 * 1024
+DEFAULT_REPLAY_TTL_SECONDS = 3600
+
+# (oldest seq, latest seq, frames after the given seq) of a project's shared buffer
+SharedReplayReader = Callable[[str, int], Tuple[Optional[int], Optional[int], List[str]]]
+
+logger = get_structured_logger(__name__)
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(0, int(os.getenv(name, default)))
+    except ValueError:
+        return default
+
+
+def replay_limits() -> Tuple[int, int, int]:
+    """
+    Replay buffer limits from the environment.
+
+    Returns:
+        (frames, bytes, TTL seconds) kept per project (WEBSOCKET_REPLAY_MAX_FRAMES,
+        WEBSOCKET_REPLAY_MAX_BYTES, WEBSOCKET_REPLAY_TTL_SECONDS)
+    """
+    return (
+        _env_int("WEBSOCKET_REPLAY_MAX_FRAMES", DEFAULT_REPLAY_MAX_FRAMES),
+        _env_int("WEBSOCKET_REPLAY_MAX_BYTES", DEFAULT_REPLAY_MAX_BYTES),
+        _env_int("WEBSOCKET_REPLAY_TTL_SECONDS", DEFAULT_REPLAY_TTL_SECONDS)
+    )
+
+
+def frames_since(
+    seq: int,
+    oldest_seq: Optional[int],
+    latest_seq: Optional[int],
+    frames: List[str]
+) -> Optional[List[str]]:
+    """
+    Frames published after `seq`, given a buffer's bounds and its frames after `seq`.
+
+    Returns:
+        Frames in sequence order (empty when nothing was missed), or None
+        when frames after `seq` are no longer buffered or `seq` is unknown
+    """
+    if latest_seq is None or seq > latest_seq:
+        return None
+    if seq == latest_seq:
+        return []
+    if oldest_seq is None or oldest_seq > seq + 1:
+        return None
+    return frames
+
+
+class ProjectReplayBuffer:
+    """
+    Ring buffer of one project's most recent broadcast frames.
+
+    Frames are appended in sequence order; the oldest are evicted once the
+    buffer holds more than max_frames frames or max_bytes bytes. A sequence
+    number lower than the latest one means the sequence was reset (e.g. Redis
+    was flushed) and empties the buffer.
+    """
+
+    def __init__(self, max_frames: int, max_bytes: int):
+        self.max_frames = max_frames
+        self.max_bytes = max_bytes
+        self._frames: Deque[Tuple[int, str]] = deque()
+        self._bytes = 0
+        self.latest_seq: Optional[int] = None
+        self.last_append = time.monotonic()
+
+    @property
+    def oldest_seq(self) -> Optional[int]:
+        """Sequence number of the oldest buffered frame."""
+        return self._frames[0][0] if self._frames else None
+
+    @property
+    def size_bytes(self) -> int:
+        """Bytes held by buffered frames."""
+        return self._bytes
+
+    def __len__(self) -> int:
+        return len(self._frames)
+
+    def append(self, seq: int, frame: str) -> None:
+        """Buffer a frame under its sequence number."""
+        if self.latest_seq is not None and seq <= self.latest_seq:
+            self._frames.clear()
+            self._bytes = 0
+
+        self._frames.append((seq, frame))
+        self._bytes += len(frame)
+        self.latest_seq = seq
+        self.last_append = time.monotonic()
+
+        while self._frames and (len(self._frames) > self.max_frames or self._bytes > self.max_bytes):
+            _, evicted = self._frames.popleft()
+            self._bytes -= len(evicted)
+
+    def since(self, seq: int) -> Optional[List[str]]:
+        """
+        Frames published after `seq`.
+
+        Returns:
+            Frames in sequence order (empty when nothing was missed), or None
+            when frames after `seq` are no longer buffered or `seq` is unknown
+        """
+        return frames_since(
+            seq,
+            self.oldest_seq,
+            self.latest_seq,
+            [frame for frame_seq, frame in self._frames if frame_seq > seq]
+        )
+
+
+class ReplayBufferRegistry:
+    """
+    Per-project replay buffers of one API process.
+
+    Reads go to the shared buffer when a reader is given (Redis bus) and fall
+    back to the process buffers when it fails. Buffers of projects without a
+    broadcast for ttl_seconds are dropped, so the registry does not keep a
+    buffer for every project the process has ever seen.
+    """
+
+    # Shortest time between two sweeps of idle project buffers
+    EVICTION_INTERVAL_SECONDS = 60.0
+
+    def __init__(
+        self,
+        max_frames: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        ttl_seconds: Optional[int] = None,
+        shared_reader: Optional[SharedReplayReader] = None
+    ):
+        """
+        Initialize replay buffers.
+
+        Args:
+            max_frames: Frames kept per project (WEBSOCKET_REPLAY_MAX_FRAMES, default 1000)
+            max_bytes: Bytes kept per project (WEBSOCKET_REPLAY_MAX_BYTES, default 1 MiB)
+            ttl_seconds: Idle time before a project buffer is dropped (WEBSOCKET_REPLAY_TTL_SECONDS, default 3600)
+            shared_reader: Reader of the buffers shared by every API process
+        """
+        env_frames, env_bytes, env_ttl = replay_limits()
+        self.max_frames = max_frames if max_frames is not None else env_frames
+        self.max_bytes = max_bytes if max_bytes is not None else env_bytes
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else env_ttl
+        self.shared_reader = shared_reader
+        self._buffers: Dict[str, ProjectReplayBuffer] = {}
+        self._last_eviction = time.monotonic()
+
+    def __len__(self) -> int:
+        return len(self._buffers)
+
+    def record(self, project_id: str, seq: int, frame: str) -> None:
+        """Buffer a project frame under its sequence number."""
+        if not self.max_frames or not self.max_bytes:
+            return
+        buffer = self._buffers.get(project_id)
+        if buffer is None:
+            buffer = self._buffers[project_id] = ProjectReplayBuffer(self.max_frames, self.max_bytes)
+        buffer.append(seq, frame)
+        self.evict_idle()
+
+    def evict_idle(self, now: Optional[float] = None) -> int:
+        """
+        Drop the buffers of projects without a broadcast for ttl_seconds.
+
+        Runs at most every EVICTION_INTERVAL_SECONDS unless `now` is given.
+
+        Returns:
+            Number of dropped project buffers
+        """
+        forced = now is not None
+        now = time.monotonic() if now is None else now
+        if not forced and now - self._last_eviction < self.EVICTION_INTERVAL_SECONDS:
+            return 0
+        self._last_eviction = now
+        idle = [
+            project_id for project_id, buffer in self._buffers.items()
+            if now - buffer.last_append >= self.ttl_seconds
+        ]
+        for project_id in idle:
+            del self._buffers[project_id]
+        return len(idle)
+
+    def read(self, project_id: str, seq: int) -> Tuple[Optional[List[str]], Optional[int], Optional[int]]:
+        """
+        Frames of a project published after `seq` together with the buffer bounds.
+
+        Returns:
+            (frames or None on a gap, oldest buffered seq, latest seq)
+        """
+        if self.shared_reader is not None:
+            try:
+                oldest_seq, latest_seq, frames = self.shared_reader(project_id, seq)
+                return frames_since(seq, oldest_seq, latest_seq, frames), oldest_seq, latest_seq
+            except Exception as e:
+                logger.warn(
+                    "Shared replay buffer unavailable, reading process buffer",
+                    project_id=project_id,
+                    error_message=str(e)
+                )
+        buffer = self._buffers.get(project_id)
+        if buffer is None:
+            return None, None, None
+        return buffer.since(seq), buffer.oldest_seq, buffer.latest_seq
+
+    def since(self, project_id: str, seq: int) -> Optional[List[str]]:
+        """Frames of a project published after `seq`, or None on a gap."""
+        return self.read(project_id, seq)[0]
+
+    def bounds(self, project_id: str) -> Tuple[Optional[int], Optional[int]]:
+        """(oldest, latest) buffered sequence numbers of a project."""
+        # No frame is newer than the largest seq, so only the bounds are read
+        _, oldest_seq, latest_seq = self.read(project_id, sys.maxsize)
+        return oldest_seq, latest_seq
@@ -0,0 +1,321 @@
+"""
+WebSocket Send Queue Module for Clarity Local Runner
+
+This module decouples WebSocket broadcasts from slow consumers:
+- One bounded outbound queue and writer task per connection
+- Broadcasts enqueue pre-serialized frames and never await a socket
+- Configurable overflow policy: drop oldest, coalesce or disconnect
+- Latest-wins conflation of status snapshots at a maximum rate per execution
+- Queue depth and send latency recorded per project
+
+Primary Responsibility: Deliver frames to one WebSocket without blocking others
+"""
+
+import asyncio
+import os
+import time
+from collections import deque
+from enum import Enum
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+from core.structured_logging import get_structured_logger
+from core.websocket_codecs import Frame
+from core.performance_monitoring import (
+    record_websocket_frames_conflated,
+    record_websocket_send_latency,
+    record_websocket_send_overflow,
+)
+
+
+logger = get_structured_logger(__name__)
+
+DEFAULT_SEND_QUEUE_SIZE = 256
+DEFAULT_UPDATE_MAX_RATE = 10.0
+
+# Close code sent to consumers disconnected by the overflow policy
+SLOW_CONSUMER_CLOSE_CODE = 4008
+
+
+class OverflowPolicy(str, Enum):
+    """What a full send queue does with a new frame."""
+    DROP_OLDEST = "drop_oldest"
+    COALESCE = "coalesce"
+    DISCONNECT = "disconnect"
+
+
+def get_send_queue_size() -> int:
+    """Configured per-connection send queue size."""
+    try:
+        return max(1, int(os.getenv("WEBSOCKET_SEND_QUEUE_SIZE", DEFAULT_SEND_QUEUE_SIZE)))
+    except ValueError:
+        return DEFAULT_SEND_QUEUE_SIZE
+
+
+def get_update_max_rate() -> float:
+    """
+    Configured maximum snapshot rate per execution and connection, per second.
+
+    WEBSOCKET_UPDATE_MAX_RATE, default 10 (one snapshot every 100ms); 0
+    disables conflation.
+    """
+    try:
+        return max(0.0, float(os.getenv("WEBSOCKET_UPDATE_MAX_RATE", DEFAULT_UPDATE_MAX_RATE)))
+    except ValueError:
+        return DEFAULT_UPDATE_MAX_RATE
+
+
+def get_overflow_policy() -> OverflowPolicy:
+    """Configured overflow policy (WEBSOCKET_OVERFLOW_POLICY, default drop_oldest)."""
+    try:
+        return OverflowPolicy(os.getenv("WEBSOCKET_OVERFLOW_POLICY", OverflowPolicy.DROP_OLDEST.value))
+    except ValueError:
+        return OverflowPolicy.DROP_OLDEST
+
+
+class ConnectionSendQueue:
+    """
+    Bounded outbound queue of one WebSocket connection.
+
+    enqueue() never blocks: frames are appended and written in order by the
+    connection's writer task, so a slow or stalled client only delays itself.
+    When the queue is full the overflow policy decides what happens:
+
+    - drop_oldest: the oldest queued frame is discarded
+    - coalesce: a queued frame with the same coalesce key is replaced by the
+      new one; without such a frame the oldest frame is discarded
+    - disconnect: the connection is closed as a slow consumer
+
+    Frames with a coalesce key are full snapshots of one execution and are
+    conflated at max_rate per key: the first frame of a window is queued at
+    once, later ones replace each other and only the latest is queued when
+    the window closes. Terminal frames are queued immediately, supersede any
+    pending snapshot of their key and are never conflated or coalesced away.
+
+    on_close is called once when the writer stops because the socket failed or
+    the consumer was disconnected.
+    """
+
+    def __init__(
+        self,
+        websocket: Any,
+        connection_id: str,
+        project_id: str,
+        max_size: Optional[int] = None,
+        policy: Optional[OverflowPolicy] = None,
+        on_close: Optional[Callable[[str], None]] = None,
+        max_rate: Optional[float] = None
+    ):
+        self.websocket = websocket
+        self.connection_id = connection_id
+        self.project_id = project_id
+        self.max_size = max_size or get_send_queue_size()
+        self.policy = OverflowPolicy(policy) if policy else get_overflow_policy()
+        self._on_close = on_close
+        rate = get_update_max_rate() if max_rate is None else max_rate
+        self._interval = 1.0 / rate if rate > 0 else 0.0
+        # Open conflation windows and the latest snapshot held back in each
+        self._windows: Dict[str, asyncio.TimerHandle] = {}
+        self._pending: Dict[str, Frame] = {}
+        # Entries are [coalesce_key, frame, enqueued_at]
+        self._frames: Deque[List[Any]] = deque()
+        self._ready: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._writer: Optional[asyncio.Task] = None
+        self._closed = False
+        self.dropped = 0
+        self.conflated = 0
+
+    @property
+    def depth(self) -> int:
+        """Number of frames waiting to be written."""
+        return len(self._frames)
+
+    @property
+    def closed(self) -> bool:
+        """Whether the queue stopped accepting frames."""
+        return self._closed
+
+    def start(self) -> None:
+        """Start the writer task on the running event loop."""
+        self._loop = asyncio.get_running_loop()
+        self._ready = asyncio.Event()
+        self._writer = self._loop.create_task(self._write_loop())
+
+    def close(self) -> None:
+        """Stop the writer and discard pending frames."""
+        self._closed = True
+        self._frames.clear()
+        self._pending.clear()
+        for window in self._windows.values():
+            window.cancel()
+        self._windows.clear()
+        if self._writer is not None and not self._writer.done():
+            try:
+                current = asyncio.current_task()
+            except RuntimeError:
+                current = None
+            if current is not self._writer:
+                self._writer.cancel()
+
+    def enqueue(self, frame: Frame, coalesce_key: Optional[str] = None, terminal: bool = False) -> bool:
+        """
+        Queue a serialized frame for this connection.
+
+        Safe to call from other threads; the frame is then queued on the
+        connection's event loop.
+
+        Args:
+            frame: Encoded message (text frame, binary frame or binary chunks)
+            coalesce_key: Key identifying frames that supersede each other
+            terminal: Whether the frame is the final snapshot of its key
+
+        Returns:
+            False if the connection is closed or was disconnected by the
+            overflow policy, True otherwise
+        """
+        if self._closed:
+            return False
+        if self._loop is not None and not self._in_loop():
+            self._loop.call_soon_threadsafe(self._submit, frame, coalesce_key, terminal)
+            return True
+        return self._submit(frame, coalesce_key, terminal)
+
+    def _in_loop(self) -> bool:
+        try:
+            return asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            return False
+
+    def _submit(self, frame: Frame, coalesce_key: Optional[str], terminal: bool) -> bool:
+        if self._closed:
+            return False
+        if coalesce_key is None or self._loop is None or not self._interval:
+            return self._append(frame, None if terminal else coalesce_key)
+
+        if terminal:
+            # The final snapshot supersedes anything held back and ends the window
+            if self._pending.pop(coalesce_key, None) is not None:
+                self._count_conflated()
+            window = self._windows.pop(coalesce_key, None)
+            if window is not None:
+                window.cancel()
+            return self._append(frame, None)
+
+        if coalesce_key in self._windows:
+            if coalesce_key in self._pending:
+                self._count_conflated()
+            self._pending[coalesce_key] = frame
+            return True
+
+        self._open_window(coalesce_key)
+        return self._append(frame, coalesce_key)
+
+    def _open_window(self, coalesce_key: str) -> None:
+        self._windows[coalesce_key] = self._loop.call_later(self._interval, self._close_window, coalesce_key)
+
+    def _close_window(self, coalesce_key: str) -> None:
+        self._windows.pop(coalesce_key, None)
+        frame = self._pending.pop(coalesce_key, None)
+        if frame is not None and not self._closed:
+            self._open_window(coalesce_key)
+            self._append(frame, coalesce_key)
+
+    def _count_conflated(self) -> None:
+        self.conflated += 1
+        record_websocket_frames_conflated(self.project_id)
+
+    def _append(self, frame: Frame, coalesce_key: Optional[str]) -> bool:
+        if self._closed:
+            return False
+
+        if len(self._frames) >= self.max_size and not self._overflow(frame, coalesce_key):
+            return not self._closed
+
+        self._frames.append([coalesce_key, frame, time.monotonic()])
+        if self._ready is not None:
+            self._ready.set()
+        return True
+
+    def _overflow(self, frame: Frame, coalesce_key: Optional[str]) -> bool:
+        """Apply the overflow policy; returns whether the new frame should be appended."""
+        self.dropped += 1
+        record_websocket_send_overflow(self.project_id, self.policy.value)
+
+        if self.policy == OverflowPolicy.DISCONNECT:
+            logger.warn(
+                "Disconnecting slow WebSocket consumer",
+                project_id=self.project_id,
+                connection_id=self.connection_id,
+                queue_depth=len(self._frames)
+            )
+            self._disconnect()
+            return False
+
+        if self.policy == OverflowPolicy.COALESCE and coalesce_key is not None:
+            for entry in self._frames:
+                if entry[0] == coalesce_key:
+                    # Latest wins, keeping the superseded frame's position
+                    entry[1] = frame
+                    return False
+
+        self._frames.popleft()
+        return True
+
+    def disconnect(self, code: int, reason: str) -> None:
+        """
+        Stop the writer, close the WebSocket with a close code and call on_close.
+
+        Args:
+            code: WebSocket close code
+            reason: Close reason sent to the client
+        """
+        self.close()
+        if self._loop is not None:
+            self._loop.create_task(self._close_socket(code, reason))
+        self._notify_closed()
+
+    def _disconnect(self) -> None:
+        self.disconnect(SLOW_CONSUMER_CLOSE_CODE, "Slow consumer")
+
+    async def _close_socket(self, code: int, reason: str) -> None:
+        try:
+            await self.websocket.close(code=code, reason=reason)
+        except Exception:
+            pass
+
+    def _notify_closed(self) -> None:
+        if self._on_close is not None:
+            on_close, self._on_close = self._on_close, None
+            on_close(self.connection_id)
+
+    async def _write_loop(self) -> None:
+        while not self._closed:
+            if not self._frames:
+                self._ready.clear()
+                await self._ready.wait()
+                continue
+
+            _, frame, enqueued_at = self._frames.popleft()
+            try:
+                if isinstance(frame, str):
+                    await self.websocket.send_text(frame)
+                elif isinstance(frame, bytes):
+                    await self.websocket.send_bytes(frame)
+                else:
+                    # Chunks of one message are written back to back
+                    for chunk in frame:
+                        await self.websocket.send_bytes(chunk)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(
+                    "Failed to send WebSocket frame",
+                    project_id=self.project_id,
+                    connection_id=self.connection_id,
+                    error=e
+                )
+                self.close()
+                self._notify_closed()
+                return
+
+            record_websocket_send_latency(self.project_id, (time.monotonic() - enqueued_at) * 1000)
@@ -0,0 +1,226 @@
+"""
+WebSocket Subscription Module for Clarity Local Runner
+
+This module lets WebSocket clients choose which broadcasts they receive:
+- Subscriptions filtering by message type, execution_id and minimum log level
+- subscribe/unsubscribe control payloads applied to a connection's subscription
+- Per-project subscriber indexes resolving a broadcast's recipients directly,
+  so fan-out cost scales with interested connections only
+
+Connections start subscribed to everything. The execution filter applies to
+messages carrying an execution_id; the log level filter to execution-log
+messages only.
+
+Primary Responsibility: Resolve the connections interested in a broadcast
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+
+LOG_LEVEL_RANKS: Dict[str, int] = {
+    "DEBUG": 0,
+    "INFO": 1,
+    "WARN": 2,
+    "WARNING": 2,
+    "ERROR": 3,
+    "CRITICAL": 4,
+}
+
+EXECUTION_LOG_TYPE = "execution-log"
+
+# Index key parts: any type / any execution / execution-filtered connections
+# receiving messages without an execution_id
+_ANY = "*"
+_UNSCOPED = "?"
+
+IndexKey = Tuple[str, str]
+
+
+@dataclass(frozen=True)
+class Subscription:
+    """
+    Broadcast filter of one connection.
+
+    Attributes:
+        types: Message types to receive (None for all)
+        execution_ids: Executions to receive messages of (None for all)
+        min_log_level: Lowest execution-log level to receive (None for all)
+    """
+    types: Optional[FrozenSet[str]] = None
+    execution_ids: Optional[FrozenSet[str]] = None
+    min_log_level: Optional[str] = None
+
+    @property
+    def is_default(self) -> bool:
+        """Whether the subscription receives every broadcast."""
+        return self.types is None and self.execution_ids is None and self.min_log_level is None
+
+    @property
+    def min_log_rank(self) -> int:
+        """Rank of min_log_level (0 when unset)."""
+        return LOG_LEVEL_RANKS.get(self.min_log_level, 0) if self.min_log_level else 0
+
+    def to_payload(self) -> Dict[str, Any]:
+        """JSON-serializable form for subscription-updated messages."""
+        return {
+            "types": sorted(self.types) if self.types is not None else None,
+            "execution_ids": sorted(self.execution_ids) if self.execution_ids is not None else None,
+            "min_log_level": self.min_log_level,
+        }
+
+    def matches(self, message: Dict[str, Any]) -> bool:
+        """Whether a single message passes this subscription's filters."""
+        message_type, execution_id, log_rank = _message_filter_keys(message)
+        if self.types is not None and message_type not in self.types:
+            return False
+        if self.execution_ids is not None and execution_id is not None and execution_id not in self.execution_ids:
+            return False
+        return log_rank is None or self.min_log_rank <= log_rank
+
+
+def _message_filter_keys(message: Dict[str, Any]) -> Tuple[Any, Optional[str], Optional[int]]:
+    """Message type, execution_id and log level rank (execution-log only) of a message."""
+    payload = message.get("payload")
+    if not isinstance(payload, dict):
+        payload = {}
+    execution_id = payload.get("execution_id")
+
+    log_rank = None
+    if message.get("type") == EXECUTION_LOG_TYPE and payload.get("level"):
+        # Unknown levels are not filtered
+        log_rank = LOG_LEVEL_RANKS.get(str(payload["level"]).upper(), max(LOG_LEVEL_RANKS.values()))
+
+    return message.get("type"), str(execution_id) if execution_id is not None else None, log_rank
+
+
+def _string_set(payload: Dict[str, Any], field: str) -> Optional[FrozenSet[str]]:
+    values = payload.get(field)
+    if values is None:
+        return None
+    if not isinstance(values, list) or not all(isinstance(value, str) and value for value in values):
+        raise ValueError(f"{field} must be a list of non-empty strings")
+    return frozenset(values)
+
+
+def apply_subscription_update(current: Subscription, action: str, payload: Dict[str, Any]) -> Subscription:
+    """
+    Apply a subscribe or unsubscribe control payload to a subscription.
+
+    subscribe replaces each filter present in the payload (`types`,
+    `execution_ids`, `min_log_level`; null resets a filter to all).
+    unsubscribe removes the listed `types` and `execution_ids`; without
+    either it stops all broadcasts.
+
+    Args:
+        current: The connection's current subscription
+        action: "subscribe" or "unsubscribe"
+        payload: Control message payload
+
+    Returns:
+        The updated subscription
+
+    Raises:
+        ValueError: If the action or payload is invalid
+    """
+    if action == "subscribe":
+        types = _string_set(payload, "types") if "types" in payload else current.types
+        execution_ids = _string_set(payload, "execution_ids") if "execution_ids" in payload else current.execution_ids
+        min_log_level = current.min_log_level
+        if "min_log_level" in payload:
+            min_log_level = payload["min_log_level"]
+            if min_log_level is not None:
+                if not isinstance(min_log_level, str) or min_log_level.upper() not in LOG_LEVEL_RANKS:
+                    raise ValueError(f"min_log_level must be one of {', '.join(LOG_LEVEL_RANKS)}")
+                min_log_level = min_log_level.upper()
+        return Subscription(types=types, execution_ids=execution_ids, min_log_level=min_log_level)
+
+    if action == "unsubscribe":
+        removed_types = _string_set(payload, "types")
+        removed_executions = _string_set(payload, "execution_ids")
+        if removed_types is None and removed_executions is None:
+            return Subscription(types=frozenset(), execution_ids=current.execution_ids, min_log_level=current.min_log_level)
+
+        types = current.types
+        if removed_types:
+            if types is None:
+                raise ValueError("Cannot unsubscribe from types while subscribed to all; subscribe to a list of types")
+            types = types - removed_types
+        execution_ids = current.execution_ids
+        if removed_executions:
+            if execution_ids is None:
+                raise ValueError(
+                    "Cannot unsubscribe from executions while subscribed to all; subscribe to a list of execution_ids"
+                )
+            execution_ids = execution_ids - removed_executions
+        return Subscription(types=types, execution_ids=execution_ids, min_log_level=current.min_log_level)
+
+    raise ValueError(f"Unknown subscription action: {action}")
+
+
+class SubscriberIndex:
+    """
+    Subscribers of one project indexed by what they receive.
+
+    Each connection is registered under (type, execution) keys derived from
+    its subscription and bucketed by its minimum log rank, so the recipients
+    of a message are a union of a few buckets.
+    """
+
+    def __init__(self):
+        # {(type key, execution key): {min log rank: connection ids}}
+        self._index: Dict[IndexKey, Dict[int, Set[str]]] = {}
+        # {connection_id: (keys, min log rank)}
+        self._registrations: Dict[str, Tuple[List[IndexKey], int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._registrations)
+
+    def add(self, connection_id: str, subscription: Subscription) -> None:
+        """Register or re-register a connection with its subscription."""
+        self.remove(connection_id)
+
+        type_keys: Iterable[str] = subscription.types if subscription.types is not None else (_ANY,)
+        if subscription.execution_ids is None:
+            execution_keys: Iterable[str] = (_ANY,)
+        else:
+            execution_keys = (*subscription.execution_ids, _UNSCOPED)
+
+        keys = [(type_key, execution_key) for type_key in type_keys for execution_key in execution_keys]
+        rank = subscription.min_log_rank
+        for key in keys:
+            self._index.setdefault(key, {}).setdefault(rank, set()).add(connection_id)
+        self._registrations[connection_id] = (keys, rank)
+
+    def remove(self, connection_id: str) -> None:
+        """Unregister a connection."""
+        registration = self._registrations.pop(connection_id, None)
+        if registration is None:
+            return
+        keys, rank = registration
+        for key in keys:
+            buckets = self._index.get(key)
+            if not buckets:
+                continue
+            members = buckets.get(rank)
+            if members is not None:
+                members.discard(connection_id)
+                if not members:
+                    del buckets[rank]
+            if not buckets:
+                del self._index[key]
+
+    def targets(self, message: Dict[str, Any]) -> Set[str]:
+        """Connections whose subscription matches a broadcast message."""
+        message_type, execution_id, log_rank = _message_filter_keys(message)
+        execution_key = execution_id if execution_id is not None else _UNSCOPED
+
+        result: Set[str] = set()
+        for key in ((message_type, _ANY), (_ANY, _ANY), (message_type, execution_key), (_ANY, execution_key)):
+            buckets = self._index.get(key)
+            if not buckets:
+                continue
+            for rank, members in buckets.items():
+                if log_rank is None or rank <= log_rank:
+                    result |= members
+        return result
@@ -2,7 +2,7 @@ import asyncio
 import logging
 from abc import ABC
 from contextlib import contextmanager
-from typing import Dict, Optional, ClassVar, Type, Any
+from typing import Callable, Dict, Optional, ClassVar, Type, Any
 
 from dotenv import load_dotenv
 
@@ -32,6 +32,8 @@ class Workflow(ABC):
         workflow_schema: Class variable defining the workflow's structure and flow
         validator: Validates the workflow schema
         nodes: Dictionary mapping node classes to their instances
+        on_node_complete: Optional callback invoked with the node name and the
+            task context after each non-router node finishes
 
     Example:
         class SupportWorkflow(Workflow):
@@ -51,6 +53,7 @@ class Workflow(ABC):
         self.validator = WorkflowValidator(self.workflow_schema)
         self.validator.validate()
         self.nodes: Dict[Type[Node], NodeConfig] = self._initialize_nodes()
+        self.on_node_complete: Optional[Callable[[str, TaskContext], None]] = None
         load_dotenv()
 
     @contextmanager
@@ -144,6 +147,8 @@ class Workflow(ABC):
             with self.node_context(current_node_class.__name__):
                 if not issubclass(current_node, BaseRouter):
                     task_context = await current_node().process(task_context)
+                    if self.on_node_complete:
+                        self.on_node_complete(current_node_class.__name__, task_context)
 
             current_node_class = await self._get_next_node_class(
                 current_node_class, task_context
@@ -1,4 +1,5 @@
 import os
+from typing import List
 
 from dotenv import load_dotenv
 
@@ -22,3 +23,27 @@ class DatabaseUtils:
         db_password = os.getenv("DATABASE_PASSWORD", "postgres")
 
         return f"postgresql://{db_user}:{db_password}@{db_host}:{db_port}/{db_name}"
+
+    @staticmethod
+    def get_replica_connection_strings() -> List[str]:
+        """Connection strings for read replicas listed in DATABASE_REPLICA_HOSTS.
+
+        DATABASE_REPLICA_HOSTS is a comma-separated list of host[:port] entries;
+        replicas share the primary's database name and credentials.
+        """
+        replica_hosts = os.getenv("DATABASE_REPLICA_HOSTS", "")
+        db_port = os.getenv("DATABASE_PORT", "5433")
+        db_name = os.getenv("DATABASE_NAME", "postgres")
+        db_user = os.getenv("DATABASE_USER", "postgres")
+        db_password = os.getenv("DATABASE_PASSWORD", "postgres")
+
+        connection_strings = []
+        for entry in replica_hosts.split(","):
+            entry = entry.strip()
+            if not entry:
+                continue
+            host, _, port = entry.partition(":")
+            connection_strings.append(
+                f"postgresql://{db_user}:{db_password}@{host}:{port or db_port}/{db_name}"
+            )
+        return connection_strings
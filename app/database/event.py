@@ -15,6 +15,12 @@ It provides two main storage components:
 2. Processing results (task_context column): Stores the workflow processing results
 
 This model is used with Alembic to generate the initial database migration.
+
+The physical `events` table is declaratively partitioned by month on
+`created_at` (see the `partition_events_by_month` migration). The ORM keeps
+`id` as the identity so lookups and merges by event ID work unchanged; finished
+events past the retention window are moved to `events_archive` by the
+retention job in `services.event_archive_service`.
 """
 
 
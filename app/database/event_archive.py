@@ -0,0 +1,55 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import JSON, Column, DateTime, String
+from sqlalchemy.dialects.postgresql import UUID
+
+from database.session import Base
+
+"""
+Event Archive Database Model Module
+
+This module defines the SQLAlchemy model for the events archive table.
+Finished events older than the retention window are moved here from the
+time-partitioned `events` table by the retention job, keeping the hot table
+and its indexes small. The JSON columns use lz4 TOAST compression (configured
+in the partitioning migration), so large diffs and logs stay cheap to keep.
+"""
+
+
+class EventArchive(Base):
+    """SQLAlchemy model for archived events.
+
+    Mirrors the columns of the Event model so archived rows can be projected
+    with the same status projection utilities, plus the time the row was
+    archived.
+    """
+
+    __tablename__ = "events_archive"
+
+    id = Column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid1,
+        doc="Identifier of the original event",
+    )
+    workflow_type = Column(
+        String(150),
+        nullable=False,
+        doc="Type of workflow associated with the event (e.g., 'support')",
+    )
+    data = Column(JSON, doc="Raw event data as received from the API endpoint")
+    task_context = Column(JSON, doc="Processing results and metadata from the workflow")
+
+    created_at = Column(
+        DateTime, nullable=False, doc="Timestamp when the original event was created"
+    )
+    updated_at = Column(
+        DateTime, doc="Timestamp when the original event was last updated"
+    )
+    archived_at = Column(
+        DateTime,
+        default=datetime.now,
+        nullable=False,
+        doc="Timestamp when the event was moved to the archive",
+    )
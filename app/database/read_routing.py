@@ -0,0 +1,196 @@
+import itertools
+import os
+import threading
+import time
+from contextvars import ContextVar
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import Session, sessionmaker
+
+from core.structured_logging import get_structured_logger
+from core.performance_monitoring import record_read_routing
+
+"""
+Read Routing Module
+
+This module routes read-only database sessions to a pool of streaming
+replicas. Clients that recently committed a write keep reading from the
+primary for a short window (read-your-writes), and replicas whose replay lag
+exceeds a threshold are skipped in favour of the primary.
+"""
+
+logger = get_structured_logger(__name__)
+
+# Identifies the client of the current request for read-your-writes
+# stickiness; set per request by ReadRoutingMiddleware.
+read_client_key: ContextVar[Optional[str]] = ContextVar("read_client_key", default=None)
+
+# Replay lag of a standby in seconds; 0 when it has replayed everything received.
+REPLICA_LAG_QUERY = text(
+    """
+    SELECT CASE
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+    """
+)
+
+
+class ReadReplicaRouter:
+    """Chooses the session factory used for read-only operations.
+
+    Replicas are used round-robin. A read falls back to the primary when no
+    replica is configured, when the client wrote within
+    READ_YOUR_WRITES_WINDOW_SECONDS, or when every replica lags more than
+    MAX_REPLICA_LAG_SECONDS. Replica lag is sampled at most once per
+    LAG_CHECK_INTERVAL_SECONDS per replica.
+    """
+
+    READ_YOUR_WRITES_WINDOW_SECONDS = float(os.getenv("DATABASE_READ_YOUR_WRITES_SECONDS", "5"))
+    MAX_REPLICA_LAG_SECONDS = float(os.getenv("DATABASE_MAX_REPLICA_LAG_SECONDS", "2"))
+    LAG_CHECK_INTERVAL_SECONDS = 5.0
+
+    def __init__(
+        self,
+        primary_session_factory: sessionmaker,
+        replica_urls: Optional[List[str]] = None,
+        replica_session_factories: Optional[List[Callable[[], Session]]] = None
+    ):
+        """
+        Initialize the router.
+
+        Args:
+            primary_session_factory: Session factory bound to the primary
+            replica_urls: Connection strings of the read replicas
+            replica_session_factories: Pre-built replica session factories
+                (used instead of replica_urls when given)
+        """
+        self.primary_session_factory = primary_session_factory
+
+        if replica_session_factories is None:
+            replica_session_factories = [
+                sessionmaker(
+                    autocommit=False,
+                    autoflush=False,
+                    bind=create_engine(url, pool_pre_ping=True)
+                )
+                for url in replica_urls or []
+            ]
+        self.replica_session_factories = replica_session_factories
+
+        self._round_robin = itertools.cycle(range(len(self.replica_session_factories)))
+        self._recent_writes: Dict[str, float] = {}
+        self._lag_samples: Dict[int, Tuple[float, Optional[float]]] = {}
+        self._lock = threading.Lock()
+
+        self._track_primary_writes()
+
+    @property
+    def has_replicas(self) -> bool:
+        """Whether any read replica is configured."""
+        return bool(self.replica_session_factories)
+
+    def mark_write(self, client_key: Optional[str]) -> None:
+        """
+        Record that a client committed a write to the primary.
+
+        Args:
+            client_key: Client identifier; ignored when None
+        """
+        if not client_key or not self.has_replicas:
+            return
+        now = time.time()
+        with self._lock:
+            self._recent_writes[client_key] = now
+            # Forget clients whose stickiness window has passed
+            if len(self._recent_writes) > 1000:
+                cutoff = now - self.READ_YOUR_WRITES_WINDOW_SECONDS
+                self._recent_writes = {
+                    key: written_at for key, written_at in self._recent_writes.items()
+                    if written_at >= cutoff
+                }
+
+    def is_sticky(self, client_key: Optional[str]) -> bool:
+        """Whether a client's reads must go to the primary to see its own writes."""
+        if not client_key:
+            return False
+        with self._lock:
+            written_at = self._recent_writes.get(client_key)
+        return written_at is not None and time.time() - written_at < self.READ_YOUR_WRITES_WINDOW_SECONDS
+
+    def read_session(self, client_key: Optional[str] = None) -> Session:
+        """
+        Open a session for read-only operations.
+
+        Args:
+            client_key: Client identifier for read-your-writes stickiness
+                (default: the current request's client)
+
+        Returns:
+            Session bound to a replica or to the primary
+        """
+        client_key = client_key if client_key is not None else read_client_key.get()
+
+        if not self.has_replicas:
+            return self.primary_session_factory()
+
+        if self.is_sticky(client_key):
+            record_read_routing(target="primary", reason="read_your_writes")
+            return self.primary_session_factory()
+
+        for _ in range(len(self.replica_session_factories)):
+            index = next(self._round_robin)
+            lag = self._replica_lag(index)
+            if lag is not None and lag <= self.MAX_REPLICA_LAG_SECONDS:
+                record_read_routing(target="replica", reason="routed", replica=str(index))
+                return self.replica_session_factories[index]()
+
+        record_read_routing(target="primary", reason="replica_lag")
+        return self.primary_session_factory()
+
+    def _replica_lag(self, index: int) -> Optional[float]:
+        """Return the cached replay lag of a replica, or None if unreachable."""
+        now = time.time()
+        sampled_at, lag = self._lag_samples.get(index, (0.0, None))
+        if now - sampled_at < self.LAG_CHECK_INTERVAL_SECONDS:
+            return lag
+
+        session = self.replica_session_factories[index]()
+        try:
+            lag = float(session.execute(REPLICA_LAG_QUERY).scalar() or 0)
+        except Exception as e:
+            logger.warn(
+                "Read replica lag check failed",
+                replica=index,
+                error_message=str(e)
+            )
+            lag = None
+        finally:
+            session.close()
+
+        self._lag_samples[index] = (now, lag)
+        if lag is not None and lag > self.MAX_REPLICA_LAG_SECONDS:
+            logger.warn(
+                "Read replica lag above threshold",
+                replica=index,
+                lag_seconds=lag,
+                max_lag_seconds=self.MAX_REPLICA_LAG_SECONDS
+            )
+        return lag
+
+    def _track_primary_writes(self) -> None:
+        """Mark the current client as a writer whenever a primary session commits changes."""
+
+        @event.listens_for(self.primary_session_factory, "after_flush")
+        def _flag_writes(session, flush_context):
+            session.info["has_writes"] = True
+
+        @event.listens_for(self.primary_session_factory, "after_commit")
+        def _record_writer(session):
+            if session.info.pop("has_writes", False):
+                self.mark_write(read_client_key.get())
+
+        @event.listens_for(self.primary_session_factory, "after_rollback")
+        def _clear_writes(session):
+            session.info.pop("has_writes", None)
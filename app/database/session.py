@@ -5,16 +5,22 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import declarative_base, sessionmaker, Session
 
 from database.database_utils import DatabaseUtils
+from database.read_routing import ReadReplicaRouter
 
 """
 Session Module
 
-This module provides a session for database operations.
+This module provides a session for database operations, and a read-only
+session that may be served by a read replica.
 """
 
 engine = create_engine(DatabaseUtils.get_connection_string())
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
+read_router = ReadReplicaRouter(
+    primary_session_factory=SessionLocal,
+    replica_urls=DatabaseUtils.get_replica_connection_strings(),
+)
 
 
 def db_session() -> Generator:
@@ -33,3 +39,40 @@ def db_session() -> Generator:
         raise ex
     finally:
         session.close()
+
+
+def db_read_session() -> Generator:
+    """Read-only Database Session Dependency.
+
+    This function provides a session for read-only operations. It is bound to
+    a read replica when one is configured and fresh enough, and to the primary
+    otherwise. Nothing is committed; callers must not write through it.
+    """
+    session: Session = read_router.read_session()
+    try:
+        yield session
+    except Exception as ex:
+        session.rollback()
+        logging.error(ex)
+        raise ex
+    finally:
+        session.close()
+
+
+def db_primary_read_session() -> Generator:
+    """Read-only Primary Database Session Dependency.
+
+    This function provides a read-only session bound to the primary, for reads
+    that must not lag behind a change already observed. The session connects
+    on first use, so requests that never read through it cost nothing.
+    Nothing is committed; callers must not write through it.
+    """
+    session: Session = SessionLocal()
+    try:
+        yield session
+    except Exception as ex:
+        session.rollback()
+        logging.error(ex)
+        raise ex
+    finally:
+        session.close()
@@ -13,8 +13,10 @@ from core.middleware import (
     ErrorHandlingMiddleware,
     LoggingMiddleware,
     PerformanceMonitoringMiddleware,
+    ReadRoutingMiddleware,
     SecurityHeadersMiddleware,
 )
+from core.websocket_bus import get_message_bus
 from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
@@ -124,6 +126,7 @@ app.add_middleware(ErrorHandlingMiddleware)
 app.add_middleware(PerformanceMonitoringMiddleware)
 app.add_middleware(LoggingMiddleware)
 app.add_middleware(SecurityHeadersMiddleware)
+app.add_middleware(ReadRoutingMiddleware)
 
 # Add CORS middleware
 app.add_middleware(
@@ -278,6 +281,8 @@ async def startup_event():
     logger.info("✅ Authentication system initialized")
     logger.info("✅ Middleware stack configured")
     logger.info("✅ API routes registered")
+    await get_message_bus().start()
+    logger.info(f"✅ WebSocket bus subscribed ({get_message_bus().transport})")
     logger.info("🚀 Clarity Local Runner API is ready!")
 
 
@@ -286,6 +291,7 @@ async def startup_event():
 async def shutdown_event():
     """Application shutdown event handler."""
     logger.info("Clarity Local Runner API shutting down...")
+    await get_message_bus().stop()
     logger.info("👋 Clarity Local Runner API stopped")
 
 
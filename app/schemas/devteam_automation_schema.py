@@ -13,7 +13,7 @@ The schemas provide comprehensive validation for:
 
 import uuid
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 
 from pydantic import BaseModel, Field, validator
 from schemas.common import APIResponse
@@ -298,6 +298,90 @@ class DevTeamAutomationStatusNotFoundResponse(BaseModel):
         }
 
 
+class DevTeamAutomationBatchStatusRequest(BaseModel):
+    """
+    Request schema for POST /api/devteam/automation/status/batch endpoint.
+    
+    Lists the projects whose automation status should be returned in one call.
+    """
+    
+    project_ids: List[str] = Field(
+        ...,
+        min_items=1,
+        max_items=100,
+        description="Project identifiers (e.g., ['customer-123/project-abc'])"
+    )
+    
+    @validator('project_ids', each_item=True)
+    def validate_project_ids(cls, v):
+        """Validate each project ID format."""
+        if not v or not v.strip():
+            raise ValueError("Project ID cannot be empty")
+        
+        v = v.strip()
+        
+        # Validate regex pattern for security
+        import re
+        if not re.match(r"^[a-zA-Z0-9_/-]+$", v):
+            raise ValueError("Project ID must contain only alphanumeric characters, underscores, hyphens, and forward slashes")
+        
+        # Validate format: customer-id/project-id
+        if '/' in v:
+            parts = v.split('/')
+            if len(parts) != 2 or not all(part.strip() for part in parts):
+                raise ValueError("Project ID must be in format 'customer-id/project-id'")
+        
+        return v
+    
+    class Config:
+        """Pydantic configuration."""
+        
+        schema_extra = {
+            "example": {
+                "project_ids": ["customer-123/project-abc", "customer-123/project-def"]
+            }
+        }
+
+
+class DevTeamAutomationBatchStatusResponse(BaseModel):
+    """
+    Response schema for POST /api/devteam/automation/status/batch endpoint.
+    
+    Maps every requested project ID to its status, or to null when the project
+    has no automation status yet.
+    """
+    
+    statuses: Dict[str, Optional[DevTeamAutomationStatusResponse]] = Field(
+        ...,
+        description="Automation status by project ID (null when not found)"
+    )
+    
+    not_found: List[str] = Field(
+        default_factory=list,
+        description="Requested project IDs without automation status"
+    )
+    
+    class Config:
+        """Pydantic configuration."""
+        
+        schema_extra = {
+            "example": {
+                "statuses": {
+                    "customer-123/project-abc": {
+                        "status": "running",
+                        "progress": 45.2,
+                        "current_task": "1.1.1",
+                        "totals": {"completed": 3, "total": 8},
+                        "execution_id": "exec_12345678-1234-1234-1234-123456789012",
+                        "project_id": "customer-123/project-abc"
+                    },
+                    "customer-123/project-def": None
+                },
+                "not_found": ["customer-123/project-def"]
+            }
+        }
+
+
 class DevTeamAutomationPauseResponse(BaseModel):
     """
     Response schema for successful DevTeam automation pause operation.
@@ -485,6 +569,7 @@ DevTeamInitializeSuccessResponse = APIResponse[DevTeamAutomationInitializeRespon
 DevTeamInitializeConflictResponse = APIResponse[DevTeamAutomationConflictResponse]
 DevTeamStatusSuccessResponse = APIResponse[DevTeamAutomationStatusResponse]
 DevTeamStatusNotFoundResponse = APIResponse[DevTeamAutomationStatusNotFoundResponse]
+DevTeamBatchStatusSuccessResponse = APIResponse[DevTeamAutomationBatchStatusResponse]
 DevTeamPauseSuccessResponse = APIResponse[DevTeamAutomationPauseResponse]
 DevTeamPauseConflictResponse = APIResponse[DevTeamAutomationStateTransitionErrorResponse]
 DevTeamResumeSuccessResponse = APIResponse[DevTeamAutomationResumeResponse]
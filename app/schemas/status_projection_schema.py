@@ -10,10 +10,12 @@ robust field validation, state transition validation, and meaningful error messa
 """
 
 import logging
+import re
 import time
 import uuid
 from datetime import datetime
 from enum import Enum
+from functools import lru_cache
 from typing import Any, Dict, List, Optional, Union
 from uuid import UUID
 
@@ -448,6 +450,30 @@ class StatusProjectionError(BaseModel):
         }
 
 
+class ExecutionHistoryPage(BaseModel):
+    """One page of a project's execution history, most recent first."""
+    
+    items: List[StatusProjection] = Field(
+        default_factory=list,
+        description="Status projections of the executions on this page"
+    )
+    
+    next_cursor: Optional[str] = Field(
+        None,
+        description="Opaque cursor of the next page, None on the last page"
+    )
+    
+    class Config:
+        """Pydantic configuration."""
+        
+        schema_extra = {
+            "example": {
+                "items": [],
+                "next_cursor": "eyJzIjogImhvdCIsICJ1IjogIjIwMjUtMDEtMTRUMTg6MzA6MDAiLCAiaSI6ICIuLi4ifQ"
+            }
+        }
+
+
 # Helper functions for robust field extraction
 def _safe_get_field_with_fallbacks(data: Any, *field_names: str, default: Any = None) -> Any:
     """
@@ -584,6 +610,191 @@ def _process_nodes_single_pass(nodes: Any) -> tuple[int, int, ExecutionStatus, O
     return completed_count, total_count, derived_status, error_details
 
 
+# Precompiled patterns mirroring the StatusProjection field validators
+_EXECUTION_ID_PATTERN = re.compile(r"^[a-zA-Z0-9_-]+$")
+_PROJECT_ID_PATTERN = re.compile(r"^[a-zA-Z0-9_/-]+$")
+_TASK_ID_PATTERN = re.compile(r"^[0-9]+(\.[0-9]+)*$")
+_CUSTOMER_ID_PATTERN = re.compile(r"^[a-zA-Z0-9_-]+$")
+_BRANCH_PATTERN = re.compile(r"^[a-zA-Z0-9_/-]+$")
+
+
+@lru_cache(maxsize=1024)
+def _parse_timestamp_cached(value: str) -> datetime:
+    """Parse a timestamp string; an execution's started_at repeats on every update."""
+    from dateutil.parser import parse
+    return parse(value)
+
+
+def _is_str_list(value: Any) -> bool:
+    """Check whether value is a list containing only strings."""
+    return isinstance(value, list) and all(isinstance(item, str) for item in value)
+
+
+def _fast_status_consistent(
+    status: ExecutionStatus,
+    progress: float,
+    current_task: Optional[str],
+    completed: int,
+    total: int
+) -> bool:
+    """Mirror StatusProjection.validate_status_consistency without raising."""
+    if status == ExecutionStatus.IDLE:
+        return progress <= 0.0 and current_task is None
+    if status == ExecutionStatus.INITIALIZING:
+        return progress <= 10.0
+    if status == ExecutionStatus.RUNNING:
+        return current_task is not None and progress < 100.0
+    if status == ExecutionStatus.COMPLETED:
+        return progress >= 100.0 and not (completed < total and total > 0)
+    if status in (ExecutionStatus.PAUSED, ExecutionStatus.STOPPING):
+        return current_task is not None
+    return True
+
+
+def _project_status_fast(
+    task_context: Any,
+    execution_id: Any,
+    project_id: Any
+) -> Optional[StatusProjection]:
+    """
+    Lean projection for well-formed task_context values.
+    
+    Computes exactly the fields of the full transformation, but checks them
+    with precompiled patterns and builds the models without re-running the
+    Pydantic validators, and does no logging or serialization. Returns None
+    whenever the input needs any defaulting, degradation or error reporting,
+    so the caller can fall back to the fully logged path with identical
+    results.
+    
+    Args:
+        task_context: The task_context from Event model
+        execution_id: Unique execution identifier
+        project_id: Project identifier
+        
+    Returns:
+        StatusProjection, or None if the full path must handle the input
+    """
+    if not isinstance(task_context, dict):
+        return None
+    if not isinstance(execution_id, str) or len(execution_id) > 100 or not _EXECUTION_ID_PATTERN.match(execution_id):
+        return None
+    if not isinstance(project_id, str) or len(project_id) > 200 or not _PROJECT_ID_PATTERN.match(project_id):
+        return None
+
+    customer_id = None
+    if '/' in project_id:
+        parts = project_id.split('/')
+        if len(parts) != 2 or not parts[0] or not parts[1]:
+            return None
+        customer_id = parts[0]
+        if len(customer_id) > 100 or not _CUSTOMER_ID_PATTERN.match(customer_id):
+            return None
+
+    metadata = task_context.get('metadata', {})
+    nodes = task_context.get('nodes', {})
+    if not isinstance(metadata, dict) or not isinstance(nodes, dict):
+        return None
+
+    completed_nodes, total_nodes, status, _ = _process_nodes_single_pass(nodes)
+    if metadata.get('status') == 'prepared' and status == ExecutionStatus.IDLE:
+        status = ExecutionStatus.INITIALIZING
+    progress = (completed_nodes / total_nodes) * 100.0 if total_nodes > 0 else 0.0
+
+    current_task = _safe_get_field_with_fallbacks(metadata, 'task_id', 'taskId')
+    if status == ExecutionStatus.IDLE:
+        current_task = None
+    if current_task is not None and (
+        not isinstance(current_task, str) or len(current_task) > 100 or not _TASK_ID_PATTERN.match(current_task)
+    ):
+        return None
+
+    branch = metadata.get('branch')
+    if branch is not None and (
+        not isinstance(branch, str) or len(branch) > 200 or not _BRANCH_PATTERN.match(branch)
+    ):
+        return None
+
+    repo_path = _safe_get_field_with_fallbacks(metadata, 'repo_path', 'repoPath')
+    logs = metadata.get('logs', [])
+    files_modified = _safe_get_field_with_fallbacks(metadata, 'files_modified', 'filesModified', default=[])
+    if (repo_path is not None and not isinstance(repo_path, str)) or not _is_str_list(logs) or not _is_str_list(files_modified):
+        return None
+
+    started_at = _safe_get_field_with_fallbacks(metadata, 'started_at', 'startedAt')
+    if isinstance(started_at, str) and started_at:
+        try:
+            started_at = _parse_timestamp_cached(started_at)
+        except Exception:
+            return None
+    elif started_at is not None and not isinstance(started_at, datetime):
+        return None
+
+    if not _fast_status_consistent(status, progress, current_task, completed_nodes, total_nodes):
+        return None
+
+    return StatusProjection.model_construct(
+        execution_id=execution_id,
+        project_id=project_id,
+        status=status.value,
+        progress=progress,
+        current_task=current_task,
+        totals=TaskTotals.model_construct(completed=completed_nodes, total=total_nodes),
+        customer_id=customer_id,
+        branch=branch,
+        artifacts=ExecutionArtifacts.model_construct(
+            repo_path=repo_path,
+            branch=branch,
+            logs=list(logs),
+            files_modified=list(files_modified)
+        ),
+        started_at=started_at,
+        updated_at=datetime.utcnow()
+    )
+
+
+def project_status_from_task_context(
+    task_context: Dict[str, Any],
+    execution_id: str,
+    project_id: str,
+    correlation_id: Optional[str] = None
+) -> StatusProjection:
+    """
+    Project status from Event.task_context following ADD Section 13 format.
+    
+    When debug logging is disabled, well-formed inputs are projected by a lean
+    fast path that skips transformation logging and model re-validation.
+    Everything else (and every call while debug logging is enabled) goes
+    through the fully logged transformation, which produces the same result.
+    
+    Args:
+        task_context: The task_context from Event model (any structure)
+        execution_id: Unique execution identifier
+        project_id: Project identifier
+        correlation_id: Optional correlation ID for distributed tracing
+        
+    Returns:
+        StatusProjection instance with projected state
+        
+    Raises:
+        TaskContextTransformationError: For critical transformation failures
+        InvalidTaskContextError: For invalid task_context structure
+        NodeDataError: For malformed node data
+        StatusCalculationError: For status calculation failures
+        FieldExtractionError: For field extraction failures
+    """
+    if not transformation_logger.logger.logger.isEnabledFor(logging.DEBUG):
+        status_projection = _project_status_fast(task_context, execution_id, project_id)
+        if status_projection is not None:
+            return status_projection
+
+    return _project_status_from_task_context_logged(
+        task_context,
+        execution_id=execution_id,
+        project_id=project_id,
+        correlation_id=correlation_id
+    )
+
+
 # Enhanced utility functions for status projection with comprehensive error handling
 @log_performance(
     transformation_logger.logger,
@@ -591,14 +802,14 @@ def _process_nodes_single_pass(nodes: Any) -> tuple[int, int, ExecutionStatus, O
     phase=TransformationPhase.VALIDATION,
     performance_thresholds={'warning': 100, 'critical': 500, 'emergency': 1000}
 )
-def project_status_from_task_context(
+def _project_status_from_task_context_logged(
     task_context: Dict[str, Any],
     execution_id: str,
     project_id: str,
     correlation_id: Optional[str] = None
 ) -> StatusProjection:
     """
-    Project status from Event.task_context following ADD Section 13 format.
+    Project status with full validation, structured logging, and performance monitoring.
     
     Enhanced with comprehensive error handling, structured logging, and performance monitoring.
     This function robustly handles all known task_context schema variations including:
@@ -6,10 +6,15 @@ following the ADD Section 6 specification: { type, ts, projectId, payload }
 
 All WebSocket messages must use this standardized envelope format to ensure consistency
 across execution-update, execution-log, error, and completion message types.
+
+The create_* utilities validate envelopes with Pydantic. Internally generated
+broadcast frames use the trusted build_* counterparts instead, which skip
+validation and serialize the envelope to JSON once (SerializedEnvelope).
 """
 
+import json
 from datetime import datetime
-from typing import Dict, Any, Literal, Union, Optional
+from typing import Dict, Any, List, Literal, Union, Optional
 from enum import Enum
 
 from pydantic import BaseModel, Field, validator
@@ -23,6 +28,12 @@ class MessageType(str, Enum):
     COMPLETION = "completion"
     CONNECTION_ESTABLISHED = "connection-established"
     MESSAGE_RECEIVED = "message-received"
+    REPLAY_GAP = "replay-gap"
+    SUBSCRIBE = "subscribe"
+    UNSUBSCRIBE = "unsubscribe"
+    SUBSCRIPTION_UPDATED = "subscription-updated"
+    PING = "ping"
+    PONG = "pong"
 
 
 class WebSocketEnvelope(BaseModel):
@@ -39,6 +50,7 @@ class WebSocketEnvelope(BaseModel):
     ts: str = Field(..., description="Timestamp in ISO format with Z suffix")
     projectId: str = Field(..., description="Project identifier for routing")
     payload: Dict[str, Any] = Field(..., description="Message payload data")
+    seq: Optional[int] = Field(None, description="Per-project sequence number of broadcast messages")
     
     @validator('ts')
     def validate_timestamp_format(cls, v):
@@ -184,6 +196,54 @@ def create_envelope(
     return envelope
 
 
+def _execution_update_payload(
+    execution_id: str,
+    status: str,
+    progress: float,
+    current_task: str,
+    totals: Dict[str, int],
+    branch: Optional[str],
+    updated_at: Optional[str],
+    event_type: str
+) -> Dict[str, Any]:
+    return {
+        "execution_id": execution_id,
+        "status": status,
+        "progress": progress,
+        "current_task": current_task,
+        "totals": totals,
+        "branch": branch,
+        "updated_at": updated_at,
+        "event_type": event_type
+    }
+
+
+def _execution_log_payload(
+    execution_id: str,
+    log_entry_type: str,
+    level: str,
+    message: str,
+    node_name: Optional[str],
+    task_id: Optional[str],
+    additional_data: Optional[Dict[str, Any]]
+) -> Dict[str, Any]:
+    payload = {
+        "execution_id": execution_id,
+        "log_entry_type": log_entry_type,
+        "level": level,
+        "message": message,
+        "timestamp": datetime.utcnow().isoformat() + "Z",
+        "node_name": node_name,
+        "task_id": task_id
+    }
+    
+    # Add additional data if provided
+    if additional_data:
+        payload.update(additional_data)
+    
+    return payload
+
+
 def create_execution_update_envelope(
     project_id: str,
     execution_id: str,
@@ -214,16 +274,9 @@ def create_execution_update_envelope(
     Returns:
         Dict containing the standardized execution-update envelope
     """
-    payload = {
-        "execution_id": execution_id,
-        "status": status,
-        "progress": progress,
-        "current_task": current_task,
-        "totals": totals,
-        "branch": branch,
-        "updated_at": updated_at,
-        "event_type": event_type
-    }
+    payload = _execution_update_payload(
+        execution_id, status, progress, current_task, totals, branch, updated_at, event_type
+    )
     
     return create_envelope(MessageType.EXECUTION_UPDATE, project_id, payload, timestamp)
 
@@ -256,21 +309,166 @@ def create_execution_log_envelope(
     Returns:
         Dict containing the standardized execution-log envelope
     """
+    payload = _execution_log_payload(
+        execution_id, log_entry_type, level, message, node_name, task_id, additional_data
+    )
+    
+    return create_envelope(MessageType.EXECUTION_LOG, project_id, payload, timestamp)
+
+
+class SerializedEnvelope(dict):
+    """
+    Trusted envelope together with its JSON text.
+    
+    Built by the build_* utilities for internally generated frames; encoders
+    use `json_text` instead of serializing the envelope again. The dict must
+    not be modified after construction.
+    """
+    
+    __slots__ = ("json_text",)
+    
+    def __init__(self, envelope: Dict[str, Any], json_text: Optional[str] = None):
+        super().__init__(envelope)
+        self.json_text = json_text if json_text is not None else json.dumps(envelope)
+    
+    def with_seq(self, seq: int) -> "SerializedEnvelope":
+        """Copy carrying a sequence number, appended to the JSON text without re-serializing."""
+        if "seq" in self or not self.json_text.endswith("}"):
+            return SerializedEnvelope({**self, "seq": seq})
+        return SerializedEnvelope({**self, "seq": seq}, f'{self.json_text[:-1]}, "seq": {int(seq)}}}')
+
+
+def with_seq(message: Dict[str, Any], seq: int) -> Dict[str, Any]:
+    """Copy of an envelope carrying a sequence number, keeping serialized JSON."""
+    if isinstance(message, SerializedEnvelope):
+        return message.with_seq(seq)
+    return {**message, "seq": seq}
+
+
+def build_envelope(
+    message_type: MessageType,
+    project_id: str,
+    payload: Dict[str, Any],
+    timestamp: Optional[str] = None
+) -> SerializedEnvelope:
+    """
+    Build a trusted envelope without validation.
+    
+    For internally generated frames only; client input goes through
+    create_envelope and the Pydantic schema.
+    
+    Args:
+        message_type: Type of message being created
+        project_id: Project identifier for routing
+        payload: Message payload data
+        timestamp: Optional timestamp with Z suffix (defaults to current UTC time)
+        
+    Returns:
+        SerializedEnvelope with the envelope and its JSON text
+    """
+    return SerializedEnvelope({
+        "type": message_type.value if isinstance(message_type, MessageType) else message_type,
+        "ts": timestamp or datetime.utcnow().isoformat() + "Z",
+        "projectId": project_id,
+        "payload": payload
+    })
+
+
+def build_execution_update_envelope(
+    project_id: str,
+    execution_id: str,
+    status: str,
+    progress: float,
+    current_task: str,
+    totals: Dict[str, int],
+    branch: Optional[str] = None,
+    updated_at: Optional[str] = None,
+    event_type: str = "status_change",
+    timestamp: Optional[str] = None
+) -> SerializedEnvelope:
+    """
+    Build a trusted execution-update envelope without validation.
+    
+    Same arguments and payload as create_execution_update_envelope.
+    """
+    payload = _execution_update_payload(
+        execution_id, status, progress, current_task, totals, branch, updated_at, event_type
+    )
+    
+    return build_envelope(MessageType.EXECUTION_UPDATE, project_id, payload, timestamp)
+
+
+def build_execution_log_envelope(
+    project_id: str,
+    execution_id: str,
+    log_entry_type: str,
+    level: str,
+    message: str,
+    node_name: Optional[str] = None,
+    task_id: Optional[str] = None,
+    additional_data: Optional[Dict[str, Any]] = None,
+    timestamp: Optional[str] = None
+) -> SerializedEnvelope:
+    """
+    Build a trusted execution-log envelope without validation.
+    
+    Same arguments and payload as create_execution_log_envelope.
+    """
+    payload = _execution_log_payload(
+        execution_id, log_entry_type, level, message, node_name, task_id, additional_data
+    )
+    
+    return build_envelope(MessageType.EXECUTION_LOG, project_id, payload, timestamp)
+
+
+def build_execution_log_entry(
+    execution_id: str,
+    log_entry_type: str,
+    level: str,
+    message: str,
+    node_name: Optional[str] = None,
+    task_id: Optional[str] = None,
+    additional_data: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """
+    Build one execution-log entry, timestamped now.
+    
+    The entry is the payload of a single execution-log envelope and an
+    element of a batched one.
+    """
+    return _execution_log_payload(
+        execution_id, log_entry_type, level, message, node_name, task_id, additional_data
+    )
+
+
+def build_execution_log_batch_envelope(
+    project_id: str,
+    execution_id: str,
+    entries: List[Dict[str, Any]],
+    level: str,
+    timestamp: Optional[str] = None
+) -> SerializedEnvelope:
+    """
+    Build a trusted execution-log envelope carrying several entries.
+    
+    Args:
+        project_id: Project identifier for routing
+        execution_id: Execution the entries belong to
+        entries: Entries from build_execution_log_entry, oldest first
+        level: Level of the entries, used by log level filters
+        timestamp: Optional timestamp with Z suffix (defaults to current UTC time)
+        
+    Returns:
+        SerializedEnvelope whose payload holds `entries` and their `count`
+    """
     payload = {
         "execution_id": execution_id,
-        "log_entry_type": log_entry_type,
         "level": level,
-        "message": message,
-        "timestamp": datetime.utcnow().isoformat() + "Z",
-        "node_name": node_name,
-        "task_id": task_id
+        "count": len(entries),
+        "entries": entries
     }
     
-    # Add additional data if provided
-    if additional_data:
-        payload.update(additional_data)
-    
-    return create_envelope(MessageType.EXECUTION_LOG, project_id, payload, timestamp)
+    return build_envelope(MessageType.EXECUTION_LOG, project_id, payload, timestamp)
 
 
 def create_error_envelope(
@@ -337,4 +535,54 @@ def create_completion_envelope(
         "total_tasks": total_tasks
     }
     
-    return create_envelope(MessageType.COMPLETION, project_id, payload, timestamp)
\ No newline at end of file
+    return create_envelope(MessageType.COMPLETION, project_id, payload, timestamp)
+
+
+def create_replay_gap_envelope(
+    project_id: str,
+    resume_from: int,
+    oldest_seq: Optional[int],
+    latest_seq: Optional[int],
+    timestamp: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Create a replay-gap envelope telling a reconnecting client that frames
+    after its last sequence number can no longer be replayed.
+    
+    Args:
+        project_id: Project identifier for routing
+        resume_from: Sequence number the client asked to resume from
+        oldest_seq: Oldest sequence number still buffered, if any
+        latest_seq: Latest sequence number seen by the server, if any
+        timestamp: Optional envelope timestamp
+        
+    Returns:
+        Dict containing the standardized replay-gap envelope
+    """
+    payload = {
+        "resume_from": resume_from,
+        "oldest_seq": oldest_seq,
+        "latest_seq": latest_seq
+    }
+    
+    return create_envelope(MessageType.REPLAY_GAP, project_id, payload, timestamp)
+
+
+def create_subscription_updated_envelope(
+    project_id: str,
+    subscription: Dict[str, Any],
+    timestamp: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Create a subscription-updated envelope confirming a connection's
+    broadcast filters after a subscribe or unsubscribe message.
+    
+    Args:
+        project_id: Project identifier for routing
+        subscription: Effective filters (types, execution_ids, min_log_level; null for all)
+        timestamp: Optional envelope timestamp
+        
+    Returns:
+        Dict containing the standardized subscription-updated envelope
+    """
+    return create_envelope(MessageType.SUBSCRIPTION_UPDATED, project_id, dict(subscription), timestamp)
@@ -5,16 +5,24 @@ This module provides Aider execution capabilities within isolated Docker contain
 integrating with the existing DeterministicPromptService and PerProjectContainerManager
 to execute Aider commands and capture execution artifacts.
 
+The execute_* methods block on Docker calls. Async workflow nodes use their
+*_async counterparts, which run them on a bounded thread pool shared by the
+process (AIDER_EXECUTION_MAX_WORKERS) so several project executions proceed
+at once; cancelling the awaiting task terminates the running container command.
+
 Primary Responsibility: Execute Aider commands in isolated containers and capture artifacts
 """
 
+import asyncio
+import contextvars
 import os
 import re
+import threading
 import time
-import json
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Callable, Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass
 
 from core.structured_logging import get_structured_logger, LogStatus, log_performance
@@ -30,6 +38,14 @@ from services.per_project_container_manager import (
     ContainerError,
     get_per_project_container_manager
 )
+from services.container_agent import AgentStep, AgentStepResult, run_steps
+from services.container_file_transfer import upload_files
+from services.container_output_stream import (
+    CommandCancellation,
+    ExecutionLogForwarder,
+    cancellation_scope,
+    stream_exec
+)
 
 
 @dataclass
@@ -104,10 +120,18 @@ class AiderExecutionResult:
     container_id: Optional[str] = None
     execution_timestamp: Optional[str] = None
     
+    # Bounded output capture: outputs cut to head and tail, and the files holding them whole
+    truncated_outputs: Optional[List[str]] = None
+    output_spill_paths: Optional[Dict[str, str]] = None
+    
     def __post_init__(self):
-        """Initialize retry_attempts as empty list if None for backward compatibility."""
+        """Initialize list and dict fields if None for backward compatibility."""
         if self.retry_attempts is None:
             self.retry_attempts = []
+        if self.truncated_outputs is None:
+            self.truncated_outputs = []
+        if self.output_spill_paths is None:
+            self.output_spill_paths = {}
 
 
 class AiderExecutionError(Exception):
@@ -146,6 +170,7 @@ class AiderExecutionService:
     # Aider installation and configuration
     AIDER_INSTALL_COMMAND = "pip install aider-chat"
     AIDER_VERSION_COMMAND = "aider --version"
+    PROMPT_FILE_NAME = "aider_prompt.txt"
     
     # File patterns for detecting modifications
     MODIFIED_FILES_PATTERNS = [
@@ -180,6 +205,9 @@ class AiderExecutionService:
         "es"
     ]
     
+    # How long a cancelled async call waits for its method to unwind
+    CANCEL_TIMEOUT_SECONDS = 30.0
+    
     def __init__(self, correlation_id: Optional[str] = None):
         """
         Initialize the Aider execution service.
@@ -260,14 +288,7 @@ class AiderExecutionService:
             result.container_id = container_result['container_id']
             result.container_setup_duration_ms = round(container_setup_duration, 2)
             
-            # Step 2: Install Aider if needed
-            self._ensure_aider_installed(container_result['container'], execution_context)
-            
-            # Step 3: Setup repository if specified
-            if execution_context.repository_url:
-                self._setup_repository(container_result['container'], execution_context)
-            
-            # Step 4: Generate prompt if requested
+            # Step 2: Generate prompt if requested
             aider_prompt = None
             if use_generated_prompt and prompt_context:
                 prompt_result = self.prompt_service.generate_prompt(prompt_context)
@@ -281,12 +302,16 @@ class AiderExecutionService:
                         prompt_length=len(aider_prompt)
                     )
             
-            # Step 5: Execute Aider
+            # Step 3: Install Aider if needed, setup repository and write the prompt file
+            self._prepare_workspace(container_result['container'], execution_context, aider_prompt)
+            
+            # Step 4: Execute Aider
             aider_execution_start = time.time()
             execution_result = self._execute_aider_command(
                 container_result['container'], 
                 execution_context, 
-                aider_prompt
+                aider_prompt,
+                prompt_written=aider_prompt is not None
             )
             aider_execution_duration = (time.time() - aider_execution_start) * 1000
             
@@ -294,8 +319,10 @@ class AiderExecutionService:
             result.stdout_output = execution_result['stdout']
             result.stderr_output = execution_result['stderr']
             result.exit_code = execution_result['exit_code']
+            result.truncated_outputs = list(execution_result.get('truncated_outputs', []))
+            result.output_spill_paths = dict(execution_result.get('output_spill_paths', {}))
             
-            # Step 6: Capture artifacts
+            # Step 5: Capture artifacts
             artifact_capture_start = time.time()
             artifacts = self._capture_execution_artifacts(
                 container_result['container'], 
@@ -306,6 +333,10 @@ class AiderExecutionService:
             
             result.artifact_capture_duration_ms = round(artifact_capture_duration, 2)
             result.diff_output = artifacts.get('diff_output')
+            if artifacts.get('diff_truncated'):
+                result.truncated_outputs.append('diff')
+                if artifacts.get('diff_spill_path'):
+                    result.output_spill_paths['diff'] = artifacts['diff_spill_path']
             result.files_modified = artifacts.get('files_modified', [])
             result.commit_hash = artifacts.get('commit_hash')
             result.aider_version = artifacts.get('aider_version')
@@ -326,6 +357,7 @@ class AiderExecutionService:
                 status=LogStatus.COMPLETED if result.success else LogStatus.FAILED,
                 exit_code=result.exit_code,
                 files_modified_count=len(result.files_modified or []),
+                truncated_outputs=result.truncated_outputs,
                 total_duration_ms=result.total_duration_ms,
                 success=result.success
             )
@@ -533,20 +565,66 @@ class AiderExecutionService:
                 project_id=context.project_id
             )
     
-    def _ensure_aider_installed(self, container, context: AiderExecutionContext) -> None:
+    def _prepare_workspace(
+        self,
+        container,
+        context: AiderExecutionContext,
+        prompt: Optional[str] = None
+    ) -> None:
+        """
+        Check Aider and clone the repository in one command batch, then upload the prompt file.
+        
+        Args:
+            container: Docker container instance
+            context: Execution context
+            prompt: Optional prompt to write for Aider
+            
+        Raises:
+            AiderExecutionError: If any preparation step fails
+        """
+        working_dir = f"{context.working_directory}/repo" if context.repository_url else context.working_directory
+        steps = [AgentStep(self.AIDER_VERSION_COMMAND)]
+        if context.repository_url:
+            steps.append(AgentStep(self._clone_command(context), stop_on_failure=True))
+        
+        try:
+            results = run_steps(container, steps)
+        except Exception as e:
+            raise AiderExecutionError(
+                f"Workspace preparation failed: {str(e)}",
+                project_id=context.project_id,
+                execution_id=context.execution_id
+            )
+        
+        self._ensure_aider_installed(container, context, version_check=results[0])
+        if context.repository_url:
+            self._setup_repository(container, context, clone_result=results[1])
+        if prompt:
+            self._write_prompt_file(container, context, working_dir, prompt)
+    
+    def _ensure_aider_installed(
+        self,
+        container,
+        context: AiderExecutionContext,
+        version_check: Optional[AgentStepResult] = None
+    ) -> None:
         """
         Ensure Aider is installed in the container.
         
         Args:
             container: Docker container instance
             context: Execution context
+            version_check: Optional result of an already run version command
             
         Raises:
             AiderExecutionError: If Aider installation fails
         """
         try:
             # Check if Aider is already installed
-            exit_code, output = container.exec_run(self.AIDER_VERSION_COMMAND)
+            if version_check is not None:
+                exit_code, output = version_check.exit_code, version_check.output
+            else:
+                exit_code, output = container.exec_run(self.AIDER_VERSION_COMMAND)
             
             if exit_code == 0:
                 # Aider is already installed
@@ -609,13 +687,19 @@ class AiderExecutionService:
                 execution_id=context.execution_id
             )
     
-    def _setup_repository(self, container, context: AiderExecutionContext) -> None:
+    def _setup_repository(
+        self,
+        container,
+        context: AiderExecutionContext,
+        clone_result: Optional[AgentStepResult] = None
+    ) -> None:
         """
         Setup repository in the container workspace.
         
         Args:
             container: Docker container instance
             context: Execution context
+            clone_result: Optional result of an already run clone command
             
         Raises:
             AiderExecutionError: If repository setup fails
@@ -634,8 +718,10 @@ class AiderExecutionService:
             )
             
             # Clone repository
-            clone_command = f"cd {context.working_directory} && git clone -b {context.repository_branch} {context.repository_url} repo"
-            exit_code, output = container.exec_run(clone_command)
+            if clone_result is not None:
+                exit_code, output = clone_result.exit_code, clone_result.output
+            else:
+                exit_code, output = container.exec_run(self._clone_command(context))
             
             if exit_code != 0:
                 error_output = output.decode('utf-8') if isinstance(output, bytes) else str(output)
@@ -663,11 +749,38 @@ class AiderExecutionService:
                 execution_id=context.execution_id
             )
     
+    def _clone_command(self, context: AiderExecutionContext) -> str:
+        """Command cloning the context's repository into the workspace."""
+        return f"cd {context.working_directory} && git clone -b {context.repository_branch} {context.repository_url} repo"
+    
+    def _write_prompt_file(
+        self,
+        container,
+        context: AiderExecutionContext,
+        working_dir: str,
+        prompt: str
+    ) -> None:
+        """
+        Upload the prompt to the prompt file in the working directory.
+        
+        Raises:
+            AiderExecutionError: If the upload fails
+        """
+        try:
+            upload_files(container, working_dir, {self.PROMPT_FILE_NAME: prompt})
+        except Exception as e:
+            raise AiderExecutionError(
+                f"Failed to write prompt file: {str(e)}",
+                project_id=context.project_id,
+                execution_id=context.execution_id
+            )
+    
     def _execute_aider_command(
         self, 
         container, 
         context: AiderExecutionContext, 
-        prompt: Optional[str] = None
+        prompt: Optional[str] = None,
+        prompt_written: bool = False
     ) -> Dict[str, Any]:
         """
         Execute Aider command in the container.
@@ -676,6 +789,7 @@ class AiderExecutionService:
             container: Docker container instance
             context: Execution context
             prompt: Optional prompt to use with Aider
+            prompt_written: Whether the prompt file was already written
             
         Returns:
             Dictionary containing execution results
@@ -701,20 +815,11 @@ class AiderExecutionService:
             
             # Add prompt if provided
             if prompt:
-                # Write prompt to temporary file and use it
-                prompt_file = f"{working_dir}/aider_prompt.txt"
-                write_prompt_cmd = f"cd {working_dir} && echo {json.dumps(prompt)} > aider_prompt.txt"
-                
-                exit_code, output = container.exec_run(write_prompt_cmd)
-                if exit_code != 0:
-                    raise AiderExecutionError(
-                        "Failed to write prompt file",
-                        project_id=context.project_id,
-                        execution_id=context.execution_id,
-                        exit_code=exit_code
-                    )
+                # Write prompt to the prompt file, unless already written, and use it
+                if not prompt_written:
+                    self._write_prompt_file(container, context, working_dir, prompt)
                 
-                aider_cmd += f" --message-file aider_prompt.txt"
+                aider_cmd += f" --message-file {self.PROMPT_FILE_NAME}"
             
             self.logger.info(
                 "Executing Aider command",
@@ -726,12 +831,9 @@ class AiderExecutionService:
                 files_count=len(context.files_to_modify or [])
             )
             
-            # Execute Aider command
-            exit_code, output = container.exec_run(aider_cmd)
-            
-            # Process output
-            stdout = output.decode('utf-8') if isinstance(output, bytes) else str(output)
-            stderr = ""  # Docker exec_run combines stdout and stderr
+            # Execute Aider command, streaming its output to execution logs
+            output = self._exec_streaming(container, aider_cmd, context, "aider")
+            exit_code = output['exit_code']
             
             self.logger.info(
                 "Aider command execution completed",
@@ -740,13 +842,12 @@ class AiderExecutionService:
                 execution_id=context.execution_id,
                 status=LogStatus.COMPLETED if exit_code == 0 else LogStatus.FAILED,
                 exit_code=exit_code,
-                output_length=len(stdout)
+                output_length=len(output['stdout']),
+                truncated_outputs=output['truncated_outputs']
             )
             
             return {
-                'exit_code': exit_code,
-                'stdout': stdout,
-                'stderr': stderr,
+                **output,
                 'command': aider_cmd
             }
             
@@ -759,6 +860,64 @@ class AiderExecutionService:
                 execution_id=context.execution_id
             )
     
+    def _exec_streaming(
+        self,
+        container,
+        command: str,
+        context: AiderExecutionContext,
+        operation: str
+    ) -> Dict[str, Any]:
+        """
+        Execute a long-running command, forwarding its output lines to execution logs.
+        
+        stdout and stderr are captured separately and bounded; streams past the
+        caps keep their head and tail, and the truncation marker is also sent
+        to the execution log.
+        
+        Args:
+            container: Docker container instance
+            command: Command to execute
+            context: Execution context
+            operation: Operation name attached to the forwarded lines
+            
+        Returns:
+            Dictionary with exit_code, stdout, stderr, truncated_outputs and output_spill_paths
+        """
+        with ExecutionLogForwarder(
+            context.project_id,
+            context.execution_id,
+            operation,
+            correlation_id=self.correlation_id
+        ) as forwarder:
+            exit_code, stdout, stderr = stream_exec(container, command, forwarder.submit)
+            truncated = [capture for capture in (stdout, stderr) if capture.truncated]
+            for capture in truncated:
+                forwarder.submit(capture.stream, capture.marker())
+        
+        for capture in truncated:
+            self.logger.warn(
+                "Command output truncated",
+                correlation_id=self.correlation_id,
+                project_id=context.project_id,
+                execution_id=context.execution_id,
+                operation=operation,
+                stream=capture.stream,
+                total_bytes=capture.total_bytes,
+                omitted_bytes=capture.omitted_bytes,
+                spill_path=capture.spill_path
+            )
+        
+        return {
+            'exit_code': exit_code,
+            'stdout': stdout.text(),
+            'stderr': stderr.text(),
+            'truncated_outputs': [f"{operation}_{capture.stream}" for capture in truncated],
+            'output_spill_paths': {
+                f"{operation}_{capture.stream}": capture.spill_path
+                for capture in truncated if capture.spill_path
+            }
+        }
+    
     def _capture_execution_artifacts(
         self, 
         container, 
@@ -778,6 +937,8 @@ class AiderExecutionService:
         """
         artifacts = {
             'diff_output': None,
+            'diff_spill_path': None,
+            'diff_truncated': False,
             'files_modified': [],
             'commit_hash': None,
             'aider_version': None
@@ -785,14 +946,17 @@ class AiderExecutionService:
         
         try:
             working_dir = f"{context.working_directory}/repo" if context.repository_url else context.working_directory
+            diff_cmd = f"cd {working_dir} && git diff HEAD~1"
+            
+            # Aider version, git diff and commit hash in one command batch
+            steps = [AgentStep(self.AIDER_VERSION_COMMAND)]
+            if context.repository_url:
+                steps += [AgentStep(diff_cmd), AgentStep(f"cd {working_dir} && {self.GIT_LOG_COMMAND}")]
+            results = run_steps(container, steps)
             
             # Capture Aider version
-            try:
-                exit_code, output = container.exec_run(self.AIDER_VERSION_COMMAND)
-                if exit_code == 0:
-                    artifacts['aider_version'] = output.decode('utf-8').strip() if isinstance(output, bytes) else str(output).strip()
-            except Exception:
-                pass  # Non-critical
+            if results[0].succeeded:
+                artifacts['aider_version'] = results[0].output.strip()
             
             # Extract files modified from stdout
             stdout = execution_result.get('stdout', '')
@@ -807,26 +971,25 @@ class AiderExecutionService:
                 file.strip() for file in files_modified if file.strip()
             ))
             
-            # Capture git diff if repository is available
+            # Capture git diff and commit hash if repository is available
             if context.repository_url:
-                try:
-                    diff_cmd = f"cd {working_dir} && git diff HEAD~1"
-                    exit_code, output = container.exec_run(diff_cmd)
-                    if exit_code == 0:
-                        artifacts['diff_output'] = output.decode('utf-8') if isinstance(output, bytes) else str(output)
-                except Exception:
-                    pass  # Non-critical
+                diff, commit = results[1], results[2]
+                if diff.succeeded:
+                    artifacts['diff_output'] = diff.output
+                    artifacts['diff_truncated'] = diff.omitted_bytes > 0
+                    artifacts['diff_spill_path'] = diff.spill_path
+                    if diff.omitted_bytes and diff.spill_path is None:
+                        # Read the oversized diff again, keeping all of it in a spill file
+                        try:
+                            exit_code, capture, _ = stream_exec(container, diff_cmd)
+                            if exit_code == 0:
+                                artifacts['diff_output'] = capture.text()
+                                artifacts['diff_spill_path'] = capture.spill_path
+                        except Exception:
+                            pass  # Non-critical
                 
-                # Capture commit hash
-                try:
-                    commit_cmd = f"cd {working_dir} && git log -1 --format=%H"
-                    exit_code, output = container.exec_run(commit_cmd)
-                    if exit_code == 0:
-                        commit_hash = output.decode('utf-8').strip() if isinstance(output, bytes) else str(output).strip()
-                        if commit_hash:
-                            artifacts['commit_hash'] = commit_hash
-                except Exception:
-                    pass  # Non-critical
+                if commit.succeeded and commit.output.strip():
+                    artifacts['commit_hash'] = commit.output.strip()
             
             self.logger.info(
                 "Execution artifacts captured",
@@ -835,6 +998,7 @@ class AiderExecutionService:
                 execution_id=context.execution_id,
                 files_modified_count=len(artifacts['files_modified']),
                 has_diff=artifacts['diff_output'] is not None,
+                diff_truncated=artifacts['diff_truncated'],
                 has_commit_hash=artifacts['commit_hash'] is not None
             )
             
@@ -1223,6 +1387,8 @@ class AiderExecutionService:
         result.stdout_output = execution_result['stdout']
         result.stderr_output = execution_result['stderr']
         result.exit_code = execution_result['exit_code']
+        result.truncated_outputs = list(execution_result.get('truncated_outputs', []))
+        result.output_spill_paths = dict(execution_result.get('output_spill_paths', {}))
         
         # Step 5: Capture artifacts
         artifact_capture_start = time.time()
@@ -1254,6 +1420,7 @@ class AiderExecutionService:
             status=LogStatus.COMPLETED if result.success else LogStatus.FAILED,
             exit_code=result.exit_code,
             attempt_duration_ms=result.total_duration_ms,
+            truncated_outputs=result.truncated_outputs,
             success=result.success
         )
         
@@ -1435,12 +1602,9 @@ class AiderExecutionService:
                 working_directory=work_dir
             )
             
-            # Execute npm ci command with timeout
-            exit_code, output = container.exec_run(npm_cmd)
-            
-            # Process output
-            stdout = output.decode('utf-8') if isinstance(output, bytes) else str(output)
-            stderr = ""  # Docker exec_run combines stdout and stderr
+            # Execute npm ci command, streaming its output to execution logs
+            output = self._exec_streaming(container, npm_cmd, context, "npm_ci")
+            exit_code = output['exit_code']
             
             self.logger.info(
                 "npm ci command execution completed",
@@ -1449,13 +1613,12 @@ class AiderExecutionService:
                 execution_id=context.execution_id,
                 status=LogStatus.COMPLETED if exit_code == 0 else LogStatus.FAILED,
                 exit_code=exit_code,
-                output_length=len(stdout)
+                output_length=len(output['stdout']),
+                truncated_outputs=output['truncated_outputs']
             )
             
             return {
-                'exit_code': exit_code,
-                'stdout': stdout,
-                'stderr': stderr,
+                **output,
                 'command': npm_cmd,
                 'skipped': False
             }
@@ -1504,27 +1667,16 @@ class AiderExecutionService:
             else:
                 work_dir = context.working_directory
             
-            # Capture npm version
-            try:
-                exit_code, output = container.exec_run(self.NPM_VERSION_COMMAND)
-                if exit_code == 0:
-                    artifacts['npm_version'] = output.decode('utf-8').strip() if isinstance(output, bytes) else str(output).strip()
-            except Exception:
-                pass  # Non-critical
-            
-            # Check if package-lock.json exists
-            try:
-                exit_code, output = container.exec_run(f"cd {work_dir} && test -f package-lock.json")
-                artifacts['package_lock_exists'] = exit_code == 0
-            except Exception:
-                pass  # Non-critical
-            
-            # Check if node_modules was created/updated
-            try:
-                exit_code, output = container.exec_run(f"cd {work_dir} && test -d node_modules")
-                artifacts['node_modules_created'] = exit_code == 0
-            except Exception:
-                pass  # Non-critical
+            # npm version, package-lock.json and node_modules checks in one command batch
+            version, package_lock, node_modules = run_steps(container, [
+                AgentStep(self.NPM_VERSION_COMMAND),
+                AgentStep(f"cd {work_dir} && test -f package-lock.json"),
+                AgentStep(f"cd {work_dir} && test -d node_modules")
+            ])
+            if version.succeeded:
+                artifacts['npm_version'] = version.output.strip()
+            artifacts['package_lock_exists'] = package_lock.succeeded
+            artifacts['node_modules_created'] = node_modules.succeeded
             
             # For npm ci, the main "files modified" are typically node_modules contents
             # We'll indicate this generically rather than listing thousands of files
@@ -1956,6 +2108,8 @@ class AiderExecutionService:
         result.stdout_output = execution_result['stdout']
         result.stderr_output = execution_result['stderr']
         result.exit_code = execution_result['exit_code']
+        result.truncated_outputs = list(execution_result.get('truncated_outputs', []))
+        result.output_spill_paths = dict(execution_result.get('output_spill_paths', {}))
         
         # Step 5: Capture artifacts
         artifact_capture_start = time.time()
@@ -1989,6 +2143,7 @@ class AiderExecutionService:
             status=LogStatus.COMPLETED if result.success else LogStatus.FAILED,
             exit_code=result.exit_code,
             attempt_duration_ms=result.total_duration_ms,
+            truncated_outputs=result.truncated_outputs,
             success=result.success
         )
         
@@ -2084,12 +2239,9 @@ class AiderExecutionService:
                 build_script=build_script
             )
             
-            # Execute npm run build command with timeout
-            exit_code, output = container.exec_run(npm_cmd)
-            
-            # Process output
-            stdout = output.decode('utf-8') if isinstance(output, bytes) else str(output)
-            stderr = ""  # Docker exec_run combines stdout and stderr
+            # Execute npm run build command, streaming its output to execution logs
+            output = self._exec_streaming(container, npm_cmd, context, "npm_build")
+            exit_code = output['exit_code']
             
             self.logger.info(
                 "npm run build command execution completed",
@@ -2098,14 +2250,13 @@ class AiderExecutionService:
                 execution_id=context.execution_id,
                 status=LogStatus.COMPLETED if exit_code == 0 else LogStatus.FAILED,
                 exit_code=exit_code,
-                output_length=len(stdout),
+                output_length=len(output['stdout']),
+                truncated_outputs=output['truncated_outputs'],
                 build_script=build_script
             )
             
             return {
-                'exit_code': exit_code,
-                'stdout': stdout,
-                'stderr': stderr,
+                **output,
                 'command': npm_cmd,
                 'skipped': False,
                 'build_script': build_script
@@ -2158,32 +2309,22 @@ class AiderExecutionService:
             else:
                 work_dir = context.working_directory
             
-            # Capture npm version
-            try:
-                exit_code, output = container.exec_run(self.NPM_VERSION_COMMAND)
-                if exit_code == 0:
-                    artifacts['npm_version'] = output.decode('utf-8').strip() if isinstance(output, bytes) else str(output).strip()
-            except Exception:
-                pass  # Non-critical
-            
-            # Check if build script exists (redundant but useful for artifacts)
-            try:
-                script_check = f"cd {work_dir} && node -e \"const pkg = require('./package.json'); if (!pkg.scripts || !pkg.scripts['{build_script}']) {{ process.exit(1); }}\""
-                exit_code, output = container.exec_run(script_check)
-                artifacts['build_script_exists'] = exit_code == 0
-            except Exception:
-                pass  # Non-critical
+            # npm version, build script check and build output directories in one command batch
+            script_check = f"cd {work_dir} && node -e \"const pkg = require('./package.json'); if (!pkg.scripts || !pkg.scripts['{build_script}']) {{ process.exit(1); }}\""
+            version, script, *build_dirs = run_steps(container, [
+                AgentStep(self.NPM_VERSION_COMMAND),
+                AgentStep(script_check)
+            ] + [
+                AgentStep(f"cd {work_dir} && test -d {build_dir}") for build_dir in self.BUILD_OUTPUT_DIRECTORIES
+            ])
+            if version.succeeded:
+                artifacts['npm_version'] = version.output.strip()
+            artifacts['build_script_exists'] = script.succeeded
             
             # Detect build output directories
-            build_dirs_found = []
-            for build_dir in self.BUILD_OUTPUT_DIRECTORIES:
-                try:
-                    exit_code, output = container.exec_run(f"cd {work_dir} && test -d {build_dir}")
-                    if exit_code == 0:
-                        build_dirs_found.append(build_dir)
-                except Exception:
-                    pass  # Non-critical
-            
+            build_dirs_found = [
+                build_dir for build_dir, check in zip(self.BUILD_OUTPUT_DIRECTORIES, build_dirs) if check.succeeded
+            ]
             artifacts['build_output_directories'] = build_dirs_found
             
             # For npm run build, the main "files modified" are typically build output directories
@@ -3254,6 +3395,145 @@ class AiderExecutionService:
             # Re-raise to be caught by the calling method
             raise
 
+    # Async API
+
+    async def execute_aider_async(
+        self,
+        execution_context: AiderExecutionContext,
+        prompt_context: Optional[PromptContext] = None,
+        use_generated_prompt: bool = True
+    ) -> AiderExecutionResult:
+        """Async counterpart of execute_aider, run on the shared execution thread pool."""
+        return await self._run_in_executor(
+            "execute_aider", execution_context,
+            self.execute_aider, execution_context, prompt_context, use_generated_prompt
+        )
+
+    async def execute_npm_ci_async(
+        self,
+        execution_context: AiderExecutionContext,
+        working_directory: Optional[str] = None
+    ) -> AiderExecutionResult:
+        """Async counterpart of execute_npm_ci, run on the shared execution thread pool."""
+        return await self._run_in_executor(
+            "execute_npm_ci", execution_context,
+            self.execute_npm_ci, execution_context, working_directory
+        )
+
+    async def execute_npm_build_async(
+        self,
+        execution_context: AiderExecutionContext,
+        working_directory: Optional[str] = None,
+        build_script: str = "build"
+    ) -> AiderExecutionResult:
+        """Async counterpart of execute_npm_build, run on the shared execution thread pool."""
+        return await self._run_in_executor(
+            "execute_npm_build", execution_context,
+            self.execute_npm_build, execution_context, working_directory, build_script
+        )
+
+    async def execute_git_merge_async(
+        self,
+        execution_context: AiderExecutionContext,
+        source_branch: str,
+        target_branch: str = "main",
+        working_directory: Optional[str] = None
+    ) -> AiderExecutionResult:
+        """Async counterpart of execute_git_merge, run on the shared execution thread pool."""
+        return await self._run_in_executor(
+            "execute_git_merge", execution_context,
+            self.execute_git_merge, execution_context, source_branch, target_branch, working_directory
+        )
+
+    async def execute_git_push_async(
+        self,
+        execution_context: AiderExecutionContext,
+        branch_name: str = "main",
+        remote_name: str = "origin",
+        working_directory: Optional[str] = None
+    ) -> AiderExecutionResult:
+        """Async counterpart of execute_git_push, run on the shared execution thread pool."""
+        return await self._run_in_executor(
+            "execute_git_push", execution_context,
+            self.execute_git_push, execution_context, branch_name, remote_name, working_directory
+        )
+
+    async def _run_in_executor(
+        self,
+        operation: str,
+        execution_context: AiderExecutionContext,
+        method: Callable[..., AiderExecutionResult],
+        *args: Any
+    ) -> AiderExecutionResult:
+        """
+        Run a blocking execute_* method on the execution thread pool.
+        
+        If the awaiting task is cancelled, the container commands of the method
+        are terminated and the method is given CANCEL_TIMEOUT_SECONDS to unwind
+        before CancelledError propagates.
+        
+        Args:
+            operation: Operation name for logging
+            execution_context: Execution context of the call
+            method: Blocking method to run
+            *args: Positional arguments of the method
+            
+        Returns:
+            Result of the method
+        """
+        loop = asyncio.get_running_loop()
+        cancellation = CommandCancellation()
+
+        def run() -> AiderExecutionResult:
+            with cancellation_scope(cancellation):
+                return method(*args)
+
+        future = loop.run_in_executor(get_aider_executor(), contextvars.copy_context().run, run)
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            self.logger.warn(
+                "Execution cancelled, terminating container command",
+                correlation_id=self.correlation_id,
+                project_id=execution_context.project_id,
+                execution_id=execution_context.execution_id,
+                operation=operation,
+                status=LogStatus.FAILED
+            )
+            await asyncio.to_thread(cancellation.cancel)
+            await asyncio.wait({future}, timeout=self.CANCEL_TIMEOUT_SECONDS)
+            if future.done() and not future.cancelled():
+                future.exception()  # Retrieved; the task is cancelled either way
+            raise
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(1, int(os.getenv(name, default)))
+    except ValueError:
+        return default
+
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_aider_executor() -> ThreadPoolExecutor:
+    """
+    Thread pool running blocking execute_* calls for the async API.
+    
+    Bounded by AIDER_EXECUTION_MAX_WORKERS (default 4); executions beyond the
+    bound wait for a free worker.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=_env_int("AIDER_EXECUTION_MAX_WORKERS", 4),
+                thread_name_prefix="aider-execution"
+            )
+        return _executor
+
 
 def get_aider_execution_service(correlation_id: Optional[str] = None) -> AiderExecutionService:
     """
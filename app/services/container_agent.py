@@ -0,0 +1,538 @@
+"""
+Container Agent Module for Clarity Local Runner
+
+This module runs short command sequences in project containers through a
+resident agent process instead of one docker exec per command:
+- A small Node.js agent (node is present in every project container image)
+  started once per container with `node -e`, attached over the exec's stdio
+- Requests are JSON lines holding a sequence of shell commands; the agent runs
+  them in order and answers with one JSON line of per-step results
+- Per-step output is bounded to a head and tail, like BoundedOutputCapture
+- A step can stop the sequence when it fails; later steps are reported skipped
+- Requests run concurrently and can be cancelled: a cancel request terminates
+  the process group of the running step and skips the remaining ones
+
+A whole step sequence costs one write and one read on the attached socket
+rather than an exec create/start/inspect round trip per command. Requests
+made inside a cancellation scope (see container_output_stream) are cancelled
+with it. Containers
+without an agent (agent disabled with CONTAINER_AGENT_ENABLED=false, agent
+failed to start, test doubles) run the same steps one exec at a time.
+
+Primary Responsibility: Batched command execution in project containers
+"""
+
+import base64
+import itertools
+import json
+import os
+import socket
+import struct
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set
+
+from docker.models.containers import Container
+
+from core.structured_logging import get_structured_logger
+from services.container_output_stream import (
+    CommandCancellation,
+    check_cancelled,
+    current_cancellation,
+    output_limits,
+    stream_exec,
+)
+
+
+# Reads JSON request lines from stdin and writes one JSON result line per request.
+# Requests run concurrently; {"cancel": id} terminates request id's running step.
+AGENT_SCRIPT = r"""
+const { spawn } = require('child_process');
+const os = require('os');
+const readline = require('readline');
+
+const requests = new Map();
+const inflight = new Set();
+
+function runStep(step, limits, state) {
+  return new Promise((resolve) => {
+    const started = Date.now();
+    const head = [];
+    const tail = [];
+    let headSize = 0;
+    let tailSize = 0;
+    let total = 0;
+    let done = false;
+    const collect = (data) => {
+      total += data.length;
+      if (headSize < limits.head_bytes) {
+        const part = data.subarray(0, limits.head_bytes - headSize);
+        head.push(part);
+        headSize += part.length;
+        data = data.subarray(part.length);
+      }
+      if (data.length && limits.tail_bytes > 0) {
+        tail.push(data);
+        tailSize += data.length;
+        while (tail.length > 1 && tailSize - tail[0].length >= limits.tail_bytes) {
+          tailSize -= tail.shift().length;
+        }
+      }
+    };
+    const finish = (exitCode, error) => {
+      if (done) return;
+      done = true;
+      state.child = null;
+      let tailBuffer = Buffer.concat(tail);
+      if (tailBuffer.length > limits.tail_bytes) {
+        tailBuffer = tailBuffer.subarray(tailBuffer.length - limits.tail_bytes);
+      }
+      resolve({
+        exit_code: exitCode,
+        head: Buffer.concat(head).toString('base64'),
+        tail: tailBuffer.toString('base64'),
+        total_bytes: total,
+        duration_ms: Date.now() - started,
+        error: error || null
+      });
+    };
+    // Own process group, so a cancel reaches every process the step started
+    const child = spawn('sh', ['-c', step.command], { stdio: ['ignore', 'pipe', 'pipe'], detached: true });
+    state.child = child;
+    child.stdout.on('data', collect);
+    child.stderr.on('data', collect);
+    child.on('error', (error) => finish(127, String(error)));
+    child.on('close', (code, signal) => {
+      finish(code === null ? 128 + (os.constants.signals[signal] || 0) : code);
+    });
+  });
+}
+
+function cancel(id) {
+  const state = requests.get(id);
+  if (!state) return;
+  state.cancelled = true;
+  if (state.child) {
+    try {
+      process.kill(-state.child.pid, 'SIGTERM');
+    } catch (error) {
+      // Already exited
+    }
+  }
+}
+
+async function handle(request) {
+  const limits = { head_bytes: request.head_bytes || 0, tail_bytes: request.tail_bytes || 0 };
+  const state = { cancelled: false, child: null };
+  requests.set(request.id, state);
+  const results = [];
+  let stopped = false;
+  try {
+    for (const step of request.steps || []) {
+      if (stopped || state.cancelled) {
+        results.push({ skipped: true });
+        continue;
+      }
+      const result = await runStep(step, limits, state);
+      results.push(result);
+      stopped = result.exit_code !== 0 && Boolean(step.stop_on_failure);
+    }
+  } finally {
+    requests.delete(request.id);
+  }
+  return { id: request.id, results, cancelled: state.cancelled };
+}
+
+const input = readline.createInterface({ input: process.stdin });
+input.on('line', (line) => {
+  let request;
+  try {
+    request = JSON.parse(line);
+  } catch (error) {
+    process.stdout.write(JSON.stringify({ id: null, error: 'Invalid request: ' + String(error) }) + '\n');
+    return;
+  }
+  if (request.cancel !== undefined) {
+    cancel(request.cancel);
+    return;
+  }
+  const running = handle(request).then((response) => {
+    process.stdout.write(JSON.stringify(response) + '\n');
+  });
+  inflight.add(running);
+  running.finally(() => inflight.delete(running));
+});
+input.on('close', () => Promise.all(inflight).then(() => process.exit(0)));
+"""
+
+# Docker multiplexed stream header: stream type, 3 padding bytes, payload size
+FRAME_HEADER = struct.Struct(">BxxxL")
+STDOUT_FRAME = 1
+
+
+class ContainerAgentError(Exception):
+    """Raised when the container agent cannot be started or stops answering."""
+
+
+@dataclass
+class AgentStep:
+    """A shell command of a step sequence."""
+    command: str
+    # Skip the remaining steps of the sequence if this one fails
+    stop_on_failure: bool = False
+
+
+@dataclass
+class AgentStepResult:
+    """Result of a step; output combines stdout and stderr."""
+    exit_code: Optional[int]
+    output: str = ""
+    duration_ms: float = 0.0
+    skipped: bool = False
+    omitted_bytes: int = 0
+    # File holding the whole output, when it was captured with a spill file
+    spill_path: Optional[str] = None
+    error: Optional[str] = None
+
+    @property
+    def succeeded(self) -> bool:
+        """Whether the step ran and exited with 0."""
+        return not self.skipped and self.exit_code == 0
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return max(0.1, float(os.getenv(name, default)))
+    except ValueError:
+        return default
+
+
+def _step_result(result: Dict) -> AgentStepResult:
+    """AgentStepResult of a step result sent by the agent."""
+    if result.get("skipped"):
+        return AgentStepResult(exit_code=None, skipped=True)
+    head = base64.b64decode(result.get("head", ""))
+    tail = base64.b64decode(result.get("tail", ""))
+    total_bytes = result.get("total_bytes", 0)
+    omitted = max(0, total_bytes - len(head) - len(tail))
+    output = head.decode('utf-8', errors='replace')
+    if omitted:
+        output += f"\n... [output truncated: {omitted} of {total_bytes} bytes omitted] ...\n"
+    return AgentStepResult(
+        exit_code=result.get("exit_code"),
+        output=output + tail.decode('utf-8', errors='replace'),
+        duration_ms=float(result.get("duration_ms", 0)),
+        omitted_bytes=omitted,
+        error=result.get("error")
+    )
+
+
+class ContainerAgent:
+    """
+    Resident agent process of one container.
+
+    Requests run concurrently in the agent; whichever caller is waiting reads
+    the socket and hands responses to their requests. A request made inside a
+    cancellation scope is cancelled in the agent when the scope is. A request
+    that times out is cancelled too; any other failure closes the agent and
+    the next `get_container_agent` call starts a new one.
+
+    Args:
+        container: Docker container instance
+        timeout_seconds: Longest wait for a response (default: CONTAINER_AGENT_TIMEOUT_SECONDS)
+    """
+
+    DEFAULT_TIMEOUT_SECONDS = 300.0
+    READ_CHUNK_BYTES = 64 * 1024
+    # Longest socket wait before a reader checks its deadline and lets others read
+    POLL_SECONDS = 0.5
+
+    def __init__(self, container: Container, timeout_seconds: Optional[float] = None):
+        self.logger = get_structured_logger(__name__)
+        self.container = container
+        self.timeout_seconds = timeout_seconds or _env_float(
+            "CONTAINER_AGENT_TIMEOUT_SECONDS", self.DEFAULT_TIMEOUT_SECONDS
+        )
+        self.closed = True
+
+        self._send_lock = threading.Lock()
+        self._condition = threading.Condition()
+        self._handle = None
+        self._socket = None
+        self._raw = bytearray()
+        self._buffer = bytearray()
+        self._reading = False
+        self._waiting: Set[int] = set()
+        self._responses: Dict[int, Dict] = {}
+        self._request_ids = itertools.count(1)
+
+    def start(self) -> None:
+        """
+        Start the agent and wait for it to answer an empty request.
+
+        Raises:
+            ContainerAgentError: If the agent does not start
+        """
+        api = self.container.client.api
+        try:
+            exec_id = api.exec_create(
+                self.container.id, ["node", "-e", AGENT_SCRIPT], stdin=True, stdout=True, stderr=True
+            )["Id"]
+            self._handle = api.exec_start(exec_id, socket=True)
+        except Exception as e:
+            raise ContainerAgentError(f"Failed to start container agent: {e}") from e
+        # The raw socket under the response's SocketIO wrapper
+        self._socket = getattr(self._handle, "_sock", self._handle)
+        self._socket.settimeout(self.POLL_SECONDS)
+        self.closed = False
+        self._request([])
+
+    def run(self, steps: List[AgentStep], head_bytes: int, tail_bytes: int) -> List[AgentStepResult]:
+        """
+        Run a step sequence in one request.
+
+        Raises:
+            ContainerAgentError: If the agent fails or does not answer in time
+            CommandCancelled: If the current cancellation token was cancelled
+        """
+        results = self._request(steps, head_bytes, tail_bytes, current_cancellation())
+        return [_step_result(result) for result in results]
+
+    def close(self) -> None:
+        """Close the attached socket; the agent exits at the end of its input."""
+        with self._condition:
+            self.closed = True
+            self._condition.notify_all()
+        for handle in (self._socket, self._handle):
+            try:
+                if handle is not None:
+                    handle.close()
+            except Exception:
+                pass  # Already closed
+
+    def _request(
+        self,
+        steps: List[AgentStep],
+        head_bytes: int = 0,
+        tail_bytes: int = 0,
+        cancellation: Optional[CommandCancellation] = None
+    ) -> List[Dict]:
+        request_id = next(self._request_ids)
+        with self._condition:
+            if self.closed:
+                raise ContainerAgentError("Container agent is closed")
+            self._waiting.add(request_id)
+        cancel_key = cancellation.on_cancel(lambda: self._cancel(request_id)) if cancellation else None
+        try:
+            if cancellation is not None:
+                cancellation.check()
+            self._send({
+                "id": request_id,
+                "steps": [{"command": step.command, "stop_on_failure": step.stop_on_failure} for step in steps],
+                "head_bytes": head_bytes,
+                "tail_bytes": tail_bytes
+            })
+            response = self._await_response(request_id, time.monotonic() + self.timeout_seconds)
+        finally:
+            if cancel_key is not None:
+                cancellation.unregister(cancel_key)
+            with self._condition:
+                self._waiting.discard(request_id)
+                self._responses.pop(request_id, None)
+        if cancellation is not None:
+            cancellation.check()
+        if "results" not in response or len(response["results"]) != len(steps):
+            self.close()
+            raise ContainerAgentError(f"Invalid container agent response: {response.get('error')}")
+        return response["results"]
+
+    def _send(self, message: Dict) -> None:
+        try:
+            with self._send_lock:
+                self._socket.sendall((json.dumps(message) + "\n").encode("utf-8"))
+        except OSError as e:
+            self.close()
+            raise ContainerAgentError(f"Container agent request failed: {e}") from e
+
+    def _cancel(self, request_id: int) -> None:
+        """Terminate the running step of a request and skip its remaining steps."""
+        if not self.closed:
+            self._send({"cancel": request_id})
+
+    def _await_response(self, request_id: int, deadline: float) -> Dict:
+        while True:
+            timed_out = False
+            with self._condition:
+                while True:
+                    if request_id in self._responses:
+                        return self._responses.pop(request_id)
+                    if self.closed:
+                        raise ContainerAgentError("Container agent exited")
+                    if time.monotonic() > deadline:
+                        timed_out = True
+                        break
+                    if not self._reading:
+                        self._reading = True
+                        break
+                    self._condition.wait(self.POLL_SECONDS)
+            if timed_out:
+                # Leave the agent to other requests; stop this one's commands
+                self._cancel(request_id)
+                raise ContainerAgentError("Container agent response timed out")
+            try:
+                self._read_available()
+            finally:
+                with self._condition:
+                    self._reading = False
+                    self._condition.notify_all()
+
+    def _read_available(self) -> None:
+        """Read what the socket has within POLL_SECONDS and file complete responses."""
+        try:
+            chunk = self._socket.recv(self.READ_CHUNK_BYTES)
+        except socket.timeout:
+            return
+        except OSError as e:
+            self.close()
+            raise ContainerAgentError(f"Container agent request failed: {e}") from e
+        if not chunk:
+            self.close()
+            raise ContainerAgentError("Container agent exited")
+        self._raw += chunk
+
+        responses = []
+        while len(self._raw) >= FRAME_HEADER.size:
+            stream, size = FRAME_HEADER.unpack_from(self._raw)
+            if len(self._raw) < FRAME_HEADER.size + size:
+                break
+            payload = bytes(self._raw[FRAME_HEADER.size:FRAME_HEADER.size + size])
+            del self._raw[:FRAME_HEADER.size + size]
+            # Output of the agent itself on stderr is not part of any response
+            if stream == STDOUT_FRAME:
+                self._buffer += payload
+        while True:
+            newline = self._buffer.find(b"\n")
+            if newline < 0:
+                break
+            line = bytes(self._buffer[:newline])
+            del self._buffer[:newline + 1]
+            try:
+                responses.append(json.loads(line))
+            except ValueError as e:
+                self.close()
+                raise ContainerAgentError(f"Invalid container agent response: {e}") from e
+
+        with self._condition:
+            for response in responses:
+                # Responses of timed-out requests are dropped
+                if response.get("id") in self._waiting:
+                    self._responses[response["id"]] = response
+
+
+_agents: Dict[str, ContainerAgent] = {}
+_unavailable: Set[str] = set()
+_agents_lock = threading.Lock()
+
+
+def _agents_enabled() -> bool:
+    return os.getenv("CONTAINER_AGENT_ENABLED", "true").lower() not in ("false", "0", "no")
+
+
+def get_container_agent(container) -> Optional[ContainerAgent]:
+    """
+    Running agent of a container, started on first use.
+
+    Returns None for containers without an agent: test doubles, agents
+    disabled, or an agent that failed to start in this container before.
+    """
+    if not isinstance(container, Container) or not _agents_enabled():
+        return None
+    with _agents_lock:
+        if container.id in _unavailable:
+            return None
+        agent = _agents.get(container.id)
+        if agent is not None and not agent.closed:
+            return agent
+        agent = ContainerAgent(container)
+        try:
+            agent.start()
+        except ContainerAgentError as e:
+            agent.close()
+            _unavailable.add(container.id)
+            agent.logger.warn(
+                "Container agent unavailable, running commands one exec at a time",
+                container_id=container.id,
+                error=str(e)
+            )
+            return None
+        _agents[container.id] = agent
+        return agent
+
+
+def discard_container_agent(container_id: str) -> None:
+    """Close and forget the agent of a removed container."""
+    with _agents_lock:
+        agent = _agents.pop(container_id, None)
+        _unavailable.discard(container_id)
+    if agent is not None:
+        agent.close()
+
+
+def _run_step_exec(container, step: AgentStep, head_bytes: int, tail_bytes: int) -> AgentStepResult:
+    start_time = time.time()
+    try:
+        exit_code, stdout, stderr = stream_exec(container, step.command, head_bytes=head_bytes, tail_bytes=tail_bytes)
+    except Exception as e:
+        return AgentStepResult(exit_code=None, output=str(e), error=str(e))
+    return AgentStepResult(
+        exit_code=exit_code,
+        output=stdout.text() + stderr.text(),
+        duration_ms=round((time.time() - start_time) * 1000, 2),
+        omitted_bytes=stdout.omitted_bytes + stderr.omitted_bytes,
+        spill_path=stdout.spill_path or stderr.spill_path
+    )
+
+
+def run_steps(
+    container,
+    steps: List[AgentStep],
+    head_bytes: Optional[int] = None,
+    tail_bytes: Optional[int] = None
+) -> List[AgentStepResult]:
+    """
+    Run a step sequence in a container, in one agent request when possible.
+
+    Without an agent every step is its own exec. A step whose exec raises gets
+    a result with `error` set and no exit code instead of failing the sequence.
+
+    Args:
+        container: Docker container instance
+        steps: Steps in execution order
+        head_bytes: Per-step output head cap (default: CONTAINER_OUTPUT_HEAD_BYTES)
+        tail_bytes: Per-step output tail cap (default: CONTAINER_OUTPUT_TAIL_BYTES)
+
+    Returns:
+        One result per step, in order
+
+    Raises:
+        ContainerAgentError: If the agent fails mid-request
+        CommandCancelled: If the current cancellation token was cancelled
+    """
+    check_cancelled()
+    head_bytes, tail_bytes = output_limits(head_bytes, tail_bytes)
+    agent = get_container_agent(container)
+    if agent is not None:
+        return agent.run(steps, head_bytes, tail_bytes)
+
+    results: List[AgentStepResult] = []
+    stopped = False
+    for step in steps:
+        if stopped:
+            results.append(AgentStepResult(exit_code=None, skipped=True))
+            continue
+        check_cancelled()
+        result = _run_step_exec(container, step, head_bytes, tail_bytes)
+        results.append(result)
+        stopped = step.stop_on_failure and not result.succeeded
+    return results
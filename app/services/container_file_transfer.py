@@ -0,0 +1,173 @@
+"""
+Container File Transfer Module for Clarity Local Runner
+
+This module moves files in and out of project containers through the Docker
+archive API instead of shell commands:
+- Uploads (prompts, task lists, patches) as one tar stream per call through
+  `put_archive`; the tar is built incrementally while Docker reads it, so
+  payload size is not bound by the argument limit and nothing is escaped
+- Downloads of a file or directory tree in one `get_archive` call, read
+  incrementally from the response stream with an optional size cap
+
+Neither direction writes temporary files.
+
+Primary Responsibility: Bulk file transfer between the runner and project containers
+"""
+
+import io
+import posixpath
+import tarfile
+import time
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Union
+
+from core.structured_logging import get_structured_logger
+
+
+FileContent = Union[str, bytes]
+
+logger = get_structured_logger(__name__)
+
+
+class ContainerFileTransferError(Exception):
+    """Raised when files cannot be transferred to or from a container."""
+
+
+class _ChunkSink:
+    """Write-only file object collecting the chunks written by tarfile."""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> Iterator[bytes]:
+        chunks, self._chunks = self._chunks, []
+        return iter(chunks)
+
+
+class _ChunkReader(io.RawIOBase):
+    """Read-only file object over an iterable of byte chunks."""
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks = iter(chunks)
+        self._pending = b""
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while not self._pending:
+            try:
+                self._pending = next(self._chunks)
+            except StopIteration:
+                return 0
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        return size
+
+
+def _validate_name(name: str) -> str:
+    normalized = posixpath.normpath(name)
+    if not name or normalized.startswith(("/", "../")) or normalized in (".", ".."):
+        raise ContainerFileTransferError(f"Invalid file name for upload: {name!r}")
+    return normalized
+
+
+def tar_stream(files: Mapping[str, FileContent], mode: int = 0o644) -> Iterator[bytes]:
+    """
+    Stream a tar archive of files, one member at a time.
+
+    Args:
+        files: Relative file paths mapped to their content (str is UTF-8 encoded)
+        mode: Permission bits of every file
+
+    Yields:
+        Chunks of the archive
+    """
+    sink = _ChunkSink()
+    mtime = time.time()
+    with tarfile.open(fileobj=sink, mode="w|", format=tarfile.PAX_FORMAT) as archive:
+        for name, content in files.items():
+            data = content.encode("utf-8") if isinstance(content, str) else content
+            info = tarfile.TarInfo(_validate_name(name))
+            info.size = len(data)
+            info.mode = mode
+            info.mtime = mtime
+            archive.addfile(info, io.BytesIO(data))
+            yield from sink.drain()
+    yield from sink.drain()
+
+
+def upload_files(container, directory: str, files: Mapping[str, FileContent], mode: int = 0o644) -> None:
+    """
+    Write files into a container directory with a single `put_archive` call.
+
+    Args:
+        container: Docker container instance
+        directory: Existing absolute directory in the container
+        files: Paths relative to the directory mapped to their content
+        mode: Permission bits of every file
+
+    Raises:
+        ContainerFileTransferError: If the upload fails
+    """
+    for name in files:
+        _validate_name(name)
+    try:
+        uploaded = container.put_archive(directory, tar_stream(files, mode))
+    except Exception as e:
+        raise ContainerFileTransferError(f"Failed to upload files to {directory}: {e}") from e
+    if not uploaded:
+        raise ContainerFileTransferError(f"Failed to upload files to {directory}")
+
+    logger.debug(
+        "Files uploaded to container",
+        container_id=getattr(container, "id", None),
+        directory=directory,
+        file_count=len(files)
+    )
+
+
+def download_files(container, path: str, max_bytes: Optional[int] = None) -> Dict[str, bytes]:
+    """
+    Read a file or directory tree from a container with a single `get_archive` call.
+
+    Args:
+        container: Docker container instance
+        path: Absolute file or directory path in the container
+        max_bytes: Optional cap on the total size of the files read
+
+    Returns:
+        Regular files by archive path (the basename of `path` comes first)
+
+    Raises:
+        ContainerFileTransferError: If the download fails or exceeds max_bytes
+    """
+    try:
+        chunks, _ = container.get_archive(path)
+        files: Dict[str, bytes] = {}
+        total = 0
+        with tarfile.open(fileobj=io.BufferedReader(_ChunkReader(chunks)), mode="r|") as archive:
+            for member in archive:
+                if not member.isfile():
+                    continue
+                total += member.size
+                if max_bytes is not None and total > max_bytes:
+                    raise ContainerFileTransferError(f"Files under {path} exceed {max_bytes} bytes")
+                files[member.name] = archive.extractfile(member).read()
+    except ContainerFileTransferError:
+        raise
+    except Exception as e:
+        raise ContainerFileTransferError(f"Failed to download {path}: {e}") from e
+
+    logger.debug(
+        "Files downloaded from container",
+        container_id=getattr(container, "id", None),
+        path=path,
+        file_count=len(files),
+        total_bytes=total
+    )
+    return files
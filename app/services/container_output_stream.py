@@ -0,0 +1,619 @@
+"""
+Container Output Streaming Module for Clarity Local Runner
+
+This module streams the output of long-running container commands (Aider,
+npm ci, npm run build) to execution logs while they run:
+- Docker exec in stream/demux mode, reading stdout and stderr incrementally
+- Incremental UTF-8 decoding and line splitting per stream
+- Forwarding of each line through ExecutionLogService from a background
+  sender, micro-batched into execution-log frames of up to BATCH_SIZE lines
+- Backpressure: a bounded queue blocks the reader when the sender falls
+  behind, so Docker stops reading the process output; lines that still
+  cannot be queued within the put timeout are dropped from the live stream
+- Bounded capture of stdout and stderr for the command result: an in-memory
+  head and tail per stream, with the whole stream spilled to a temp file once
+  it outgrows them and a truncation marker in place of the omitted middle;
+  spill files are swept once older than the retention period or beyond the
+  spill directory's size budget
+- Cancellation of running commands: inside a cancellation scope, commands run
+  under a shell that records its PID so cancelling can signal the process
+
+Primary Responsibility: Live execution-log streaming of container command output
+"""
+
+import asyncio
+import codecs
+import contextvars
+import os
+import queue
+import tempfile
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from docker.models.containers import Container
+
+from core.structured_logging import get_structured_logger, LogLevel
+from services.execution_log_service import get_execution_log_service
+
+
+STDOUT = "stdout"
+STDERR = "stderr"
+
+# Called with (stream, line) for each complete output line
+LineHandler = Callable[[str, str], None]
+
+
+class OutputLineSplitter:
+    """
+    Incremental splitter of one output stream into lines.
+
+    Bytes may end mid-character or mid-line; partial lines are kept until
+    their newline arrives or they reach max_line_chars.
+    """
+
+    def __init__(self, stream: str, on_line: LineHandler, max_line_chars: int = 4096):
+        self.stream = stream
+        self.on_line = on_line
+        self.max_line_chars = max_line_chars
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self._partial = ""
+
+    def feed(self, data: bytes) -> None:
+        """Decode a chunk and emit the lines it completes."""
+        text = self._partial + self._decoder.decode(data)
+        lines = text.split("\n")
+        self._partial = lines.pop()
+        for line in lines:
+            self._emit(line)
+        while len(self._partial) >= self.max_line_chars:
+            self._emit(self._partial[:self.max_line_chars])
+            self._partial = self._partial[self.max_line_chars:]
+
+    def close(self) -> None:
+        """Emit the last line of a stream without a trailing newline."""
+        self._partial += self._decoder.decode(b"", final=True)
+        if self._partial:
+            self._emit(self._partial)
+            self._partial = ""
+
+    def _emit(self, line: str) -> None:
+        self.on_line(self.stream, line.rstrip("\r"))
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(0, int(os.getenv(name, default)))
+    except ValueError:
+        return default
+
+
+def output_limits(head_bytes: Optional[int] = None, tail_bytes: Optional[int] = None) -> Tuple[int, int]:
+    """Per-stream (head, tail) capture caps, defaulting to CONTAINER_OUTPUT_HEAD_BYTES / _TAIL_BYTES."""
+    return (
+        head_bytes if head_bytes is not None else _env_int(
+            "CONTAINER_OUTPUT_HEAD_BYTES", BoundedOutputCapture.DEFAULT_HEAD_BYTES
+        ),
+        tail_bytes if tail_bytes is not None else _env_int(
+            "CONTAINER_OUTPUT_TAIL_BYTES", BoundedOutputCapture.DEFAULT_TAIL_BYTES
+        )
+    )
+
+
+SPILL_FILE_PREFIX = "clarity-"
+SPILL_FILE_SUFFIX = ".log"
+DEFAULT_SPILL_RETENTION_SECONDS = 24 * 3600
+DEFAULT_SPILL_MAX_BYTES = 1024 * 1024 * 1024
+# Shortest time between two sweeps of a spill directory
+SPILL_SWEEP_INTERVAL_SECONDS = 60.0
+
+_last_spill_sweeps: Dict[str, float] = {}
+_spill_sweep_lock = threading.Lock()
+
+
+def sweep_spill_files(
+    spill_dir: Optional[str] = None,
+    max_age_seconds: Optional[int] = None,
+    max_total_bytes: Optional[int] = None,
+    now: Optional[float] = None
+) -> List[str]:
+    """
+    Delete spill files past the retention period or beyond the directory budget.
+
+    Files older than max_age_seconds are removed; if the remaining files
+    still exceed max_total_bytes, the oldest are removed until they fit.
+    Files written within the last SPILL_SWEEP_INTERVAL_SECONDS are never
+    removed for size, as their command may still be running.
+
+    Args:
+        spill_dir: Spill directory (default: CONTAINER_OUTPUT_SPILL_DIR or the temp dir)
+        max_age_seconds: Retention (default: CONTAINER_OUTPUT_SPILL_RETENTION_SECONDS, 24h)
+        max_total_bytes: Directory budget (default: CONTAINER_OUTPUT_SPILL_MAX_BYTES, 1 GiB)
+        now: Time treated as "now" (default: current time)
+
+    Returns:
+        Paths of the deleted files
+    """
+    spill_dir = spill_dir or os.getenv("CONTAINER_OUTPUT_SPILL_DIR") or tempfile.gettempdir()
+    max_age_seconds = max_age_seconds if max_age_seconds is not None else _env_int(
+        "CONTAINER_OUTPUT_SPILL_RETENTION_SECONDS", DEFAULT_SPILL_RETENTION_SECONDS
+    )
+    max_total_bytes = max_total_bytes if max_total_bytes is not None else _env_int(
+        "CONTAINER_OUTPUT_SPILL_MAX_BYTES", DEFAULT_SPILL_MAX_BYTES
+    )
+    now = time.time() if now is None else now
+
+    files = []
+    try:
+        with os.scandir(spill_dir) as entries:
+            for entry in entries:
+                if entry.name.startswith(SPILL_FILE_PREFIX) and entry.name.endswith(SPILL_FILE_SUFFIX):
+                    try:
+                        stat = entry.stat(follow_symlinks=False)
+                    except OSError:
+                        continue
+                    files.append((stat.st_mtime, stat.st_size, entry.path))
+    except OSError:
+        return []
+    files.sort()
+
+    expired = [path for mtime, _, path in files if now - mtime >= max_age_seconds]
+    kept = [(mtime, size, path) for mtime, size, path in files if now - mtime < max_age_seconds]
+    total = sum(size for _, size, _ in kept)
+    oversized = []
+    for mtime, size, path in kept:
+        if total <= max_total_bytes or now - mtime < SPILL_SWEEP_INTERVAL_SECONDS:
+            break
+        oversized.append(path)
+        total -= size
+
+    deleted = []
+    for path in expired + oversized:
+        try:
+            os.remove(path)
+            deleted.append(path)
+        except OSError:
+            pass  # Removed meanwhile
+    return deleted
+
+
+def _sweep_spill_dir_if_due(spill_dir: Optional[str]) -> None:
+    key = spill_dir or ""
+    now = time.monotonic()
+    with _spill_sweep_lock:
+        last = _last_spill_sweeps.get(key)
+        if last is not None and now - last < SPILL_SWEEP_INTERVAL_SECONDS:
+            return
+        _last_spill_sweeps[key] = now
+    deleted = sweep_spill_files(spill_dir)
+    if deleted:
+        get_structured_logger(__name__).info(
+            "Container output spill files swept",
+            spill_dir=spill_dir,
+            deleted_count=len(deleted)
+        )
+
+
+class BoundedOutputCapture:
+    """
+    Bounded capture of one output stream.
+
+    Keeps the first head_bytes and the last tail_bytes of the stream in memory.
+    Once the stream outgrows both, everything written so far and all further
+    output goes to a temp file (spill_path) and `text()` replaces the omitted
+    middle with a truncation marker. Caps default to CONTAINER_OUTPUT_HEAD_BYTES
+    and CONTAINER_OUTPUT_TAIL_BYTES and apply to each stream separately.
+    Starting a spill sweeps expired spill files (see `sweep_spill_files`).
+
+    Args:
+        stream: Stream name (stdout or stderr)
+        head_bytes: Bytes kept from the start of the stream
+        tail_bytes: Bytes kept from the end of the stream
+        spill_dir: Directory for spill files (default: CONTAINER_OUTPUT_SPILL_DIR or the temp dir)
+    """
+
+    DEFAULT_HEAD_BYTES = 64 * 1024
+    DEFAULT_TAIL_BYTES = 192 * 1024
+
+    def __init__(
+        self,
+        stream: str,
+        head_bytes: Optional[int] = None,
+        tail_bytes: Optional[int] = None,
+        spill_dir: Optional[str] = None
+    ):
+        self.stream = stream
+        self.head_bytes, self.tail_bytes = output_limits(head_bytes, tail_bytes)
+        self.spill_dir = spill_dir or os.getenv("CONTAINER_OUTPUT_SPILL_DIR") or None
+        self.total_bytes = 0
+        self.spill_path: Optional[str] = None
+
+        self._head = bytearray()
+        self._tail = bytearray()
+        self._spill = None
+
+    @property
+    def truncated(self) -> bool:
+        """Whether the in-memory text omits part of the stream."""
+        return self.total_bytes > self.head_bytes + self.tail_bytes
+
+    @property
+    def omitted_bytes(self) -> int:
+        """Bytes of the stream missing from the in-memory text."""
+        return max(0, self.total_bytes - self.head_bytes - self.tail_bytes)
+
+    def feed(self, data: bytes) -> None:
+        """Add a chunk of the stream."""
+        if not data:
+            return
+        if self._spill is None and self.total_bytes + len(data) > self.head_bytes + self.tail_bytes:
+            self._start_spill()
+        if self._spill is not None:
+            self._spill.write(data)
+        self.total_bytes += len(data)
+
+        room = self.head_bytes - len(self._head)
+        if room > 0:
+            self._head += data[:room]
+            data = data[room:]
+        if data and self.tail_bytes:
+            self._tail += data[-self.tail_bytes:]
+            if len(self._tail) > self.tail_bytes:
+                del self._tail[:len(self._tail) - self.tail_bytes]
+
+    def close(self) -> None:
+        """Close the spill file, if any."""
+        if self._spill is not None:
+            self._spill.close()
+            self._spill = None
+
+    def marker(self) -> str:
+        """Truncation marker describing the omitted part, empty if nothing was omitted."""
+        if not self.truncated:
+            return ""
+        where = f"; full output in {self.spill_path}" if self.spill_path else ""
+        return (
+            f"... [{self.stream} truncated: {self.omitted_bytes} of {self.total_bytes} bytes omitted{where}] ..."
+        )
+
+    def text(self) -> str:
+        """The captured stream, with a truncation marker in place of the omitted middle."""
+        if not self.truncated:
+            return (bytes(self._head) + bytes(self._tail)).decode('utf-8', errors='replace')
+        return "{}\n{}\n{}".format(
+            bytes(self._head).decode('utf-8', errors='replace'),
+            self.marker(),
+            bytes(self._tail).decode('utf-8', errors='replace')
+        )
+
+    def _start_spill(self) -> None:
+        _sweep_spill_dir_if_due(self.spill_dir)
+        try:
+            self._spill = tempfile.NamedTemporaryFile(
+                mode="wb",
+                prefix=f"{SPILL_FILE_PREFIX}{self.stream}-",
+                suffix=SPILL_FILE_SUFFIX,
+                dir=self.spill_dir,
+                delete=False
+            )
+        except OSError:
+            # Keep the bounded capture without the full copy
+            return
+        self.spill_path = self._spill.name
+        self._spill.write(bytes(self._head))
+        self._spill.write(bytes(self._tail))
+
+
+class CommandCancelled(BaseException):
+    """
+    Raised in the thread running a container command once it is cancelled.
+
+    Like asyncio.CancelledError it derives from BaseException, so handlers
+    catching Exception (retry loops, error wrapping) let it through.
+    """
+
+
+class CommandCancellation:
+    """
+    Cancellation token shared by an awaiting coroutine and the worker thread
+    running container commands for it.
+
+    Commands started through `stream_exec` while the token is the current one
+    (see `cancellation_scope`) register their container and PID file; `cancel`
+    signals them with SIGTERM. Signalling is best effort: the shell and its
+    direct children are terminated. Other runners of container commands (the
+    container agent) register a callback with `on_cancel` instead.
+    """
+
+    PID_DIR = "/tmp"
+
+    def __init__(self):
+        self.logger = get_structured_logger(__name__)
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._running: Dict[str, Tuple[object, str]] = {}
+        self._callbacks: Dict[str, Callable[[], None]] = {}
+
+    @property
+    def cancelled(self) -> bool:
+        """Whether cancel() was called."""
+        return self._event.is_set()
+
+    def check(self) -> None:
+        """Raise CommandCancelled if cancelled."""
+        if self._event.is_set():
+            raise CommandCancelled("Container command cancelled")
+
+    def cancel(self) -> None:
+        """Cancel: stop starting commands and terminate the running ones."""
+        self._event.set()
+        with self._lock:
+            running = list(self._running.values())
+            callbacks = list(self._callbacks.values())
+        for container, pid_file in running:
+            self._terminate(container, pid_file)
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                self.logger.warn("Failed to cancel container command", error=str(e))
+
+    def wrap(self, container, command: str) -> Tuple[str, List[str]]:
+        """Register a command about to start; returns its key and the PID-recording command."""
+        key = uuid.uuid4().hex
+        pid_file = f"{self.PID_DIR}/clarity-exec-{key}.pid"
+        with self._lock:
+            self._running[key] = (container, pid_file)
+        return key, ["sh", "-c", f"echo $$ > {pid_file}; {command}"]
+
+    def on_cancel(self, callback: Callable[[], None]) -> str:
+        """Register a callback terminating a running command on cancel; returns its key."""
+        key = uuid.uuid4().hex
+        with self._lock:
+            self._callbacks[key] = callback
+        return key
+
+    def unregister(self, key: str) -> None:
+        """Forget a finished command and remove its PID file."""
+        with self._lock:
+            self._callbacks.pop(key, None)
+            container, pid_file = self._running.pop(key, (None, None))
+        if container is not None:
+            try:
+                container.exec_run(["rm", "-f", pid_file])
+            except Exception:
+                pass  # Non-critical
+
+    def _terminate(self, container, pid_file: str) -> None:
+        try:
+            container.exec_run([
+                "sh", "-c",
+                f"pid=$(cat {pid_file} 2>/dev/null) && [ -n \"$pid\" ] && "
+                f"(pkill -TERM -P \"$pid\" 2>/dev/null; kill -TERM \"$pid\")"
+            ])
+        except Exception as e:
+            self.logger.warn(
+                "Failed to signal cancelled container command",
+                container_id=getattr(container, "id", None),
+                pid_file=pid_file,
+                error=str(e)
+            )
+
+
+_current_cancellation: "contextvars.ContextVar[Optional[CommandCancellation]]" = contextvars.ContextVar(
+    "command_cancellation", default=None
+)
+
+
+@contextmanager
+def cancellation_scope(cancellation: CommandCancellation) -> Iterator[CommandCancellation]:
+    """Make a cancellation token current for the container commands run inside the block."""
+    token = _current_cancellation.set(cancellation)
+    try:
+        yield cancellation
+    finally:
+        _current_cancellation.reset(token)
+
+
+def current_cancellation() -> Optional[CommandCancellation]:
+    """The cancellation token current in this context, if any."""
+    return _current_cancellation.get()
+
+
+def check_cancelled() -> None:
+    """Raise CommandCancelled if the current cancellation token was cancelled."""
+    cancellation = _current_cancellation.get()
+    if cancellation is not None:
+        cancellation.check()
+
+
+def stream_exec(
+    container,
+    command: str,
+    on_line: Optional[LineHandler] = None,
+    head_bytes: Optional[int] = None,
+    tail_bytes: Optional[int] = None
+) -> Tuple[int, BoundedOutputCapture, BoundedOutputCapture]:
+    """
+    Run a command in a container, handing out its output lines as they arrive.
+
+    Docker containers are read through the low-level exec API in stream/demux
+    mode. Other container objects (test doubles) run through `exec_run`; their
+    output is split once the command has finished and captured as stdout.
+    
+    Inside a cancellation scope the command is not started once cancelled,
+    Docker commands can be signalled while running, and CommandCancelled is
+    raised after a cancelled command ends.
+
+    Args:
+        container: Docker container instance
+        command: Command to execute
+        on_line: Optional handler called with (stream, line) per output line
+        head_bytes: Optional per-stream head cap of the captures
+        tail_bytes: Optional per-stream tail cap of the captures
+
+    Returns:
+        (exit code, stdout capture, stderr capture)
+    
+    Raises:
+        CommandCancelled: If the current cancellation token was cancelled
+    """
+    cancellation = _current_cancellation.get()
+    if cancellation is not None:
+        cancellation.check()
+    captures = {
+        stream: BoundedOutputCapture(stream, head_bytes=head_bytes, tail_bytes=tail_bytes)
+        for stream in (STDOUT, STDERR)
+    }
+    handler = on_line or (lambda stream, line: None)
+    splitters = {stream: OutputLineSplitter(stream, handler) for stream in (STDOUT, STDERR)}
+    running_key = None
+
+    try:
+        if not isinstance(container, Container):
+            exit_code, output = container.exec_run(command)
+            data = output if isinstance(output, bytes) else str(output).encode('utf-8')
+            captures[STDOUT].feed(data)
+            splitters[STDOUT].feed(data)
+        else:
+            api = container.client.api
+            exec_command = command
+            if cancellation is not None:
+                running_key, exec_command = cancellation.wrap(container, command)
+            exec_id = api.exec_create(container.id, exec_command, stdout=True, stderr=True)["Id"]
+            for stdout_chunk, stderr_chunk in api.exec_start(exec_id, stream=True, demux=True):
+                if stdout_chunk:
+                    captures[STDOUT].feed(stdout_chunk)
+                    splitters[STDOUT].feed(stdout_chunk)
+                if stderr_chunk:
+                    captures[STDERR].feed(stderr_chunk)
+                    splitters[STDERR].feed(stderr_chunk)
+            exit_code = api.exec_inspect(exec_id).get("ExitCode")
+        for splitter in splitters.values():
+            splitter.close()
+    finally:
+        for capture in captures.values():
+            capture.close()
+        if running_key is not None:
+            cancellation.unregister(running_key)
+
+    if cancellation is not None:
+        cancellation.check()
+    return exit_code, captures[STDOUT], captures[STDERR]
+
+
+class ExecutionLogForwarder:
+    """
+    Background forwarder of output lines to execution logs.
+
+    `submit` is called from the thread reading the command output; a sender
+    thread with its own event loop broadcasts the lines in order through a
+    batching ExecutionLogService. Use as a context manager around the command.
+
+    Args:
+        project_id: Project identifier for routing messages
+        execution_id: Unique execution identifier
+        operation: Operation name attached to every line (aider, npm_ci, ...)
+        correlation_id: Optional correlation ID for distributed tracing
+    """
+
+    # Lines waiting for the sender before the reader blocks
+    MAX_PENDING_LINES = 1000
+    # How long the reader blocks on a full queue before dropping a line
+    PUT_TIMEOUT_SECONDS = 5.0
+    # How long closing waits for the sender to drain the queue
+    CLOSE_TIMEOUT_SECONDS = 10.0
+    # Lines per execution-log frame and longest wait for a frame to fill
+    BATCH_SIZE = 50
+    BATCH_INTERVAL_MS = 100.0
+
+    _CLOSE = object()
+
+    def __init__(
+        self,
+        project_id: str,
+        execution_id: str,
+        operation: str,
+        correlation_id: Optional[str] = None
+    ):
+        self.logger = get_structured_logger(__name__)
+        self.project_id = project_id
+        self.execution_id = execution_id
+        self.operation = operation
+        self.correlation_id = correlation_id
+        self.log_service = get_execution_log_service(
+            correlation_id, batch_size=self.BATCH_SIZE, batch_interval_ms=self.BATCH_INTERVAL_MS
+        )
+
+        self.lines_submitted = 0
+        self.lines_dropped = 0
+        self._queue: "queue.Queue" = queue.Queue(maxsize=self.MAX_PENDING_LINES)
+        self._thread: Optional[threading.Thread] = None
+
+    def __enter__(self) -> "ExecutionLogForwarder":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def start(self) -> None:
+        """Start the sender thread."""
+        self._thread = threading.Thread(
+            target=self._run, name=f"execution-log-forwarder-{self.execution_id}", daemon=True
+        )
+        self._thread.start()
+
+    def submit(self, stream: str, line: str) -> None:
+        """Queue a line, blocking while the sender is behind."""
+        self.lines_submitted += 1
+        try:
+            self._queue.put((stream, self.lines_submitted, line), timeout=self.PUT_TIMEOUT_SECONDS)
+        except queue.Full:
+            self.lines_dropped += 1
+
+    def close(self) -> None:
+        """Wait for queued lines to be sent and stop the sender."""
+        if self._thread is None:
+            return
+        try:
+            self._queue.put(self._CLOSE, timeout=self.CLOSE_TIMEOUT_SECONDS)
+        except queue.Full:
+            pass
+        self._thread.join(self.CLOSE_TIMEOUT_SECONDS)
+        self._thread = None
+
+        if self.lines_dropped:
+            self.logger.warn(
+                "Execution log stream fell behind, lines dropped",
+                correlation_id=self.correlation_id,
+                project_id=self.project_id,
+                execution_id=self.execution_id,
+                operation=self.operation,
+                lines_submitted=self.lines_submitted,
+                lines_dropped=self.lines_dropped
+            )
+
+    def _run(self) -> None:
+        asyncio.run(self._send_lines())
+
+    async def _send_lines(self) -> None:
+        try:
+            while True:
+                # Waiting off-loop keeps batch flush timers running
+                item = await asyncio.to_thread(self._queue.get)
+                if item is self._CLOSE:
+                    break
+                stream, line_number, line = item
+                await self.log_service.send_operation_log(
+                    project_id=self.project_id,
+                    execution_id=self.execution_id,
+                    operation=self.operation,
+                    message=line,
+                    level=LogLevel.INFO,
+                    additional_data={"stream": stream, "line_number": line_number}
+                )
+        finally:
+            await self.log_service.flush()
@@ -0,0 +1,323 @@
+"""
+Event Archive Service Module for Clarity Local Runner
+
+This module provides retention management for the time-partitioned events table:
+- Rolling creation of upcoming monthly `events` partitions
+- Moving finished events past the retention window into `events_archive`
+- Dropping monthly partitions that have been fully drained
+- Structured logging with correlationId propagation
+
+Primary Responsibility: Events table partition and archive lifecycle management
+"""
+
+import os
+import re
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import bindparam, text
+from sqlalchemy.orm import Session
+
+from core.structured_logging import get_structured_logger, LogStatus, log_performance
+from core.exceptions import RepositoryError
+
+
+class EventArchiveService:
+    """
+    Retention manager for the partitioned events table.
+
+    Finished events (terminal metadata status) older than the retention window
+    are moved to `events_archive` in batches with a single DELETE ... RETURNING
+    statement per batch, so rows are never lost between the two tables. Rows
+    already archived by an earlier, partially failed run are overwritten
+    rather than skipped.
+    Monthly partitions that end before the retention cutoff and no longer hold
+    any rows are detached and dropped.
+    """
+
+    # Retention configuration
+    ARCHIVE_AFTER_DAYS = int(os.getenv("EVENT_ARCHIVE_AFTER_DAYS", "30"))
+    PARTITION_MONTHS_AHEAD = int(os.getenv("EVENT_PARTITION_MONTHS_AHEAD", "2"))
+    ARCHIVE_BATCH_SIZE = 500
+    TERMINAL_STATUSES = ("completed", "error", "stopped")
+
+    PARTITION_NAME_PATTERN = re.compile(r"^events_y(\d{4})m(\d{2})$")
+
+    def __init__(self, session: Session, correlation_id: Optional[str] = None):
+        """
+        Initialize event archive service.
+
+        Args:
+            session: Database session for operations
+            correlation_id: Optional correlation ID for distributed tracing
+        """
+        self.session = session
+        self.logger = get_structured_logger(__name__)
+        self.correlation_id = correlation_id or f"eas_{int(time.time() * 1000)}"
+
+        # Set persistent context for logging
+        self.logger.set_context(correlationId=self.correlation_id)
+
+    @staticmethod
+    def month_start(value: datetime) -> datetime:
+        """Return the first instant of the month containing value."""
+        return datetime(value.year, value.month, 1)
+
+    @staticmethod
+    def add_months(value: datetime, months: int) -> datetime:
+        """Return the first day of the month `months` after value's month."""
+        month_index = value.month - 1 + months
+        return datetime(value.year + month_index // 12, month_index % 12 + 1, 1)
+
+    @classmethod
+    def partition_name(cls, month_start: datetime) -> str:
+        """Return the partition table name for a month (e.g. events_y2025m01)."""
+        return f"events_y{month_start.year:04d}m{month_start.month:02d}"
+
+    def ensure_partitions(
+        self,
+        months_ahead: Optional[int] = None,
+        reference_time: Optional[datetime] = None
+    ) -> List[str]:
+        """
+        Create monthly partitions from the current month through months_ahead.
+
+        Args:
+            months_ahead: Number of future months to cover (default: PARTITION_MONTHS_AHEAD)
+            reference_time: Time treated as "now" (default: current time)
+
+        Returns:
+            Names of the partitions covering the window
+
+        Raises:
+            RepositoryError: If partition creation fails
+        """
+        months_ahead = self.PARTITION_MONTHS_AHEAD if months_ahead is None else months_ahead
+        current_month = self.month_start(reference_time or datetime.now())
+
+        partitions = []
+        try:
+            for offset in range(months_ahead + 1):
+                month = self.add_months(current_month, offset)
+                next_month = self.add_months(month, 1)
+                name = self.partition_name(month)
+                self.session.execute(text(
+                    f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF events "
+                    f"FOR VALUES FROM ('{month:%Y-%m-%d}') TO ('{next_month:%Y-%m-%d}')"
+                ))
+                partitions.append(name)
+            self.session.commit()
+        except Exception as e:
+            self.session.rollback()
+            self.logger.error(
+                "Failed to ensure events partitions",
+                correlation_id=self.correlation_id,
+                status=LogStatus.FAILED,
+                months_ahead=months_ahead,
+                error=e
+            )
+            raise RepositoryError(f"Failed to ensure events partitions: {str(e)}")
+
+        self.logger.info(
+            "Events partitions ensured",
+            correlation_id=self.correlation_id,
+            status=LogStatus.COMPLETED,
+            partitions=partitions
+        )
+        return partitions
+
+    def archive_finished_events(
+        self,
+        older_than_days: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        reference_time: Optional[datetime] = None
+    ) -> int:
+        """
+        Move finished events created before the retention cutoff to events_archive.
+
+        Args:
+            older_than_days: Retention window in days (default: ARCHIVE_AFTER_DAYS)
+            batch_size: Rows moved per statement (default: ARCHIVE_BATCH_SIZE)
+            reference_time: Time treated as "now" (default: current time)
+
+        Returns:
+            Number of events archived
+
+        Raises:
+            RepositoryError: If the archive operation fails
+        """
+        older_than_days = self.ARCHIVE_AFTER_DAYS if older_than_days is None else older_than_days
+        batch_size = batch_size or self.ARCHIVE_BATCH_SIZE
+        cutoff = (reference_time or datetime.now()) - timedelta(days=older_than_days)
+
+        statement = text(
+            """
+            WITH moved AS (
+                DELETE FROM events
+                WHERE (id, created_at) IN (
+                    SELECT id, created_at FROM events
+                    WHERE created_at < :cutoff
+                      AND (task_context -> 'metadata' ->> 'status') IN :statuses
+                    LIMIT :batch_size
+                )
+                RETURNING id, workflow_type, data, task_context, created_at, updated_at
+            ), archived AS (
+                INSERT INTO events_archive (id, workflow_type, data, task_context, created_at, updated_at, archived_at)
+                SELECT id, workflow_type, data, task_context, created_at, updated_at, now() FROM moved
+                ON CONFLICT (id) DO UPDATE SET
+                    workflow_type = EXCLUDED.workflow_type,
+                    data = EXCLUDED.data,
+                    task_context = EXCLUDED.task_context,
+                    created_at = EXCLUDED.created_at,
+                    updated_at = EXCLUDED.updated_at,
+                    archived_at = EXCLUDED.archived_at
+            )
+            SELECT count(*) FROM moved
+            """
+        ).bindparams(bindparam("statuses", expanding=True))
+
+        start_time = time.time()
+        archived = 0
+        try:
+            while True:
+                result = self.session.execute(statement, {
+                    "cutoff": cutoff,
+                    "statuses": self.TERMINAL_STATUSES,
+                    "batch_size": batch_size
+                })
+                self.session.commit()
+                # Deleted rows, each of which landed in the archive
+                moved = result.scalar() or 0
+                archived += moved
+                if moved < batch_size:
+                    break
+        except Exception as e:
+            self.session.rollback()
+            self.logger.error(
+                "Failed to archive finished events",
+                correlation_id=self.correlation_id,
+                status=LogStatus.FAILED,
+                archived_count=archived,
+                cutoff=cutoff.isoformat(),
+                error=e
+            )
+            raise RepositoryError(f"Failed to archive finished events: {str(e)}")
+
+        self.logger.info(
+            "Finished events archived",
+            correlation_id=self.correlation_id,
+            status=LogStatus.COMPLETED,
+            archived_count=archived,
+            cutoff=cutoff.isoformat(),
+            duration_ms=round((time.time() - start_time) * 1000, 2)
+        )
+        return archived
+
+    def drop_drained_partitions(
+        self,
+        older_than_days: Optional[int] = None,
+        reference_time: Optional[datetime] = None
+    ) -> List[str]:
+        """
+        Detach and drop monthly partitions that ended before the cutoff and are empty.
+
+        Partitions still holding unfinished events are kept so that no data
+        is dropped; they are retried on the next retention run.
+
+        Args:
+            older_than_days: Retention window in days (default: ARCHIVE_AFTER_DAYS)
+            reference_time: Time treated as "now" (default: current time)
+
+        Returns:
+            Names of the dropped partitions
+
+        Raises:
+            RepositoryError: If partition inspection or removal fails
+        """
+        older_than_days = self.ARCHIVE_AFTER_DAYS if older_than_days is None else older_than_days
+        cutoff = (reference_time or datetime.now()) - timedelta(days=older_than_days)
+
+        dropped = []
+        try:
+            partition_names = self.session.execute(text(
+                """
+                SELECT child.relname
+                FROM pg_inherits
+                JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+                JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+                WHERE parent.relname = 'events'
+                """
+            )).scalars().all()
+
+            for name in sorted(partition_names):
+                match = self.PARTITION_NAME_PATTERN.match(name)
+                if not match:
+                    # Leaves the DEFAULT partition and any manually created tables alone
+                    continue
+                month = datetime(int(match.group(1)), int(match.group(2)), 1)
+                if self.add_months(month, 1) > cutoff:
+                    continue
+                has_rows = self.session.execute(text(f"SELECT 1 FROM {name} LIMIT 1")).first()
+                if has_rows:
+                    continue
+                self.session.execute(text(f"ALTER TABLE events DETACH PARTITION {name}"))
+                self.session.execute(text(f"DROP TABLE {name}"))
+                dropped.append(name)
+            self.session.commit()
+        except Exception as e:
+            self.session.rollback()
+            self.logger.error(
+                "Failed to drop drained events partitions",
+                correlation_id=self.correlation_id,
+                status=LogStatus.FAILED,
+                error=e
+            )
+            raise RepositoryError(f"Failed to drop drained events partitions: {str(e)}")
+
+        if dropped:
+            self.logger.info(
+                "Drained events partitions dropped",
+                correlation_id=self.correlation_id,
+                status=LogStatus.COMPLETED,
+                partitions=dropped
+            )
+        return dropped
+
+    @log_performance(get_structured_logger(__name__), "run_event_retention")
+    def run_retention(self, reference_time: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        Run the full retention cycle: ensure partitions, archive, drop drained partitions.
+
+        Args:
+            reference_time: Time treated as "now" (default: current time)
+
+        Returns:
+            Summary of the retention run
+        """
+        partitions = self.ensure_partitions(reference_time=reference_time)
+        archived = self.archive_finished_events(reference_time=reference_time)
+        dropped = self.drop_drained_partitions(reference_time=reference_time)
+
+        return {
+            "partitions_ensured": partitions,
+            "archived_events": archived,
+            "dropped_partitions": dropped
+        }
+
+
+def get_event_archive_service(
+    session: Session,
+    correlation_id: Optional[str] = None
+) -> EventArchiveService:
+    """
+    Factory function to get an event archive service instance.
+
+    Args:
+        session: Database session for operations
+        correlation_id: Optional correlation ID for distributed tracing
+
+    Returns:
+        EventArchiveService instance
+    """
+    return EventArchiveService(session=session, correlation_id=correlation_id)
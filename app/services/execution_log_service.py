@@ -5,17 +5,36 @@ This module provides real-time execution log broadcasting via WebSocket connecti
 It captures structured log entries from workflow execution and sends execution-log frames 
 with ≤500ms latency to connected clients following the established message envelope format.
 
+Every entry is also appended to the durable ExecutionLogStore, which stamps
+it with its per-execution `log_seq`, so clients joining late can read the log
+so far and continue from the live frames.
+
+Entries can optionally be micro-batched: entries of one (project, execution)
+are accumulated and broadcast as a single execution-log frame carrying an
+`entries` array once batch_size entries are pending or batch_interval_ms has
+passed since the first one, whichever comes first. A batch is split into runs
+of consecutive entries of the same level, one frame each, so minimum log level
+subscriptions filter batched entries as they do single ones.
+
 Primary Responsibility: Real-time execution log broadcasting with performance optimization
 """
 
 import asyncio
+import itertools
 import time
 from datetime import datetime
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
 from enum import Enum
 
 from core.structured_logging import get_structured_logger, LogStatus, LogLevel
-from schemas.websocket_envelope import create_execution_log_envelope
+from core.websocket_subscriptions import LOG_LEVEL_RANKS
+from schemas.websocket_envelope import (
+    MessageType,
+    build_envelope,
+    build_execution_log_batch_envelope,
+    build_execution_log_entry
+)
+from services.execution_log_store import ExecutionLogStore, get_execution_log_store
 from api.v1.endpoints.websocket import broadcast_to_project
 
 
@@ -35,6 +54,11 @@ class LogEntryType(Enum):
     ERROR_LOG = "error_log"
 
 
+def _level_rank(entry: Dict[str, Any]) -> int:
+    """Rank of an entry's level as used by log level filters (unknown levels rank highest)."""
+    return LOG_LEVEL_RANKS.get(str(entry["level"]).upper(), max(LOG_LEVEL_RANKS.values()))
+
+
 class ExecutionLogService:
     """
     Service for broadcasting real-time execution logs via WebSocket.
@@ -43,17 +67,43 @@ class ExecutionLogService:
     execution-log messages to connected WebSocket clients with ≤500ms latency.
     It integrates with the existing WebSocket infrastructure and follows the
     established message envelope format.
+    
+    Batching is opt-in (batch_size > 1). Batches are flushed from the event
+    loop of the sending code, so callers must await flush() before that loop
+    ends; entries still pending then would otherwise be lost.
     """
     
-    def __init__(self, correlation_id: Optional[str] = None):
+    DEFAULT_BATCH_INTERVAL_MS = 100.0
+    
+    def __init__(
+        self,
+        correlation_id: Optional[str] = None,
+        batch_size: int = 1,
+        batch_interval_ms: Optional[float] = None,
+        log_store: Optional[ExecutionLogStore] = None
+    ):
         """
         Initialize execution log service.
         
         Args:
             correlation_id: Optional correlation ID for distributed tracing
+            batch_size: Entries per batched frame; 1 sends one frame per entry
+            batch_interval_ms: Longest time an entry waits for its batch to fill
+            log_store: Durable log store (default: the process-wide store)
         """
         self.logger = get_structured_logger(__name__)
         self.correlation_id = correlation_id
+        self.log_store = log_store or get_execution_log_store()
+        self.batch_size = max(1, batch_size)
+        self.batch_interval_ms = (
+            batch_interval_ms if batch_interval_ms is not None else self.DEFAULT_BATCH_INTERVAL_MS
+        )
+        
+        # Pending entries and flush timers per (project_id, execution_id)
+        self._batches: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+        self._flush_timers: Dict[Tuple[str, str], asyncio.Task] = {}
+        # Batches are broadcast one at a time, keeping their order
+        self._flush_lock: Optional[asyncio.Lock] = None
         
         # Set persistent context for logging
         if correlation_id:
@@ -109,9 +159,7 @@ class ExecutionLogService:
                 status=LogStatus.STARTED
             )
             
-            # Build execution-log message using standardized envelope utility
-            execution_log_message = create_execution_log_envelope(
-                project_id=project_id,
+            entry = build_execution_log_entry(
                 execution_id=execution_id,
                 log_entry_type=log_entry_type.value,
                 level=level.value,
@@ -121,6 +169,14 @@ class ExecutionLogService:
                 additional_data=additional_data
             )
             
+            if self.batch_size > 1:
+                await self._add_to_batch(project_id, execution_id, entry)
+                return
+            
+            # Build execution-log message with the trusted pre-serialized envelope builder
+            self._store_entries(project_id, execution_id, [entry])
+            execution_log_message = build_envelope(MessageType.EXECUTION_LOG, project_id, entry)
+            
             # Broadcast to all WebSocket connections for this project
             await broadcast_to_project(execution_log_message, project_id)
             
@@ -166,6 +222,100 @@ class ExecutionLogService:
                 exc_info=True
             )
     
+    async def flush(self) -> None:
+        """Broadcast every pending batch."""
+        for key in list(self._batches):
+            self._cancel_flush_timer(key)
+            await self._flush_batch(key)
+    
+    def close_execution_log(self, project_id: str, execution_id: str) -> None:
+        """Close the stored log of a finished execution, compressing its last segment."""
+        try:
+            self.log_store.close_execution(project_id, execution_id)
+        except Exception as e:
+            self.logger.warn(
+                "Failed to close stored execution log",
+                correlation_id=self.correlation_id,
+                project_id=project_id,
+                execution_id=execution_id,
+                error_message=str(e)
+            )
+    
+    def _store_entries(self, project_id: str, execution_id: str, entries: List[Dict[str, Any]]) -> None:
+        # Storage failures never hold back the live frames
+        try:
+            self.log_store.append(project_id, execution_id, entries)
+        except Exception as e:
+            self.logger.warn(
+                "Failed to store execution log entries",
+                correlation_id=self.correlation_id,
+                project_id=project_id,
+                execution_id=execution_id,
+                entry_count=len(entries),
+                error_message=str(e)
+            )
+    
+    async def _add_to_batch(self, project_id: str, execution_id: str, entry: Dict[str, Any]) -> None:
+        key = (project_id, execution_id)
+        batch = self._batches.setdefault(key, [])
+        batch.append(entry)
+        
+        if len(batch) >= self.batch_size:
+            self._cancel_flush_timer(key)
+            await self._flush_batch(key)
+        elif key not in self._flush_timers:
+            self._flush_timers[key] = asyncio.create_task(self._flush_later(key))
+    
+    async def _flush_later(self, key: Tuple[str, str]) -> None:
+        await asyncio.sleep(self.batch_interval_ms / 1000)
+        # Unregistered before flushing, so the flush itself is never cancelled
+        self._flush_timers.pop(key, None)
+        await self._flush_batch(key)
+    
+    def _cancel_flush_timer(self, key: Tuple[str, str]) -> None:
+        timer = self._flush_timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+    
+    async def _flush_batch(self, key: Tuple[str, str]) -> None:
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+        async with self._flush_lock:
+            entries = self._batches.pop(key, None)
+            if not entries:
+                return
+            
+            project_id, execution_id = key
+            start_time = time.time()
+            try:
+                self._store_entries(project_id, execution_id, entries)
+                for _, run in itertools.groupby(entries, key=_level_rank):
+                    run = list(run)
+                    await broadcast_to_project(
+                        build_execution_log_batch_envelope(project_id, execution_id, run, run[0]["level"]),
+                        project_id
+                    )
+                self.logger.debug(
+                    "Execution log batch sent successfully",
+                    correlation_id=self.correlation_id,
+                    project_id=project_id,
+                    execution_id=execution_id,
+                    entry_count=len(entries),
+                    status=LogStatus.COMPLETED,
+                    duration_ms=round((time.time() - start_time) * 1000, 2)
+                )
+            except Exception as e:
+                self.logger.error(
+                    "Failed to send execution log batch",
+                    correlation_id=self.correlation_id,
+                    project_id=project_id,
+                    execution_id=execution_id,
+                    entry_count=len(entries),
+                    status=LogStatus.FAILED,
+                    error_message=str(e),
+                    exc_info=True
+                )
+    
     async def send_task_receipt_log(
         self,
         project_id: str,
@@ -346,6 +496,8 @@ class ExecutionLogService:
             task_id=task_id,
             additional_data=additional_data
         )
+        await self.flush()
+        self.close_execution_log(project_id, execution_id)
     
     async def send_workflow_error_log(
         self,
@@ -377,6 +529,8 @@ class ExecutionLogService:
                 "error_message": error_message
             }
         )
+        await self.flush()
+        self.close_execution_log(project_id, execution_id)
     
     async def send_operation_log(
         self,
@@ -418,17 +572,27 @@ class ExecutionLogService:
         )
 
 
-def get_execution_log_service(correlation_id: Optional[str] = None) -> ExecutionLogService:
+def get_execution_log_service(
+    correlation_id: Optional[str] = None,
+    batch_size: int = 1,
+    batch_interval_ms: Optional[float] = None
+) -> ExecutionLogService:
     """
     Factory function to get an execution log service instance.
     
     Args:
         correlation_id: Optional correlation ID for distributed tracing
+        batch_size: Entries per batched frame; 1 (default) disables batching
+        batch_interval_ms: Longest time an entry waits for its batch to fill
         
     Returns:
         ExecutionLogService instance
     """
-    return ExecutionLogService(correlation_id=correlation_id)
+    return ExecutionLogService(
+        correlation_id=correlation_id,
+        batch_size=batch_size,
+        batch_interval_ms=batch_interval_ms
+    )
 
 
 # Utility function for easy integration
@@ -0,0 +1,361 @@
+"""
+Execution Log Store Module for Clarity Local Runner
+
+This module keeps a durable, append-only copy of every execution-log entry so
+clients joining late can read what already happened:
+- One directory per execution holding NDJSON segment files, one entry per line
+- Per-execution sequence numbers (`log_seq`) stamped on every entry
+- Rotation of the active segment at EXECUTION_LOG_SEGMENT_BYTES; closed
+  segments are gzip-compressed and listed in the execution's index.json
+- Streaming reads of a byte range of the uncompressed log (all segments
+  concatenated) or of a log_seq range, in bounded chunks
+
+Entries of one execution are expected to be written by one process (the
+worker running it); any process can read. Segments live under
+EXECUTION_LOG_DIR, which API and worker containers must share. Project IDs
+may contain slashes (`customer-123/project-abc`); their directory name is
+the percent-encoded ID, so each project is one directory level.
+
+Primary Responsibility: Durable execution log storage with range reads
+"""
+
+import gzip
+import json
+import os
+import re
+import shutil
+import tempfile
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import quote
+
+from core.structured_logging import get_structured_logger
+
+
+SAFE_ID_PATTERN = re.compile(r"^[A-Za-z0-9_.-]+$")
+PROJECT_ID_PATTERN = re.compile(r"^[A-Za-z0-9_./-]+$")
+
+
+class ExecutionLogNotFound(Exception):
+    """Raised when an execution has no stored log."""
+
+
+@dataclass
+class _Segment:
+    """A segment of an execution log; size is uncompressed."""
+    file: str
+    first_seq: int
+    last_seq: Optional[int] = None
+    size: Optional[int] = None
+
+
+@dataclass
+class _ExecutionLog:
+    """Writer state of an execution log."""
+    directory: Path
+    closed: List[_Segment] = field(default_factory=list)
+    active: Optional[_Segment] = None
+    active_size: int = 0
+    next_seq: int = 1
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(1, int(os.getenv(name, default)))
+    except ValueError:
+        return default
+
+
+def _safe_id(value: str, name: str) -> str:
+    if not value or value in (".", "..") or not SAFE_ID_PATTERN.match(value):
+        raise ValueError(f"Invalid {name} for execution log: {value!r}")
+    return value
+
+
+def _project_dir_name(project_id: str) -> str:
+    """Directory name of a project: the ID with slashes percent-encoded."""
+    if not project_id or project_id in (".", "..") or not PROJECT_ID_PATTERN.match(project_id):
+        raise ValueError(f"Invalid project_id for execution log: {project_id!r}")
+    return quote(project_id, safe="")
+
+
+def _segment_name(first_seq: int) -> str:
+    return f"segment-{first_seq:012d}.jsonl"
+
+
+class ExecutionLogStore:
+    """
+    Append-only execution log store on local disk.
+
+    Args:
+        root: Directory holding the logs (default: EXECUTION_LOG_DIR)
+        segment_bytes: Size at which the active segment is closed
+        read_chunk_bytes: Size of the chunks yielded by byte range reads
+    """
+
+    DEFAULT_SEGMENT_BYTES = 1024 * 1024
+    DEFAULT_READ_CHUNK_BYTES = 64 * 1024
+    COMPRESSION_LEVEL = 6
+    INDEX_FILE = "index.json"
+
+    def __init__(
+        self,
+        root: Optional[str] = None,
+        segment_bytes: Optional[int] = None,
+        read_chunk_bytes: Optional[int] = None
+    ):
+        self.logger = get_structured_logger(__name__)
+        self.root = Path(root or os.getenv(
+            "EXECUTION_LOG_DIR", os.path.join(tempfile.gettempdir(), "clarity-execution-logs")
+        ))
+        self.segment_bytes = segment_bytes or _env_int("EXECUTION_LOG_SEGMENT_BYTES", self.DEFAULT_SEGMENT_BYTES)
+        self.read_chunk_bytes = read_chunk_bytes or self.DEFAULT_READ_CHUNK_BYTES
+
+        self._lock = threading.Lock()
+        self._logs: Dict[Tuple[str, str], _ExecutionLog] = {}
+
+    # Writing
+
+    def append(self, project_id: str, execution_id: str, entries: List[Dict[str, Any]]) -> None:
+        """
+        Append entries in order, stamping each with its `log_seq`.
+
+        Args:
+            project_id: Project identifier
+            execution_id: Execution identifier
+            entries: JSON-serializable execution-log entries (modified in place)
+        """
+        if not entries:
+            return
+        with self._lock:
+            log = self._writer_state(project_id, execution_id)
+            if log.active is None:
+                self._open_segment(log)
+
+            lines = []
+            for entry in entries:
+                entry["log_seq"] = log.next_seq
+                log.next_seq += 1
+                lines.append(json.dumps(entry, default=str) + "\n")
+            data = "".join(lines).encode("utf-8")
+
+            with open(log.directory / log.active.file, "ab") as segment:
+                segment.write(data)
+            log.active_size += len(data)
+            log.active.last_seq = log.next_seq - 1
+
+            if log.active_size >= self.segment_bytes:
+                self._close_segment(log)
+
+    def close_execution(self, project_id: str, execution_id: str) -> None:
+        """Compress the active segment of a finished execution and drop its writer state."""
+        with self._lock:
+            key = (_project_dir_name(project_id), _safe_id(execution_id, "execution_id"))
+            log = self._logs.pop(key, None)
+            if log is None:
+                directory = self.root / key[0] / key[1]
+                if not directory.is_dir():
+                    return
+                log = self._load(directory)
+            if log.active is not None:
+                self._close_segment(log)
+
+    def _writer_state(self, project_id: str, execution_id: str) -> _ExecutionLog:
+        key = (_project_dir_name(project_id), _safe_id(execution_id, "execution_id"))
+        log = self._logs.get(key)
+        if log is None:
+            directory = self.root / key[0] / key[1]
+            directory.mkdir(parents=True, exist_ok=True)
+            log = self._logs[key] = self._load(directory)
+        return log
+
+    def _open_segment(self, log: _ExecutionLog) -> None:
+        log.active = _Segment(file=_segment_name(log.next_seq), first_seq=log.next_seq)
+        log.active_size = 0
+        self._write_index(log)
+
+    def _close_segment(self, log: _ExecutionLog) -> None:
+        segment = log.active
+        source = log.directory / segment.file
+        if segment.last_seq is None or not source.exists():
+            # Nothing was written to it
+            log.active = None
+            self._write_index(log)
+            source.unlink(missing_ok=True)
+            return
+
+        compressed = log.directory / (segment.file + ".gz")
+        partial = log.directory / (segment.file + ".gz.tmp")
+        with open(source, "rb") as raw, gzip.open(partial, "wb", compresslevel=self.COMPRESSION_LEVEL) as packed:
+            shutil.copyfileobj(raw, packed)
+        os.replace(partial, compressed)
+
+        segment.file = compressed.name
+        segment.size = log.active_size
+        log.closed.append(segment)
+        log.active = None
+        self._write_index(log)
+        # Removed last; readers holding the previous index fall back to the compressed file
+        source.unlink(missing_ok=True)
+
+        self.logger.debug(
+            "Execution log segment closed",
+            directory=str(log.directory),
+            segment=segment.file,
+            first_seq=segment.first_seq,
+            last_seq=segment.last_seq,
+            size_bytes=segment.size
+        )
+
+    def _write_index(self, log: _ExecutionLog) -> None:
+        index = {
+            "segments": [segment.__dict__ for segment in log.closed],
+            "active": log.active.__dict__ if log.active is not None else None
+        }
+        partial = log.directory / (self.INDEX_FILE + ".tmp")
+        partial.write_text(json.dumps(index))
+        os.replace(partial, log.directory / self.INDEX_FILE)
+
+    def _load(self, directory: Path) -> _ExecutionLog:
+        """Writer state from disk, counting the lines of the active segment."""
+        log = _ExecutionLog(directory=directory)
+        index_path = directory / self.INDEX_FILE
+        if not index_path.exists():
+            return log
+        index = json.loads(index_path.read_text())
+        log.closed = [_Segment(**segment) for segment in index.get("segments", [])]
+        if log.closed:
+            log.next_seq = log.closed[-1].last_seq + 1
+        if index.get("active"):
+            log.active = _Segment(**index["active"])
+            path = directory / log.active.file
+            count = 0
+            if path.exists():
+                with open(path, "rb") as segment:
+                    for line in segment:
+                        if line.endswith(b"\n"):
+                            count += 1
+                            log.active_size += len(line)
+                # Drop a line torn by a crash mid-write
+                if path.stat().st_size != log.active_size:
+                    os.truncate(path, log.active_size)
+            log.next_seq = log.active.first_seq + count
+            log.active.last_seq = log.next_seq - 1 if count else None
+        return log
+
+    # Reading
+
+    def size(self, project_id: str, execution_id: str) -> int:
+        """Uncompressed size in bytes of an execution's log."""
+        return sum(size for _, _, size in self._read_segments(project_id, execution_id))
+
+    def read_bytes(self, project_id: str, execution_id: str, start: int = 0, end: Optional[int] = None) -> Iterator[bytes]:
+        """
+        Stream bytes [start, end) of the uncompressed log in bounded chunks.
+
+        Raises:
+            ExecutionLogNotFound: If the execution has no stored log
+        """
+        segments = self._read_segments(project_id, execution_id)
+        position = 0
+        for path, _, size in segments:
+            segment_start, segment_end = position, position + size
+            position = segment_end
+            if segment_end <= start or (end is not None and segment_start >= end):
+                continue
+            skip = max(0, start - segment_start)
+            remaining = (min(end, segment_end) if end is not None else segment_end) - segment_start - skip
+            with self._open_segment_file(path) as segment:
+                segment.seek(skip)
+                while remaining > 0:
+                    chunk = segment.read(min(self.read_chunk_bytes, remaining))
+                    if not chunk:
+                        break
+                    remaining -= len(chunk)
+                    yield chunk
+
+    def read_entries(
+        self,
+        project_id: str,
+        execution_id: str,
+        from_seq: int = 1,
+        to_seq: Optional[int] = None
+    ) -> Iterator[bytes]:
+        """
+        Stream the NDJSON lines of entries with from_seq <= log_seq <= to_seq.
+
+        Raises:
+            ExecutionLogNotFound: If the execution has no stored log
+        """
+        for path, first_seq, _ in self._read_segments(project_id, execution_id):
+            if to_seq is not None and first_seq > to_seq:
+                break
+            with self._open_segment_file(path) as segment:
+                for seq, line in enumerate(segment, start=first_seq):
+                    if to_seq is not None and seq > to_seq:
+                        return
+                    if seq >= from_seq and line.endswith(b"\n"):
+                        yield line
+
+    def _read_segments(self, project_id: str, execution_id: str) -> List[Tuple[Path, int, int]]:
+        """(path, first_seq, uncompressed size) of every segment, oldest first."""
+        directory = self.root / _project_dir_name(project_id) / _safe_id(execution_id, "execution_id")
+        index_path = directory / self.INDEX_FILE
+        if not index_path.exists():
+            raise ExecutionLogNotFound(f"No execution log for {project_id}/{execution_id}")
+
+        # The writer may close the active segment while the index is read; retry once
+        for attempt in range(2):
+            index = json.loads(index_path.read_text())
+            segments = [
+                (directory / segment["file"], segment["first_seq"], segment["size"])
+                for segment in index.get("segments", [])
+            ]
+            active = index.get("active")
+            if active is None:
+                return segments
+            path = directory / active["file"]
+            try:
+                # Only complete lines of the active segment are readable
+                size = path.stat().st_size
+                with open(path, "rb") as segment:
+                    segment.seek(max(0, size - 1))
+                    if size and segment.read(1) != b"\n":
+                        size = self._complete_size(path)
+                return segments + [(path, active["first_seq"], size)]
+            except FileNotFoundError:
+                if attempt:
+                    return segments
+        return segments
+
+    @staticmethod
+    def _complete_size(path: Path) -> int:
+        size = 0
+        with open(path, "rb") as segment:
+            for line in segment:
+                if line.endswith(b"\n"):
+                    size += len(line)
+        return size
+
+    @staticmethod
+    def _open_segment_file(path: Path):
+        if path.name.endswith(".gz"):
+            return gzip.open(path, "rb")
+        try:
+            return open(path, "rb")
+        except FileNotFoundError:
+            # Closed and compressed since the index was read
+            return gzip.open(path.with_name(path.name + ".gz"), "rb")
+
+
+_store: Optional[ExecutionLogStore] = None
+
+
+def get_execution_log_store() -> ExecutionLogStore:
+    """Process-wide execution log store."""
+    global _store
+    if _store is None:
+        _store = ExecutionLogStore()
+    return _store
@@ -15,7 +15,7 @@ from typing import Optional, Dict, Any
 
 from core.structured_logging import get_structured_logger, LogStatus
 from schemas.status_projection_schema import project_status_from_task_context, ExecutionStatus
-from schemas.websocket_envelope import create_execution_update_envelope
+from schemas.websocket_envelope import build_execution_update_envelope
 from api.v1.endpoints.websocket import broadcast_to_project
 
 
@@ -101,8 +101,8 @@ class ExecutionUpdateService:
                 )
                 return
             
-            # Build execution-update message using standardized envelope utility
-            execution_update_message = create_execution_update_envelope(
+            # Build execution-update message with the trusted pre-serialized envelope builder
+            execution_update_message = build_execution_update_envelope(
                 project_id=project_id,
                 execution_id=execution_id,
                 status=status_projection.status.value if hasattr(status_projection.status, 'value') else str(status_projection.status),
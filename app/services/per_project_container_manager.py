@@ -30,6 +30,7 @@ from docker.models.volumes import Volume
 
 from core.structured_logging import get_structured_logger, LogStatus, log_performance
 from core.exceptions import RepositoryError
+from services.container_agent import AgentStep, discard_container_agent, run_steps
 
 
 class ContainerError(Exception):
@@ -349,6 +350,7 @@ class PerProjectContainerManager:
         """
         with self._registry_lock:
             self._container_registry.pop(container_id, None)
+        discard_container_agent(container_id)
     
     @log_performance(get_structured_logger(__name__), "start_or_reuse_container")
     def start_or_reuse_container(
@@ -843,18 +845,16 @@ class PerProjectContainerManager:
             except Exception:
                 health_checks['git_available'] = False
             
-            # 3. Check node is available
+            # 3-4. Check node is available and workspace is accessible in one command batch
             try:
-                exit_code, output = container.exec_run("node --version")
-                health_checks['node_available'] = exit_code == 0
+                node_check, workspace_check = run_steps(container, [
+                    AgentStep("node --version"),
+                    AgentStep("ls -la /workspace")
+                ])
+                health_checks['node_available'] = node_check.succeeded
+                health_checks['workspace_accessible'] = workspace_check.succeeded
             except Exception:
                 health_checks['node_available'] = False
-            
-            # 4. Check workspace is accessible
-            try:
-                exit_code, output = container.exec_run("ls -la /workspace")
-                health_checks['workspace_accessible'] = exit_code == 0
-            except Exception:
                 health_checks['workspace_accessible'] = False
             
             # Determine overall health
@@ -0,0 +1,219 @@
+"""
+Status Projection Cache Module for Clarity Local Runner
+
+This module provides a two-tier cache for status projections:
+- In-process LRU tier for repeated reads within one API process
+- Shared Redis tier so every API replica reuses a transformation
+- Entries keyed by (event id, event version) so any write to the event
+  naturally misses, plus explicit invalidation on known writes
+- Hit/miss metrics per tier via the performance monitor
+
+Primary Responsibility: Avoid re-transforming unchanged task contexts
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Optional, Tuple
+
+# Make redis optional; the cache degrades to the in-process tier without it
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+    redis = None  # type: ignore
+
+from core.structured_logging import get_structured_logger
+from core.performance_monitoring import record_cache_lookup
+from schemas.status_projection_schema import StatusProjection
+
+
+logger = get_structured_logger(__name__)
+
+
+class StatusProjectionCache:
+    """
+    Two-tier (in-process LRU + Redis) cache of StatusProjection objects.
+
+    Each event has at most one entry per tier, tagged with the event version
+    (its updated_at). A lookup only hits when the stored version matches the
+    version just read from the database, so stale entries are never served.
+    When Redis is unreachable the shared tier is skipped for
+    REDIS_RETRY_SECONDS and the cache keeps working in-process.
+    """
+
+    # Cache configuration
+    LOCAL_MAX_ENTRIES = int(os.getenv("STATUS_PROJECTION_CACHE_SIZE", "1024"))
+    REDIS_TTL_SECONDS = int(os.getenv("STATUS_PROJECTION_CACHE_TTL_SECONDS", "300"))
+    REDIS_KEY_PREFIX = "status_projection:"
+    REDIS_TIMEOUT_SECONDS = 0.05
+    REDIS_RETRY_SECONDS = 30.0
+
+    def __init__(self, redis_url: Optional[str] = None, redis_client: Any = None):
+        """
+        Initialize status projection cache.
+
+        Args:
+            redis_url: Redis URL for the shared tier (None disables it)
+            redis_client: Pre-built Redis client (takes precedence over redis_url)
+        """
+        self._local: "OrderedDict[str, Tuple[str, StatusProjection]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self._redis = redis_client
+        if self._redis is None and redis_url and REDIS_AVAILABLE:
+            self._redis = redis.Redis.from_url(
+                redis_url,
+                socket_connect_timeout=self.REDIS_TIMEOUT_SECONDS,
+                socket_timeout=self.REDIS_TIMEOUT_SECONDS
+            )
+        self._redis_disabled_until = 0.0
+
+    @staticmethod
+    def version_of(updated_at: Any) -> Optional[str]:
+        """
+        Derive a cache version from an event's updated_at.
+
+        Args:
+            updated_at: Event.updated_at value
+
+        Returns:
+            Version string, or None if the value cannot identify a version
+        """
+        if isinstance(updated_at, datetime):
+            return updated_at.isoformat()
+        return None
+
+    def get(self, event_id: Any, version: Optional[str]) -> Optional[StatusProjection]:
+        """
+        Look up the projection of an event at a given version.
+
+        Args:
+            event_id: Event identifier
+            version: Event version from version_of()
+
+        Returns:
+            Cached StatusProjection copy, or None on a miss
+        """
+        if version is None:
+            return None
+        key = str(event_id)
+
+        with self._lock:
+            entry = self._local.get(key)
+            if entry is not None and entry[0] == version:
+                self._local.move_to_end(key)
+                record_cache_lookup("status_projection", hit=True, tier="local")
+                return entry[1].model_copy()
+        record_cache_lookup("status_projection", hit=False, tier="local")
+
+        projection = self._redis_get(key, version)
+        record_cache_lookup("status_projection", hit=projection is not None, tier="redis")
+        if projection is not None:
+            self._local_put(key, version, projection)
+            return projection.model_copy()
+        return None
+
+    def put(self, event_id: Any, version: Optional[str], projection: StatusProjection) -> None:
+        """
+        Store the projection of an event at a given version in both tiers.
+
+        Args:
+            event_id: Event identifier
+            version: Event version from version_of()
+            projection: Projection computed from that version
+        """
+        if version is None:
+            return
+        key = str(event_id)
+        self._local_put(key, version, projection.model_copy())
+        self._redis_call(
+            "set",
+            self.REDIS_KEY_PREFIX + key,
+            f"{version}\n{projection.model_dump_json()}",
+            ex=self.REDIS_TTL_SECONDS
+        )
+
+    def invalidate(self, event_id: Any) -> None:
+        """
+        Drop any cached projection of an event from both tiers.
+
+        Args:
+            event_id: Event identifier
+        """
+        key = str(event_id)
+        with self._lock:
+            self._local.pop(key, None)
+        self._redis_call("delete", self.REDIS_KEY_PREFIX + key)
+
+    def clear_local(self) -> None:
+        """Drop every entry of the in-process tier."""
+        with self._lock:
+            self._local.clear()
+
+    def _local_put(self, key: str, version: str, projection: StatusProjection) -> None:
+        with self._lock:
+            self._local[key] = (version, projection)
+            self._local.move_to_end(key)
+            while len(self._local) > self.LOCAL_MAX_ENTRIES:
+                self._local.popitem(last=False)
+
+    def _redis_get(self, key: str, version: str) -> Optional[StatusProjection]:
+        raw = self._redis_call("get", self.REDIS_KEY_PREFIX + key)
+        if not raw:
+            return None
+        if isinstance(raw, bytes):
+            raw = raw.decode("utf-8")
+        cached_version, _, payload = raw.partition("\n")
+        if cached_version != version:
+            return None
+        try:
+            return StatusProjection.model_validate_json(payload)
+        except Exception as e:
+            logger.warn(
+                "Discarding unreadable cached status projection",
+                event_id=key,
+                error_message=str(e)
+            )
+            return None
+
+    def _redis_call(self, method: str, *args, **kwargs) -> Any:
+        if self._redis is None or time.time() < self._redis_disabled_until:
+            return None
+        try:
+            return getattr(self._redis, method)(*args, **kwargs)
+        except Exception as e:
+            self._redis_disabled_until = time.time() + self.REDIS_RETRY_SECONDS
+            logger.warn(
+                "Status projection cache Redis tier unavailable",
+                operation=method,
+                retry_in_seconds=self.REDIS_RETRY_SECONDS,
+                error_message=str(e)
+            )
+            return None
+
+
+def _resolve_redis_url() -> Optional[str]:
+    """Redis URL for the shared tier, or None when no Redis is configured."""
+    redis_url = os.getenv("STATUS_PROJECTION_CACHE_REDIS_URL")
+    if redis_url:
+        return redis_url
+    if os.getenv("PROJECT_NAME"):
+        from worker.config import get_redis_url
+        return get_redis_url()
+    return None
+
+
+# Global status projection cache instance
+_status_projection_cache: Optional[StatusProjectionCache] = None
+
+
+def get_status_projection_cache() -> StatusProjectionCache:
+    """Get the global status projection cache instance."""
+    global _status_projection_cache
+    if _status_projection_cache is None:
+        _status_projection_cache = StatusProjectionCache(redis_url=_resolve_redis_url())
+    return _status_projection_cache
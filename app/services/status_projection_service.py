@@ -12,11 +12,15 @@ This module provides comprehensive status projection read model operations with:
 Primary Responsibility: Status projection read model operations
 """
 
+import base64
+import json
+import re
 import time
+import uuid
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, desc, String
+from sqlalchemy import and_, or_, desc, false, func, literal_column, text, tuple_, String
 
 from core.structured_logging import get_structured_logger, get_transformation_logger, LogStatus, log_performance, TransformationPhase, TransformationLogger
 from core.exceptions import (
@@ -31,18 +35,35 @@ from core.exceptions import (
 )
 from database.repository import GenericRepository
 from database.event import Event
+from database.event_archive import EventArchive
 from database.session import db_session
 from schemas.status_projection_schema import (
     StatusProjection,
     ExecutionStatus,
+    ExecutionHistoryPage,
     StatusProjectionError,
     project_status_from_task_context,
     validate_status_transition
 )
-from schemas.websocket_envelope import create_execution_update_envelope, create_completion_envelope
+from schemas.websocket_envelope import build_execution_update_envelope, create_completion_envelope
+from services.status_projection_cache import get_status_projection_cache
 from api.v1.endpoints.websocket import broadcast_to_project
 
 
+def project_id_expression(model) -> Any:
+    """
+    Project ID expression of an events table, matching its per-project index.
+
+    Kept literal so the planner can match it against the index definition.
+    """
+    return literal_column(f"({model.__tablename__}.task_context -> 'metadata' ->> 'project_id')")
+
+
+EVENT_PROJECT_ID = project_id_expression(Event)
+
+_PROJECT_ID_PATTERN = re.compile(r'^[a-zA-Z0-9_/-]+$')
+
+
 class StatusProjectionService:
     """
     Status projection read model service with comprehensive query operations.
@@ -52,6 +73,9 @@ class StatusProjectionService:
     It follows established patterns for logging, error handling, and performance optimization.
     """
     
+    # Maximum number of projects in one batch status request
+    MAX_BATCH_PROJECT_IDS = 100
+    
     def __init__(self, session: Session, correlation_id: Optional[str] = None):
         """
         Initialize status projection service.
@@ -169,6 +193,22 @@ class StatusProjectionService:
             # Generate execution_id from event ID if not provided
             event_execution_id = str(matching_event.id)
             
+            # Serve unchanged events from the projection cache
+            projection_cache = get_status_projection_cache()
+            event_version = projection_cache.version_of(matching_event.updated_at)
+            cached_projection = projection_cache.get(matching_event.id, event_version)
+            if cached_projection is not None:
+                self.logger.info(
+                    "Status projection served from cache by project ID",
+                    correlation_id=self.correlation_id,
+                    project_id=project_id,
+                    execution_id=execution_id,
+                    status=LogStatus.COMPLETED,
+                    event_id=event_execution_id,
+                    duration_ms=round((time.time() - start_time) * 1000, 2)
+                )
+                return cached_projection
+            
             # Project status from task_context using utility from Task 5.2.1 with enhanced error handling
             try:
                 self.transformation_logger.log_transformation_start(
@@ -258,6 +298,8 @@ class StatusProjectionService:
                     }
                 )
 
+            projection_cache.put(matching_event.id, event_version, status_projection)
+
             # Handle status value properly - could be enum or string
             projection_status = status_projection.status.value if hasattr(status_projection.status, 'value') else str(status_projection.status)
 
@@ -292,6 +334,157 @@ class StatusProjectionService:
                 f"Failed to get status projection by project ID: {str(e)}"
             )
     
+    def get_status_version_by_project_id(self, project_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the version of a project's latest event without loading its task_context.
+        
+        This is a cheap metadata lookup (event id and updated_at only) served by
+        the project_id/updated_at index, used to answer conditional requests
+        without projecting or serializing the status.
+        
+        Args:
+            project_id: Project identifier to get the status version for
+            
+        Returns:
+            Dict with event_id and version, or None if the project has no events
+            
+        Raises:
+            RepositoryError: If database operation fails
+        """
+        try:
+            row = self.session.query(Event.id, Event.updated_at).filter(
+                EVENT_PROJECT_ID == project_id
+            ).order_by(desc(Event.updated_at)).first()
+        except Exception as e:
+            self.logger.error(
+                "Failed to get status version by project ID",
+                correlation_id=self.correlation_id,
+                project_id=project_id,
+                status=LogStatus.FAILED,
+                error=e
+            )
+            raise RepositoryError(
+                f"Failed to get status version by project ID: {str(e)}"
+            )
+        
+        if row is None:
+            return None
+        
+        event_id, updated_at = row
+        return {
+            "event_id": str(event_id),
+            "version": status_version_of(event_id, updated_at)
+        }
+    
+    @log_performance(get_structured_logger(__name__), "get_status_by_project_ids")
+    def get_status_by_project_ids(
+        self,
+        project_ids: List[str]
+    ) -> Dict[str, Optional[StatusProjection]]:
+        """
+        Get status projections for many projects in one database round trip.
+        
+        The latest event of every requested project is fetched with a single
+        DISTINCT ON query served by the project_id/updated_at index, and all
+        events are then projected in one pass, reusing cached projections of
+        unchanged events.
+        
+        Args:
+            project_ids: Project identifiers to get status for
+            
+        Returns:
+            Map of project ID to StatusProjection, or None for projects without events
+            
+        Raises:
+            RepositoryError: If database operation fails or validation errors occur
+        """
+        start_time = time.time()
+        
+        try:
+            unique_project_ids = self._validate_batch_project_ids(project_ids)
+            
+            self.logger.info(
+                "Getting status projections by project IDs",
+                correlation_id=self.correlation_id,
+                status=LogStatus.STARTED,
+                project_count=len(unique_project_ids)
+            )
+            
+            # One indexed query: latest event per requested project
+            latest_events = self.session.query(Event).filter(
+                EVENT_PROJECT_ID.in_(unique_project_ids)
+            ).distinct(EVENT_PROJECT_ID).order_by(
+                EVENT_PROJECT_ID, desc(Event.updated_at)
+            ).all()
+            
+            projections: Dict[str, Optional[StatusProjection]] = {
+                project_id: None for project_id in unique_project_ids
+            }
+            projection_cache = get_status_projection_cache()
+            cache_hits = 0
+            failed_projects = []
+            
+            for event in latest_events:
+                task_context = event.task_context if isinstance(event.task_context, dict) else {}
+                metadata = task_context.get('metadata') or {}
+                event_project_id = metadata.get('project_id')
+                if event_project_id not in projections:
+                    continue
+                
+                event_version = projection_cache.version_of(event.updated_at)
+                status_projection = projection_cache.get(event.id, event_version)
+                if status_projection is not None:
+                    cache_hits += 1
+                else:
+                    try:
+                        status_projection = project_status_from_task_context(
+                            task_context=task_context,
+                            execution_id=str(event.id),
+                            project_id=event_project_id
+                        )
+                    except Exception as e:
+                        # One bad context must not fail the whole batch
+                        failed_projects.append(event_project_id)
+                        self.logger.warn(
+                            "Failed to project status for event",
+                            correlation_id=self.correlation_id,
+                            project_id=event_project_id,
+                            event_id=str(event.id),
+                            error=str(e)
+                        )
+                        continue
+                    projection_cache.put(event.id, event_version, status_projection)
+                
+                projections[event_project_id] = status_projection
+            
+            self.logger.info(
+                "Status projections retrieved successfully by project IDs",
+                correlation_id=self.correlation_id,
+                status=LogStatus.COMPLETED,
+                project_count=len(unique_project_ids),
+                events_found=len(latest_events),
+                cache_hits=cache_hits,
+                failed_projects=failed_projects,
+                duration_ms=round((time.time() - start_time) * 1000, 2)
+            )
+            
+            return projections
+            
+        except RepositoryError:
+            raise
+        except Exception as e:
+            duration_ms = (time.time() - start_time) * 1000
+            self.logger.error(
+                "Failed to get status projections by project IDs",
+                correlation_id=self.correlation_id,
+                status=LogStatus.FAILED,
+                duration_ms=round(duration_ms, 2),
+                error=e
+            )
+            raise RepositoryError(
+                f"Failed to get status projections by project IDs: {str(e)}"
+            )
+    
     @log_performance(get_structured_logger(__name__), "get_status_by_execution_id")
     def get_status_by_execution_id(
         self,
@@ -435,7 +628,9 @@ class StatusProjectionService:
             active_projections = []
             processed_projects = set()
             
+            events_processed = 0
             for event in query:
+                events_processed += 1
                 task_context = event.task_context or {}
                 metadata = task_context.get('metadata', {})
                 event_project_id = metadata.get('project_id')
@@ -492,7 +687,7 @@ class StatusProjectionService:
                 project_id=project_id,
                 status=LogStatus.COMPLETED,
                 active_executions_count=len(active_projections),
-                events_processed=query.count(),
+                events_processed=events_processed,
                 duration_ms=round((time.time() - start_time) * 1000, 2)
             )
             
@@ -637,18 +832,70 @@ class StatusProjectionService:
     def get_execution_history(
         self,
         project_id: str,
-        limit: int = 10
+        limit: int = 10,
+        include_archived: bool = False,
+        **filters: Any
     ) -> List[StatusProjection]:
         """
         Get execution history for a project.
         
+        Returns the items of one page of get_execution_history_page(); see
+        there for filters, ordering and cursors.
+        
         Args:
             project_id: Project identifier to get history for
             limit: Maximum number of historical executions to return
-            
+            include_archived: Whether to continue into archived events
+            **filters: status, branch, updated_after, updated_before or cursor
+        
         Returns:
             List of StatusProjection instances ordered by most recent first
-            
+        
+        Raises:
+            RepositoryError: If database operation fails or validation errors occur
+        """
+        return self.get_execution_history_page(
+            project_id,
+            limit=limit,
+            include_archived=include_archived,
+            **filters
+        ).items
+    
+    @log_performance(get_structured_logger(__name__), "get_execution_history_page")
+    def get_execution_history_page(
+        self,
+        project_id: str,
+        limit: int = 10,
+        include_archived: bool = False,
+        status: Optional[ExecutionStatus] = None,
+        branch: Optional[str] = None,
+        updated_after: Optional[datetime] = None,
+        updated_before: Optional[datetime] = None,
+        cursor: Optional[str] = None
+    ) -> ExecutionHistoryPage:
+        """
+        Get one page of execution history for a project.
+        
+        Pages are ordered by (updated_at, id) descending, created_at standing
+        in for a NULL updated_at, and continue from the opaque cursor of the
+        previous page, so every page is one bounded index range scan however
+        long the project's history is. All filters are applied in SQL. Hot
+        events come first; when include_archived is set the history continues
+        into the events archive.
+        
+        Args:
+            project_id: Project identifier to get history for
+            limit: Maximum number of historical executions to return
+            include_archived: Whether to continue into archived events
+            status: Only executions whose projected status matches
+            branch: Only executions on this branch
+            updated_after: Only executions updated at or after this time
+            updated_before: Only executions updated before this time
+            cursor: next_cursor of the previous page
+        
+        Returns:
+            ExecutionHistoryPage with items ordered by most recent first
+        
         Raises:
             RepositoryError: If database operation fails or validation errors occur
         """
@@ -665,56 +912,96 @@ class StatusProjectionService:
                     "Limit must be between 1 and 100"
                 )
             
+            if status is not None:
+                status = ExecutionStatus(status)
+            position = _decode_history_cursor(cursor) if cursor else None
+            
             self.logger.info(
                 "Getting execution history for project",
                 correlation_id=self.correlation_id,
                 project_id=project_id,
                 status=LogStatus.STARTED,
-                limit=limit
+                limit=limit,
+                has_cursor=position is not None
             )
             
-            # Query for events with task_context for this project
-            query = self.session.query(Event).filter(
-                Event.task_context.isnot(None)
-            ).order_by(desc(Event.updated_at)).limit(limit * 3)  # Get more to filter
+            # Hot events first, then the archive when requested
+            sources = [(_HISTORY_SOURCE_HOT, Event)]
+            if include_archived:
+                sources.append((_HISTORY_SOURCE_ARCHIVE, EventArchive))
+            if position is not None:
+                source_names = [name for name, _ in sources]
+                if position[0] not in source_names:
+                    raise RepositoryError("History cursor does not match the requested sources")
+                sources = sources[source_names.index(position[0]):]
             
             history_projections = []
+            next_cursor = None
             
-            for event in query:
-                task_context = event.task_context or {}
-                metadata = task_context.get('metadata', {})
-                event_project_id = metadata.get('project_id')
+            for source_index, (source_name, model) in enumerate(sources):
+                remaining = limit - len(history_projections)
+                updated_at = _history_timestamp(model)
                 
-                # Skip if not matching project
-                if event_project_id != project_id:
-                    continue
-                
-                try:
-                    # Project status from task_context using utility from Task 5.2.1
-                    # Convert SQLAlchemy column to dict
-                    task_context_dict = event.task_context if isinstance(event.task_context, dict) else {}
-                    status_projection = project_status_from_task_context(
-                        task_context=task_context_dict,
-                        execution_id=str(event.id),
-                        project_id=project_id
+                conditions = [
+                    model.task_context.isnot(None),
+                    project_id_expression(model) == project_id
+                ]
+                if status is not None:
+                    conditions.append(_execution_status_condition(model, status))
+                if branch is not None:
+                    conditions.append(
+                        literal_column(f"({model.__tablename__}.task_context -> 'metadata' ->> 'branch')") == branch
                     )
-                    
-                    history_projections.append(status_projection)
-                    
-                    # Stop if we have enough history
-                    if len(history_projections) >= limit:
-                        break
-                        
-                except Exception as e:
-                    # Log but continue processing other events
-                    self.logger.warn(
-                        "Failed to project status for historical event",
-                        correlation_id=self.correlation_id,
-                        project_id=project_id,
-                        event_id=str(event.id),
-                        error=str(e)
+                if updated_after is not None:
+                    conditions.append(updated_at >= updated_after)
+                if updated_before is not None:
+                    conditions.append(updated_at < updated_before)
+                if position is not None and position[0] == source_name and position[1] is not None:
+                    conditions.append(
+                        tuple_(updated_at, model.id) < tuple_(position[1], position[2])
                     )
-                    continue
+                
+                # One extra row tells whether another page follows
+                rows = list(
+                    self.session.query(model).filter(*conditions).order_by(
+                        desc(updated_at), desc(model.id)
+                    ).limit(remaining + 1)
+                )
+                page_rows = rows[:remaining]
+                
+                for event in page_rows:
+                    try:
+                        # Project status from task_context using utility from Task 5.2.1
+                        # Convert SQLAlchemy column to dict
+                        task_context_dict = event.task_context if isinstance(event.task_context, dict) else {}
+                        status_projection = project_status_from_task_context(
+                            task_context=task_context_dict,
+                            execution_id=str(event.id),
+                            project_id=project_id
+                        )
+                        history_projections.append(status_projection)
+                    except Exception as e:
+                        # Log but continue processing other events
+                        self.logger.warn(
+                            "Failed to project status for historical event",
+                            correlation_id=self.correlation_id,
+                            project_id=project_id,
+                            event_id=str(event.id),
+                            error=str(e)
+                        )
+                
+                if len(rows) > remaining:
+                    last_event = page_rows[-1]
+                    next_cursor = _encode_history_cursor(
+                        source_name, last_event.updated_at or last_event.created_at, last_event.id
+                    )
+                    break
+                if len(page_rows) == remaining:
+                    # This source ended exactly at the page boundary; the
+                    # next page starts at the following source, if any
+                    if source_index + 1 < len(sources):
+                        next_cursor = _encode_history_cursor(sources[source_index + 1][0])
+                    break
             
             self.logger.info(
                 "Execution history retrieved successfully",
@@ -722,11 +1009,13 @@ class StatusProjectionService:
                 project_id=project_id,
                 status=LogStatus.COMPLETED,
                 history_count=len(history_projections),
+                include_archived=include_archived,
+                has_next_page=next_cursor is not None,
                 duration_ms=round((time.time() - start_time) * 1000, 2)
             )
             
-            return history_projections
-            
+            return ExecutionHistoryPage(items=history_projections, next_cursor=next_cursor)
+        
         except RepositoryError:
             raise
         except Exception as e:
@@ -804,6 +1093,7 @@ class StatusProjectionService:
                 'updated_at': datetime.utcnow()
             })
             self.session.commit()
+            get_status_projection_cache().invalidate(event.id)
             
             # Get updated event
             updated_event = self.session.query(Event).filter(Event.id == event.id).first()
@@ -853,6 +1143,45 @@ class StatusProjectionService:
                 f"Failed to update status projection to completed: {str(e)}"
             )
     
+    def _validate_batch_project_ids(self, project_ids: List[str]) -> List[str]:
+        """
+        Validate a batch of project IDs and return them de-duplicated in order.
+        
+        Args:
+            project_ids: Project identifiers to validate
+            
+        Returns:
+            Unique project identifiers in request order
+            
+        Raises:
+            ClarityValidationError: If the batch or any project ID is invalid
+        """
+        if not isinstance(project_ids, list) or not project_ids:
+            raise ClarityValidationError(
+                "Project IDs must be a non-empty list",
+                context={"field": "project_ids"}
+            )
+        
+        unique_project_ids = list(dict.fromkeys(project_ids))
+        if len(unique_project_ids) > self.MAX_BATCH_PROJECT_IDS:
+            raise ClarityValidationError(
+                f"At most {self.MAX_BATCH_PROJECT_IDS} project IDs can be requested at once",
+                context={"field": "project_ids", "count": len(unique_project_ids)}
+            )
+        
+        for project_id in unique_project_ids:
+            if not isinstance(project_id, str) or not _PROJECT_ID_PATTERN.match(project_id):
+                raise ClarityValidationError(
+                    "Project ID contains invalid characters",
+                    context={
+                        "field": "project_ids",
+                        "value": project_id,
+                        "allowed_pattern": "alphanumeric, underscores, hyphens, forward slashes"
+                    }
+                )
+        
+        return unique_project_ids
+    
     def _validate_update_parameters(self, execution_id: str, project_id: str) -> None:
         """
         Validate parameters for status projection update.
@@ -1026,7 +1355,7 @@ class StatusProjectionService:
         """
         try:
             # Create execution update envelope for completion
-            update_envelope = create_execution_update_envelope(
+            update_envelope = build_execution_update_envelope(
                 project_id=projection.project_id,
                 execution_id=projection.execution_id,
                 status=projection.status.value,
@@ -1094,6 +1423,109 @@ class StatusProjectionService:
             )
 
 
+_HISTORY_SOURCE_HOT = "hot"
+_HISTORY_SOURCE_ARCHIVE = "archive"
+
+
+def _history_timestamp(model) -> Any:
+    """
+    Ordering timestamp of execution history rows.
+
+    Rows never updated have a NULL updated_at; their created_at takes its
+    place so they still sort, and cursors after them compare, by time.
+    Matches the expression of the per-project history index.
+    """
+    return func.coalesce(model.updated_at, model.created_at)
+
+
+def _encode_history_cursor(
+    source: str,
+    updated_at: Optional[datetime] = None,
+    event_id: Any = None
+) -> str:
+    """Encode an execution history position as an opaque cursor."""
+    position = {"s": source}
+    if updated_at is not None:
+        position["u"] = updated_at.isoformat()
+        position["i"] = str(event_id)
+    return base64.urlsafe_b64encode(json.dumps(position).encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def _decode_history_cursor(cursor: str) -> Tuple[str, Optional[datetime], Optional[uuid.UUID]]:
+    """
+    Decode an execution history cursor.
+
+    Returns:
+        Tuple of (source, updated_at, event_id); updated_at and event_id are
+        None for a cursor pointing at the start of a source
+
+    Raises:
+        RepositoryError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        position = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if "u" not in position:
+            return position["s"], None, None
+        return position["s"], datetime.fromisoformat(position["u"]), uuid.UUID(position["i"])
+    except Exception:
+        raise RepositoryError("Invalid execution history cursor")
+
+
+def _execution_status_condition(model, status: ExecutionStatus) -> Any:
+    """
+    SQL condition selecting events whose projected status is `status`.
+
+    Mirrors _process_nodes_single_pass: a node's status is its `status` or
+    `event_data.status`; any error node means ERROR, all nodes completed means
+    COMPLETED, any running or completed node means RUNNING, and anything else
+    is IDLE, or INITIALIZING when metadata.status is 'prepared'. Statuses the
+    projection never derives (paused, stopping, stopped) match nothing.
+    """
+    table = model.__tablename__
+    nodes = f"{table}.task_context -> 'nodes'"
+    node_rows = f"json_each(CASE WHEN json_typeof({nodes}) = 'object' THEN {nodes} ELSE '{{}}'::json END) AS n"
+    node_status = "COALESCE(n.value ->> 'status', n.value -> 'event_data' ->> 'status')"
+
+    has_error = f"EXISTS (SELECT 1 FROM {node_rows} WHERE {node_status} = 'error')"
+    has_running = f"EXISTS (SELECT 1 FROM {node_rows} WHERE {node_status} = 'running')"
+    total = f"(SELECT count(*) FROM {node_rows})"
+    completed = f"(SELECT count(*) FROM {node_rows} WHERE {node_status} = 'completed')"
+    all_completed = f"({total} > 0 AND {completed} = {total})"
+    idle = f"(NOT {has_error} AND NOT {has_running} AND {completed} = 0)"
+    prepared = f"COALESCE({table}.task_context -> 'metadata' ->> 'status', '') = 'prepared'"
+
+    conditions = {
+        ExecutionStatus.ERROR: has_error,
+        ExecutionStatus.COMPLETED: f"NOT {has_error} AND {all_completed}",
+        ExecutionStatus.RUNNING: f"NOT {has_error} AND NOT {all_completed} AND ({has_running} OR {completed} > 0)",
+        ExecutionStatus.INITIALIZING: f"{idle} AND {prepared}",
+        ExecutionStatus.IDLE: f"{idle} AND NOT {prepared}",
+    }
+    if status not in conditions:
+        return false()
+    return text(f"({conditions[status]})")
+
+
+def status_version_of(event_id: Any, updated_at: Optional[datetime]) -> str:
+    """
+    Build the opaque version token of an event's status projection.
+    
+    The token changes whenever the event is written, so it can be used as a
+    strong ETag and as the ``since`` cursor of status polling.
+    
+    Args:
+        event_id: Event identifier
+        updated_at: Event.updated_at value
+        
+    Returns:
+        Version token string
+    """
+    event_hex = event_id.hex if isinstance(event_id, uuid.UUID) else str(event_id).replace('-', '')
+    timestamp = updated_at.strftime('%Y%m%d%H%M%S%f') if updated_at else '0'
+    return f"{event_hex}-{timestamp}"
+
+
 def get_status_projection_service(
     session: Session,
     correlation_id: Optional[str] = None
@@ -0,0 +1,144 @@
+"""
+Status Waiters Module for Clarity Local Runner
+
+This module provides in-process waiters for long-polling status requests:
+- Waiters keyed by project, parked on an asyncio event (no DB access while idle)
+- Woken by the same broadcast notification that drives WebSocket updates
+- Thread-safe notification, so broadcasts from any event loop or thread wake
+  waiters on the API event loop
+
+Primary Responsibility: Park status pollers until their project changes
+"""
+
+import asyncio
+import threading
+from typing import Dict, Optional, Set
+
+from core.structured_logging import get_structured_logger
+
+
+logger = get_structured_logger(__name__)
+
+
+class StatusWatch:
+    """
+    Registration of one long-poll request on a project.
+
+    A watch stays registered until closed, so notifications arriving between
+    a version check and the next wait() are never lost.
+    """
+
+    def __init__(self, registry: "StatusWaiterRegistry", project_id: str):
+        self.project_id = project_id
+        self._registry = registry
+        self._loop = asyncio.get_running_loop()
+        self._changed = asyncio.Event()
+
+    async def wait(self, timeout: float) -> bool:
+        """
+        Wait until the project is notified or the timeout elapses.
+
+        Args:
+            timeout: Maximum time to wait in seconds
+
+        Returns:
+            True if a notification arrived, False on timeout
+        """
+        try:
+            await asyncio.wait_for(self._changed.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        self._changed.clear()
+        return True
+
+    def close(self) -> None:
+        """Unregister the watch."""
+        self._registry._remove(self)
+
+    def _notify(self) -> None:
+        try:
+            self._loop.call_soon_threadsafe(self._changed.set)
+        except RuntimeError:
+            # The owning event loop is closed; the request is gone
+            self.close()
+
+    def __enter__(self) -> "StatusWatch":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+
+class StatusWaiterRegistry:
+    """
+    Registry of long-poll watches by project.
+
+    Idle watches cost one asyncio event each; notify() only touches the
+    watches of the notified project.
+    """
+
+    def __init__(self):
+        self._watches: Dict[str, Set[StatusWatch]] = {}
+        self._lock = threading.Lock()
+
+    def watch(self, project_id: str) -> StatusWatch:
+        """
+        Register a watch on a project from within the running event loop.
+
+        Args:
+            project_id: Project identifier to watch
+
+        Returns:
+            StatusWatch to wait on; close it (or use it as a context manager) when done
+        """
+        status_watch = StatusWatch(self, project_id)
+        with self._lock:
+            self._watches.setdefault(project_id, set()).add(status_watch)
+        return status_watch
+
+    def notify(self, project_id: str) -> int:
+        """
+        Wake every watch registered on a project.
+
+        Args:
+            project_id: Project whose status may have changed
+
+        Returns:
+            Number of watches notified
+        """
+        with self._lock:
+            watches = list(self._watches.get(project_id, ()))
+        for status_watch in watches:
+            status_watch._notify()
+        if watches:
+            logger.debug(
+                "Status waiters notified",
+                project_id=project_id,
+                waiter_count=len(watches)
+            )
+        return len(watches)
+
+    def waiter_count(self, project_id: Optional[str] = None) -> int:
+        """Number of registered watches, for one project or overall."""
+        with self._lock:
+            if project_id is not None:
+                return len(self._watches.get(project_id, ()))
+            return sum(len(watches) for watches in self._watches.values())
+
+    def _remove(self, status_watch: StatusWatch) -> None:
+        with self._lock:
+            watches = self._watches.get(status_watch.project_id)
+            if watches is None:
+                return
+            watches.discard(status_watch)
+            if not watches:
+                del self._watches[status_watch.project_id]
+
+
+# Global status waiter registry instance
+_status_waiters = StatusWaiterRegistry()
+
+
+def get_status_waiters() -> StatusWaiterRegistry:
+    """Get the global status waiter registry instance."""
+    return _status_waiters
@@ -293,9 +293,9 @@ class TestAiderExecutionService:
     
     def test_execute_aider_command_with_prompt(self, service, mock_container, valid_execution_context):
         """Test Aider command execution with prompt."""
-        # Mock successful prompt file write and Aider execution
+        # Mock successful prompt file upload and Aider execution
+        mock_container.put_archive.return_value = True
         mock_container.exec_run.side_effect = [
-            (0, b""),  # Prompt file write
             (0, b"Aider execution with prompt completed")  # Aider execution
         ]
         
@@ -306,8 +306,10 @@ class TestAiderExecutionService:
         assert result['stdout'] == "Aider execution with prompt completed"
         assert "--message-file aider_prompt.txt" in result['command']
         
-        # Should call exec_run twice (write prompt file, execute aider)
-        assert mock_container.exec_run.call_count == 2
+        # Prompt file is uploaded as an archive, only Aider runs through exec_run
+        mock_container.put_archive.assert_called_once()
+        assert mock_container.put_archive.call_args[0][0] == "/workspace/repo"
+        assert mock_container.exec_run.call_count == 1
     
     def test_execute_aider_command_with_files(self, service, mock_container, valid_execution_context):
         """Test Aider command execution with specific files."""
@@ -413,7 +415,6 @@ class TestAiderExecutionService:
         mock_container.exec_run.side_effect = [
             (0, b"aider 0.35.0"),  # Aider version check
             (0, b"Cloning into 'repo'..."),  # Git clone
-            (0, b""),  # Prompt file write
             (0, b"Modified test.py\nAider execution completed"),  # Aider execution
             (0, b"aider 0.35.0"),  # Version for artifacts
             (0, b"diff --git a/test.py"),  # Git diff
@@ -1,6 +1,7 @@
 import os
 
 from celery import Celery
+from celery.schedules import crontab
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -33,6 +34,12 @@ def get_celery_config():
         "result_serializer": "json",
         "enable_utc": True,
         "broker_connection_retry_on_startup": True,
+        "beat_schedule": {
+            "archive-old-events": {
+                "task": "archive_old_events",
+                "schedule": crontab(hour=3, minute=0),
+            },
+        },
     }
 
 
@@ -0,0 +1,295 @@
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from core.structured_logging import get_structured_logger, LogStatus
+from core.performance_monitoring import record_task_context_flush
+from database.session import SessionLocal
+from services.status_projection_cache import get_status_projection_cache
+
+"""
+Task Context Write-Behind Buffer Module
+
+This module coalesces intermediate task_context persistence in the worker.
+Node completions stage the latest task_context snapshot per event; a flush
+writes every due snapshot with a single multi-row UPDATE, so the database
+reflects progress within the persistence SLA without a commit per node.
+"""
+
+logger = get_structured_logger(__name__)
+
+
+@dataclass
+class PendingTaskContext:
+    """Latest unflushed task_context snapshot for one event."""
+
+    event_id: str
+    execution_id: Optional[str]
+    task_context: Dict[str, Any]
+    first_staged_at: float
+    staged_at: datetime
+
+
+class TaskContextWriteBuffer:
+    """Write-behind buffer for task_context updates.
+
+    Snapshots are coalesced per event (latest wins) and flushed at most every
+    FLUSH_INTERVAL_MS per event, or immediately when staged as terminal. A
+    daemon flusher thread guarantees pending snapshots are written even when
+    no further nodes complete. Each flush writes all due events in one
+    statement and never overwrites a row that has been updated more recently
+    than the snapshot being written.
+    """
+
+    # Per-event flush interval; together with the flusher tick this keeps
+    # persistence lag under the 1s SLA.
+    FLUSH_INTERVAL_MS = int(os.getenv("TASK_CONTEXT_FLUSH_INTERVAL_MS", "500"))
+    FLUSHER_TICK_MS = 100
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        flush_interval_ms: Optional[int] = None,
+        start_flusher: bool = True
+    ):
+        """
+        Initialize the write-behind buffer.
+
+        Args:
+            session_factory: Factory returning a new database session
+            flush_interval_ms: Minimum time between flushes of one event
+            start_flusher: Whether to run the background flusher thread
+        """
+        self.session_factory = session_factory
+        self.flush_interval_ms = self.FLUSH_INTERVAL_MS if flush_interval_ms is None else flush_interval_ms
+        self.start_flusher = start_flusher
+
+        self._pending: Dict[str, PendingTaskContext] = {}
+        self._last_flushed: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._flusher: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+
+    def stage(
+        self,
+        event_id: str,
+        task_context: Dict[str, Any],
+        execution_id: Optional[str] = None,
+        terminal: bool = False,
+        correlation_id: Optional[str] = None
+    ) -> int:
+        """
+        Stage the latest task_context snapshot for an event.
+
+        Args:
+            event_id: ID of the event row to update
+            task_context: JSON-serializable task_context snapshot
+            execution_id: Optional execution identifier for metrics
+            terminal: Flush immediately (terminal workflow status)
+            correlation_id: Optional correlation ID for distributed tracing
+
+        Returns:
+            Number of events written by a flush triggered by this call
+        """
+        now = time.time()
+        with self._lock:
+            existing = self._pending.get(event_id)
+            self._pending[event_id] = PendingTaskContext(
+                event_id=event_id,
+                execution_id=execution_id,
+                task_context=task_context,
+                first_staged_at=existing.first_staged_at if existing else now,
+                staged_at=datetime.now()
+            )
+
+        if terminal:
+            return self.flush(event_ids=[event_id], terminal=True, correlation_id=correlation_id)
+
+        self._ensure_flusher()
+        if self._is_due(event_id, now):
+            return self.flush(correlation_id=correlation_id)
+        return 0
+
+    def discard(self, event_id: str) -> None:
+        """
+        Drop any pending snapshot for an event.
+
+        Used when the caller persists the final task_context itself.
+
+        Args:
+            event_id: ID of the event whose pending snapshot is dropped
+        """
+        with self._lock:
+            self._pending.pop(event_id, None)
+            self._last_flushed.pop(event_id, None)
+
+    def pending_count(self) -> int:
+        """Return the number of events with unflushed snapshots."""
+        with self._lock:
+            return len(self._pending)
+
+    def flush(
+        self,
+        event_ids: Optional[List[str]] = None,
+        terminal: bool = False,
+        force: bool = False,
+        correlation_id: Optional[str] = None
+    ) -> int:
+        """
+        Write due snapshots with a single multi-row UPDATE.
+
+        Args:
+            event_ids: Events that must be written regardless of their interval
+            terminal: Whether the flush was triggered by a terminal status
+            force: Write every pending snapshot regardless of interval
+            correlation_id: Optional correlation ID for distributed tracing
+
+        Returns:
+            Number of events written
+        """
+        with self._flush_lock:
+            now = time.time()
+            required = set(event_ids or [])
+            with self._lock:
+                batch = [
+                    entry for event_id, entry in self._pending.items()
+                    if force or event_id in required or self._is_due(event_id, now)
+                ]
+                for entry in batch:
+                    del self._pending[entry.event_id]
+
+            if terminal:
+                # Terminal events will not be staged again
+                with self._lock:
+                    for event_id in required:
+                        self._last_flushed.pop(event_id, None)
+
+            if not batch:
+                return 0
+
+            start_time = time.time()
+            try:
+                self._write_batch(batch)
+            except Exception as e:
+                # Re-queue snapshots that were not superseded meanwhile
+                with self._lock:
+                    for entry in batch:
+                        self._pending.setdefault(entry.event_id, entry)
+                logger.error(
+                    "Failed to flush buffered task_context updates",
+                    correlation_id=correlation_id,
+                    status=LogStatus.FAILED,
+                    batch_size=len(batch),
+                    terminal=terminal,
+                    error=e
+                )
+                return 0
+
+            projection_cache = get_status_projection_cache()
+            for entry in batch:
+                projection_cache.invalidate(entry.event_id)
+
+            flushed_at = time.time()
+            with self._lock:
+                for entry in batch:
+                    if not (terminal and entry.event_id in required):
+                        self._last_flushed[entry.event_id] = flushed_at
+
+            record_task_context_flush(
+                flush_lags_ms={
+                    entry.execution_id or entry.event_id: (flushed_at - entry.first_staged_at) * 1000
+                    for entry in batch
+                },
+                duration_ms=(flushed_at - start_time) * 1000,
+                terminal=terminal,
+                correlation_id=correlation_id
+            )
+            logger.debug(
+                "Buffered task_context updates flushed",
+                correlation_id=correlation_id,
+                status=LogStatus.COMPLETED,
+                batch_size=len(batch),
+                terminal=terminal,
+                duration_ms=round((flushed_at - start_time) * 1000, 2)
+            )
+            return len(batch)
+
+    def shutdown(self) -> None:
+        """Stop the flusher thread and write every pending snapshot."""
+        self._stop_event.set()
+        if self._flusher and self._flusher.is_alive():
+            self._flusher.join(timeout=self.FLUSHER_TICK_MS / 1000 * 5)
+        self._flusher = None
+        self.flush(force=True)
+
+    def _is_due(self, event_id: str, now: float) -> bool:
+        last_flushed = self._last_flushed.get(event_id)
+        return last_flushed is None or (now - last_flushed) * 1000 >= self.flush_interval_ms
+
+    def _write_batch(self, batch: List[PendingTaskContext]) -> None:
+        values = []
+        params: Dict[str, Any] = {}
+        for index, entry in enumerate(batch):
+            values.append(f"(CAST(:id_{index} AS UUID), CAST(:tc_{index} AS JSON), CAST(:ts_{index} AS TIMESTAMP))")
+            params[f"id_{index}"] = entry.event_id
+            params[f"tc_{index}"] = json.dumps(entry.task_context, default=str)
+            params[f"ts_{index}"] = entry.staged_at
+
+        # The updated_at guard keeps a late write-behind flush from clobbering
+        # a newer task_context written directly by the worker.
+        statement = text(
+            "UPDATE events SET task_context = v.task_context, updated_at = v.updated_at "
+            f"FROM (VALUES {', '.join(values)}) AS v(id, task_context, updated_at) "
+            "WHERE events.id = v.id "
+            "AND (events.updated_at IS NULL OR events.updated_at <= v.updated_at)"
+        )
+
+        session = self.session_factory()
+        try:
+            session.execute(statement, params)
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+    def _ensure_flusher(self) -> None:
+        if not self.start_flusher or (self._flusher and self._flusher.is_alive()):
+            return
+        with self._lock:
+            if self._flusher and self._flusher.is_alive():
+                return
+            self._stop_event.clear()
+            self._flusher = threading.Thread(
+                target=self._flusher_loop,
+                name="task-context-flusher",
+                daemon=True
+            )
+            self._flusher.start()
+
+    def _flusher_loop(self) -> None:
+        while not self._stop_event.wait(self.FLUSHER_TICK_MS / 1000):
+            if self.pending_count():
+                self.flush()
+
+
+# Per-process buffer; created lazily so the flusher thread starts after the
+# Celery worker has forked.
+_task_context_buffer: Optional[TaskContextWriteBuffer] = None
+
+
+def get_task_context_buffer() -> TaskContextWriteBuffer:
+    """Get the per-process task_context write-behind buffer."""
+    global _task_context_buffer
+    if _task_context_buffer is None:
+        _task_context_buffer = TaskContextWriteBuffer()
+    return _task_context_buffer
@@ -13,6 +13,9 @@ from workflows.workflow_registry import WorkflowRegistry
 from schemas.event_schema import EventRequest
 from services.execution_update_service import send_execution_update
 from services.execution_log_service import get_execution_log_service, LogEntryType
+from services.event_archive_service import get_event_archive_service
+from services.status_projection_cache import get_status_projection_cache
+from worker.task_context_buffer import get_task_context_buffer
 from pydantic import ValidationError as PydanticValidationError
 
 # Configure structured logging
@@ -266,8 +269,65 @@ def process_incoming_event(self, event_id: str):
                             error_message=str(update_error)
                         )
                 
+                # Persist intermediate node results through the write-behind buffer
+                context_buffer = get_task_context_buffer()
+                run_metadata = {
+                    'correlationId': correlation_id,
+                    'taskId': str(self.request.id),
+                    'executionId': execution_id,
+                    'project_id': project_id
+                }
+                last_snapshot = {}
+
+                def stage_node_result(node_name, node_task_context):
+                    try:
+                        snapshot = node_task_context.model_dump(mode="json", exclude={'metadata'})
+                        snapshot['metadata'] = {
+                            key: value for key, value in node_task_context.metadata.items()
+                            if key != 'nodes'
+                        }
+                        snapshot['metadata'].update(run_metadata)
+                        snapshot['metadata'].setdefault('status', 'running')
+                        last_snapshot['task_context'] = snapshot
+                        context_buffer.stage(
+                            event_id=event_id,
+                            task_context=snapshot,
+                            execution_id=execution_id,
+                            correlation_id=correlation_id
+                        )
+                    except Exception as stage_error:
+                        logger.warn(
+                            "Failed to stage intermediate task context",
+                            correlation_id=correlation_id,
+                            project_id=project_id,
+                            execution_id=execution_id,
+                            node=node_name,
+                            error_message=str(stage_error)
+                        )
+
+                workflow.on_node_complete = stage_node_result
+
                 # Execute the workflow
-                task_context = workflow.run(db_event.data).model_dump(mode="json")
+                try:
+                    task_context = workflow.run(db_event.data).model_dump(mode="json")
+                except Exception as run_error:
+                    # Terminal status: write the last staged node results now,
+                    # marked as failed so the execution does not stay "running"
+                    error_task_context = dict(last_snapshot.get('task_context') or {'nodes': {}})
+                    error_task_context['metadata'] = {
+                        **error_task_context.get('metadata', run_metadata),
+                        'status': 'error',
+                        'error_message': str(run_error),
+                        'error_type': type(run_error).__name__
+                    }
+                    context_buffer.stage(
+                        event_id=event_id,
+                        task_context=error_task_context,
+                        execution_id=execution_id,
+                        terminal=True,
+                        correlation_id=correlation_id
+                    )
+                    raise
                 
                 # Ensure correlationId is included in task_context metadata
                 if 'metadata' not in task_context:
@@ -280,8 +340,12 @@ def process_incoming_event(self, event_id: str):
                 # Update the database event with task context
                 setattr(db_event, 'task_context', task_context)
 
+                # Final results supersede any buffered intermediate snapshot
+                context_buffer.discard(event_id)
+
                 # Update event with processing results
                 repository.update(obj=db_event)
+                get_status_projection_cache().invalidate(event_id)
                 
                 # Send completion execution update
                 if project_id:
@@ -394,3 +458,32 @@ def process_incoming_event(self, event_id: str):
             error=e
         )
         raise
+
+
+@celery_app.task(name="archive_old_events")
+def archive_old_events():
+    """Runs the events retention cycle.
+
+    Keeps upcoming monthly partitions of the events table in place, moves
+    finished events past the retention window to the archive table and drops
+    partitions that have been fully drained. Scheduled daily via Celery beat.
+
+    Returns:
+        Dict summarizing the retention run
+    """
+    correlation_id = f"retention_{int(time.time() * 1000)}"
+    with contextmanager(db_session)() as session:
+        summary = get_event_archive_service(
+            session=session,
+            correlation_id=correlation_id
+        ).run_retention()
+
+    logger.info(
+        "Events retention run completed",
+        correlation_id=correlation_id,
+        node="archive_old_events",
+        status=LogStatus.COMPLETED,
+        archived_events=summary["archived_events"],
+        dropped_partitions=summary["dropped_partitions"]
+    )
+    return summary
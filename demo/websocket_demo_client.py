@@ -10,6 +10,10 @@ Features:
 - Connection state management (connecting, connected, disconnected, reconnecting)
 - Client-side payload size validation (10KB limit)
 - Linear reconnect with fixed 2-second intervals (ADD Profile C)
+- Resume after reconnect from the last received broadcast sequence number
+- Optional compressed/binary subprotocols with bytes-on-wire and decode-time stats
+- Server-side subscription filters by message type, execution and log level
+- Answers server heartbeat pings
 - Comprehensive error handling and structured logging
 """
 
@@ -23,6 +27,7 @@ from enum import Enum
 from typing import Dict, Any, Optional, Callable, List
 from dataclasses import dataclass, field
 from collections import deque
+from urllib.parse import quote
 import statistics
 
 import websockets
@@ -33,6 +38,7 @@ import sys
 import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 from core.structured_logging import get_structured_logger, LogStatus
+from core.websocket_codecs import FrameDecoder
 
 
 class ConnectionState(str, Enum):
@@ -51,6 +57,12 @@ class MessageType(str, Enum):
     COMPLETION = "completion"
     CONNECTION_ESTABLISHED = "connection-established"
     MESSAGE_RECEIVED = "message-received"
+    REPLAY_GAP = "replay-gap"
+    SUBSCRIBE = "subscribe"
+    UNSUBSCRIBE = "unsubscribe"
+    SUBSCRIPTION_UPDATED = "subscription-updated"
+    PING = "ping"
+    PONG = "pong"
 
 
 @dataclass
@@ -264,6 +276,16 @@ class ClientConfig:
     max_payload_size: int = 10240  # 10KB limit to match server
     connection_timeout: float = 10.0
     message_timeout: float = 5.0
+    resume_on_reconnect: bool = True  # Ask the server to replay broadcasts missed while disconnected
+    # Subprotocols to request in preference order, e.g. ["clarity.msgpack+deflate", "clarity.json+deflate"];
+    # empty for plain JSON text frames
+    subprotocols: List[str] = field(default_factory=list)
+    # Transport permessage-deflate; disabled automatically when an application-level +deflate subprotocol is requested
+    permessage_deflate: bool = True
+    # Broadcast filters applied by the server from connect on; empty/None for all
+    subscribe_types: List[str] = field(default_factory=list)
+    subscribe_execution_ids: List[str] = field(default_factory=list)
+    min_log_level: Optional[str] = None
     performance_thresholds: PerformanceThresholds = field(default_factory=PerformanceThresholds)
 
 
@@ -308,6 +330,7 @@ class WebSocketDemoClient:
         self.on_state_change: Optional[Callable[[ConnectionState], None]] = None
         self.on_error: Optional[Callable[[Exception], None]] = None
         self.on_performance_alert: Optional[Callable[[str, float, float], None]] = None
+        self.on_replay_gap: Optional[Callable[[Dict[str, Any]], None]] = None
         
         # Statistics
         self.connection_attempts = 0
@@ -315,6 +338,18 @@ class WebSocketDemoClient:
         self.messages_received = 0
         self.last_connection_time: Optional[float] = None
         
+        # Negotiated subprotocol and wire statistics
+        self.subprotocol: Optional[str] = None
+        self.frame_decoder = FrameDecoder()
+        self.bytes_received = 0
+        self.frames_received = 0
+        self.decode_time_ms = 0.0
+        
+        # Broadcast sequence tracking for resume after reconnect
+        self.last_seq: Optional[int] = None
+        self.duplicate_messages = 0
+        self.replay_gaps = 0
+        
         # Performance monitoring
         self.performance_stats = PerformanceStats()
         self.handshake_start_time: Optional[float] = None
@@ -418,7 +453,16 @@ class WebSocketDemoClient:
             Complete WebSocket URI
         """
         base_uri = f"{self.config.server_url}/api/v1/ws/devteam"
-        return f"{base_uri}?projectId={self.config.project_id}"
+        uri = f"{base_uri}?projectId={self.config.project_id}"
+        if self.config.resume_on_reconnect and self.last_seq is not None:
+            uri += f"&resume_from={self.last_seq}"
+        if self.config.subscribe_types:
+            uri += f"&types={quote(','.join(self.config.subscribe_types))}"
+        if self.config.subscribe_execution_ids:
+            uri += f"&execution_ids={quote(','.join(self.config.subscribe_execution_ids))}"
+        if self.config.min_log_level:
+            uri += f"&min_log_level={quote(self.config.min_log_level)}"
+        return uri
     
     def _build_auth_headers(self) -> Dict[str, str]:
         """
@@ -590,10 +634,18 @@ class WebSocketDemoClient:
             self.logger.info(f"Connecting to {uri} (attempt {self.connection_attempts})")
             
             # Connect with timeout
+            app_deflate = any(subprotocol.endswith("+deflate") for subprotocol in self.config.subprotocols)
             self.websocket = await asyncio.wait_for(
-                websockets.connect(uri, additional_headers=headers),
+                websockets.connect(
+                    uri,
+                    additional_headers=headers,
+                    subprotocols=self.config.subprotocols or None,
+                    compression="deflate" if self.config.permessage_deflate and not app_deflate else None
+                ),
                 timeout=self.config.connection_timeout
             )
+            self.subprotocol = self.websocket.subprotocol
+            self.frame_decoder = FrameDecoder(self.subprotocol)
             
             # Calculate handshake time
             handshake_duration = (time.time() - self.handshake_start_time) * 1000  # Convert to ms
@@ -796,15 +848,46 @@ class WebSocketDemoClient:
             self.logger.error(f"Error sending message: {e}")
             return False
     
-    async def _handle_received_message(self, message_data: str) -> None:
+    async def subscribe(
+        self,
+        types: Optional[List[str]] = None,
+        execution_ids: Optional[List[str]] = None,
+        min_log_level: Optional[str] = None
+    ) -> bool:
+        """
+        Narrow the broadcasts the server sends to this client.
+        
+        Filters left as None are unchanged. They are kept in the config so
+        reconnects apply them from the start.
+        
+        Returns:
+            True if the subscribe message was sent, False otherwise
+        """
+        payload: Dict[str, Any] = {}
+        if types is not None:
+            payload["types"] = self.config.subscribe_types = list(types)
+        if execution_ids is not None:
+            payload["execution_ids"] = self.config.subscribe_execution_ids = list(execution_ids)
+        if min_log_level is not None:
+            payload["min_log_level"] = self.config.min_log_level = min_log_level
+        return await self.send_message(MessageType.SUBSCRIBE, payload)
+    
+    async def _handle_received_message(self, message_data: Any) -> None:
         """
         Handle received WebSocket message with latency tracking.
         
         Args:
-            message_data: Raw message data from WebSocket
+            message_data: Raw text or binary frame from WebSocket
         """
         try:
-            message = json.loads(message_data)
+            self.frames_received += 1
+            self.bytes_received += len(message_data)
+            decode_start = time.perf_counter()
+            message = self.frame_decoder.decode(message_data)
+            self.decode_time_ms += (time.perf_counter() - decode_start) * 1000
+            if message is None:
+                # More chunks of this message to come
+                return
             self.messages_received += 1
             
             # Check for message ID to calculate latency
@@ -836,6 +919,31 @@ class WebSocketDemoClient:
                 self.logger.error("Received invalid message envelope")
                 return
             
+            # Skip broadcasts already received before a reconnect
+            seq = message.get("seq")
+            if isinstance(seq, int):
+                if self.last_seq is not None and seq <= self.last_seq:
+                    self.duplicate_messages += 1
+                    return
+                self.last_seq = seq
+            
+            if message["type"] == MessageType.PING.value:
+                # Server heartbeat; unanswered pings get the connection evicted
+                await self.websocket.send(json.dumps(self.create_message_envelope(MessageType.PONG, {})))
+                return
+            
+            if message["type"] == MessageType.REPLAY_GAP.value:
+                # Missed broadcasts are gone; refetch state and continue from the latest one
+                self.replay_gaps += 1
+                latest_seq = message["payload"].get("latest_seq")
+                self.last_seq = latest_seq if isinstance(latest_seq, int) else None
+                self.logger.warning(f"Replay gap after seq {message['payload'].get('resume_from')}, refetch required")
+                if self.on_replay_gap:
+                    try:
+                        self.on_replay_gap(message["payload"])
+                    except Exception as e:
+                        self.logger.error(f"Error in replay gap handler: {e}")
+            
             self.logger.debug(f"Received message: {message.get('type', 'unknown')}")
             
             # Call message handler if set
@@ -991,6 +1099,13 @@ class WebSocketDemoClient:
             "connection_attempts": self.connection_attempts,
             "messages_sent": self.messages_sent,
             "messages_received": self.messages_received,
+            "subprotocol": self.subprotocol,
+            "frames_received": self.frames_received,
+            "bytes_received": self.bytes_received,
+            "decode_time_ms": round(self.decode_time_ms, 3),
+            "last_seq": self.last_seq,
+            "duplicate_messages": self.duplicate_messages,
+            "replay_gaps": self.replay_gaps,
             "last_connection_time": self.last_connection_time,
             "uptime_seconds": time.time() - self.last_connection_time if self.last_connection_time else 0,
             "project_id": self.config.project_id,
@@ -0,0 +1,544 @@
+#!/usr/bin/env python3
+"""
+Headless WebSocket Load Test for Clarity Local Runner
+
+This module drives the /ws/devteam endpoint at realistic scale, without the
+interactive demo client:
+- Opens many concurrent authenticated connections spread over many projects
+- Injects execution-log broadcasts at a controlled rate through
+  ExecutionLogService inside the server process
+- Records handshake time and publish-to-receive latency percentiles
+- Samples server CPU and memory while the load runs
+- Writes a JSON report with the full configuration, so a run can be repeated
+
+By default the server is started as a subprocess of this script. It serves
+the WebSocket router only, authenticates with a local HS256 JWT stub instead
+of Supabase, and adds /loadtest routes for injection and resource sampling.
+
+Performance Requirements:
+- Handshake time: ≤300ms (p95)
+- Publish-to-receive latency: ≤500ms (p95)
+
+Usage:
+    python demo/websocket_load_test.py --connections 2000 --projects 50 \\
+        --rate 200 --duration 30 --report websocket_load_report.json
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import urllib.request
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import jwt
+import websockets
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'app'))
+
+# Make psutil optional; the server falls back to getrusage and /proc
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+    psutil = None  # type: ignore
+
+
+HANDSHAKE_TARGET_MS = 300.0
+DELIVERY_TARGET_MS = 500.0
+
+logger = logging.getLogger("websocket_load_test")
+
+
+@dataclass
+class LoadTestConfig:
+    """Configuration of one load test run."""
+    connections: int = 1000
+    projects: int = 20
+    users: int = 100
+    rate: float = 100.0  # Broadcasts per second across all projects
+    duration: float = 30.0  # Injection duration in seconds
+    drain_seconds: float = 5.0  # Wait for in-flight deliveries after injection
+    connect_concurrency: int = 200  # Handshakes in flight at once
+    message_bytes: int = 200  # Log message size
+    subprotocol: Optional[str] = None  # e.g. clarity.json+deflate; plain JSON when None
+    seed: int = 1
+    host: str = "127.0.0.1"
+    port: int = 8091
+    jwt_secret: str = "clarity-load-test-secret"
+    server_url: Optional[str] = None  # http(s) URL of a running load test server; started locally when None
+    server_log: str = "websocket_load_server.log"  # Output of the locally started server
+
+
+class LocalJWTAuth:
+    """
+    Local JWT stub standing in for SupabaseJWTAuth.
+
+    Validates HS256 tokens signed with a shared secret and builds the user
+    context from the token claims, without Supabase lookups.
+    """
+
+    def __init__(self, jwt_secret: str):
+        self.jwt_secret = jwt_secret
+
+    async def validate_token(self, token: str):
+        """Validate a token and return its user context."""
+        from auth.exceptions import InvalidTokenError
+        from auth.models import UserContext, UserRole
+
+        try:
+            payload = jwt.decode(token, self.jwt_secret, algorithms=["HS256"])
+        except jwt.InvalidTokenError as e:
+            raise InvalidTokenError(f"Invalid token: {str(e)}")
+
+        return UserContext(
+            user_id=payload["sub"],
+            email=payload.get("email", f"{payload['sub']}@loadtest.local"),
+            role=UserRole(payload.get("role", UserRole.PARENT.value)),
+            authenticated=True,
+            auth_type="local_jwt_stub"
+        )
+
+
+def issue_token(jwt_secret: str, user_id: str) -> str:
+    """Issue a load test token for a user."""
+    return jwt.encode(
+        {"sub": user_id, "email": f"{user_id}@loadtest.local", "role": "parent", "exp": int(time.time()) + 86400},
+        jwt_secret,
+        algorithm="HS256"
+    )
+
+
+def percentiles(values: List[float]) -> Dict[str, Optional[float]]:
+    """Count, nearest-rank percentiles and max of a sample."""
+    if not values:
+        return {"count": 0, "p50": None, "p90": None, "p95": None, "p99": None, "max": None}
+    ordered = sorted(values)
+
+    def rank(percent: float) -> float:
+        index = max(0, min(len(ordered) - 1, int(round(percent / 100 * len(ordered) + 0.5)) - 1))
+        return round(ordered[index], 2)
+
+    return {
+        "count": len(ordered),
+        "p50": rank(50),
+        "p90": rank(90),
+        "p95": rank(95),
+        "p99": rank(99),
+        "max": round(ordered[-1], 2),
+    }
+
+
+def project_ids(config: LoadTestConfig) -> List[str]:
+    """Project identifiers of a run."""
+    return [f"loadtest-project-{index}" for index in range(config.projects)]
+
+
+# Server side
+
+def _process_resources() -> Dict[str, float]:
+    """CPU seconds and resident memory of the current process."""
+    if PSUTIL_AVAILABLE:
+        process = psutil.Process()
+        cpu = process.cpu_times()
+        return {"cpu_seconds": cpu.user + cpu.system, "rss_bytes": float(process.memory_info().rss)}
+
+    import resource
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    rss_bytes = float(usage.ru_maxrss * 1024)
+    try:
+        with open("/proc/self/statm") as statm:
+            rss_bytes = float(int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE"))
+    except (OSError, ValueError, IndexError):
+        pass
+    return {"cpu_seconds": usage.ru_utime + usage.ru_stime, "rss_bytes": rss_bytes}
+
+
+def build_server_app(jwt_secret: str):
+    """
+    FastAPI app serving the WebSocket endpoint with the local JWT stub and
+    the /loadtest routes.
+    """
+    from fastapi import FastAPI
+    from pydantic import BaseModel
+
+    from api.v1.endpoints.websocket import get_total_connection_count, router as websocket_router
+    from auth.dependencies import initialize_auth_handler
+    from core.structured_logging import LogLevel
+    from core.websocket_bus import get_message_bus
+    from services.execution_log_service import ExecutionLogService, LogEntryType
+
+    initialize_auth_handler(LocalJWTAuth(jwt_secret))
+
+    app = FastAPI(title="Clarity WebSocket Load Test Server")
+    app.include_router(websocket_router, prefix="/api/v1/ws")
+    state: Dict[str, Any] = {"injected": 0, "done": True, "task": None}
+
+    class InjectRequest(BaseModel):
+        projects: List[str]
+        rate: float
+        duration: float
+        message_bytes: int = 200
+        seed: int = 1
+
+    async def inject(request: InjectRequest) -> None:
+        service = ExecutionLogService(correlation_id="websocket-load-test")
+        rng = random.Random(request.seed)
+        message = "x" * request.message_bytes
+        total = int(request.rate * request.duration)
+        started = time.perf_counter()
+        for index in range(total):
+            delay = started + index / request.rate - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            project_id = rng.choice(request.projects)
+            await service.send_execution_log(
+                project_id=project_id,
+                execution_id=f"{project_id}-exec",
+                log_entry_type=LogEntryType.INFO_LOG,
+                message=message,
+                level=LogLevel.INFO,
+                additional_data={"load_test_index": index, "published_at": time.time()}
+            )
+            state["injected"] += 1
+        state["done"] = True
+
+    @app.on_event("startup")
+    async def startup() -> None:
+        await get_message_bus().start()
+
+    @app.on_event("shutdown")
+    async def shutdown() -> None:
+        await get_message_bus().stop()
+
+    @app.post("/loadtest/inject")
+    async def start_injection(request: InjectRequest) -> Dict[str, Any]:
+        state.update(injected=0, done=False)
+        state["task"] = asyncio.create_task(inject(request))
+        return {"started": True, "planned": int(request.rate * request.duration)}
+
+    @app.get("/loadtest/status")
+    async def status() -> Dict[str, Any]:
+        return {
+            "injected": state["injected"],
+            "done": state["done"],
+            "connections": get_total_connection_count(),
+            **_process_resources()
+        }
+
+    return app
+
+
+def serve(host: str, port: int, jwt_secret: str) -> None:
+    """Run the load test server (blocking)."""
+    import uvicorn
+
+    uvicorn.run(build_server_app(jwt_secret), host=host, port=port, log_level="warning")
+
+
+# Client side
+
+async def _http(method: str, url: str, body: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    def call() -> Dict[str, Any]:
+        data = json.dumps(body).encode("utf-8") if body is not None else None
+        request = urllib.request.Request(url, data=data, method=method, headers={"Content-Type": "application/json"})
+        with urllib.request.urlopen(request, timeout=10) as response:
+            return json.loads(response.read())
+
+    return await asyncio.to_thread(call)
+
+
+class WebSocketLoadTest:
+    """
+    Headless load generator against the /ws/devteam endpoint.
+
+    Example usage:
+        report = await WebSocketLoadTest(LoadTestConfig(connections=500)).run()
+    """
+
+    def __init__(self, config: LoadTestConfig):
+        self.config = config
+        self.http_url = config.server_url or f"http://{config.host}:{config.port}"
+        self.ws_url = self.http_url.replace("http", "ws", 1) + "/api/v1/ws/devteam"
+        self.projects = project_ids(config)
+        self.server_process: Optional[subprocess.Popen] = None
+
+        self.handshake_ms: List[float] = []
+        self.handshake_failures: Dict[str, int] = {}
+        self.latencies_ms: List[float] = []
+        self.received = 0
+        self.connections_per_project: Dict[str, int] = {}
+        self.resource_samples: List[Dict[str, float]] = []
+        self._websockets: List[Any] = []
+        self._readers: List[asyncio.Task] = []
+
+    async def run(self) -> Dict[str, Any]:
+        """Run the load test and return the report."""
+        started_at = datetime.utcnow().isoformat() + "Z"
+        if self.config.server_url is None:
+            await self._start_server()
+        sampler = None
+        try:
+            await self._open_connections()
+            sampler = asyncio.create_task(self._sample_resources())
+            injection = await self._inject()
+            await asyncio.sleep(self.config.drain_seconds)
+        finally:
+            if sampler is not None:
+                sampler.cancel()
+            await self._close_connections()
+            self._stop_server()
+        return self._report(started_at, injection)
+
+    async def _start_server(self) -> None:
+        """Start the load test server subprocess and wait until it answers."""
+        with open(self.config.server_log, "w") as server_log:
+            self.server_process = subprocess.Popen(
+                [
+                    sys.executable, os.path.abspath(__file__), "--serve",
+                    "--host", self.config.host, "--port", str(self.config.port), "--jwt-secret", self.config.jwt_secret
+                ],
+                stdout=server_log,
+                stderr=subprocess.STDOUT
+            )
+        deadline = time.monotonic() + 30
+        while time.monotonic() < deadline:
+            if self.server_process.poll() is not None:
+                raise RuntimeError(
+                    f"Load test server exited with code {self.server_process.returncode}, see {self.config.server_log}"
+                )
+            try:
+                await _http("GET", f"{self.http_url}/loadtest/status")
+                return
+            except OSError:
+                await asyncio.sleep(0.2)
+        raise RuntimeError("Load test server did not start within 30s")
+
+    def _stop_server(self) -> None:
+        if self.server_process is not None and self.server_process.poll() is None:
+            self.server_process.terminate()
+            try:
+                self.server_process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.server_process.kill()
+
+    async def _open_connections(self) -> None:
+        """Open all connections, at most connect_concurrency handshakes at once."""
+        semaphore = asyncio.Semaphore(self.config.connect_concurrency)
+        tokens = [issue_token(self.config.jwt_secret, f"load-user-{user}") for user in range(self.config.users)]
+
+        async def open_connection(index: int) -> None:
+            project_id = self.projects[index % len(self.projects)]
+            uri = f"{self.ws_url}?project_id={project_id}"
+            async with semaphore:
+                start_time = time.perf_counter()
+                try:
+                    websocket = await websockets.connect(
+                        uri,
+                        additional_headers={"Authorization": f"Bearer {tokens[index % len(tokens)]}"},
+                        subprotocols=[self.config.subprotocol] if self.config.subprotocol else None,
+                        compression=None,
+                        open_timeout=30
+                    )
+                    # The welcome message completes the server-side handshake
+                    await websocket.recv()
+                except Exception as e:
+                    error_type = type(e).__name__
+                    self.handshake_failures[error_type] = self.handshake_failures.get(error_type, 0) + 1
+                    return
+                self.handshake_ms.append((time.perf_counter() - start_time) * 1000)
+            self.connections_per_project[project_id] = self.connections_per_project.get(project_id, 0) + 1
+            self._websockets.append(websocket)
+            self._readers.append(asyncio.create_task(self._read(websocket)))
+
+        await asyncio.gather(*(open_connection(index) for index in range(self.config.connections)))
+        logger.info(f"Opened {len(self._websockets)}/{self.config.connections} connections")
+
+    async def _read(self, websocket) -> None:
+        """Record publish-to-receive latency of injected broadcasts."""
+        from core.websocket_codecs import FrameDecoder
+
+        decoder = FrameDecoder(websocket.subprotocol)
+        try:
+            async for frame in websocket:
+                message = decoder.decode(frame)
+                if message is None:
+                    continue
+                if message.get("type") == "ping":
+                    await websocket.send(json.dumps({
+                        "type": "pong",
+                        "ts": datetime.utcnow().isoformat() + "Z",
+                        "projectId": message.get("projectId"),
+                        "payload": {}
+                    }))
+                    continue
+                published_at = (message.get("payload") or {}).get("published_at")
+                if published_at is not None:
+                    self.latencies_ms.append((time.time() - published_at) * 1000)
+                    self.received += 1
+        except websockets.ConnectionClosed:
+            pass
+
+    async def _inject(self) -> Dict[str, Any]:
+        """Start server-side injection and wait for it to finish."""
+        await _http("POST", f"{self.http_url}/loadtest/inject", {
+            "projects": self.projects,
+            "rate": self.config.rate,
+            "duration": self.config.duration,
+            "message_bytes": self.config.message_bytes,
+            "seed": self.config.seed
+        })
+        while True:
+            await asyncio.sleep(0.5)
+            status = await _http("GET", f"{self.http_url}/loadtest/status")
+            if status["done"]:
+                return status
+
+    async def _sample_resources(self) -> None:
+        """Sample server CPU and memory once per second."""
+        previous = None
+        while True:
+            status = await _http("GET", f"{self.http_url}/loadtest/status")
+            now = time.monotonic()
+            if previous is not None:
+                self.resource_samples.append({
+                    "cpu_percent": (status["cpu_seconds"] - previous[1]["cpu_seconds"]) / (now - previous[0]) * 100,
+                    "rss_mb": status["rss_bytes"] / (1024 * 1024)
+                })
+            previous = (now, status)
+            await asyncio.sleep(1.0)
+
+    async def _close_connections(self) -> None:
+        await asyncio.gather(*(websocket.close() for websocket in self._websockets), return_exceptions=True)
+        for reader in self._readers:
+            reader.cancel()
+        await asyncio.gather(*self._readers, return_exceptions=True)
+
+    def _report(self, started_at: str, injection: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the run report."""
+        # Injection picks projects with a seeded RNG; replay it to count expected deliveries
+        rng = random.Random(self.config.seed)
+        expected = sum(
+            self.connections_per_project.get(rng.choice(self.projects), 0) for _ in range(injection["injected"])
+        )
+        handshake = percentiles(self.handshake_ms)
+        delivery = percentiles(self.latencies_ms)
+        cpu = [sample["cpu_percent"] for sample in self.resource_samples]
+        rss = [sample["rss_mb"] for sample in self.resource_samples]
+
+        return {
+            "started_at": started_at,
+            "config": asdict(self.config),
+            "environment": {
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "cpu_count": os.cpu_count(),
+                "websockets": websockets.__version__,
+            },
+            "connections": {
+                "opened": len(self.handshake_ms),
+                "failed": self.handshake_failures,
+            },
+            "handshake_ms": handshake,
+            "delivery": {
+                "broadcasts_injected": injection["injected"],
+                "expected_deliveries": expected,
+                "received_deliveries": self.received,
+                "loss_percent": round((1 - self.received / expected) * 100, 3) if expected else None,
+                "latency_ms": delivery,
+            },
+            "server_resources": {
+                "samples": len(self.resource_samples),
+                "cpu_percent_avg": round(sum(cpu) / len(cpu), 1) if cpu else None,
+                "cpu_percent_max": round(max(cpu), 1) if cpu else None,
+                "rss_mb_max": round(max(rss), 1) if rss else None,
+            },
+            "targets": {
+                "handshake_p95_ms": HANDSHAKE_TARGET_MS,
+                "delivery_p95_ms": DELIVERY_TARGET_MS,
+                "handshake_met": handshake["p95"] is not None and handshake["p95"] <= HANDSHAKE_TARGET_MS,
+                "delivery_met": delivery["p95"] is not None and delivery["p95"] <= DELIVERY_TARGET_MS,
+            },
+        }
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    """Print a short summary of a report."""
+    handshake = report["handshake_ms"]
+    delivery = report["delivery"]
+    resources = report["server_resources"]
+    targets = report["targets"]
+
+    print("\n" + "=" * 60)
+    print("WEBSOCKET LOAD TEST SUMMARY")
+    print("=" * 60)
+    print(f"Connections: {report['connections']['opened']}/{report['config']['connections']} "
+          f"over {report['config']['projects']} projects, failures: {report['connections']['failed'] or 'none'}")
+    print(f"Handshake ms: p50={handshake['p50']} p95={handshake['p95']} p99={handshake['p99']} max={handshake['max']} "
+          f"({'✅' if targets['handshake_met'] else '❌'} ≤{targets['handshake_p95_ms']:.0f}ms p95)")
+    latency = delivery["latency_ms"]
+    print(f"Deliveries: {delivery['received_deliveries']}/{delivery['expected_deliveries']} "
+          f"of {delivery['broadcasts_injected']} broadcasts (loss {delivery['loss_percent']}%)")
+    print(f"Delivery ms: p50={latency['p50']} p95={latency['p95']} p99={latency['p99']} max={latency['max']} "
+          f"({'✅' if targets['delivery_met'] else '❌'} ≤{targets['delivery_p95_ms']:.0f}ms p95)")
+    print(f"Server: CPU avg {resources['cpu_percent_avg']}% max {resources['cpu_percent_max']}%, "
+          f"RSS max {resources['rss_mb_max']} MB")
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    defaults = LoadTestConfig()
+    parser = argparse.ArgumentParser(description="Headless WebSocket load test")
+    parser.add_argument("--serve", action="store_true", help="Run the load test server instead of the load generator")
+    parser.add_argument("--connections", type=int, default=defaults.connections)
+    parser.add_argument("--projects", type=int, default=defaults.projects)
+    parser.add_argument("--users", type=int, default=defaults.users)
+    parser.add_argument("--rate", type=float, default=defaults.rate, help="Broadcasts per second across all projects")
+    parser.add_argument("--duration", type=float, default=defaults.duration, help="Injection duration in seconds")
+    parser.add_argument("--drain-seconds", type=float, default=defaults.drain_seconds)
+    parser.add_argument("--connect-concurrency", type=int, default=defaults.connect_concurrency)
+    parser.add_argument("--message-bytes", type=int, default=defaults.message_bytes)
+    parser.add_argument("--subprotocol", default=defaults.subprotocol)
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument("--host", default=defaults.host)
+    parser.add_argument("--port", type=int, default=defaults.port)
+    parser.add_argument("--jwt-secret", default=defaults.jwt_secret)
+    parser.add_argument("--server-url", default=None, help="Running load test server (started locally if omitted)")
+    parser.add_argument("--server-log", default=defaults.server_log, help="Output file of the locally started server")
+    parser.add_argument("--report", default="websocket_load_report.json", help="Report file path")
+    return parser.parse_args(argv)
+
+
+async def main(argv: Optional[List[str]] = None) -> int:
+    """Run a load test from command line arguments."""
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    config = LoadTestConfig(**{
+        name: getattr(args, name) for name in LoadTestConfig.__dataclass_fields__
+    })
+    report = await WebSocketLoadTest(config).run()
+
+    with open(args.report, "w") as report_file:
+        json.dump(report, report_file, indent=2)
+    print_report(report)
+    print(f"\nReport written to {args.report}")
+
+    targets = report["targets"]
+    return 0 if targets["handshake_met"] and targets["delivery_met"] else 1
+
+
+if __name__ == "__main__":
+    arguments = parse_args()
+    if arguments.serve:
+        serve(arguments.host, arguments.port, arguments.jwt_secret)
+    else:
+        sys.exit(asyncio.run(main()))
@@ -0,0 +1,186 @@
+"""
+Unit Tests for the Async AiderExecutionService API
+
+Tests the *_async counterparts of the blocking execute_* methods:
+- Calls run on the bounded execution thread pool without blocking the event loop
+- Several executions proceed concurrently
+- Cancelling the awaiting task terminates the running container command
+- Commands are not started once cancelled
+"""
+
+import asyncio
+import threading
+import time
+from unittest.mock import Mock
+
+import pytest
+from docker.models.containers import Container
+
+from services.aider_execution_service import (
+    AiderExecutionContext,
+    AiderExecutionResult,
+    AiderExecutionService,
+    get_aider_executor,
+)
+from services.container_output_stream import (
+    CommandCancellation,
+    CommandCancelled,
+    cancellation_scope,
+    stream_exec,
+)
+
+
+def _context(execution_id="exec_123"):
+    return AiderExecutionContext(project_id="test-project", execution_id=execution_id)
+
+
+def _result(context):
+    return AiderExecutionResult(
+        success=True,
+        execution_id=context.execution_id,
+        project_id=context.project_id,
+        stdout_output="",
+        stderr_output="",
+        exit_code=0
+    )
+
+
+def _blocking_container(release):
+    """Docker container double whose command runs until it is signalled."""
+    container = Mock(spec=Container)
+    container.id = "container_123"
+    container.client = Mock()
+    api = container.client.api
+    api.exec_create.return_value = {"Id": "exec-1"}
+    api.exec_inspect.return_value = {"ExitCode": 143}
+
+    def output(*args, **kwargs):
+        yield b"started\n", None
+        release.wait(5)
+
+    def exec_run(command):
+        if "kill" in command[-1]:
+            release.set()
+        return 0, b""
+
+    api.exec_start.side_effect = output
+    container.exec_run.side_effect = exec_run
+    return container
+
+
+class TestAsyncExecution:
+    """Test suite for the async execute_* counterparts."""
+
+    def test_async_call_returns_result_off_loop(self):
+        """The blocking method runs on an execution pool thread with the same arguments."""
+        service = AiderExecutionService(correlation_id="corr_123")
+        calls = []
+
+        def execute_npm_build(context, working_directory, build_script):
+            calls.append((threading.current_thread().name, working_directory, build_script))
+            return _result(context)
+
+        service.execute_npm_build = execute_npm_build
+        context = _context()
+
+        result = asyncio.run(service.execute_npm_build_async(context, "/workspace/app", build_script="dist"))
+
+        assert result.execution_id == "exec_123"
+        thread_name, working_directory, build_script = calls[0]
+        assert thread_name.startswith("aider-execution")
+        assert (working_directory, build_script) == ("/workspace/app", "dist")
+
+    def test_executions_run_concurrently(self):
+        """Blocking executions overlap and the event loop keeps running meanwhile."""
+        service = AiderExecutionService(correlation_id="corr_123")
+
+        def execute_npm_ci(context, working_directory):
+            time.sleep(0.2)
+            return _result(context)
+
+        service.execute_npm_ci = execute_npm_ci
+        ticks = []
+
+        async def main():
+            async def ticker():
+                while True:
+                    ticks.append(time.perf_counter())
+                    await asyncio.sleep(0.01)
+
+            ticking = asyncio.create_task(ticker())
+            started = time.perf_counter()
+            results = await asyncio.gather(
+                service.execute_npm_ci_async(_context("exec_1")),
+                service.execute_npm_ci_async(_context("exec_2"))
+            )
+            elapsed = time.perf_counter() - started
+            ticking.cancel()
+            return results, elapsed
+
+        assert get_aider_executor()._max_workers >= 2
+        results, elapsed = asyncio.run(main())
+
+        assert [result.execution_id for result in results] == ["exec_1", "exec_2"]
+        assert elapsed < 0.35
+        assert len(ticks) >= 10
+
+    def test_cancellation_terminates_container_command(self):
+        """Cancelling the task signals the running command and unwinds the method."""
+        service = AiderExecutionService(correlation_id="corr_123")
+        release = threading.Event()
+        container = _blocking_container(release)
+        outcome = []
+
+        def execute_aider(context, prompt_context, use_generated_prompt):
+            try:
+                stream_exec(container, "cd /workspace && aider --yes")
+            except CommandCancelled:
+                outcome.append("cancelled")
+                raise
+            outcome.append("finished")
+            return _result(context)
+
+        service.execute_aider = execute_aider
+
+        async def main():
+            task = asyncio.create_task(service.execute_aider_async(_context()))
+            while not container.client.api.exec_start.called:
+                await asyncio.sleep(0.01)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(main())
+
+        assert outcome == ["cancelled"]
+        command = container.client.api.exec_create.call_args[0][1]
+        assert command[:2] == ["sh", "-c"]
+        assert command[2].endswith("; cd /workspace && aider --yes")
+        pid_file = command[2].split("> ")[1].split(";")[0]
+        kill_commands = [call.args[0][-1] for call in container.exec_run.call_args_list if "kill" in call.args[0][-1]]
+        assert len(kill_commands) == 1 and pid_file in kill_commands[0]
+
+
+class TestCommandCancellation:
+    """Test suite for CommandCancellation outside the async API."""
+
+    def test_commands_are_not_started_once_cancelled(self):
+        """A cancelled scope refuses to start further commands."""
+        cancellation = CommandCancellation()
+        container = Mock()
+        cancellation.cancel()
+
+        with cancellation_scope(cancellation), pytest.raises(CommandCancelled):
+            stream_exec(container, "npm ci")
+
+        container.exec_run.assert_not_called()
+
+    def test_commands_run_unwrapped_outside_a_scope(self):
+        """Without a cancellation scope commands are passed through unchanged."""
+        release = threading.Event()
+        release.set()
+        container = _blocking_container(release)
+
+        stream_exec(container, "npm ci")
+
+        assert container.client.api.exec_create.call_args[0][1] == "npm ci"
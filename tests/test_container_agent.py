@@ -0,0 +1,254 @@
+"""
+Unit Tests for the Container Agent
+
+Tests batched command execution in project containers:
+- The Node.js agent running step sequences from one request, started once per container
+- Per-step exit codes, combined output, head/tail truncation and stop-on-failure skipping
+- Concurrent requests and cancellation of a running request
+- Exec-per-step fallback for containers without an agent, keeping step order
+- AiderExecutionService artifact capture issuing one agent request
+"""
+
+import itertools
+import shutil
+import socket
+import struct
+import subprocess
+import threading
+import time
+from unittest.mock import Mock
+
+import pytest
+from docker.models.containers import Container
+
+from services.aider_execution_service import AiderExecutionContext, AiderExecutionService
+from services.container_agent import AgentStep, discard_container_agent, get_container_agent, run_steps
+from services.container_output_stream import CommandCancellation, CommandCancelled, cancellation_scope
+
+
+_container_ids = itertools.count()
+
+
+def _pump_output(source, sock, stream):
+    """Forward process output to the socket as Docker multiplexed frames."""
+    for chunk in iter(lambda: source.read1(4096), b""):
+        sock.sendall(struct.pack(">BxxxL", stream, len(chunk)) + chunk)
+
+
+def _wait_for(path, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not path.exists() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert path.exists()
+
+
+def _pump_input(sock, sink):
+    for chunk in iter(lambda: sock.recv(4096), b""):
+        sink.write(chunk)
+        sink.flush()
+    sink.close()
+
+
+class _LocalAgentContainer:
+    """Docker container double running exec'd commands as local processes over a socket pair."""
+
+    def __init__(self):
+        self.container = Mock(spec=Container)
+        self.container.id = f"agent-container-{next(_container_ids)}"
+        self.container.client = Mock()
+        api = self.container.client.api
+        api.exec_create.side_effect = lambda container_id, command, **kwargs: {"Id": command}
+        api.exec_start.side_effect = self._exec_start
+        self.processes = []
+
+    def _exec_start(self, command, **kwargs):
+        process = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        self.processes.append(process)
+        ours, theirs = socket.socketpair()
+        for target, args in (
+            (_pump_input, (theirs, process.stdin)),
+            (_pump_output, (process.stdout, theirs, 1)),
+            (_pump_output, (process.stderr, theirs, 2)),
+        ):
+            threading.Thread(target=target, args=args, daemon=True).start()
+        return ours
+
+    def close(self):
+        discard_container_agent(self.container.id)
+        for process in self.processes:
+            process.wait(5)
+
+
+@pytest.fixture
+def agent_container():
+    if shutil.which("node") is None:
+        pytest.skip("node is not installed")
+    container = _LocalAgentContainer()
+    yield container
+    container.close()
+
+
+class TestContainerAgent:
+    """Test suite for the resident container agent."""
+
+    def test_steps_run_in_one_request(self, agent_container):
+        """A step sequence yields per-step exit codes and combined output."""
+        results = run_steps(agent_container.container, [
+            AgentStep("echo out; echo err >&2"),
+            AgentStep("exit 3"),
+            AgentStep("printf 'no newline'")
+        ])
+
+        assert [result.exit_code for result in results] == [0, 3, 0]
+        assert sorted(results[0].output.split()) == ["err", "out"]
+        assert results[2].output == "no newline"
+        assert not results[1].succeeded
+
+    def test_agent_is_resident(self, agent_container):
+        """Later sequences reuse the agent instead of new execs."""
+        run_steps(agent_container.container, [AgentStep("true")])
+        results = run_steps(agent_container.container, [AgentStep("echo again")])
+
+        assert results[0].output == "again\n"
+        assert agent_container.container.client.api.exec_create.call_count == 1
+        agent_container.container.exec_run.assert_not_called()
+
+    def test_stop_on_failure_skips_remaining_steps(self, agent_container):
+        """Steps after a failed stop_on_failure step are reported skipped."""
+        results = run_steps(agent_container.container, [
+            AgentStep("false", stop_on_failure=True),
+            AgentStep("echo never")
+        ])
+
+        assert results[0].exit_code == 1
+        assert results[1].skipped and results[1].exit_code is None
+
+    def test_output_is_bounded(self, agent_container):
+        """Long output keeps its head and tail around a truncation marker."""
+        results = run_steps(
+            agent_container.container, [AgentStep("seq 1 1000")], head_bytes=8, tail_bytes=9
+        )
+
+        output = results[0].output
+        assert output.startswith("1\n2\n3\n4\n")
+        assert output.endswith("999\n1000\n")
+        assert "output truncated" in output
+        assert results[0].omitted_bytes == len("".join(f"{n}\n" for n in range(1, 1001))) - 17
+
+    def test_agent_restarts_after_exit(self, agent_container):
+        """A closed agent is replaced on next use."""
+        run_steps(agent_container.container, [AgentStep("true")])
+        get_container_agent(agent_container.container).close()
+
+        results = run_steps(agent_container.container, [AgentStep("echo back")])
+
+        assert results[0].output == "back\n"
+        assert agent_container.container.client.api.exec_create.call_count == 2
+
+    def test_requests_run_concurrently(self, agent_container, tmp_path):
+        """A long request does not hold up other requests to the same agent."""
+        started = tmp_path / "started"
+        slow = threading.Thread(
+            target=run_steps, args=(agent_container.container, [AgentStep(f"touch {started}; sleep 2")])
+        )
+        slow.start()
+        _wait_for(started)
+
+        begin = time.monotonic()
+        results = run_steps(agent_container.container, [AgentStep("echo fast")])
+
+        assert results[0].output == "fast\n"
+        assert time.monotonic() - begin < 1
+        assert slow.is_alive()
+        slow.join(5)
+
+    def test_cancellation_terminates_running_step(self, agent_container, tmp_path):
+        """Cancelling the scope kills the running step in the agent and skips the rest."""
+        started = tmp_path / "started"
+        cancellation = CommandCancellation()
+        outcome = []
+
+        def run():
+            with cancellation_scope(cancellation):
+                try:
+                    run_steps(agent_container.container, [
+                        AgentStep(f"touch {started}; sleep 30"),
+                        AgentStep(f"touch {tmp_path / 'never'}")
+                    ])
+                except CommandCancelled:
+                    outcome.append("cancelled")
+
+        thread = threading.Thread(target=run)
+        thread.start()
+        _wait_for(started)
+        begin = time.monotonic()
+        cancellation.cancel()
+        thread.join(5)
+
+        assert outcome == ["cancelled"]
+        assert time.monotonic() - begin < 2
+        assert not (tmp_path / "never").exists()
+        assert run_steps(agent_container.container, [AgentStep("echo alive")])[0].output == "alive\n"
+
+
+class TestExecFallback:
+    """Test suite for containers without an agent."""
+
+    def test_steps_run_one_exec_each(self):
+        """Steps run in order through exec_run, exceptions become step errors."""
+        container = Mock()
+        container.exec_run.side_effect = [(0, b"v18.0.0\n"), Exception("exec failed"), (1, b"")]
+
+        version, broken, missing = run_steps(container, [
+            AgentStep("node --version"),
+            AgentStep("ls /workspace"),
+            AgentStep("test -d dist", stop_on_failure=True)
+        ])
+
+        assert (version.exit_code, version.output) == (0, "v18.0.0\n")
+        assert broken.error == "exec failed" and not broken.succeeded
+        assert missing.exit_code == 1
+        assert [call.args[0] for call in container.exec_run.call_args_list] == [
+            "node --version", "ls /workspace", "test -d dist"
+        ]
+
+    def test_unstartable_agent_falls_back(self):
+        """Containers whose agent does not start run steps one exec at a time."""
+        container = Mock(spec=Container)
+        container.id = f"agent-container-{next(_container_ids)}"
+        container.client = Mock()
+        api = container.client.api
+        api.exec_create.side_effect = lambda container_id, command, **kwargs: {"Id": "exec-1"}
+        api.exec_start.side_effect = [Exception("no such binary"), iter([(b"ok\n", None)])]
+        api.exec_inspect.return_value = {"ExitCode": 0}
+
+        try:
+            results = run_steps(container, [AgentStep("echo ok")])
+        finally:
+            discard_container_agent(container.id)
+
+        assert results[0].output == "ok\n"
+        assert api.exec_start.call_args_list[1].kwargs == {"stream": True, "demux": True}
+
+
+class TestServiceBatching:
+    """Test suite for AiderExecutionService command batches."""
+
+    def test_npm_build_artifacts_use_one_request(self, agent_container, tmp_path):
+        """Version, script check and every build directory check share one agent request."""
+        (tmp_path / "package.json").write_text('{"scripts": {"build": "vite build"}}')
+        (tmp_path / "dist").mkdir()
+        (tmp_path / "out").mkdir()
+        context = AiderExecutionContext(project_id="test-project", execution_id="exec_123")
+        service = AiderExecutionService(correlation_id="corr_123")
+        agent = get_container_agent(agent_container.container)
+        send = Mock(wraps=agent._socket.sendall)
+        agent._socket = Mock(wraps=agent._socket, sendall=send)
+
+        artifacts = service._capture_npm_build_artifacts(
+            agent_container.container, context, {"exit_code": 0}, str(tmp_path), "build"
+        )
+
+        assert artifacts['build_script_exists'] is True
+        assert artifacts['build_output_directories'] == ["dist", "out"]
+        assert send.call_count == 1
@@ -0,0 +1,120 @@
+"""
+Unit Tests for Container File Transfer
+
+Tests archive-based file transfer to and from project containers:
+- Streamed tar construction, one member at a time
+- Uploads of several files in one put_archive call, with path validation
+- Downloads of a directory tree in one get_archive call, with a size cap
+- Aider prompts uploaded verbatim instead of echoed through a shell
+"""
+
+import io
+import tarfile
+from unittest.mock import Mock
+
+import pytest
+
+from services.aider_execution_service import AiderExecutionContext, AiderExecutionService
+from services.container_file_transfer import (
+    ContainerFileTransferError,
+    download_files,
+    tar_stream,
+    upload_files,
+)
+
+
+def _read_tar(data):
+    with tarfile.open(fileobj=io.BytesIO(data)) as archive:
+        return {member.name: archive.extractfile(member).read() for member in archive if member.isfile()}
+
+
+def _tar_chunks(files, chunk_size=1000):
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w") as archive:
+        directory = tarfile.TarInfo("dist")
+        directory.type = tarfile.DIRTYPE
+        archive.addfile(directory)
+        for name, data in files.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            archive.addfile(info, io.BytesIO(data))
+    data = buffer.getvalue()
+    return [data[offset:offset + chunk_size] for offset in range(0, len(data), chunk_size)]
+
+
+class TestUpload:
+    """Test suite for tar_stream and upload_files."""
+
+    def test_tar_stream_round_trip(self):
+        """Files come back unchanged, text encoded as UTF-8, built in several chunks."""
+        large = b"x" * (3 * 1024 * 1024)
+        chunks = list(tar_stream({"prompt.txt": "héllo", "patches/fix.patch": large}, mode=0o600))
+
+        assert len(chunks) > 1
+        archive = tarfile.open(fileobj=io.BytesIO(b"".join(chunks)))
+        assert archive.getmember("patches/fix.patch").mode == 0o600
+        assert _read_tar(b"".join(chunks)) == {"prompt.txt": "héllo".encode(), "patches/fix.patch": large}
+
+    def test_upload_is_one_put_archive_call(self):
+        """All files go to the directory in one archive."""
+        container = Mock()
+        container.put_archive.return_value = True
+
+        upload_files(container, "/workspace/repo", {"aider_prompt.txt": "prompt", "tasks.md": "- [ ] task"})
+
+        container.put_archive.assert_called_once()
+        directory, data = container.put_archive.call_args[0]
+        assert directory == "/workspace/repo"
+        assert _read_tar(b"".join(data)) == {"aider_prompt.txt": b"prompt", "tasks.md": b"- [ ] task"}
+
+    def test_upload_failures(self):
+        """Escaping paths are rejected before any call; failed uploads raise."""
+        container = Mock()
+        for name in ("../outside.txt", "/etc/passwd", ""):
+            with pytest.raises(ContainerFileTransferError):
+                upload_files(container, "/workspace", {name: "x"})
+        container.put_archive.assert_not_called()
+
+        container.put_archive.return_value = False
+        with pytest.raises(ContainerFileTransferError):
+            upload_files(container, "/workspace", {"a.txt": "x"})
+
+
+class TestDownload:
+    """Test suite for download_files."""
+
+    def test_download_tree(self):
+        """Regular files of the tree are read from the streamed archive."""
+        files = {"dist/index.html": b"<html/>", "dist/main.js": b"console.log(1)" * 200}
+        container = Mock()
+        container.get_archive.return_value = (iter(_tar_chunks(files)), {"name": "dist"})
+
+        assert download_files(container, "/workspace/repo/dist") == files
+        container.get_archive.assert_called_once_with("/workspace/repo/dist")
+
+    def test_download_size_cap(self):
+        """Trees larger than max_bytes raise."""
+        container = Mock()
+        container.get_archive.return_value = (iter(_tar_chunks({"dist/big.js": b"x" * 5000})), {})
+
+        with pytest.raises(ContainerFileTransferError):
+            download_files(container, "/workspace/repo/dist", max_bytes=1000)
+
+
+class TestPromptUpload:
+    """Test suite for Aider prompt files."""
+
+    def test_prompt_is_uploaded_verbatim(self):
+        """Prompts with shell metacharacters reach the file unchanged, with no shell write."""
+        prompt = "Fix `rm -rf $HOME` \"quotes\" 'single' && $(whoami)\n" * 5000
+        container = Mock()
+        container.put_archive.return_value = True
+        container.exec_run.return_value = (0, b"done")
+        context = AiderExecutionContext(project_id="test-project", execution_id="exec_123")
+
+        result = AiderExecutionService(correlation_id="corr_123")._execute_aider_command(container, context, prompt)
+
+        directory, data = container.put_archive.call_args[0]
+        assert directory == "/workspace"
+        assert _read_tar(b"".join(data)) == {"aider_prompt.txt": prompt.encode()}
+        assert [call.args[0] for call in container.exec_run.call_args_list] == [result["command"]]
@@ -0,0 +1,279 @@
+"""
+Unit Tests for Container Output Streaming
+
+Tests live streaming of container command output:
+- Incremental line splitting across chunk, character and line boundaries
+- Docker stream/demux exec reading stdout and stderr as they arrive
+- Bounded per-stream capture with head, tail, spill file and truncation marker
+- Sweeping of spill files past retention or beyond the directory budget
+- Background forwarding through ExecutionLogService in order
+- Backpressure blocking the reader and dropping lines past the put timeout
+- AiderExecutionService commands forwarding their output lines
+"""
+
+import os
+import threading
+import time
+from unittest.mock import AsyncMock, Mock, patch
+
+from docker.models.containers import Container
+
+from services.aider_execution_service import AiderExecutionContext, AiderExecutionService
+from services.container_output_stream import (
+    BoundedOutputCapture,
+    ExecutionLogForwarder,
+    OutputLineSplitter,
+    stream_exec,
+    sweep_spill_files,
+)
+
+
+def _collector():
+    lines = []
+    return lines, lambda stream, line: lines.append((stream, line))
+
+
+def _docker_container(chunks, exit_code=0):
+    """Docker container double serving demuxed exec output."""
+    container = Mock(spec=Container)
+    container.id = "container_123"
+    container.client = Mock()
+    api = container.client.api
+    api.exec_create.return_value = {"Id": "exec-1"}
+    api.exec_start.return_value = iter(chunks)
+    api.exec_inspect.return_value = {"ExitCode": exit_code}
+    return container
+
+
+class TestOutputLineSplitter:
+    """Test suite for OutputLineSplitter."""
+
+    def test_lines_split_across_chunks(self):
+        """Partial lines wait for their newline; the last line is flushed on close."""
+        lines, handler = _collector()
+        splitter = OutputLineSplitter("stdout", handler)
+
+        splitter.feed(b"Installing de")
+        splitter.feed(b"pendencies\r\nadded 12 packages\npartial")
+        assert lines == [("stdout", "Installing dependencies"), ("stdout", "added 12 packages")]
+
+        splitter.close()
+        assert lines[-1] == ("stdout", "partial")
+
+    def test_multibyte_characters_split_across_chunks(self):
+        """A character split between chunks is decoded once complete."""
+        lines, handler = _collector()
+        splitter = OutputLineSplitter("stdout", handler)
+        encoded = "✓ built\n".encode("utf-8")
+
+        splitter.feed(encoded[:1])
+        splitter.feed(encoded[1:])
+
+        assert lines == [("stdout", "✓ built")]
+
+    def test_long_lines_are_cut(self):
+        """Output without newlines is emitted in max_line_chars pieces."""
+        lines, handler = _collector()
+        splitter = OutputLineSplitter("stdout", handler, max_line_chars=4)
+
+        splitter.feed(b"abcdefghij")
+        splitter.close()
+
+        assert [line for _, line in lines] == ["abcd", "efgh", "ij"]
+
+
+class TestStreamExec:
+    """Test suite for stream_exec."""
+
+    def test_docker_exec_streams_demuxed_lines(self):
+        """Lines are tagged by stream in arrival order and each stream is captured separately."""
+        container = _docker_container(
+            [(b"Added file.py\n", None), (None, b"warning: slow\n"), (b"Done", None)], exit_code=3
+        )
+        lines, handler = _collector()
+
+        exit_code, stdout, stderr = stream_exec(container, "aider --model gpt-4", handler)
+
+        assert exit_code == 3
+        assert stdout.text() == "Added file.py\nDone"
+        assert stderr.text() == "warning: slow\n"
+        assert lines == [("stdout", "Added file.py"), ("stderr", "warning: slow"), ("stdout", "Done")]
+        container.client.api.exec_start.assert_called_once_with("exec-1", stream=True, demux=True)
+        container.exec_run.assert_not_called()
+
+    def test_other_containers_run_buffered(self):
+        """Container doubles run through exec_run and their output is split afterwards."""
+        container = Mock()
+        container.exec_run.return_value = (0, b"one\ntwo\n")
+        lines, handler = _collector()
+
+        exit_code, stdout, stderr = stream_exec(container, "npm ci", handler)
+
+        assert (exit_code, stdout.text(), stderr.text()) == (0, "one\ntwo\n", "")
+        assert lines == [("stdout", "one"), ("stdout", "two")]
+        container.exec_run.assert_called_once_with("npm ci")
+
+
+class TestBoundedOutputCapture:
+    """Test suite for BoundedOutputCapture."""
+
+    def test_small_output_is_kept_whole(self, tmp_path):
+        """Output within the caps is neither truncated nor spilled."""
+        capture = BoundedOutputCapture("stdout", head_bytes=8, tail_bytes=8, spill_dir=str(tmp_path))
+        capture.feed(b"abcdefgh")
+        capture.feed(b"ijklmnop")
+        capture.close()
+
+        assert capture.text() == "abcdefghijklmnop"
+        assert not capture.truncated
+        assert capture.spill_path is None
+        assert capture.marker() == ""
+        assert not list(tmp_path.iterdir())
+
+    def test_overflow_keeps_head_and_tail_and_spills(self, tmp_path):
+        """Past the caps the middle is replaced by a marker and the spill file holds everything."""
+        capture = BoundedOutputCapture("stderr", head_bytes=4, tail_bytes=6, spill_dir=str(tmp_path))
+        data = b"".join(f"line {index}\n".encode() for index in range(100))
+        for offset in range(0, len(data), 7):
+            capture.feed(data[offset:offset + 7])
+        capture.close()
+
+        marker = capture.marker()
+        assert capture.truncated
+        assert capture.omitted_bytes == len(data) - 10
+        assert capture.text() == f"line\n{marker}\n{data[-6:].decode()}"
+        assert f"stderr truncated: {len(data) - 10} of {len(data)} bytes omitted" in marker
+        assert capture.spill_path in marker
+        with open(capture.spill_path, "rb") as spill:
+            assert spill.read() == data
+
+    def test_docker_streams_have_separate_caps(self, tmp_path, monkeypatch):
+        """Each stream is bounded on its own."""
+        monkeypatch.setenv("CONTAINER_OUTPUT_SPILL_DIR", str(tmp_path))
+        container = _docker_container([(b"x" * 50, None), (None, b"warn\n")])
+
+        _, stdout, stderr = stream_exec(container, "npm run build", head_bytes=10, tail_bytes=10)
+
+        assert stdout.truncated and stdout.omitted_bytes == 30
+        assert not stderr.truncated and stderr.text() == "warn\n"
+
+    def test_sweep_removes_expired_and_excess_spill_files(self, tmp_path):
+        """Spill files past retention go first, then the oldest beyond the size budget."""
+        now = time.time()
+        ages = {
+            "clarity-stdout-old.log": 7200,
+            "clarity-stderr-a.log": 600,
+            "clarity-stdout-b.log": 300,
+            "clarity-stdout-new.log": 10,
+            "unrelated.log": 7200
+        }
+        for name, age in ages.items():
+            path = tmp_path / name
+            path.write_bytes(b"x" * 100)
+            os.utime(path, (now - age, now - age))
+
+        deleted = sweep_spill_files(str(tmp_path), max_age_seconds=3600, max_total_bytes=150, now=now)
+
+        assert sorted(os.path.basename(path) for path in deleted) == [
+            "clarity-stderr-a.log", "clarity-stdout-b.log", "clarity-stdout-old.log"
+        ]
+        assert sorted(path.name for path in tmp_path.iterdir()) == ["clarity-stdout-new.log", "unrelated.log"]
+
+    def test_spilling_sweeps_expired_files(self, tmp_path, monkeypatch):
+        """Starting a spill removes spill files left past the retention period."""
+        monkeypatch.setenv("CONTAINER_OUTPUT_SPILL_RETENTION_SECONDS", "60")
+        stale = tmp_path / "clarity-stdout-stale.log"
+        stale.write_bytes(b"old output")
+        os.utime(stale, (time.time() - 120, time.time() - 120))
+
+        capture = BoundedOutputCapture("stdout", head_bytes=2, tail_bytes=2, spill_dir=str(tmp_path))
+        capture.feed(b"0123456789")
+        capture.close()
+
+        assert not stale.exists()
+        assert os.path.exists(capture.spill_path)
+
+
+class TestExecutionLogForwarder:
+    """Test suite for ExecutionLogForwarder."""
+
+    def _forwarder(self, send):
+        log_service = AsyncMock()
+        log_service.send_operation_log = send
+        with patch("services.container_output_stream.get_execution_log_service", return_value=log_service):
+            return ExecutionLogForwarder("test-project", "exec_123", "npm_ci")
+
+    def test_lines_are_forwarded_in_order(self):
+        """Every submitted line is sent as an operation log with its stream and number."""
+        send = AsyncMock()
+        with self._forwarder(send) as forwarder:
+            forwarder.submit("stdout", "first")
+            forwarder.submit("stderr", "second")
+
+        sent = [call.kwargs for call in send.call_args_list]
+        assert [entry["message"] for entry in sent] == ["first", "second"]
+        forwarder.log_service.flush.assert_awaited_once()
+        assert sent[1]["operation"] == "npm_ci"
+        assert sent[1]["additional_data"] == {"stream": "stderr", "line_number": 2}
+
+    def test_full_queue_blocks_then_drops(self):
+        """A stalled sender blocks the reader for the put timeout, then lines are dropped."""
+        release = threading.Event()
+
+        async def stalled_send(**kwargs):
+            release.wait(5)
+
+        with patch.object(ExecutionLogForwarder, "MAX_PENDING_LINES", 1), \
+                patch.object(ExecutionLogForwarder, "PUT_TIMEOUT_SECONDS", 0.05):
+            forwarder = self._forwarder(stalled_send)
+            forwarder.start()
+            for index in range(4):
+                forwarder.submit("stdout", f"line {index}")
+        release.set()
+        forwarder.close()
+
+        assert forwarder.lines_submitted == 4
+        assert forwarder.lines_dropped >= 1
+
+
+class TestAiderCommandStreaming:
+    """Test suite for streamed AiderExecutionService commands."""
+
+    def test_npm_ci_output_is_forwarded(self):
+        """npm ci lines reach execution logs and the result keeps both streams."""
+        container = _docker_container([(b"added 1 package\n", None), (None, b"npm WARN deprecated\n")])
+        container.exec_run.return_value = (0, b"")  # package.json check
+        context = AiderExecutionContext(project_id="test-project", execution_id="exec_123")
+        send = AsyncMock()
+        log_service = AsyncMock(send_operation_log=send)
+
+        with patch("services.container_output_stream.get_execution_log_service", return_value=log_service):
+            result = AiderExecutionService(correlation_id="corr_123")._execute_npm_ci_command(container, context)
+
+        assert result["stdout"] == "added 1 package\n"
+        assert result["stderr"] == "npm WARN deprecated\n"
+        assert result["truncated_outputs"] == []
+        assert [call.kwargs["message"] for call in send.call_args_list] == ["added 1 package", "npm WARN deprecated"]
+        assert {call.kwargs["operation"] for call in send.call_args_list} == {"npm_ci"}
+
+    def test_truncated_output_is_reported(self, tmp_path, monkeypatch):
+        """Truncation markers reach the result and the execution log."""
+        monkeypatch.setenv("CONTAINER_OUTPUT_HEAD_BYTES", "8")
+        monkeypatch.setenv("CONTAINER_OUTPUT_TAIL_BYTES", "8")
+        monkeypatch.setenv("CONTAINER_OUTPUT_SPILL_DIR", str(tmp_path))
+        output = b"".join(f"added package {index}\n".encode() for index in range(20))
+        container = _docker_container([(output, None), (None, b"npm WARN\n")])
+        container.exec_run.return_value = (0, b"")  # package.json check
+        context = AiderExecutionContext(project_id="test-project", execution_id="exec_123")
+        send = AsyncMock()
+        log_service = AsyncMock(send_operation_log=send)
+
+        with patch("services.container_output_stream.get_execution_log_service", return_value=log_service):
+            result = AiderExecutionService(correlation_id="corr_123")._execute_npm_ci_command(container, context)
+
+        assert result["truncated_outputs"] == ["npm_ci_stdout"]
+        assert result["stderr"] == "npm WARN\n"
+        assert "stdout truncated" in result["stdout"]
+        with open(result["output_spill_paths"]["npm_ci_stdout"], "rb") as spill:
+            assert spill.read() == output
+        assert "stdout truncated" in send.call_args_list[-1].kwargs["message"]
@@ -0,0 +1,184 @@
+"""
+Unit Tests for Event Archive Service
+
+Tests the retention manager for the time-partitioned events table:
+- Monthly partition naming and window creation
+- Batched archival of finished events
+- Dropping of drained partitions past the retention cutoff
+- Execution history spanning hot and archived events
+"""
+
+import uuid
+from datetime import datetime
+from unittest.mock import Mock, patch
+
+import pytest
+from sqlalchemy.orm import Session
+
+from core.exceptions import RepositoryError
+from database.event import Event
+from database.event_archive import EventArchive
+from services.event_archive_service import EventArchiveService
+from services.status_projection_service import StatusProjectionService
+
+
+class TestEventArchiveService:
+    """Test suite for EventArchiveService."""
+
+    @pytest.fixture
+    def session(self):
+        """Create mock database session."""
+        return Mock(spec=Session)
+
+    @pytest.fixture
+    def service(self, session):
+        """Create EventArchiveService with a mocked session."""
+        return EventArchiveService(session=session, correlation_id="test-retention")
+
+    def test_add_months_rolls_over_year(self):
+        """Month arithmetic crosses year boundaries."""
+        assert EventArchiveService.add_months(datetime(2025, 11, 15), 1) == datetime(2025, 12, 1)
+        assert EventArchiveService.add_months(datetime(2025, 12, 1), 1) == datetime(2026, 1, 1)
+        assert EventArchiveService.add_months(datetime(2025, 1, 31), -1) == datetime(2024, 12, 1)
+
+    def test_partition_name(self):
+        """Partition names are zero-padded year/month."""
+        assert EventArchiveService.partition_name(datetime(2025, 3, 1)) == "events_y2025m03"
+
+    def test_ensure_partitions_creates_window(self, service, session):
+        """Current month plus months_ahead partitions are created."""
+        partitions = service.ensure_partitions(months_ahead=2, reference_time=datetime(2025, 12, 10))
+
+        assert partitions == ["events_y2025m12", "events_y2026m01", "events_y2026m02"]
+        assert session.execute.call_count == 3
+        first_sql = str(session.execute.call_args_list[0].args[0])
+        assert "FROM ('2025-12-01') TO ('2026-01-01')" in first_sql
+        session.commit.assert_called_once()
+
+    def test_ensure_partitions_failure_rolls_back(self, service, session):
+        """Partition DDL failures roll back and surface as RepositoryError."""
+        session.execute.side_effect = Exception("permission denied")
+
+        with pytest.raises(RepositoryError):
+            service.ensure_partitions(reference_time=datetime(2025, 1, 1))
+
+        session.rollback.assert_called_once()
+
+    def test_archive_finished_events_batches_until_short_batch(self, service, session):
+        """Archival repeats full batches and stops at the first short batch."""
+        session.execute.side_effect = [
+            Mock(**{"scalar.return_value": count}) for count in (2, 2, 1)
+        ]
+
+        archived = service.archive_finished_events(
+            older_than_days=30,
+            batch_size=2,
+            reference_time=datetime(2025, 3, 31)
+        )
+
+        assert archived == 5
+        assert session.execute.call_count == 3
+        params = session.execute.call_args_list[0].args[1]
+        assert params["cutoff"] == datetime(2025, 3, 1)
+        assert params["statuses"] == EventArchiveService.TERMINAL_STATUSES
+        assert session.commit.call_count == 3
+
+    def test_archive_keeps_rows_already_in_archive(self, service, session):
+        """Re-archived ids overwrite the archived copy instead of dropping the deleted row."""
+        session.execute.return_value = Mock(**{"scalar.return_value": 0})
+
+        service.archive_finished_events(reference_time=datetime(2025, 3, 31))
+
+        sql = str(session.execute.call_args.args[0])
+        assert "ON CONFLICT (id) DO UPDATE" in sql
+        assert "DO NOTHING" not in sql
+        assert "SELECT count(*) FROM moved" in sql
+
+    def test_drop_drained_partitions_only_drops_old_empty_partitions(self, service, session):
+        """Only empty, fully expired monthly partitions are dropped."""
+        listing = Mock()
+        listing.scalars.return_value.all.return_value = [
+            "events_default",
+            "events_y2025m01",  # expired, empty -> dropped
+            "events_y2025m02",  # expired, still has rows -> kept
+            "events_y2025m03",  # inside retention window -> kept
+        ]
+        empty = Mock()
+        empty.first.return_value = None
+        not_empty = Mock()
+        not_empty.first.return_value = (1,)
+
+        session.execute.side_effect = [listing, empty, Mock(), Mock(), not_empty]
+
+        dropped = service.drop_drained_partitions(
+            older_than_days=30,
+            reference_time=datetime(2025, 4, 1)
+        )
+
+        assert dropped == ["events_y2025m01"]
+        executed = [str(call.args[0]) for call in session.execute.call_args_list]
+        assert "ALTER TABLE events DETACH PARTITION events_y2025m01" in executed
+        assert "DROP TABLE events_y2025m01" in executed
+        assert not any("events_y2025m03" in sql for sql in executed)
+
+
+class TestExecutionHistoryWithArchive:
+    """Execution history reads through to the archive when requested."""
+
+    @pytest.fixture
+    def service(self):
+        """Create StatusProjectionService with a mocked session."""
+        with patch('services.status_projection_service.GenericRepository'):
+            return StatusProjectionService(session=Mock(spec=Session), correlation_id="test-history")
+
+    @staticmethod
+    def _event(model, project_id):
+        event = Mock(spec=model)
+        event.id = uuid.uuid4()
+        event.task_context = {
+            'metadata': {'project_id': project_id, 'status': 'completed'},
+            'nodes': {'select': {'status': 'completed'}}
+        }
+        return event
+
+    def _mock_queries(self, service, rows_by_model):
+        def query(model):
+            chain = Mock()
+            chain.filter.return_value.order_by.return_value.limit.return_value = rows_by_model[model]
+            return chain
+        service.session.query.side_effect = query
+
+    def test_history_without_archive_reads_hot_table_only(self, service):
+        """Default behaviour never touches the archive table."""
+        project_id = "customer-1/project-a"
+        self._mock_queries(service, {Event: [self._event(Event, project_id)]})
+
+        result = service.get_execution_history(project_id, limit=5)
+
+        assert len(result) == 1
+        queried = [call.args[0] for call in service.session.query.call_args_list]
+        assert queried == [Event]
+
+    def test_history_spans_hot_and_archived_events(self, service):
+        """Archived executions fill the page after hot ones."""
+        project_id = "customer-1/project-a"
+        hot = self._event(Event, project_id)
+        archived = self._event(EventArchive, project_id)
+        self._mock_queries(service, {Event: [hot], EventArchive: [archived]})
+
+        result = service.get_execution_history(project_id, limit=5, include_archived=True)
+
+        assert [p.execution_id for p in result] == [str(hot.id), str(archived.id)]
+
+    def test_history_skips_archive_when_hot_table_fills_limit(self, service):
+        """The archive is not queried once the hot table satisfies the limit."""
+        project_id = "customer-1/project-a"
+        self._mock_queries(service, {
+            Event: [self._event(Event, project_id), self._event(Event, project_id)]
+        })
+
+        result = service.get_execution_history(project_id, limit=2, include_archived=True)
+
+        assert len(result) == 2
+        queried = [call.args[0] for call in service.session.query.call_args_list]
+        assert queried == [Event]
@@ -0,0 +1,192 @@
+"""
+Unit Tests for Keyset-Paginated Execution History
+
+Tests StatusProjectionService.get_execution_history_page:
+- Pages bounded to limit + 1 rows with an opaque next cursor
+- Cursors continuing after (updated_at, id) of the previous page
+- Rows without updated_at ordered and paged by created_at
+- Status, branch and date range filters compiled into SQL
+- Continuation from hot events into the archive across pages
+"""
+
+import uuid
+from datetime import datetime, timedelta
+from unittest.mock import Mock, patch
+
+import pytest
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+
+from core.exceptions import RepositoryError
+from database.event import Event
+from database.event_archive import EventArchive
+from schemas.status_projection_schema import ExecutionStatus
+from services.status_projection_service import StatusProjectionService, _decode_history_cursor
+
+
+PROJECT_ID = "customer-1/project-a"
+
+
+def _event(model, minutes_ago, status="completed", branch="main", updated=True):
+    event = Mock(spec=model)
+    event.id = uuid.uuid4()
+    event.created_at = datetime(2025, 1, 1, 12, 0, 0) - timedelta(minutes=minutes_ago)
+    event.updated_at = event.created_at if updated else None
+    event.task_context = {
+        "metadata": {"project_id": PROJECT_ID, "task_id": "1.1.1", "branch": branch},
+        "nodes": {"select": {"status": status}}
+    }
+    return event
+
+
+class TestExecutionHistoryPagination:
+    """Test suite for keyset-paginated execution history."""
+
+    @pytest.fixture
+    def service(self):
+        """Create StatusProjectionService with a mocked session."""
+        with patch("services.status_projection_service.GenericRepository"):
+            return StatusProjectionService(session=Mock(spec=Session), correlation_id="test-history-page")
+
+    def _mock_tables(self, service, rows_by_model):
+        """Serve rows per model and record every query's filters, ordering and limit."""
+        queries = []
+
+        def query(model):
+            recorded = {"model": model}
+            chain = Mock()
+
+            def filter_(*conditions):
+                recorded["sql"] = " AND ".join(
+                    str(condition.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+                    for condition in conditions
+                )
+                return chain
+
+            def order_by(*clauses):
+                recorded["order_by"] = ", ".join(
+                    str(clause.compile(dialect=postgresql.dialect())) for clause in clauses
+                )
+                return chain
+
+            def limit(count):
+                recorded["limit"] = count
+                return rows_by_model[model][:count]
+
+            chain.filter.side_effect = filter_
+            chain.order_by.side_effect = order_by
+            chain.limit.side_effect = limit
+            queries.append(recorded)
+            return chain
+
+        service.session.query.side_effect = query
+        return queries
+
+    def test_first_page_returns_cursor_when_more_rows_exist(self, service):
+        """Only limit + 1 rows are read and the cursor points after the last item."""
+        events = [_event(Event, minutes) for minutes in range(5)]
+        queries = self._mock_tables(service, {Event: events})
+
+        page = service.get_execution_history_page(PROJECT_ID, limit=2)
+
+        assert [item.execution_id for item in page.items] == [str(events[0].id), str(events[1].id)]
+        assert queries[0]["limit"] == 3
+        assert _decode_history_cursor(page.next_cursor) == ("hot", events[1].updated_at, events[1].id)
+
+    def test_cursor_continues_after_previous_page(self, service):
+        """The next page is a keyset range starting after the cursor position."""
+        events = [_event(Event, minutes) for minutes in range(3)]
+        self._mock_tables(service, {Event: events})
+        first_page = service.get_execution_history_page(PROJECT_ID, limit=2)
+
+        queries = self._mock_tables(service, {Event: events[2:]})
+        last_page = service.get_execution_history_page(PROJECT_ID, limit=2, cursor=first_page.next_cursor)
+
+        assert "(coalesce(events.updated_at, events.created_at), events.id) < ('2025-01-01 11:59:00'" in queries[0]["sql"]
+        assert [item.execution_id for item in last_page.items] == [str(events[2].id)]
+        assert last_page.next_cursor is None
+
+    def test_rows_without_updated_at_page_by_created_at(self, service):
+        """A NULL updated_at falls back to created_at in the ordering and the cursor."""
+        events = [_event(Event, minutes, updated=minutes != 1) for minutes in range(3)]
+        queries = self._mock_tables(service, {Event: events})
+
+        first_page = service.get_execution_history_page(PROJECT_ID, limit=2)
+
+        assert _decode_history_cursor(first_page.next_cursor) == ("hot", events[1].created_at, events[1].id)
+        assert queries[0]["order_by"] == "coalesce(events.updated_at, events.created_at) DESC, events.id DESC"
+        queries = self._mock_tables(service, {Event: events[2:]})
+        last_page = service.get_execution_history_page(PROJECT_ID, limit=2, cursor=first_page.next_cursor)
+
+        assert "(coalesce(events.updated_at, events.created_at), events.id) < ('2025-01-01 11:59:00'" in queries[0]["sql"]
+        assert [item.execution_id for item in last_page.items] == [str(events[2].id)]
+
+    def test_filters_are_applied_in_sql(self, service):
+        """Project, status, branch and date range are all part of the query."""
+        queries = self._mock_tables(service, {Event: []})
+
+        service.get_execution_history_page(
+            PROJECT_ID,
+            limit=10,
+            status=ExecutionStatus.COMPLETED,
+            branch="task/1-1-1-feature",
+            updated_after=datetime(2025, 1, 1),
+            updated_before=datetime(2025, 2, 1)
+        )
+
+        sql = queries[0]["sql"]
+        assert "(events.task_context -> 'metadata' ->> 'project_id') = 'customer-1/project-a'" in sql
+        assert "(events.task_context -> 'metadata' ->> 'branch') = 'task/1-1-1-feature'" in sql
+        assert "json_each(CASE WHEN json_typeof(events.task_context -> 'nodes') = 'object'" in sql
+        assert "coalesce(events.updated_at, events.created_at) >= '2025-01-01 00:00:00'" in sql
+        assert "coalesce(events.updated_at, events.created_at) < '2025-02-01 00:00:00'" in sql
+
+    def test_underived_status_matches_nothing(self, service):
+        """Statuses the projection never derives short-circuit to false."""
+        queries = self._mock_tables(service, {Event: []})
+
+        page = service.get_execution_history_page(PROJECT_ID, status="paused")
+
+        assert "false" in queries[0]["sql"]
+        assert page.items == []
+
+    def test_history_continues_into_archive_on_next_page(self, service):
+        """A page ending exactly at the last hot event points to the archive."""
+        hot = [_event(Event, minutes) for minutes in range(2)]
+        archived = [_event(EventArchive, minutes) for minutes in range(60, 63)]
+        queries = self._mock_tables(service, {Event: hot, EventArchive: archived})
+
+        first_page = service.get_execution_history_page(PROJECT_ID, limit=2, include_archived=True)
+
+        assert [query["model"] for query in queries] == [Event]
+        assert _decode_history_cursor(first_page.next_cursor) == ("archive", None, None)
+
+        queries = self._mock_tables(service, {Event: hot, EventArchive: archived})
+        second_page = service.get_execution_history_page(
+            PROJECT_ID, limit=2, include_archived=True, cursor=first_page.next_cursor
+        )
+
+        assert [query["model"] for query in queries] == [EventArchive]
+        assert "events_archive.task_context" in queries[0]["sql"]
+        assert [item.execution_id for item in second_page.items] == [str(event.id) for event in archived[:2]]
+        assert _decode_history_cursor(second_page.next_cursor)[0] == "archive"
+
+    def test_invalid_cursor_is_rejected(self, service):
+        """Malformed cursors and archive cursors without include_archived fail cleanly."""
+        self._mock_tables(service, {Event: []})
+
+        with pytest.raises(RepositoryError):
+            service.get_execution_history_page(PROJECT_ID, cursor="not-a-cursor")
+
+        archive_cursor = "eyJzIjogImFyY2hpdmUifQ"
+        with pytest.raises(RepositoryError):
+            service.get_execution_history_page(PROJECT_ID, cursor=archive_cursor)
+
+    def test_get_execution_history_returns_page_items(self, service):
+        """The list API returns the items of the first page."""
+        events = [_event(Event, minutes) for minutes in range(3)]
+        self._mock_tables(service, {Event: events})
+
+        result = service.get_execution_history(PROJECT_ID, limit=2, branch="main")
+
+        assert [item.execution_id for item in result] == [str(events[0].id), str(events[1].id)]
@@ -0,0 +1,139 @@
+"""
+Unit Tests for Micro-Batched Execution Logs
+
+Tests opt-in batching in ExecutionLogService:
+- One frame per entry without batching
+- Size-triggered and time-triggered flushes per (project, execution)
+- Entry order, per-entry timestamps and batch level
+- Batches split by level so log level subscriptions filter batched entries
+- Explicit flush of pending batches
+"""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from core.structured_logging import LogLevel
+from core.websocket_subscriptions import Subscription
+from services.execution_log_service import ExecutionLogService, LogEntryType
+from services.execution_log_store import ExecutionLogStore
+
+
+PROJECT_ID = "customer-1-project-1"
+
+
+@pytest.fixture(autouse=True)
+def log_store(tmp_path):
+    """Keep stored entries in a temporary directory."""
+    with patch(
+        "services.execution_log_service.get_execution_log_store",
+        return_value=ExecutionLogStore(root=str(tmp_path))
+    ):
+        yield
+
+
+async def _send(service, message, execution_id="exec-1", level=LogLevel.INFO):
+    await service.send_execution_log(
+        project_id=PROJECT_ID,
+        execution_id=execution_id,
+        log_entry_type=LogEntryType.OPERATION_LOG,
+        message=message,
+        level=level
+    )
+
+
+def _run(scenario):
+    """Run a scenario against a patched broadcast, returning the broadcast frames."""
+    broadcast = AsyncMock()
+
+    async def main():
+        with patch("services.execution_log_service.broadcast_to_project", broadcast):
+            await scenario()
+
+    asyncio.run(main())
+    return [call.args[0] for call in broadcast.call_args_list]
+
+
+class TestExecutionLogBatching:
+    """Test suite for ExecutionLogService batching."""
+
+    def test_unbatched_by_default(self):
+        """Without batching every entry is its own frame."""
+        async def scenario():
+            service = ExecutionLogService()
+            await _send(service, "one")
+            await _send(service, "two")
+
+        frames = _run(scenario)
+
+        assert [frame["payload"]["message"] for frame in frames] == ["one", "two"]
+
+    def test_flush_after_batch_size(self):
+        """A full batch is sent at once as one frame carrying its entries in order."""
+        async def scenario():
+            service = ExecutionLogService(batch_size=3, batch_interval_ms=10_000)
+            for index in range(7):
+                await _send(service, f"line {index}")
+            await service.flush()
+
+        frames = _run(scenario)
+
+        assert [frame["payload"]["count"] for frame in frames] == [3, 3, 1]
+        messages = [entry["message"] for frame in frames for entry in frame["payload"]["entries"]]
+        assert messages == [f"line {index}" for index in range(7)]
+        assert frames[0]["type"] == "execution-log"
+        assert frames[0]["payload"]["level"] == "INFO"
+        assert json.loads(frames[0].json_text) == frames[0]
+
+    def test_batch_is_split_by_level(self):
+        """Runs of entries of one level get their own frame, so level filters drop lower entries."""
+        levels = [LogLevel.INFO, LogLevel.INFO, LogLevel.ERROR, LogLevel.DEBUG, LogLevel.WARN]
+
+        async def scenario():
+            service = ExecutionLogService(batch_size=5, batch_interval_ms=10_000)
+            for index, level in enumerate(levels):
+                await _send(service, f"line {index}", level=level)
+
+        frames = _run(scenario)
+
+        assert [(frame["payload"]["level"], frame["payload"]["count"]) for frame in frames] == [
+            ("INFO", 2), ("ERROR", 1), ("DEBUG", 1), ("WARN", 1)
+        ]
+        messages = [entry["message"] for frame in frames for entry in frame["payload"]["entries"]]
+        assert messages == [f"line {index}" for index in range(5)]
+        warnings = Subscription(min_log_level="WARN")
+        received = [entry for frame in frames if warnings.matches(frame) for entry in frame["payload"]["entries"]]
+        assert [entry["level"] for entry in received] == ["ERROR", "WARN"]
+
+    def test_flush_after_interval(self):
+        """A partial batch is sent once the interval passes."""
+        async def scenario():
+            service = ExecutionLogService(batch_size=100, batch_interval_ms=20)
+            await _send(service, "first")
+            await _send(service, "second")
+            await asyncio.sleep(0.1)
+
+        frames = _run(scenario)
+
+        assert len(frames) == 1
+        entries = frames[0]["payload"]["entries"]
+        assert [entry["message"] for entry in entries] == ["first", "second"]
+        assert all(entry["timestamp"].endswith("Z") for entry in entries)
+        assert entries[0]["timestamp"] <= entries[1]["timestamp"]
+
+    def test_batches_are_per_execution(self):
+        """Entries of different executions never share a frame."""
+        async def scenario():
+            service = ExecutionLogService(batch_size=2, batch_interval_ms=10_000)
+            await _send(service, "a1", execution_id="exec-a")
+            await _send(service, "b1", execution_id="exec-b")
+            await _send(service, "a2", execution_id="exec-a")
+            await service.flush()
+
+        frames = _run(scenario)
+
+        assert [(frame["payload"]["execution_id"], frame["payload"]["count"]) for frame in frames] == [
+            ("exec-a", 2), ("exec-b", 1)
+        ]
@@ -0,0 +1,225 @@
+"""
+Unit Tests for the Durable Execution Log Store
+
+Tests append-only execution log storage and range reads:
+- log_seq stamping, segment rotation and gzip compression of closed segments
+- Byte range and log_seq range reads across raw and compressed segments
+- Writer state recovery after a restart, including torn last lines
+- ExecutionLogService storing entries before broadcasting them
+- The streaming HTTP endpoint with Range headers and sequence ranges
+- Project IDs containing slashes, stored in one directory and routed
+"""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from api.v1.endpoints import execution_logs
+from core.structured_logging import LogLevel
+from services.execution_log_service import ExecutionLogService, LogEntryType
+from services.execution_log_store import ExecutionLogNotFound, ExecutionLogStore
+
+
+PROJECT_ID = "customer-1-project-1"
+EXECUTION_ID = "exec_123"
+SLASH_PROJECT_ID = "customer-123/project-abc"
+
+
+def _entries(start, count):
+    return [{"message": f"line {index}", "level": "INFO"} for index in range(start, start + count)]
+
+
+def _log_seqs(lines):
+    return [json.loads(line)["log_seq"] for line in b"".join(lines).splitlines()]
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Store with small segments, rotating every few entries."""
+    return ExecutionLogStore(root=str(tmp_path), segment_bytes=200, read_chunk_bytes=16)
+
+
+class TestExecutionLogStore:
+    """Test suite for ExecutionLogStore."""
+
+    def test_append_stamps_log_seq(self, store):
+        """Entries get consecutive log_seq values across appends."""
+        first, second = _entries(0, 2), _entries(2, 1)
+        store.append(PROJECT_ID, EXECUTION_ID, first)
+        store.append(PROJECT_ID, EXECUTION_ID, second)
+
+        assert [entry["log_seq"] for entry in first + second] == [1, 2, 3]
+        assert _log_seqs(store.read_entries(PROJECT_ID, EXECUTION_ID)) == [1, 2, 3]
+
+    def test_rotation_compresses_closed_segments(self, store, tmp_path):
+        """Full segments are gzip-compressed; the log reads back unchanged."""
+        for index in range(20):
+            store.append(PROJECT_ID, EXECUTION_ID, _entries(index, 1))
+
+        directory = tmp_path / PROJECT_ID / EXECUTION_ID
+        compressed = sorted(path.name for path in directory.glob("segment-*.jsonl.gz"))
+        assert len(compressed) >= 2
+        assert len(list(directory.glob("segment-*.jsonl"))) <= 1
+
+        content = b"".join(store.read_bytes(PROJECT_ID, EXECUTION_ID))
+        assert len(content) == store.size(PROJECT_ID, EXECUTION_ID)
+        assert [json.loads(line)["log_seq"] for line in content.splitlines()] == list(range(1, 21))
+
+    def test_byte_ranges_span_segments(self, store):
+        """Any byte range equals the same slice of the whole log."""
+        for index in range(20):
+            store.append(PROJECT_ID, EXECUTION_ID, _entries(index, 1))
+        content = b"".join(store.read_bytes(PROJECT_ID, EXECUTION_ID))
+
+        for start, end in [(0, 10), (150, 450), (len(content) - 5, len(content)), (37, None)]:
+            chunks = list(store.read_bytes(PROJECT_ID, EXECUTION_ID, start, end))
+            assert b"".join(chunks) == content[start:end]
+            assert all(len(chunk) <= 16 for chunk in chunks)
+
+    def test_seq_ranges(self, store):
+        """Sequence ranges are inclusive and skip untouched segments."""
+        for index in range(20):
+            store.append(PROJECT_ID, EXECUTION_ID, _entries(index, 1))
+
+        assert _log_seqs(store.read_entries(PROJECT_ID, EXECUTION_ID, 5, 12)) == list(range(5, 13))
+        assert _log_seqs(store.read_entries(PROJECT_ID, EXECUTION_ID, 19)) == [19, 20]
+
+    def test_close_execution_compresses_active_segment(self, store, tmp_path):
+        """Closing leaves only compressed segments."""
+        store.append(PROJECT_ID, EXECUTION_ID, _entries(0, 2))
+        store.close_execution(PROJECT_ID, EXECUTION_ID)
+
+        directory = tmp_path / PROJECT_ID / EXECUTION_ID
+        assert not list(directory.glob("segment-*.jsonl"))
+        assert _log_seqs(store.read_entries(PROJECT_ID, EXECUTION_ID)) == [1, 2]
+
+    def test_restart_resumes_sequence_and_drops_torn_line(self, store, tmp_path):
+        """A new store continues the sequence after the last complete line."""
+        store.append(PROJECT_ID, EXECUTION_ID, _entries(0, 2))
+        active = next((tmp_path / PROJECT_ID / EXECUTION_ID).glob("segment-*.jsonl"))
+        with open(active, "ab") as segment:
+            segment.write(b'{"message": "torn')
+
+        assert _log_seqs(store.read_entries(PROJECT_ID, EXECUTION_ID)) == [1, 2]
+
+        restarted = ExecutionLogStore(root=str(tmp_path), segment_bytes=200)
+        entries = _entries(2, 1)
+        restarted.append(PROJECT_ID, EXECUTION_ID, entries)
+
+        assert entries[0]["log_seq"] == 3
+        assert _log_seqs(restarted.read_entries(PROJECT_ID, EXECUTION_ID)) == [1, 2, 3]
+
+    def test_missing_and_invalid_logs(self, store):
+        """Unknown executions raise ExecutionLogNotFound; unsafe identifiers ValueError."""
+        with pytest.raises(ExecutionLogNotFound):
+            store.size(PROJECT_ID, "exec_unknown")
+        with pytest.raises(ValueError):
+            store.append("..", EXECUTION_ID, _entries(0, 1))
+
+    def test_slash_project_id(self, store, tmp_path):
+        """Project IDs with slashes are stored in one encoded directory, apart from look-alikes."""
+        store.append(SLASH_PROJECT_ID, EXECUTION_ID, _entries(0, 2))
+        store.append("customer-123", "project-abc", _entries(0, 1))
+
+        assert (tmp_path / "customer-123%2Fproject-abc" / EXECUTION_ID / "index.json").exists()
+        assert _log_seqs(store.read_entries(SLASH_PROJECT_ID, EXECUTION_ID)) == [1, 2]
+        assert _log_seqs(store.read_entries("customer-123", "project-abc")) == [1]
+
+
+class TestServiceStorage:
+    """Test suite for ExecutionLogService writing to the store."""
+
+    def test_frames_carry_stored_log_seq(self, store):
+        """Single and batched frames carry the log_seq of their stored entries."""
+        broadcast = AsyncMock()
+
+        async def scenario():
+            with patch("services.execution_log_service.broadcast_to_project", broadcast):
+                single = ExecutionLogService(log_store=store)
+                batched = ExecutionLogService(log_store=store, batch_size=2, batch_interval_ms=10_000)
+                for service, message in ((single, "one"), (batched, "two"), (batched, "three")):
+                    await service.send_execution_log(
+                        project_id=PROJECT_ID,
+                        execution_id=EXECUTION_ID,
+                        log_entry_type=LogEntryType.OPERATION_LOG,
+                        message=message,
+                        level=LogLevel.INFO
+                    )
+
+        asyncio.run(scenario())
+
+        single_frame, batch_frame = [call.args[0] for call in broadcast.call_args_list]
+        assert single_frame["payload"]["log_seq"] == 1
+        assert [entry["log_seq"] for entry in batch_frame["payload"]["entries"]] == [2, 3]
+        assert _log_seqs(store.read_entries(PROJECT_ID, EXECUTION_ID)) == [1, 2, 3]
+
+
+class TestExecutionLogEndpoint:
+    """Test suite for the execution log endpoint."""
+
+    @pytest.fixture
+    def client(self, store):
+        """Client of an app serving the endpoint from a filled store."""
+        for index in range(20):
+            store.append(PROJECT_ID, EXECUTION_ID, _entries(index, 1))
+        app = FastAPI()
+        app.include_router(execution_logs.router)
+        with patch("api.v1.endpoints.execution_logs.get_execution_log_store", return_value=store):
+            yield TestClient(app)
+
+    def _url(self, execution_id=EXECUTION_ID):
+        return f"/logs/{PROJECT_ID}/{execution_id}"
+
+    def test_whole_log(self, client, store):
+        """Without ranges the whole log is streamed as NDJSON."""
+        response = client.get(self._url())
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        assert response.headers["accept-ranges"] == "bytes"
+        assert response.content == b"".join(store.read_bytes(PROJECT_ID, EXECUTION_ID))
+
+    def test_byte_range(self, client, store):
+        """Range requests get 206 with Content-Range."""
+        content = b"".join(store.read_bytes(PROJECT_ID, EXECUTION_ID))
+
+        response = client.get(self._url(), headers={"Range": "bytes=100-299"})
+        assert response.status_code == 206
+        assert response.headers["content-range"] == f"bytes 100-299/{len(content)}"
+        assert response.content == content[100:300]
+
+        suffix = client.get(self._url(), headers={"Range": "bytes=-50"})
+        assert suffix.content == content[-50:]
+
+    def test_unsatisfiable_range(self, client, store):
+        """Ranges past the end get 416 with the log size."""
+        size = store.size(PROJECT_ID, EXECUTION_ID)
+
+        response = client.get(self._url(), headers={"Range": f"bytes={size}-"})
+
+        assert response.status_code == 416
+        assert response.headers["content-range"] == f"bytes */{size}"
+
+    def test_seq_range(self, client):
+        """from_seq/to_seq select entries by log_seq."""
+        response = client.get(self._url(), params={"from_seq": 18, "to_seq": 19})
+
+        assert response.status_code == 200
+        assert [json.loads(line)["log_seq"] for line in response.content.splitlines()] == [18, 19]
+
+    def test_unknown_execution(self, client):
+        """Executions without a stored log get 404."""
+        assert client.get(self._url("exec_unknown")).status_code == 404
+
+    def test_slash_project_id(self, client, store):
+        """Project IDs with slashes are routed to their log."""
+        store.append(SLASH_PROJECT_ID, EXECUTION_ID, _entries(0, 3))
+
+        response = client.get(f"/logs/{SLASH_PROJECT_ID}/{EXECUTION_ID}", params={"from_seq": 2})
+
+        assert response.status_code == 200
+        assert [json.loads(line)["log_seq"] for line in response.content.splitlines()] == [2, 3]
@@ -0,0 +1,108 @@
+"""
+Unit Tests for Conditional GET on the Automation Status Endpoint
+
+Tests ETag / If-None-Match handling of GET /devteam/automation/status/{project_id}:
+- Strong ETag and Cache-Control on 200 responses
+- 304 Not Modified from the version lookup alone, without projecting
+- Full response when the version changed
+- Version token derivation from the event id and updated_at
+"""
+
+import uuid
+from datetime import datetime
+from unittest.mock import Mock, patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from api.v1.endpoints import devteam_automation
+from database.session import db_read_session
+from schemas.status_projection_schema import ExecutionStatus, StatusProjection
+from services.status_projection_service import status_version_of
+
+
+PROJECT_ID = "customer-1-project-1"
+EVENT_ID = uuid.UUID("12345678-1234-1234-1234-123456789012")
+UPDATED_AT = datetime(2025, 1, 14, 18, 30, 0, 123456)
+VERSION = status_version_of(EVENT_ID, UPDATED_AT)
+
+
+class TestStatusConditionalGet:
+    """Test suite for conditional GET on the status endpoint."""
+
+    @pytest.fixture
+    def status_service(self):
+        """Mock status projection service for the endpoint."""
+        service = Mock()
+        service.get_status_version_by_project_id.return_value = {
+            "event_id": str(EVENT_ID),
+            "version": VERSION
+        }
+        service.get_status_by_project_id.return_value = StatusProjection(
+            execution_id=str(EVENT_ID),
+            project_id=PROJECT_ID,
+            status=ExecutionStatus.RUNNING,
+            progress=50.0,
+            current_task="1.1.1"
+        )
+        with patch.object(devteam_automation, "get_status_projection_service", return_value=service):
+            yield service
+
+    @pytest.fixture
+    def client(self):
+        """Test client for the DevTeam automation router."""
+        app = FastAPI()
+        app.include_router(devteam_automation.router, prefix="/devteam/automation")
+        app.dependency_overrides[db_read_session] = lambda: Mock()
+        return TestClient(app)
+
+    def test_ok_response_carries_etag(self, client, status_service):
+        """A full response is tagged with the event version."""
+        response = client.get(f"/devteam/automation/status/{PROJECT_ID}")
+
+        assert response.status_code == 200
+        assert response.headers["ETag"] == f'"{VERSION}"'
+        assert response.headers["Cache-Control"] == "private, no-cache"
+        assert response.json()["data"]["progress"] == 50.0
+
+    def test_matching_etag_returns_not_modified(self, client, status_service):
+        """A matching If-None-Match is answered without projecting the status."""
+        response = client.get(
+            f"/devteam/automation/status/{PROJECT_ID}",
+            headers={"If-None-Match": f'W/"other", "{VERSION}"'}
+        )
+
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["ETag"] == f'"{VERSION}"'
+        status_service.get_status_by_project_id.assert_not_called()
+
+    def test_stale_etag_returns_full_response(self, client, status_service):
+        """A changed version returns the full projection again."""
+        response = client.get(
+            f"/devteam/automation/status/{PROJECT_ID}",
+            headers={"If-None-Match": '"stale-version"'}
+        )
+
+        assert response.status_code == 200
+        assert response.headers["ETag"] == f'"{VERSION}"'
+        status_service.get_status_by_project_id.assert_called_once()
+
+    def test_projection_of_other_event_is_not_tagged(self, client, status_service):
+        """A projection that does not come from the versioned event is not cacheable."""
+        status_service.get_status_version_by_project_id.return_value = {
+            "event_id": str(uuid.uuid4()),
+            "version": "other-version"
+        }
+
+        response = client.get(f"/devteam/automation/status/{PROJECT_ID}")
+
+        assert response.status_code == 200
+        assert "ETag" not in response.headers
+        assert response.headers["Cache-Control"] == "no-cache"
+
+    def test_version_changes_with_updated_at(self):
+        """Every write to the event yields a new version token."""
+        assert VERSION == "12345678123412341234123456789012-20250114183000123456"
+        assert status_version_of(EVENT_ID, datetime(2025, 1, 14, 18, 30, 1)) != VERSION
@@ -0,0 +1,184 @@
+"""
+Unit Tests for Status Long-Polling
+
+Tests long-polling of GET /devteam/automation/status/{project_id}?wait=&since=:
+- Immediate response when a newer version already exists
+- Parked requests woken by the WebSocket broadcast notification
+- Woken requests reading from the primary, ahead of a lagging replica
+- 304 Not Modified when the wait elapses without a change
+- Waiter registry bookkeeping and cross-thread notification
+"""
+
+import asyncio
+import threading
+import time
+import uuid
+from unittest.mock import Mock, patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from api.v1.endpoints import devteam_automation
+from api.v1.endpoints.websocket import broadcast_to_project
+from database.session import db_primary_read_session, db_read_session
+from schemas.status_projection_schema import ExecutionStatus, StatusProjection
+from services.status_waiters import StatusWaiterRegistry, get_status_waiters
+
+
+PROJECT_ID = "customer-1-project-1"
+EVENT_ID = str(uuid.uuid4())
+
+
+def _version(version):
+    return {"event_id": EVENT_ID, "version": version}
+
+
+class TestStatusLongPoll:
+    """Test suite for the long-poll status endpoint."""
+
+    @pytest.fixture
+    def status_service(self):
+        """Mock status projection service for the endpoint."""
+        service = Mock()
+        service.get_status_version_by_project_id.return_value = _version("v1")
+        service.get_status_by_project_id.return_value = StatusProjection(
+            execution_id=EVENT_ID,
+            project_id=PROJECT_ID,
+            status=ExecutionStatus.RUNNING,
+            progress=50.0,
+            current_task="1.1.1"
+        )
+        with patch.object(devteam_automation, "get_status_projection_service", return_value=service):
+            yield service
+
+    @pytest.fixture
+    def session(self):
+        """Mock read session."""
+        return Mock()
+
+    @pytest.fixture
+    def primary_session(self):
+        """Mock primary session."""
+        return Mock()
+
+    @pytest.fixture
+    def client(self, session, primary_session):
+        """Test client for the DevTeam automation router."""
+        app = FastAPI()
+        app.include_router(devteam_automation.router, prefix="/devteam/automation")
+        app.dependency_overrides[db_read_session] = lambda: session
+        app.dependency_overrides[db_primary_read_session] = lambda: primary_session
+        return TestClient(app)
+
+    def test_newer_version_returns_immediately(self, client, status_service):
+        """A client behind the current version is answered without waiting."""
+        start = time.monotonic()
+        response = client.get(f"/devteam/automation/status/{PROJECT_ID}?wait=30&since=v0")
+
+        assert response.status_code == 200
+        assert response.headers["ETag"] == '"v1"'
+        assert time.monotonic() - start < 5
+        assert get_status_waiters().waiter_count(PROJECT_ID) == 0
+
+    def test_broadcast_wakes_parked_request(self, client, status_service, session):
+        """A status broadcast for the project ends the wait with the new version."""
+        def publish_update():
+            while get_status_waiters().waiter_count(PROJECT_ID) == 0:
+                time.sleep(0.01)
+            status_service.get_status_version_by_project_id.return_value = _version("v2")
+            asyncio.run(broadcast_to_project({"type": "execution-update"}, PROJECT_ID))
+
+        publisher = threading.Thread(target=publish_update)
+        publisher.start()
+        start = time.monotonic()
+        response = client.get(f"/devteam/automation/status/{PROJECT_ID}?wait=30&since=v1")
+        publisher.join()
+
+        assert response.status_code == 200
+        assert response.headers["ETag"] == '"v2"'
+        assert time.monotonic() - start < 5
+        # The pooled connection is released while parked
+        session.close.assert_called()
+        assert get_status_waiters().waiter_count(PROJECT_ID) == 0
+
+    def test_woken_request_reads_primary(self, client, status_service, session, primary_session):
+        """After a wake the change is read from the primary, not a replica still at the old version."""
+        replica_service = Mock()
+        replica_service.get_status_version_by_project_id.return_value = _version("v1")
+        services = {id(session): replica_service, id(primary_session): status_service}
+        status_service.get_status_version_by_project_id.return_value = _version("v2")
+
+        def publish_update():
+            while get_status_waiters().waiter_count(PROJECT_ID) == 0:
+                time.sleep(0.01)
+            asyncio.run(broadcast_to_project({"type": "execution-update"}, PROJECT_ID))
+
+        publisher = threading.Thread(target=publish_update)
+        publisher.start()
+        start = time.monotonic()
+        with patch.object(
+            devteam_automation, "get_status_projection_service",
+            side_effect=lambda session, correlation_id: services[id(session)]
+        ):
+            response = client.get(f"/devteam/automation/status/{PROJECT_ID}?wait=30&since=v1")
+        publisher.join()
+
+        assert response.status_code == 200
+        assert response.headers["ETag"] == '"v2"'
+        assert time.monotonic() - start < 5
+        status_service.get_status_by_project_id.assert_called_once()
+        replica_service.get_status_by_project_id.assert_not_called()
+
+    def test_unchanged_version_times_out_with_not_modified(self, client, status_service):
+        """A wait that elapses without a change returns 304."""
+        response = client.get(f"/devteam/automation/status/{PROJECT_ID}?wait=1&since=%22v1%22")
+
+        assert response.status_code == 304
+        assert response.headers["ETag"] == '"v1"'
+        status_service.get_status_by_project_id.assert_not_called()
+
+    def test_wait_is_bounded(self, client, status_service):
+        """Waits longer than the maximum are rejected."""
+        response = client.get(f"/devteam/automation/status/{PROJECT_ID}?wait=3600&since=v1")
+
+        assert response.status_code == 422
+
+
+class TestStatusWaiterRegistry:
+    """Test suite for StatusWaiterRegistry."""
+
+    def test_notification_from_other_thread_wakes_watch(self):
+        """Broadcasts from worker threads wake waiters on the API loop."""
+        registry = StatusWaiterRegistry()
+
+        async def scenario():
+            with registry.watch("project-a") as watch:
+                threading.Timer(0.05, registry.notify, args=("project-a",)).start()
+                return await watch.wait(5)
+
+        assert asyncio.run(scenario()) is True
+        assert registry.waiter_count() == 0
+
+    def test_notification_is_scoped_to_project(self):
+        """Only watches on the notified project are woken."""
+        registry = StatusWaiterRegistry()
+
+        async def scenario():
+            with registry.watch("project-a") as watch_a, registry.watch("project-b") as watch_b:
+                assert registry.notify("project-a") == 1
+                return await watch_a.wait(1), await watch_b.wait(0.05)
+
+        assert asyncio.run(scenario()) == (True, False)
+
+    def test_notification_before_wait_is_not_lost(self):
+        """A change notified between the version check and wait() still wakes the watch."""
+        registry = StatusWaiterRegistry()
+
+        async def scenario():
+            with registry.watch("project-a") as watch:
+                registry.notify("project-a")
+                await asyncio.sleep(0)
+                return await watch.wait(0.05)
+
+        assert asyncio.run(scenario()) is True
@@ -0,0 +1,162 @@
+"""
+Unit Tests for Batch Status Projection
+
+Tests the batch status lookup across many projects:
+- One database query regardless of the number of projects
+- Project ID expression matching the project_id/updated_at index
+- Projection map with None for projects without events
+- Per-event failures isolated from the rest of the batch
+- Batch status endpoint response mapping
+"""
+
+import asyncio
+import uuid
+from datetime import datetime
+from unittest.mock import Mock, patch
+
+import pytest
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+
+from api.v1.endpoints.devteam_automation import get_devteam_automation_status_batch
+from core.exceptions import RepositoryError
+from database.event import Event
+from schemas.devteam_automation_schema import DevTeamAutomationBatchStatusRequest
+from schemas.status_projection_schema import ExecutionStatus, StatusProjection
+from services.status_projection_cache import StatusProjectionCache
+from services.status_projection_service import EVENT_PROJECT_ID, StatusProjectionService
+
+
+def _event(project_id, running_nodes=1):
+    event = Mock(spec=Event)
+    event.id = uuid.uuid4()
+    event.updated_at = datetime(2025, 1, 1, 12, 0, 0)
+    event.task_context = {
+        "metadata": {"project_id": project_id, "task_id": "1.1.1"},
+        "nodes": {
+            "select": {"status": "completed"},
+            **{f"node_{i}": {"status": "running"} for i in range(running_nodes)}
+        }
+    }
+    return event
+
+
+class TestGetStatusByProjectIds:
+    """Test suite for StatusProjectionService.get_status_by_project_ids."""
+
+    @pytest.fixture
+    def service(self):
+        """Create StatusProjectionService with a mocked session and isolated cache."""
+        with patch("services.status_projection_service.GenericRepository"), \
+                patch("services.status_projection_service.get_status_projection_cache",
+                      return_value=StatusProjectionCache()):
+            yield StatusProjectionService(session=Mock(spec=Session), correlation_id="test-batch")
+
+    def _mock_latest_events(self, service, events):
+        query = service.session.query.return_value
+        query.filter.return_value.distinct.return_value.order_by.return_value.all.return_value = events
+        return query
+
+    def test_single_query_for_many_projects(self, service):
+        """All projects are resolved with one query and one projection each."""
+        project_ids = [f"customer-1/project-{i}" for i in range(50)]
+        events = [_event(project_id) for project_id in project_ids]
+        query = self._mock_latest_events(service, events)
+
+        result = service.get_status_by_project_ids(project_ids)
+
+        service.session.query.assert_called_once_with(Event)
+        query.filter.assert_called_once()
+        assert list(result) == project_ids
+        assert all(projection.status == ExecutionStatus.RUNNING for projection in result.values())
+        assert result["customer-1/project-7"].execution_id == str(events[7].id)
+
+    def test_missing_projects_map_to_none(self, service):
+        """Projects without events are present in the map with None."""
+        self._mock_latest_events(service, [_event("customer-1/project-a")])
+
+        result = service.get_status_by_project_ids(
+            ["customer-1/project-a", "customer-1/project-b", "customer-1/project-a"]
+        )
+
+        assert list(result) == ["customer-1/project-a", "customer-1/project-b"]
+        assert result["customer-1/project-b"] is None
+
+    def test_failed_projection_does_not_fail_batch(self, service):
+        """A context that cannot be projected only affects its own project."""
+        self._mock_latest_events(
+            service, [_event("customer-1/project-ok"), _event("customer-1/project-broken")]
+        )
+
+        with patch(
+            "services.status_projection_service.project_status_from_task_context",
+            side_effect=[
+                StatusProjection(
+                    execution_id="exec_ok", project_id="customer-1/project-ok", status=ExecutionStatus.IDLE
+                ),
+                ValueError("bad context")
+            ]
+        ):
+            result = service.get_status_by_project_ids(
+                ["customer-1/project-ok", "customer-1/project-broken"]
+            )
+
+        assert result["customer-1/project-ok"].execution_id == "exec_ok"
+        assert result["customer-1/project-broken"] is None
+
+    def test_invalid_project_ids_rejected(self, service):
+        """Invalid batches are rejected before querying."""
+        with pytest.raises(RepositoryError):
+            service.get_status_by_project_ids([])
+
+        with pytest.raises(RepositoryError):
+            service.get_status_by_project_ids(["customer-1/project'; DROP TABLE events"])
+
+        with pytest.raises(RepositoryError):
+            service.get_status_by_project_ids(
+                [f"p{i}" for i in range(StatusProjectionService.MAX_BATCH_PROJECT_IDS + 1)]
+            )
+
+        service.session.query.assert_not_called()
+
+    def test_project_id_expression_matches_index(self):
+        """The filter uses the exact expression of the per-project index."""
+        compiled = str(EVENT_PROJECT_ID.compile(dialect=postgresql.dialect()))
+
+        assert compiled == "(events.task_context -> 'metadata' ->> 'project_id')"
+
+
+class TestBatchStatusEndpoint:
+    """Test suite for POST /devteam/automation/status/batch."""
+
+    @patch("api.v1.endpoints.devteam_automation.get_status_projection_service")
+    def test_returns_statuses_and_not_found(self, mock_service_factory):
+        """Found projects are mapped to status responses, missing ones listed."""
+        mock_service_factory.return_value.get_status_by_project_ids.return_value = {
+            "customer-1/project-a": StatusProjection(
+                execution_id="exec_a",
+                project_id="customer-1/project-a",
+                status=ExecutionStatus.RUNNING,
+                progress=50.0,
+                current_task="1.1.1"
+            ),
+            "customer-1/project-b": None
+        }
+        request = DevTeamAutomationBatchStatusRequest(
+            project_ids=["customer-1/project-a", "customer-1/project-b"]
+        )
+
+        response = asyncio.run(get_devteam_automation_status_batch(request, session=Mock()))
+
+        assert response.success is True
+        assert response.data.statuses["customer-1/project-a"].status == "running"
+        assert response.data.statuses["customer-1/project-b"] is None
+        assert response.data.not_found == ["customer-1/project-b"]
+
+    def test_request_validates_project_ids(self):
+        """Each project ID is validated like the single status endpoint."""
+        with pytest.raises(ValueError):
+            DevTeamAutomationBatchStatusRequest(project_ids=["customer/project/extra"])
+
+        with pytest.raises(ValueError):
+            DevTeamAutomationBatchStatusRequest(project_ids=[])
@@ -0,0 +1,193 @@
+"""
+Unit Tests for Status Projection Cache
+
+Tests the two-tier status projection cache:
+- Version-keyed hits and misses in the in-process LRU tier
+- LRU eviction and explicit invalidation
+- Shared Redis tier round-trips and graceful degradation
+- StatusProjectionService serving unchanged events without re-transforming
+"""
+
+import uuid
+from datetime import datetime, timedelta
+from unittest.mock import Mock, patch
+
+import pytest
+from sqlalchemy.orm import Session
+
+from database.event import Event
+from schemas.status_projection_schema import ExecutionStatus, StatusProjection
+from services.status_projection_cache import StatusProjectionCache
+from services.status_projection_service import StatusProjectionService
+
+
+class FakeRedis:
+    """Minimal in-memory stand-in for the redis client methods used by the cache."""
+
+    def __init__(self):
+        self.store = {}
+
+    def get(self, key):
+        return self.store.get(key)
+
+    def set(self, key, value, ex=None):
+        self.store[key] = value.encode("utf-8")
+
+    def delete(self, key):
+        self.store.pop(key, None)
+
+
+def _projection(execution_id="exec_1", progress=50.0):
+    return StatusProjection(
+        execution_id=execution_id,
+        project_id="customer-1/project-1",
+        status=ExecutionStatus.RUNNING,
+        progress=progress,
+        current_task="1.1.1"
+    )
+
+
+class TestStatusProjectionCache:
+    """Test suite for StatusProjectionCache."""
+
+    @pytest.fixture(autouse=True)
+    def mock_metrics(self):
+        """Capture cache metrics."""
+        with patch("services.status_projection_cache.record_cache_lookup") as mock_record:
+            yield mock_record
+
+    def test_hit_requires_matching_version(self):
+        """Entries are only served for the version they were computed from."""
+        cache = StatusProjectionCache()
+        updated_at = datetime(2025, 1, 1, 12, 0, 0)
+        version = cache.version_of(updated_at)
+
+        cache.put("event-1", version, _projection())
+
+        assert cache.get("event-1", version).progress == 50.0
+        assert cache.get("event-1", cache.version_of(updated_at + timedelta(seconds=1))) is None
+
+    def test_unversioned_events_are_not_cached(self):
+        """Events without a usable updated_at bypass the cache."""
+        cache = StatusProjectionCache()
+        version = cache.version_of(None)
+
+        cache.put("event-1", version, _projection())
+
+        assert version is None
+        assert cache.get("event-1", version) is None
+
+    def test_returned_projection_is_a_copy(self):
+        """Callers cannot mutate the cached projection."""
+        cache = StatusProjectionCache()
+        version = cache.version_of(datetime(2025, 1, 1))
+        cache.put("event-1", version, _projection())
+
+        cache.get("event-1", version).progress = 99.0
+
+        assert cache.get("event-1", version).progress == 50.0
+
+    def test_lru_evicts_least_recently_used(self):
+        """The in-process tier is bounded."""
+        cache = StatusProjectionCache()
+        cache.LOCAL_MAX_ENTRIES = 2
+        version = cache.version_of(datetime(2025, 1, 1))
+
+        cache.put("event-1", version, _projection())
+        cache.put("event-2", version, _projection())
+        cache.get("event-1", version)
+        cache.put("event-3", version, _projection())
+
+        assert cache.get("event-2", version) is None
+        assert cache.get("event-1", version) is not None
+
+    def test_invalidate_drops_both_tiers(self):
+        """Invalidation removes the local entry and the shared entry."""
+        fake_redis = FakeRedis()
+        cache = StatusProjectionCache(redis_client=fake_redis)
+        version = cache.version_of(datetime(2025, 1, 1))
+        cache.put("event-1", version, _projection())
+
+        cache.invalidate("event-1")
+
+        assert fake_redis.store == {}
+        assert cache.get("event-1", version) is None
+
+    def test_redis_tier_shared_between_processes(self, mock_metrics):
+        """A projection cached by one process is served to another from Redis."""
+        fake_redis = FakeRedis()
+        writer = StatusProjectionCache(redis_client=fake_redis)
+        reader = StatusProjectionCache(redis_client=fake_redis)
+        version = writer.version_of(datetime(2025, 1, 1))
+
+        writer.put("event-1", version, _projection(progress=75.0))
+        projection = reader.get("event-1", version)
+
+        assert projection.progress == 75.0
+        assert projection.execution_id == "exec_1"
+        assert mock_metrics.call_args.kwargs == {"hit": True, "tier": "redis"}
+
+    def test_unavailable_redis_degrades_to_local_tier(self):
+        """Redis errors disable the shared tier without failing lookups."""
+        broken_redis = Mock()
+        broken_redis.get.side_effect = ConnectionError("refused")
+        broken_redis.set.side_effect = ConnectionError("refused")
+        cache = StatusProjectionCache(redis_client=broken_redis)
+        version = cache.version_of(datetime(2025, 1, 1))
+
+        cache.put("event-1", version, _projection())
+        assert cache.get("event-1", version) is not None
+        assert cache.get("event-2", version) is None
+
+        # The shared tier is skipped after the first failure
+        assert broken_redis.set.call_count == 1
+        broken_redis.get.assert_not_called()
+
+
+class TestStatusProjectionServiceCaching:
+    """StatusProjectionService reuses projections of unchanged events."""
+
+    @pytest.fixture
+    def service(self):
+        """Create StatusProjectionService with a mocked session."""
+        with patch("services.status_projection_service.GenericRepository"):
+            return StatusProjectionService(session=Mock(spec=Session), correlation_id="test-cache")
+
+    @pytest.fixture
+    def cache(self):
+        """Provide an isolated cache to the service."""
+        cache = StatusProjectionCache()
+        with patch("services.status_projection_service.get_status_projection_cache", return_value=cache):
+            yield cache
+
+    def _mock_latest_event(self, service, event):
+        service.session.query.return_value.filter.return_value.order_by.return_value.limit.side_effect = (
+            lambda n: iter([event])
+        )
+
+    def test_repeated_polls_transform_once_per_version(self, service, cache):
+        """Polling an unchanged event transforms its context only once."""
+        project_id = "customer-1/project-1"
+        event = Mock(spec=Event)
+        event.id = uuid.uuid4()
+        event.updated_at = datetime(2025, 1, 1, 12, 0, 0)
+        event.task_context = {
+            "metadata": {"project_id": project_id, "task_id": "1.1.1"},
+            "nodes": {"select": {"status": "completed"}, "prep": {"status": "running"}}
+        }
+        self._mock_latest_event(service, event)
+
+        with patch(
+            "services.status_projection_service.project_status_from_task_context",
+            return_value=_projection(execution_id=str(event.id).replace("-", ""))
+        ) as mock_project:
+            for _ in range(10):
+                result = service.get_status_by_project_id(project_id)
+            assert mock_project.call_count == 1
+
+            # A write bumps updated_at and forces one new transformation
+            event.updated_at = datetime(2025, 1, 1, 12, 0, 1)
+            service.get_status_by_project_id(project_id)
+            assert mock_project.call_count == 2
+
+        assert result.progress == 50.0
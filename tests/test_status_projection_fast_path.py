@@ -0,0 +1,147 @@
+"""
+Unit Tests for the Status Projection Fast Path
+
+Tests that the lean projector behind project_status_from_task_context:
+- Produces the same StatusProjection as the fully logged transformation
+- Falls back to the logged transformation for malformed or invalid input
+- Skips transformation logging while debug logging is disabled
+- Projects large realistic contexts at least 10x faster
+"""
+
+import logging
+import time
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+
+from core.exceptions import InvalidTaskContextError, TaskContextTransformationError
+from schemas.status_projection_schema import (
+    ExecutionStatus,
+    _project_status_fast,
+    _project_status_from_task_context_logged,
+    project_status_from_task_context,
+    transformation_logger,
+)
+
+
+def _large_task_context(total_nodes=200, completed_nodes=150):
+    """Build a task_context shaped like a long DevTeam execution."""
+    nodes = {
+        f"node_{i}": {
+            "status": "completed" if i < completed_nodes else "running",
+            "output": "x" * 2000,
+            "event_data": {"values": list(range(50))}
+        }
+        for i in range(total_nodes)
+    }
+    return {
+        "metadata": {
+            "task_id": "1.2.3",
+            "branch": "task/1-2-3-add-feature",
+            "repo_path": "/workspace/repos/customer-1-project-2",
+            "logs": [f"log line {i}" for i in range(500)],
+            "files_modified": [f"src/file_{i}.py" for i in range(100)],
+            "started_at": "2025-01-14T18:25:00Z",
+            "correlationId": "corr_123"
+        },
+        "nodes": nodes
+    }
+
+
+EQUIVALENT_CASES = [
+    ({"metadata": {}, "nodes": {}}, "exec_1", "customer-1/project-1"),
+    ({"metadata": {"status": "prepared"}, "nodes": {}}, "exec_2", "project-only"),
+    ({"metadata": {"taskId": "2.1"}, "nodes": {"a": {"status": "running"}}}, "exec_3", "c/p"),
+    ({"metadata": {"task_id": "1"}, "nodes": {"a": {"event_data": {"status": "completed"}}}}, "exec_4", "c/p"),
+    ({"metadata": {}, "nodes": {"a": {"status": "error"}, "b": "not-a-dict"}}, "exec_5", "c/p"),
+    ({"metadata": {"startedAt": datetime(2025, 1, 1)}, "nodes": {"a": {"status": "completed"}}}, "exec_6", "c/p"),
+    (_large_task_context(), "exec_large", "customer-1/project-2"),
+]
+
+FALLBACK_CASES = [
+    # Malformed structures are degraded with logging by the full path
+    ({"metadata": "oops", "nodes": {}}, "exec_1", "c/p"),
+    ({"metadata": {}, "nodes": ["a"]}, "exec_2", "c/p"),
+    # Invalid field values are reported or defaulted by the full path
+    ({"metadata": {"branch": "bad branch"}, "nodes": {}}, "exec_3", "c/p"),
+    ({"metadata": {"logs": [1, 2]}, "nodes": {}}, "exec_4", "c/p"),
+    ({"metadata": {"started_at": "not a date"}, "nodes": {}}, "exec_5", "c/p"),
+    ({"metadata": {}, "nodes": {"a": {"status": "running"}}}, "exec_6", "c/p"),
+    ({"metadata": {}, "nodes": {}}, "exec with spaces", "c/p"),
+    ({"metadata": {}, "nodes": {}}, "exec_7", "a/b/c"),
+    (None, "exec_8", "c/p"),
+]
+
+
+class TestStatusProjectionFastPath:
+    """Test suite for the status projection fast path."""
+
+    @pytest.mark.parametrize("task_context,execution_id,project_id", EQUIVALENT_CASES)
+    def test_fast_path_matches_logged_transformation(self, task_context, execution_id, project_id):
+        """The fast path returns exactly what the logged path returns."""
+        fast = _project_status_fast(task_context, execution_id, project_id)
+        full = _project_status_from_task_context_logged(
+            task_context, execution_id=execution_id, project_id=project_id
+        )
+
+        assert fast is not None
+        assert fast.model_dump(exclude={"updated_at"}) == full.model_dump(exclude={"updated_at"})
+
+    @pytest.mark.parametrize("task_context,execution_id,project_id", FALLBACK_CASES)
+    def test_fast_path_defers_unusual_input(self, task_context, execution_id, project_id):
+        """Input needing degradation or error reporting is left to the logged path."""
+        assert _project_status_fast(task_context, execution_id, project_id) is None
+
+    def test_invalid_input_still_raises(self):
+        """Errors raised by the logged path are preserved."""
+        with pytest.raises(InvalidTaskContextError):
+            project_status_from_task_context(None, "exec_1", "c/p")
+
+        with pytest.raises(TaskContextTransformationError):
+            project_status_from_task_context(
+                {"metadata": {}, "nodes": {"a": {"status": "running"}}}, "exec_1", "c/p"
+            )
+
+    def test_fast_path_skips_transformation_logging(self):
+        """No transformation logging happens for well-formed input when debug is off."""
+        with patch.object(transformation_logger, "set_transformation_context") as mock_context, \
+                patch.object(transformation_logger.logger.logger, "isEnabledFor", return_value=False):
+            projection = project_status_from_task_context(
+                _large_task_context(), execution_id="exec_1", project_id="c/p"
+            )
+
+        assert projection.status == ExecutionStatus.RUNNING.value
+        assert projection.progress == 75.0
+        mock_context.assert_not_called()
+
+    def test_debug_logging_uses_logged_transformation(self):
+        """Enabling debug logging restores the fully logged transformation."""
+        with patch.object(transformation_logger, "set_transformation_context") as mock_context, \
+                patch.object(transformation_logger.logger.logger, "isEnabledFor", return_value=True):
+            project_status_from_task_context({"metadata": {}, "nodes": {}}, "exec_1", "c/p")
+
+        mock_context.assert_called_once()
+
+    def test_fast_path_benchmark(self):
+        """The fast path projects large contexts at least 10x faster."""
+        task_context = _large_task_context()
+        iterations = 50
+
+        def best_rate(projector):
+            best = float("inf")
+            for _ in range(3):
+                start = time.perf_counter()
+                for _ in range(iterations):
+                    projector(task_context, execution_id="exec_bench", project_id="customer-1/project-2")
+                best = min(best, time.perf_counter() - start)
+            return iterations / best
+
+        with patch.object(transformation_logger.logger.logger, "isEnabledFor", return_value=False):
+            fast_rate = best_rate(project_status_from_task_context)
+        logged_rate = best_rate(_project_status_from_task_context_logged)
+
+        logging.getLogger(__name__).info(
+            "status projection benchmark: fast=%.0f/s logged=%.0f/s", fast_rate, logged_rate
+        )
+        assert fast_rate >= 10 * logged_rate
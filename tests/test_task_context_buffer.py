@@ -0,0 +1,176 @@
+"""
+Unit Tests for Task Context Write-Behind Buffer
+
+Tests coalescing of intermediate task_context persistence in the worker:
+- Latest-wins coalescing per event
+- Per-event flush interval and immediate terminal flushes
+- Multi-row UPDATE batching across executions
+- Failure re-queueing and flush-lag metrics
+- Failed workflows persisting an error status as their terminal write
+"""
+
+import json
+import time
+from unittest.mock import MagicMock, Mock, patch
+
+import pytest
+from sqlalchemy.orm import Session
+
+from core.task import TaskContext
+from worker.task_context_buffer import TaskContextWriteBuffer
+from worker.tasks import process_incoming_event
+
+
+class TestTaskContextWriteBuffer:
+    """Test suite for TaskContextWriteBuffer."""
+
+    @pytest.fixture
+    def session(self):
+        """Create mock database session."""
+        return Mock(spec=Session)
+
+    @pytest.fixture
+    def buffer(self, session):
+        """Create a buffer without the background flusher thread."""
+        return TaskContextWriteBuffer(
+            session_factory=lambda: session,
+            flush_interval_ms=10_000,
+            start_flusher=False
+        )
+
+    @staticmethod
+    def _params(session, call_index=0):
+        return session.execute.call_args_list[call_index].args[1]
+
+    def test_first_snapshot_is_written_immediately(self, buffer, session):
+        """An event that has never been flushed is due at once."""
+        written = buffer.stage("event-1", {"nodes": {"A": {}}}, execution_id="exec_event-1")
+
+        assert written == 1
+        session.execute.assert_called_once()
+        session.commit.assert_called_once()
+        session.close.assert_called_once()
+
+    def test_snapshots_coalesce_within_interval(self, buffer, session):
+        """Later snapshots inside the interval replace earlier ones without writing."""
+        buffer.stage("event-1", {"nodes": {"A": {}}})
+        buffer.stage("event-1", {"nodes": {"A": {}, "B": {}}})
+        buffer.stage("event-1", {"nodes": {"A": {}, "B": {}, "C": {}}})
+
+        assert session.execute.call_count == 1
+        assert buffer.pending_count() == 1
+
+        buffer.flush(force=True)
+
+        assert session.execute.call_count == 2
+        assert json.loads(self._params(session, 1)["tc_0"]) == {"nodes": {"A": {}, "B": {}, "C": {}}}
+
+    def test_terminal_stage_flushes_immediately(self, buffer, session):
+        """Terminal snapshots bypass the interval."""
+        buffer.stage("event-1", {"metadata": {"status": "running"}})
+        buffer.stage("event-1", {"metadata": {"status": "completed"}}, terminal=True)
+
+        assert session.execute.call_count == 2
+        assert buffer.pending_count() == 0
+
+    def test_flush_batches_events_into_one_statement(self, session):
+        """All due events are written by a single multi-row UPDATE."""
+        buffer = TaskContextWriteBuffer(session_factory=lambda: session, start_flusher=False)
+        with patch.object(buffer, "_is_due", return_value=False):
+            for index in range(3):
+                buffer.stage(f"event-{index}", {"index": index})
+
+        written = buffer.flush(force=True)
+
+        assert written == 3
+        session.execute.assert_called_once()
+        sql = str(session.execute.call_args.args[0])
+        assert sql.count("CAST(:id_") == 3
+        assert "events.updated_at <= v.updated_at" in sql
+        assert {self._params(session)[f"id_{i}"] for i in range(3)} == {"event-0", "event-1", "event-2"}
+
+    def test_failed_flush_requeues_snapshot(self, buffer, session):
+        """Snapshots are kept for the next flush when the write fails."""
+        session.execute.side_effect = Exception("connection lost")
+
+        written = buffer.stage("event-1", {"nodes": {}})
+
+        assert written == 0
+        assert buffer.pending_count() == 1
+        session.rollback.assert_called_once()
+
+    def test_discard_drops_pending_snapshot(self, buffer, session):
+        """Discarded events are never written by a later flush."""
+        buffer.stage("event-1", {"nodes": {}})
+        buffer.stage("event-1", {"nodes": {"A": {}}})
+
+        buffer.discard("event-1")
+
+        assert buffer.flush(force=True) == 0
+        assert session.execute.call_count == 1
+
+    def test_flush_records_lag_metrics(self, buffer):
+        """Flush lag is recorded per execution."""
+        with patch("worker.task_context_buffer.record_task_context_flush") as mock_record:
+            buffer.stage("event-1", {"nodes": {}}, execution_id="exec_event-1", terminal=True)
+
+        kwargs = mock_record.call_args.kwargs
+        assert list(kwargs["flush_lags_ms"]) == ["exec_event-1"]
+        assert kwargs["flush_lags_ms"]["exec_event-1"] >= 0
+        assert kwargs["terminal"] is True
+
+    def test_background_flusher_writes_pending_snapshots(self, session):
+        """The flusher thread writes snapshots once their interval elapses."""
+        buffer = TaskContextWriteBuffer(session_factory=lambda: session, flush_interval_ms=50)
+        buffer.FLUSHER_TICK_MS = 10
+        try:
+            buffer.stage("event-1", {"nodes": {}})
+            buffer.stage("event-1", {"nodes": {"A": {}}})
+
+            deadline = time.time() + 2
+            while buffer.pending_count() and time.time() < deadline:
+                time.sleep(0.01)
+
+            assert buffer.pending_count() == 0
+            assert session.execute.call_count == 2
+        finally:
+            buffer.shutdown()
+
+
+class TestFailedWorkflowPersistence:
+    """Test suite for the terminal write of a failed workflow."""
+
+    def test_failed_workflow_persists_error_status(self):
+        """The last staged snapshot is written with status 'error' before re-raising."""
+        session = Mock(spec=Session)
+        buffer = TaskContextWriteBuffer(session_factory=lambda: session, start_flusher=False)
+        workflow = MagicMock()
+
+        def run(event_data):
+            workflow.on_node_complete("AnalyzeNode", TaskContext(event=event_data, nodes={"AnalyzeNode": {"ok": True}}))
+            raise RuntimeError("node exploded")
+
+        workflow.run.side_effect = run
+        db_event = MagicMock(id="event-1", workflow_type="PLACEHOLDER", data={})
+        task = MagicMock()
+        task.request.id = "task-1"
+        task.request.headers = {"correlation_id": "corr-1", "project_id": "project-1"}
+
+        with patch("worker.tasks.contextmanager"), \
+             patch("worker.tasks.GenericRepository") as mock_repo, \
+             patch("worker.tasks.WorkflowRegistry") as mock_registry, \
+             patch("worker.tasks.EventRequest"), \
+             patch("worker.tasks.send_execution_update"), \
+             patch("worker.tasks.get_execution_log_service"), \
+             patch("worker.tasks.get_task_context_buffer", return_value=buffer), \
+             patch("worker.tasks.asyncio"):
+            mock_repo.return_value.get.return_value = db_event
+            mock_registry.__getitem__.return_value.value.return_value = workflow
+            with pytest.raises(RuntimeError):
+                process_incoming_event.run.__func__(task, "event-1")
+
+        persisted = json.loads(session.execute.call_args.args[1]["tc_0"])
+        assert persisted["metadata"]["status"] == "error"
+        assert persisted["metadata"]["error_message"] == "node exploded"
+        assert persisted["nodes"] == {"AnalyzeNode": {"ok": True}}
+        assert buffer.pending_count() == 0
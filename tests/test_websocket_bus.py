@@ -0,0 +1,171 @@
+"""
+Unit Tests for the WebSocket Message Bus
+
+Tests cross-process fan-out of WebSocket messages:
+- In-memory bus delivering to local connections and status waiters
+- Redis bus publishing one JSON envelope per project channel
+- Received channel messages delivered locally with latency recorded
+- Local fallback while Redis publishing is unavailable
+- Per-project sequence numbers assigned at publish time
+- Replay buffers read back from Redis
+"""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from api.v1.endpoints import websocket
+from core.websocket_bus import InMemoryMessageBus, RedisMessageBus
+
+
+PROJECT_ID = "customer-1-project-1"
+MESSAGE = {"type": "execution-update", "payload": {"status": "running"}}
+
+
+class TestInMemoryMessageBus:
+    """Test suite for the process-local bus."""
+
+    def test_publish_reaches_every_handler(self):
+        """Each subscriber receives the project and message."""
+        bus = InMemoryMessageBus()
+        first, second = AsyncMock(), AsyncMock()
+        bus.subscribe(first)
+        bus.subscribe(second)
+        bus.subscribe(first)
+
+        asyncio.run(bus.publish(PROJECT_ID, MESSAGE))
+
+        first.assert_awaited_once()
+        second.assert_awaited_once()
+        assert first.await_args.args[:2] == (PROJECT_ID, {**MESSAGE, "seq": 1})
+
+    def test_sequence_numbers_are_per_project(self):
+        """Each project has its own increasing sequence."""
+        bus = InMemoryMessageBus()
+        handler = AsyncMock()
+        bus.subscribe(handler)
+
+        async def scenario():
+            await bus.publish(PROJECT_ID, MESSAGE)
+            await bus.publish("other-project", MESSAGE)
+            await bus.publish(PROJECT_ID, MESSAGE)
+
+        asyncio.run(scenario())
+
+        assert [(call.args[0], call.args[1]["seq"]) for call in handler.await_args_list] == [
+            (PROJECT_ID, 1), ("other-project", 1), (PROJECT_ID, 2)
+        ]
+        assert "seq" not in MESSAGE
+
+    def test_failing_handler_does_not_stop_delivery(self):
+        """A handler error is logged and later handlers still run."""
+        bus = InMemoryMessageBus()
+        healthy = AsyncMock()
+        bus.subscribe(AsyncMock(side_effect=RuntimeError("boom")))
+        bus.subscribe(healthy)
+
+        asyncio.run(bus.publish(PROJECT_ID, MESSAGE))
+
+        healthy.assert_awaited_once()
+
+    def test_broadcast_to_project_fans_out_locally(self):
+        """broadcast_to_project goes through the bus to connections and waiters."""
+        bus = InMemoryMessageBus()
+        bus.subscribe(websocket.deliver_to_local_connections)
+        waiters = Mock()
+
+        with patch.object(websocket, "get_message_bus", return_value=bus), \
+                patch.object(websocket, "get_status_waiters", return_value=waiters), \
+                patch.object(websocket.manager, "broadcast_to_project", new=AsyncMock()) as broadcast:
+            asyncio.run(websocket.broadcast_to_project(MESSAGE, PROJECT_ID))
+
+        broadcast.assert_awaited_once_with({**MESSAGE, "seq": 1}, PROJECT_ID)
+        waiters.notify.assert_called_once_with(PROJECT_ID)
+
+
+class TestRedisMessageBus:
+    """Test suite for the Redis pub/sub bus."""
+
+    @pytest.fixture
+    def script(self):
+        """Mock sequence-and-publish script."""
+        return Mock(return_value=7)
+
+    @pytest.fixture
+    def client(self, script):
+        """Mock synchronous Redis client."""
+        client = Mock()
+        client.register_script.return_value = script
+        return client
+
+    @pytest.fixture
+    def bus(self, client):
+        """Redis bus with a local handler."""
+        bus = RedisMessageBus("redis://test:6379/0", redis_client=client)
+        bus.handler = AsyncMock()
+        bus.subscribe(bus.handler)
+        return bus
+
+    def test_publish_sends_envelope_on_project_channel(self, bus, client, script):
+        """Messages are sequenced and published by one script, not delivered directly."""
+        asyncio.run(bus.publish(PROJECT_ID, MESSAGE))
+
+        client.register_script.assert_called_once_with(RedisMessageBus.PUBLISH_SCRIPT)
+        assert script.call_args.kwargs["keys"] == [
+            f"ws:seq:{PROJECT_ID}", f"ws:replay:{PROJECT_ID}", f"ws:replay-bytes:{PROJECT_ID}"
+        ]
+        channel, payload, max_frames, max_bytes, ttl_seconds = script.call_args.kwargs["args"]
+        assert (max_frames, max_bytes, ttl_seconds) == (1000, 1024 * 1024, 3600)
+        envelope = json.loads(payload)
+        assert channel == f"ws:project:{PROJECT_ID}"
+        assert envelope["project_id"] == PROJECT_ID
+        assert envelope["message"] == MESSAGE
+        assert envelope["published_at"] > 0
+        bus.handler.assert_not_awaited()
+
+    def test_dispatch_delivers_and_records_latency(self, bus):
+        """Channel messages are delivered locally with publish-to-deliver latency."""
+        payload = "42|" + json.dumps({"project_id": PROJECT_ID, "published_at": 1000.0, "message": MESSAGE})
+
+        with patch("core.websocket_bus.time.time", return_value=1000.25), \
+                patch("core.websocket_bus.record_websocket_delivery") as record:
+            asyncio.run(bus._dispatch(payload.encode("utf-8")))
+
+        bus.handler.assert_awaited_once_with(PROJECT_ID, {**MESSAGE, "seq": 42}, 1000.0)
+        record.assert_called_once_with(latency_ms=250.0, project_id=PROJECT_ID, transport="redis")
+
+    def test_unreadable_message_is_discarded(self, bus):
+        """Malformed channel payloads are skipped."""
+        asyncio.run(bus._dispatch(b"not-json"))
+
+        bus.handler.assert_not_awaited()
+
+    def test_publish_failure_falls_back_to_local_delivery(self, bus, script):
+        """While Redis is unreachable, messages are delivered locally without retrying each one."""
+        script.side_effect = ConnectionError("redis down")
+
+        asyncio.run(bus.publish(PROJECT_ID, MESSAGE))
+        asyncio.run(bus.publish(PROJECT_ID, MESSAGE))
+
+        assert bus.handler.await_count == 2
+        assert script.call_count == 1
+        # Unsequenced: the message never reached Redis
+        assert "seq" not in bus.handler.await_args.args[1]
+
+    def test_read_replay_returns_bounds_and_frames(self, bus, client):
+        """Buffered payloads come back as sequenced JSON frames with the buffer bounds."""
+        entries = [
+            f"{seq}|" + json.dumps({"project_id": PROJECT_ID, "published_at": 1000.0, "message": MESSAGE})
+            for seq in (4, 5)
+        ]
+        client.pipeline.return_value.execute.return_value = (
+            [(entries[0].encode("utf-8"), 3.0)], b"5", [entry.encode("utf-8") for entry in entries]
+        )
+
+        oldest_seq, latest_seq, frames = bus.read_replay(PROJECT_ID, 3)
+
+        assert (oldest_seq, latest_seq) == (3, 5)
+        assert [json.loads(frame) for frame in frames] == [{**MESSAGE, "seq": 4}, {**MESSAGE, "seq": 5}]
+        client.pipeline.return_value.zrangebyscore.assert_called_once_with(f"ws:replay:{PROJECT_ID}", "(3", "+inf")
@@ -0,0 +1,230 @@
+"""
+Unit Tests for WebSocket Codecs
+
+Tests subprotocol negotiation and frame encoding:
+- JSON text frames by default
+- Deflate-compressed binary frames above the size threshold
+- Chunking and reassembly of large bodies
+- msgpack envelopes when msgpack is installed
+- Per-subprotocol encoding in ConnectionManager broadcasts
+- Binary client frames received and decoded for the negotiated subprotocol
+- Size and pending-chunk limits on client frames
+"""
+
+import asyncio
+import json
+import zlib
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from fastapi import WebSocketDisconnect
+
+from api.v1.endpoints.websocket import ConnectionManager, receive_frame
+from core.websocket_codecs import (
+    CHUNK_HEADER,
+    FLAG_CHUNKED,
+    FLAG_DEFLATED,
+    JSON_DEFLATE_SUBPROTOCOL,
+    JSON_SUBPROTOCOL,
+    MSGPACK_SUBPROTOCOL,
+    FrameCodec,
+    FrameDecoder,
+    get_codec,
+    negotiate_subprotocol,
+)
+
+
+PROJECT_ID = "customer-1-project-1"
+
+
+def _log_message(size):
+    return {
+        "type": "execution-log",
+        "ts": "2025-01-14T18:30:00.123Z",
+        "projectId": PROJECT_ID,
+        "payload": {"execution_id": "exec-1", "message": "diff --git a/file.py b/file.py\n" * (size // 32 + 1)}
+    }
+
+
+class TestSubprotocolNegotiation:
+    """Test suite for negotiate_subprotocol."""
+
+    def test_first_supported_requested_subprotocol_wins(self):
+        """The client's preference order decides among supported subprotocols."""
+        assert negotiate_subprotocol(["unknown", JSON_DEFLATE_SUBPROTOCOL, JSON_SUBPROTOCOL]) == JSON_DEFLATE_SUBPROTOCOL
+
+    def test_no_supported_subprotocol_means_default(self):
+        """Clients without a supported subprotocol get plain JSON."""
+        assert negotiate_subprotocol([]) is None
+        assert negotiate_subprotocol(["graphql-ws"]) is None
+        assert get_codec(None).subprotocol == JSON_SUBPROTOCOL
+
+
+class TestFrameCodec:
+    """Test suite for FrameCodec and FrameDecoder."""
+
+    def test_json_is_a_text_frame(self):
+        """The default codec produces plain JSON text."""
+        message = _log_message(100)
+
+        frame = get_codec(JSON_SUBPROTOCOL).encode(message)
+
+        assert frame == json.dumps(message)
+        assert FrameDecoder().decode(frame) == message
+
+    def test_deflate_compresses_large_bodies(self):
+        """Bodies above the threshold are compressed and flagged."""
+        codec = FrameCodec(JSON_DEFLATE_SUBPROTOCOL, deflate=True, compression_level=6, compression_min_bytes=512)
+        message = _log_message(20000)
+
+        frame = codec.encode(message)
+
+        assert isinstance(frame, bytes)
+        assert frame[0] == FLAG_DEFLATED
+        assert len(frame) < len(json.dumps(message)) / 5
+        assert FrameDecoder(JSON_DEFLATE_SUBPROTOCOL, max_decoded_bytes=10 ** 6).decode(frame) == message
+
+    def test_small_bodies_are_not_compressed(self):
+        """Bodies below the threshold are sent as they are."""
+        codec = FrameCodec(JSON_DEFLATE_SUBPROTOCOL, deflate=True, compression_min_bytes=512)
+        message = {"type": "execution-update", "payload": {"status": "running"}}
+
+        frame = codec.encode(message)
+
+        assert frame[0] == 0
+        assert FrameDecoder(JSON_DEFLATE_SUBPROTOCOL).decode(frame) == message
+
+    def test_large_bodies_are_chunked_and_reassembled(self):
+        """Bodies above the chunk size are split and decoded once complete."""
+        codec = FrameCodec(JSON_DEFLATE_SUBPROTOCOL, deflate=True, compression_min_bytes=10 ** 9, chunk_bytes=1024)
+        message = _log_message(5000)
+
+        chunks = codec.encode(message)
+
+        assert isinstance(chunks, list) and len(chunks) > 1
+        assert all(chunk[0] & FLAG_CHUNKED for chunk in chunks)
+        decoder = FrameDecoder(JSON_DEFLATE_SUBPROTOCOL)
+        results = [decoder.decode(chunk) for chunk in chunks]
+        assert results[:-1] == [None] * (len(chunks) - 1)
+        assert results[-1] == message
+
+    def test_msgpack_round_trip(self):
+        """msgpack envelopes decode to the original message."""
+        pytest.importorskip("msgpack")
+        message = _log_message(2000)
+
+        frame = get_codec(MSGPACK_SUBPROTOCOL).encode(message)
+
+        assert isinstance(frame, bytes)
+        assert FrameDecoder(MSGPACK_SUBPROTOCOL).decode(frame) == message
+
+
+class FakeWebSocket:
+    """WebSocket double recording text and binary frames."""
+
+    def __init__(self):
+        self.sent = []
+        self.subprotocol = None
+
+    async def accept(self, subprotocol=None):
+        self.subprotocol = subprotocol
+
+    async def send_text(self, frame):
+        self.sent.append(frame)
+
+    async def send_bytes(self, frame):
+        self.sent.append(frame)
+
+    async def close(self, code=1000, reason=""):
+        pass
+
+
+class TestSubprotocolBroadcast:
+    """Test suite for per-subprotocol ConnectionManager broadcasts."""
+
+    def test_each_connection_gets_its_encoding(self):
+        """JSON and binary connections receive the same message in their own encoding."""
+        user = Mock()
+        user.user_id = "user-1"
+        message = _log_message(4000)
+
+        async def scenario():
+            manager = ConnectionManager()
+            text_socket, binary_socket = FakeWebSocket(), FakeWebSocket()
+            await manager.connect(text_socket, PROJECT_ID, user, connection_id="text")
+            await manager.connect(binary_socket, PROJECT_ID, user, connection_id="binary", subprotocol=JSON_DEFLATE_SUBPROTOCOL)
+            await manager.broadcast_to_project(message, PROJECT_ID)
+            for _ in range(10):
+                await asyncio.sleep(0)
+            info = manager.get_connection_info("binary")
+            manager.disconnect("text")
+            manager.disconnect("binary")
+            return text_socket, binary_socket, info
+
+        text_socket, binary_socket, info = asyncio.run(scenario())
+        assert binary_socket.subprotocol == JSON_DEFLATE_SUBPROTOCOL
+        assert info["subprotocol"] == JSON_DEFLATE_SUBPROTOCOL
+        assert text_socket.sent == [json.dumps(message)]
+        assert isinstance(binary_socket.sent[0], bytes)
+        assert FrameDecoder(JSON_DEFLATE_SUBPROTOCOL).decode(binary_socket.sent[0]) == message
+
+
+class TestClientFrames:
+    """Test suite for frames received from clients."""
+
+    def test_binary_frames_decode_for_the_subprotocol(self):
+        """Binary frames from a client decode like the server's own, text frames stay JSON."""
+        message = {"type": "subscribe", "ts": "2025-01-14T18:30:00Z", "projectId": PROJECT_ID, "payload": {}}
+        codec = FrameCodec(JSON_DEFLATE_SUBPROTOCOL, deflate=True, compression_min_bytes=0)
+        websocket = Mock()
+        websocket.receive = AsyncMock(side_effect=[
+            {"type": "websocket.receive", "bytes": codec.encode(message)},
+            {"type": "websocket.receive", "text": json.dumps(message)},
+            {"type": "websocket.disconnect", "code": 1001}
+        ])
+        decoder = FrameDecoder(JSON_DEFLATE_SUBPROTOCOL)
+
+        binary = asyncio.run(receive_frame(websocket))
+        text = asyncio.run(receive_frame(websocket))
+
+        assert isinstance(binary, bytes) and decoder.decode(binary) == message
+        assert decoder.decode(text) == message
+        with pytest.raises(WebSocketDisconnect):
+            asyncio.run(receive_frame(websocket))
+
+    def test_malformed_binary_frames_raise_value_error(self):
+        """Truncated or corrupt binary frames are reported as ValueError."""
+        decoder = FrameDecoder(JSON_DEFLATE_SUBPROTOCOL)
+
+        for frame in (b"", bytes([FLAG_DEFLATED]) + b"not zlib", bytes([FLAG_CHUNKED]) + b"\x00"):
+            with pytest.raises(ValueError):
+                decoder.decode(frame)
+
+    def test_decompressed_size_is_bounded(self):
+        """A small deflated frame inflating past the limit is rejected without inflating it all."""
+        decoder = FrameDecoder(JSON_DEFLATE_SUBPROTOCOL, max_decoded_bytes=1000)
+        bomb = bytes([FLAG_DEFLATED]) + zlib.compress(b" " * (50 * 1024 * 1024))
+
+        assert len(bomb) < 100 * 1024
+        with pytest.raises(ValueError, match="exceeds 1000 bytes"):
+            decoder.decode(bomb)
+
+    def test_chunked_messages_are_bounded(self):
+        """Reassembled messages and pending chunked messages are capped."""
+        decoder = FrameDecoder(JSON_DEFLATE_SUBPROTOCOL, max_decoded_bytes=1000, max_pending_messages=2)
+
+        def chunk(message_id, index, count, size):
+            return bytes([FLAG_CHUNKED]) + CHUNK_HEADER.pack(message_id, index, count) + b"x" * size
+
+        assert decoder.decode(chunk(1, 0, 3, 600)) is None
+        with pytest.raises(ValueError, match="exceeds 1000 bytes"):
+            decoder.decode(chunk(1, 1, 3, 600))
+        assert decoder._chunks == {}
+
+        assert decoder.decode(chunk(2, 0, 2, 10)) is None
+        assert decoder.decode(chunk(3, 0, 2, 10)) is None
+        with pytest.raises(ValueError, match="pending"):
+            decoder.decode(chunk(4, 0, 2, 10))
+        with pytest.raises(ValueError, match="out of range"):
+            decoder.decode(chunk(2, 5, 2, 10))
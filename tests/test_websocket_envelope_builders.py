@@ -0,0 +1,180 @@
+"""
+Unit Tests for Trusted WebSocket Envelope Builders
+
+Tests the validation-free build_* envelope utilities:
+- Same envelopes as the validated create_* utilities
+- JSON text serialized once and reused for sequence numbers
+- Message buses and codecs sending the pre-serialized text
+- Per-frame cost below the validated path
+"""
+
+import asyncio
+import json
+import logging
+import time
+
+from core.websocket_bus import InMemoryMessageBus, RedisMessageBus
+from core.websocket_codecs import FrameCodec
+from schemas.websocket_envelope import (
+    SerializedEnvelope,
+    build_execution_log_envelope,
+    build_execution_update_envelope,
+    create_execution_log_envelope,
+    create_execution_update_envelope,
+    with_seq,
+)
+
+
+PROJECT_ID = "customer-1-project-1"
+TIMESTAMP = "2025-01-14T18:25:00Z"
+
+UPDATE_ARGS = dict(
+    project_id=PROJECT_ID,
+    execution_id="exec-1",
+    status="running",
+    progress=42.5,
+    current_task="1.2",
+    totals={"completed": 2, "total": 5},
+    branch="task/1-2",
+    updated_at="2025-01-14T18:24:59Z",
+    timestamp=TIMESTAMP
+)
+
+LOG_ARGS = dict(
+    project_id=PROJECT_ID,
+    execution_id="exec-1",
+    log_entry_type="info",
+    level="INFO",
+    message="Running aider for task 1.2 " * 8,
+    node_name="aider",
+    task_id="1.2",
+    additional_data={"line": 7},
+    timestamp=TIMESTAMP
+)
+
+
+def _without_log_timestamp(envelope):
+    return {**envelope, "payload": {**envelope["payload"], "timestamp": None}}
+
+
+class TestBuilders:
+    """Test suite for the build_* utilities."""
+
+    def test_execution_update_matches_validated_envelope(self):
+        """The trusted builder produces the validated envelope."""
+        envelope = build_execution_update_envelope(**UPDATE_ARGS)
+
+        assert isinstance(envelope, SerializedEnvelope)
+        assert envelope == create_execution_update_envelope(**UPDATE_ARGS)
+        assert json.loads(envelope.json_text) == envelope
+
+    def test_execution_log_matches_validated_envelope(self):
+        """Log envelopes match apart from the per-call log timestamp."""
+        envelope = build_execution_log_envelope(**LOG_ARGS)
+
+        assert _without_log_timestamp(envelope) == _without_log_timestamp(create_execution_log_envelope(**LOG_ARGS))
+        assert envelope["payload"]["line"] == 7
+        assert json.loads(envelope.json_text) == envelope
+
+    def test_with_seq_appends_to_serialized_text(self):
+        """Sequence numbers are spliced into the JSON text."""
+        envelope = build_execution_update_envelope(**UPDATE_ARGS)
+
+        sequenced = with_seq(envelope, 12)
+
+        assert isinstance(sequenced, SerializedEnvelope)
+        assert sequenced.json_text.startswith(envelope.json_text[:-1])
+        assert json.loads(sequenced.json_text) == {**envelope, "seq": 12} == sequenced
+        assert json.loads(sequenced.with_seq(13).json_text)["seq"] == 13
+        assert "seq" not in envelope
+
+    def test_with_seq_copies_plain_envelopes(self):
+        """Validated dict envelopes get a plain copy with seq."""
+        envelope = create_execution_update_envelope(**UPDATE_ARGS)
+
+        assert with_seq(envelope, 3) == {**envelope, "seq": 3}
+        assert "seq" not in envelope
+
+
+class TestSerializedDelivery:
+    """Test suite for buses and codecs reusing the serialized text."""
+
+    def test_json_codec_sends_serialized_text(self):
+        """JSON frames are the pre-serialized text, byte for byte."""
+        envelope = build_execution_log_envelope(**LOG_ARGS)
+        envelope.json_text = envelope.json_text.replace("Running", "Reused")
+
+        assert FrameCodec("clarity.json").encode(envelope) == envelope.json_text
+
+    def test_in_memory_bus_keeps_serialized_text(self):
+        """Subscribers receive a SerializedEnvelope carrying seq."""
+        received = []
+
+        async def scenario():
+            bus = InMemoryMessageBus()
+            bus.subscribe(lambda project_id, message, published_at: _record(received, message))
+            await bus.publish(PROJECT_ID, build_execution_update_envelope(**UPDATE_ARGS))
+
+        asyncio.run(scenario())
+
+        assert isinstance(received[0], SerializedEnvelope)
+        assert json.loads(received[0].json_text)["seq"] == 1
+
+    def test_redis_payload_round_trip(self):
+        """Published wrappers keep the envelope text through dispatch."""
+        envelope = build_execution_update_envelope(**UPDATE_ARGS)
+        received = []
+        published = []
+
+        def publisher(keys, args):
+            published.append(args[1])
+
+        async def scenario():
+            bus = RedisMessageBus("redis://localhost:6379/0")
+            bus._publish_script = publisher
+            bus.subscribe(lambda project_id, message, published_at: _record(received, message))
+            await bus.publish(PROJECT_ID, envelope)
+            await bus._dispatch("5|" + published[0])
+
+        asyncio.run(scenario())
+
+        wrapper = json.loads(published[0])
+        assert published[0] == json.dumps(wrapper)
+        assert wrapper["message"] == envelope
+        assert received[0].json_text == envelope.with_seq(5).json_text
+
+    def test_builder_benchmark(self):
+        """Building a trusted frame's wire text is faster than the validated path."""
+        iterations = 2000
+
+        def validated():
+            # Validated envelope, dumped into the bus wrapper and again into the frame
+            message = create_execution_log_envelope(**LOG_ARGS)
+            json.dumps({"project_id": PROJECT_ID, "published_at": 0.0, "message": message})
+            json.dumps({**message, "seq": 1})
+
+        def trusted():
+            message = build_execution_log_envelope(**LOG_ARGS)
+            '{"project_id": "%s", "published_at": 0.0, "message": ' % PROJECT_ID + message.json_text + "}"
+            with_seq(message, 1).json_text
+
+        def best_rate(frame):
+            best = float("inf")
+            for _ in range(3):
+                start = time.perf_counter()
+                for _ in range(iterations):
+                    frame()
+                best = min(best, time.perf_counter() - start)
+            return iterations / best
+
+        trusted_rate = best_rate(trusted)
+        validated_rate = best_rate(validated)
+
+        logging.getLogger(__name__).info(
+            "envelope builder benchmark: trusted=%.0f/s validated=%.0f/s", trusted_rate, validated_rate
+        )
+        assert trusted_rate >= 1.3 * validated_rate
+
+
+async def _record(received, message):
+    received.append(message)
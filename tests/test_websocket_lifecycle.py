@@ -0,0 +1,217 @@
+"""
+Unit Tests for WebSocket Connection Lifecycle
+
+Tests heartbeats, eviction and connection caps:
+- Silent heartbeat connections pinged, dead and idle ones evicted
+- Listen-only connections never pinged or evicted for silence
+- Pongs and application messages keeping connections alive and active
+- Connection counts by state
+- Per-user and per-project caps refusing connections before accept
+- ConnectionManager sweeps closing evicted sockets with their close codes
+"""
+
+import asyncio
+import json
+from unittest.mock import Mock, patch
+
+import pytest
+
+from api.v1.endpoints.websocket import ConnectionManager
+from core.websocket_lifecycle import (
+    HEARTBEAT_TIMEOUT_CLOSE_CODE,
+    IDLE_TIMEOUT_CLOSE_CODE,
+    ConnectionLifecycle,
+    ConnectionLimitExceeded,
+    EvictionReason,
+)
+
+
+PROJECT_ID = "customer-1-project-1"
+
+
+def _lifecycle(**overrides):
+    settings = dict(
+        heartbeat_interval=30, heartbeat_timeout=90, idle_timeout=600,
+        max_connections_per_user=2, max_connections_per_project=3
+    )
+    settings.update(overrides)
+    return ConnectionLifecycle(**settings)
+
+
+class TestConnectionLifecycle:
+    """Test suite for ConnectionLifecycle."""
+
+    @pytest.fixture
+    def lifecycle(self):
+        """Lifecycle with one connection admitted at t=0."""
+        lifecycle = _lifecycle()
+        with patch("core.websocket_lifecycle.time.monotonic", return_value=0.0):
+            lifecycle.admit("conn-1", PROJECT_ID, "user-1", heartbeat=True)
+        return lifecycle
+
+    def test_silent_connection_is_pinged(self, lifecycle):
+        """A connection silent for the heartbeat interval is pinged."""
+        assert lifecycle.sweep(now=10) == ([], [])
+        assert lifecycle.sweep(now=30) == (["conn-1"], [])
+        assert lifecycle.state_counts(now=30) == {"active": 0, "idle": 0, "awaiting_pong": 1}
+
+    def test_pong_keeps_connection_alive(self, lifecycle):
+        """Any received frame answers the ping and resets the heartbeat."""
+        lifecycle.sweep(now=30)
+        lifecycle.mark_received("conn-1", now=35)
+
+        assert lifecycle.sweep(now=60) == ([], [])
+        assert lifecycle.state_counts(now=60)["idle"] == 1
+
+    def test_dead_connection_is_evicted(self, lifecycle):
+        """A connection silent past the heartbeat timeout is evicted."""
+        assert lifecycle.sweep(now=90) == ([], [("conn-1", EvictionReason.HEARTBEAT_TIMEOUT)])
+
+    def test_idle_connection_is_evicted(self, lifecycle):
+        """A live connection without application messages is evicted after the idle timeout."""
+        lifecycle.mark_received("conn-1", now=599)
+
+        assert lifecycle.sweep(now=600) == ([], [("conn-1", EvictionReason.IDLE_TIMEOUT)])
+
+    def test_activity_keeps_connection_active(self, lifecycle):
+        """Application messages reset the idle timer."""
+        lifecycle.mark_received("conn-1", now=599)
+        lifecycle.mark_activity("conn-1", now=590)
+
+        assert lifecycle.sweep(now=600) == ([], [])
+        assert lifecycle.state_counts(now=600)["active"] == 1
+
+    def test_listen_only_connection_is_not_pinged(self):
+        """Connections not opted in to heartbeats are only subject to the idle timeout."""
+        lifecycle = _lifecycle()
+        with patch("core.websocket_lifecycle.time.monotonic", return_value=0.0):
+            lifecycle.admit("conn-1", PROJECT_ID, "user-1")
+        lifecycle.mark_activity("conn-1", now=500)
+
+        assert lifecycle.sweep(now=550) == ([], [])
+        assert lifecycle.sweep(now=1100) == ([], [("conn-1", EvictionReason.IDLE_TIMEOUT)])
+
+    def test_disabled_heartbeats_never_evict_silent_connections(self):
+        """Without heartbeats the heartbeat timeout does not apply."""
+        lifecycle = _lifecycle(heartbeat_interval=0, idle_timeout=0)
+        lifecycle.admit("conn-1", PROJECT_ID, "user-1", heartbeat=True)
+
+        assert lifecycle.sweep_interval == 0
+        assert lifecycle.sweep(now=10 ** 6) == ([], [])
+
+    def test_user_cap(self):
+        """A user's connections beyond the cap are refused until one is released."""
+        lifecycle = _lifecycle()
+        lifecycle.admit("conn-1", PROJECT_ID, "user-1")
+        lifecycle.admit("conn-2", "other-project", "user-1")
+
+        with pytest.raises(ConnectionLimitExceeded) as error:
+            lifecycle.admit("conn-3", PROJECT_ID, "user-1")
+        assert error.value.reason == "user_limit"
+
+        lifecycle.release("conn-1")
+        lifecycle.admit("conn-3", PROJECT_ID, "user-1")
+        assert len(lifecycle) == 2
+
+    def test_project_cap(self):
+        """A project's connections beyond the cap are refused."""
+        lifecycle = _lifecycle()
+        for index in range(3):
+            lifecycle.admit(f"conn-{index}", PROJECT_ID, f"user-{index}")
+
+        with pytest.raises(ConnectionLimitExceeded) as error:
+            lifecycle.admit("conn-4", PROJECT_ID, "user-4")
+        assert error.value.reason == "project_limit"
+
+
+class FakeWebSocket:
+    """WebSocket double recording frames and close codes."""
+
+    def __init__(self):
+        self.sent = []
+        self.accepted = False
+        self.close_code = None
+
+    async def accept(self, subprotocol=None):
+        self.accepted = True
+
+    async def send_text(self, frame):
+        self.sent.append(frame)
+
+    async def close(self, code=1000, reason=""):
+        self.close_code = code
+
+
+def _user(user_id="user-1"):
+    user = Mock()
+    user.user_id = user_id
+    return user
+
+
+class TestManagerLifecycle:
+    """Test suite for ConnectionManager heartbeats, eviction and caps."""
+
+    def test_cap_refuses_before_accept(self):
+        """A connection over the user cap is never accepted."""
+        async def scenario():
+            manager = ConnectionManager()
+            manager.lifecycle = _lifecycle(max_connections_per_user=1)
+            await manager.connect(FakeWebSocket(), PROJECT_ID, _user(), connection_id="first")
+            refused = FakeWebSocket()
+            with pytest.raises(ConnectionLimitExceeded):
+                await manager.connect(refused, PROJECT_ID, _user(), connection_id="second")
+            count = manager.get_total_connections()
+            manager.disconnect("first")
+            return refused, count
+
+        refused, count = asyncio.run(scenario())
+
+        assert not refused.accepted
+        assert count == 1
+
+    def test_sweep_pings_and_evicts(self):
+        """Silent heartbeat connections get a ping; dead and idle ones are closed and removed."""
+        async def scenario():
+            manager = ConnectionManager()
+            manager.lifecycle = _lifecycle(max_connections_per_project=0, max_connections_per_user=0)
+            sockets = {name: FakeWebSocket() for name in ("silent", "dead", "idle", "listener")}
+            for name, websocket in sockets.items():
+                await manager.connect(
+                    websocket, PROJECT_ID, _user(name), connection_id=name, heartbeat=name != "listener"
+                )
+            # Make the clocks say what each connection last did
+            lifecycle = manager.lifecycle
+            lifecycle._last_received.update(silent=-40.0, dead=-100.0, idle=-1.0, listener=-100.0)
+            lifecycle._last_activity.update(silent=-40.0, dead=-100.0, idle=-700.0, listener=-10.0)
+            with patch("core.websocket_lifecycle.time.monotonic", return_value=0.0), \
+                    patch("api.v1.endpoints.websocket.record_websocket_connections") as gauges:
+                manager.sweep_connections()
+            for _ in range(10):
+                await asyncio.sleep(0)
+            remaining = set(manager.connection_metadata)
+            manager.disconnect("silent")
+            manager.disconnect("listener")
+            return sockets, remaining, gauges.call_args.args[0], manager
+
+        sockets, remaining, counts, manager = asyncio.run(scenario())
+
+        assert remaining == {"silent", "listener"}
+        assert sockets["listener"].sent == [] and sockets["listener"].close_code is None
+        assert sockets["dead"].close_code == HEARTBEAT_TIMEOUT_CLOSE_CODE
+        assert sockets["idle"].close_code == IDLE_TIMEOUT_CLOSE_CODE
+        assert [json.loads(frame)["type"] for frame in sockets["silent"].sent] == ["ping"]
+        assert counts == {"active": 1, "idle": 0, "awaiting_pong": 1}
+        assert manager._sweeper is None and len(manager.lifecycle) == 0
+
+    def test_broadcast_counts_as_activity(self):
+        """Broadcast frames reset a connection's idle timer."""
+        async def scenario():
+            manager = ConnectionManager()
+            await manager.connect(FakeWebSocket(), PROJECT_ID, _user(), connection_id="conn")
+            manager.lifecycle._last_activity["conn"] = -1000.0
+            await manager.broadcast_to_project({"type": "execution-update", "payload": {}}, PROJECT_ID)
+            last_activity = manager.lifecycle._last_activity["conn"]
+            manager.disconnect("conn")
+            return last_activity
+
+        assert asyncio.run(scenario()) > 0
@@ -0,0 +1,180 @@
+"""
+Unit Tests for WebSocket Replay
+
+Tests sequence-numbered replay of project broadcasts:
+- Ring buffers bounded by frame count and bytes
+- Frames missed since a sequence number, or a gap once evicted
+- Sequence resets emptying the buffer
+- Shared (Redis) buffers read first, idle project buffers dropped
+- Reconnecting connections receiving missed frames or a replay-gap message
+"""
+
+import asyncio
+import json
+import time
+from unittest.mock import Mock
+
+from api.v1.endpoints.websocket import ConnectionManager
+from core.websocket_replay import ProjectReplayBuffer, ReplayBufferRegistry
+
+
+PROJECT_ID = "customer-1-project-1"
+
+
+class TestProjectReplayBuffer:
+    """Test suite for ProjectReplayBuffer."""
+
+    def _buffer(self, count, max_frames=100, max_bytes=10000):
+        buffer = ProjectReplayBuffer(max_frames=max_frames, max_bytes=max_bytes)
+        for seq in range(1, count + 1):
+            buffer.append(seq, f"frame-{seq}")
+        return buffer
+
+    def test_since_returns_missed_frames(self):
+        """Frames after the given sequence number are returned in order."""
+        buffer = self._buffer(5)
+
+        assert buffer.since(2) == ["frame-3", "frame-4", "frame-5"]
+        assert buffer.since(5) == []
+
+    def test_bounded_by_frame_count(self):
+        """The oldest frames are evicted beyond max_frames."""
+        buffer = self._buffer(10, max_frames=3)
+
+        assert len(buffer) == 3
+        assert buffer.oldest_seq == 8
+        assert buffer.since(7) == ["frame-8", "frame-9", "frame-10"]
+
+    def test_bounded_by_bytes(self):
+        """The oldest frames are evicted beyond max_bytes."""
+        buffer = self._buffer(10, max_bytes=len("frame-10") * 2)
+
+        assert buffer.oldest_seq == 9
+        assert buffer.size_bytes <= len("frame-10") * 2
+
+    def test_evicted_frames_are_a_gap(self):
+        """Resuming before the oldest buffered frame cannot be served."""
+        buffer = self._buffer(10, max_frames=3)
+
+        assert buffer.since(6) is None
+
+    def test_unknown_sequence_is_a_gap(self):
+        """Sequence numbers ahead of the buffer mean the sequence was reset."""
+        buffer = self._buffer(3)
+
+        assert buffer.since(9) is None
+        assert ProjectReplayBuffer(10, 1000).since(0) is None
+
+    def test_sequence_reset_empties_buffer(self):
+        """A lower sequence number starts the buffer over."""
+        buffer = self._buffer(5)
+        buffer.append(1, "after-reset")
+
+        assert len(buffer) == 1
+        assert buffer.since(0) == ["after-reset"]
+
+    def test_registry_keeps_projects_apart(self):
+        """Buffers are per project."""
+        registry = ReplayBufferRegistry(max_frames=10, max_bytes=1000)
+        registry.record("project-a", 1, "a-1")
+        registry.record("project-b", 1, "b-1")
+
+        assert registry.since("project-a", 0) == ["a-1"]
+        assert registry.since("project-c", 0) is None
+        assert registry.bounds("project-b") == (1, 1)
+
+    def test_registry_drops_idle_projects(self):
+        """Buffers of projects without broadcasts for the TTL are evicted."""
+        registry = ReplayBufferRegistry(max_frames=10, max_bytes=1000, ttl_seconds=60)
+        registry.record("project-a", 1, "a-1")
+        registry.record("project-b", 1, "b-1")
+        registry._buffers["project-a"].last_append -= 120
+
+        assert registry.evict_idle(now=time.monotonic()) == 1
+        assert len(registry) == 1
+        assert registry.since("project-a", 0) is None
+        assert registry.since("project-b", 0) == ["b-1"]
+
+    def test_registry_reads_shared_buffer_first(self):
+        """The shared buffer serves reads; the process buffer covers its failures."""
+        reader = Mock(return_value=(3, 5, ["frame-4", "frame-5"]))
+        registry = ReplayBufferRegistry(max_frames=10, max_bytes=1000, shared_reader=reader)
+        registry.record(PROJECT_ID, 1, "local-1")
+
+        assert registry.since(PROJECT_ID, 3) == ["frame-4", "frame-5"]
+        assert registry.since(PROJECT_ID, 1) is None
+        assert registry.bounds(PROJECT_ID) == (3, 5)
+
+        reader.side_effect = ConnectionError("redis down")
+        assert registry.read(PROJECT_ID, 0) == (["local-1"], 1, 1)
+
+
+def _user():
+    user = Mock()
+    user.user_id = "user-1"
+    return user
+
+
+class FakeWebSocket:
+    """WebSocket double recording frames."""
+
+    def __init__(self):
+        self.sent = []
+
+    async def accept(self, subprotocol=None):
+        pass
+
+    async def send_text(self, frame):
+        self.sent.append(frame)
+
+    async def close(self, code=1000, reason=""):
+        pass
+
+
+class TestConnectionReplay:
+    """Test suite for ConnectionManager.replay_missed."""
+
+    def _update(self, seq):
+        return {"type": "execution-log", "projectId": PROJECT_ID, "payload": {"line": seq}, "seq": seq}
+
+    def _scenario(self, published, resume_from, max_frames=100):
+        """Broadcast sequenced frames with nobody connected, then reconnect."""
+        async def scenario():
+            manager = ConnectionManager()
+            manager.replay_buffers = ReplayBufferRegistry(max_frames=max_frames, max_bytes=100000)
+            for seq in range(1, published + 1):
+                await manager.broadcast_to_project(self._update(seq), PROJECT_ID)
+
+            websocket = FakeWebSocket()
+            connection_id = await manager.connect(websocket, PROJECT_ID, _user())
+            replayed = await manager.replay_missed(connection_id, resume_from)
+            for _ in range(10):
+                await asyncio.sleep(0)
+            manager.disconnect(connection_id)
+            return replayed, [json.loads(frame) for frame in websocket.sent]
+
+        return asyncio.run(scenario())
+
+    def test_reconnect_receives_missed_frames(self):
+        """Frames broadcast while disconnected are replayed in order."""
+        replayed, sent = self._scenario(published=5, resume_from=2)
+
+        assert replayed == 3
+        assert [frame["seq"] for frame in sent] == [3, 4, 5]
+
+    def test_evicted_frames_signal_gap(self):
+        """A client too far behind gets one replay-gap message."""
+        replayed, sent = self._scenario(published=10, resume_from=1, max_frames=3)
+
+        assert replayed is None
+        assert [frame["type"] for frame in sent] == ["replay-gap"]
+        assert sent[0]["payload"] == {"resume_from": 1, "oldest_seq": 8, "latest_seq": 10}
+
+    def test_unsequenced_messages_are_not_buffered(self):
+        """Messages delivered without a sequence number cannot be replayed."""
+        async def scenario():
+            manager = ConnectionManager()
+            await manager.broadcast_to_project({"type": "execution-log", "payload": {}}, PROJECT_ID)
+            return manager.replay_buffers.bounds(PROJECT_ID)
+
+        assert asyncio.run(scenario()) == (None, None)
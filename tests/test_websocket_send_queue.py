@@ -0,0 +1,296 @@
+"""
+Unit Tests for WebSocket Send Queues
+
+Tests per-connection outbound queues and the ConnectionManager fan-out:
+- Frames written in order by the connection's writer task
+- Slow consumers not delaying broadcasts to other connections
+- Overflow policies: drop oldest, coalesce and disconnect
+- Latest-wins conflation of execution updates, sparing terminal and log frames
+- Broadcast serializing the message once for all connections
+"""
+
+import asyncio
+import json
+from unittest.mock import Mock, patch
+
+from api.v1.endpoints.websocket import ConnectionManager
+from core.websocket_send_queue import ConnectionSendQueue, OverflowPolicy, SLOW_CONSUMER_CLOSE_CODE
+
+
+PROJECT_ID = "customer-1-project-1"
+
+
+class FakeWebSocket:
+    """WebSocket double recording frames; sends block while `gate` is cleared."""
+
+    def __init__(self, blocked=False):
+        self.sent = []
+        self.closed_with = None
+        self.gate = asyncio.Event()
+        if not blocked:
+            self.gate.set()
+
+    async def accept(self, subprotocol=None):
+        pass
+
+    async def send_text(self, frame):
+        await self.gate.wait()
+        self.sent.append(frame)
+
+    async def close(self, code=1000, reason=""):
+        self.closed_with = code
+
+
+async def _drain():
+    for _ in range(10):
+        await asyncio.sleep(0)
+
+
+def _user(user_id="user-1"):
+    user = Mock()
+    user.user_id = user_id
+    return user
+
+
+class TestConnectionSendQueue:
+    """Test suite for ConnectionSendQueue."""
+
+    def test_frames_are_written_in_order(self):
+        """The writer task sends queued frames in enqueue order."""
+        async def scenario():
+            websocket = FakeWebSocket()
+            queue = ConnectionSendQueue(websocket, "conn-1", PROJECT_ID, max_size=10)
+            queue.start()
+            for index in range(3):
+                assert queue.enqueue(f"frame-{index}")
+            await _drain()
+            queue.close()
+            return websocket.sent
+
+        assert asyncio.run(scenario()) == ["frame-0", "frame-1", "frame-2"]
+
+    def test_drop_oldest_keeps_newest_frames(self):
+        """A full drop_oldest queue discards its oldest frame."""
+        async def scenario():
+            websocket = FakeWebSocket(blocked=True)
+            queue = ConnectionSendQueue(websocket, "conn-1", PROJECT_ID, max_size=2, policy=OverflowPolicy.DROP_OLDEST)
+            queue.start()
+            # The writer takes the first frame and blocks on it
+            queue.enqueue("frame-0")
+            await _drain()
+            for index in range(1, 5):
+                queue.enqueue(f"frame-{index}")
+            websocket.gate.set()
+            await _drain()
+            queue.close()
+            return websocket.sent, queue.dropped
+
+        sent, dropped = asyncio.run(scenario())
+        assert sent == ["frame-0", "frame-3", "frame-4"]
+        assert dropped == 2
+
+    def test_coalesce_replaces_superseded_frame(self):
+        """A full coalesce queue replaces a queued frame with the same key."""
+        async def scenario():
+            websocket = FakeWebSocket(blocked=True)
+            queue = ConnectionSendQueue(
+                websocket, "conn-1", PROJECT_ID, max_size=2, policy=OverflowPolicy.COALESCE, max_rate=0
+            )
+            queue.start()
+            queue.enqueue("in-flight")
+            await _drain()
+            queue.enqueue("update-1", coalesce_key="exec-1")
+            queue.enqueue("log-1")
+            queue.enqueue("update-2", coalesce_key="exec-1")
+            websocket.gate.set()
+            await _drain()
+            queue.close()
+            return websocket.sent
+
+        assert asyncio.run(scenario()) == ["in-flight", "update-2", "log-1"]
+
+    def test_disconnect_policy_closes_slow_consumer(self):
+        """A full disconnect queue closes the socket and reports the connection."""
+        on_close = Mock()
+
+        async def scenario():
+            websocket = FakeWebSocket(blocked=True)
+            queue = ConnectionSendQueue(
+                websocket, "conn-1", PROJECT_ID, max_size=1, policy=OverflowPolicy.DISCONNECT, on_close=on_close
+            )
+            queue.start()
+            queue.enqueue("in-flight")
+            await _drain()
+            queue.enqueue("frame-1")
+            accepted = queue.enqueue("frame-2")
+            await _drain()
+            return websocket, queue, accepted
+
+        websocket, queue, accepted = asyncio.run(scenario())
+        assert accepted is False
+        assert queue.closed
+        assert websocket.closed_with == SLOW_CONSUMER_CLOSE_CODE
+        on_close.assert_called_once_with("conn-1")
+
+    def test_send_failure_reports_connection(self):
+        """A failing socket stops the writer and reports the connection."""
+        on_close = Mock()
+
+        async def scenario():
+            websocket = FakeWebSocket()
+            websocket.send_text = Mock(side_effect=RuntimeError("socket closed"))
+            queue = ConnectionSendQueue(websocket, "conn-1", PROJECT_ID, on_close=on_close)
+            queue.start()
+            queue.enqueue("frame-0")
+            await _drain()
+            return queue
+
+        assert asyncio.run(scenario()).closed
+        on_close.assert_called_once_with("conn-1")
+
+
+class TestSnapshotConflation:
+    """Test suite for rate-limited latest-wins conflation."""
+
+    def _run(self, steps, max_rate=20):
+        """Enqueue (frame, key, terminal) steps, then let conflation windows close."""
+        async def scenario():
+            websocket = FakeWebSocket()
+            queue = ConnectionSendQueue(websocket, "conn-1", PROJECT_ID, max_rate=max_rate)
+            queue.start()
+            for frame, key, terminal in steps:
+                queue.enqueue(frame, key, terminal)
+            await asyncio.sleep(0.2)
+            queue.close()
+            return websocket.sent, queue.conflated
+
+        return asyncio.run(scenario())
+
+    def test_burst_sends_first_and_latest_snapshot(self):
+        """Snapshots inside one window collapse to the newest."""
+        sent, conflated = self._run([(f"update-{index}", "exec-1", False) for index in range(5)])
+
+        assert sent == ["update-0", "update-4"]
+        assert conflated == 3
+
+    def test_executions_are_conflated_independently(self):
+        """Each execution keeps its own window."""
+        sent, _ = self._run([
+            ("a-0", "exec-a", False),
+            ("b-0", "exec-b", False),
+            ("a-1", "exec-a", False),
+            ("b-1", "exec-b", False),
+        ])
+
+        assert sent == ["a-0", "b-0", "a-1", "b-1"]
+
+    def test_terminal_snapshot_is_sent_at_once_and_supersedes_pending(self):
+        """A terminal update is never held back and replaces the pending snapshot."""
+        sent, conflated = self._run([
+            ("update-0", "exec-1", False),
+            ("update-1", "exec-1", False),
+            ("completed", "exec-1", True),
+        ])
+
+        assert sent == ["update-0", "completed"]
+        assert conflated == 1
+
+    def test_frames_without_key_are_never_conflated(self):
+        """Log frames are all delivered in order."""
+        sent, conflated = self._run([(f"log-{index}", None, False) for index in range(5)])
+
+        assert sent == [f"log-{index}" for index in range(5)]
+        assert conflated == 0
+
+    def test_zero_rate_disables_conflation(self):
+        """With max_rate 0 every snapshot is sent."""
+        sent, _ = self._run([(f"update-{index}", "exec-1", False) for index in range(3)], max_rate=0)
+
+        assert sent == ["update-0", "update-1", "update-2"]
+
+
+class TestConnectionManagerBroadcast:
+    """Test suite for queued ConnectionManager broadcasts."""
+
+    def test_slow_connection_does_not_block_others(self):
+        """Broadcast returns immediately and fast connections receive the message."""
+        message = {"type": "execution-update", "payload": {"execution_id": "exec-1", "status": "running"}}
+
+        async def scenario():
+            manager = ConnectionManager()
+            slow, fast = FakeWebSocket(blocked=True), FakeWebSocket()
+            await manager.connect(slow, PROJECT_ID, _user(), connection_id="slow")
+            await manager.connect(fast, PROJECT_ID, _user(), connection_id="fast")
+
+            await asyncio.wait_for(manager.broadcast_to_project(message, PROJECT_ID), timeout=1)
+            await _drain()
+            result = (list(slow.sent), list(fast.sent), manager.send_queues["slow"].depth)
+            manager.disconnect("slow")
+            manager.disconnect("fast")
+            return result
+
+        slow_sent, fast_sent, slow_depth = asyncio.run(scenario())
+        assert slow_sent == []
+        assert fast_sent == [json.dumps(message)]
+        assert slow_depth == 0
+
+    def test_message_is_serialized_once(self):
+        """The broadcast frame is encoded once for all connections."""
+        message = {"type": "execution-log", "payload": {"message": "hello"}}
+
+        async def scenario():
+            manager = ConnectionManager()
+            sockets = [FakeWebSocket() for _ in range(3)]
+            for index, websocket in enumerate(sockets):
+                await manager.connect(websocket, PROJECT_ID, _user(), connection_id=f"conn-{index}")
+
+            with patch("api.v1.endpoints.websocket.json.dumps", wraps=json.dumps) as dumps:
+                await manager.broadcast_to_project(message, PROJECT_ID)
+            await _drain()
+            for index in range(3):
+                manager.disconnect(f"conn-{index}")
+            message_dumps = [call for call in dumps.call_args_list if call.args and call.args[0] is message]
+            return len(message_dumps), [websocket.sent for websocket in sockets]
+
+        dumps_calls, sent = asyncio.run(scenario())
+        assert dumps_calls == 1
+        assert sent == [[json.dumps(message)]] * 3
+
+    def test_terminal_update_follows_conflated_burst(self):
+        """A burst ending in a terminal status delivers the first and the terminal update."""
+        def update(status, progress):
+            return {"type": "execution-update", "payload": {"execution_id": "exec-1", "status": status, "progress": progress}}
+
+        async def scenario():
+            manager = ConnectionManager()
+            websocket = FakeWebSocket()
+            await manager.connect(websocket, PROJECT_ID, _user(), connection_id="conn-1")
+            for progress in (10.0, 20.0, 30.0):
+                await manager.broadcast_to_project(update("running", progress), PROJECT_ID)
+            await manager.broadcast_to_project(update("completed", 100.0), PROJECT_ID)
+            await manager.broadcast_to_project({"type": "execution-log", "payload": {"execution_id": "exec-1"}}, PROJECT_ID)
+            await asyncio.sleep(0.2)
+            manager.disconnect("conn-1")
+            return [json.loads(frame) for frame in websocket.sent]
+
+        sent = asyncio.run(scenario())
+        assert [(frame["type"], frame["payload"].get("progress")) for frame in sent] == [
+            ("execution-update", 10.0),
+            ("execution-update", 100.0),
+            ("execution-log", None),
+        ]
+
+    def test_disconnect_stops_writer(self):
+        """Disconnecting removes the connection's send queue."""
+        async def scenario():
+            manager = ConnectionManager()
+            await manager.connect(FakeWebSocket(), PROJECT_ID, _user(), connection_id="conn-1")
+            queue = manager.send_queues["conn-1"]
+            manager.disconnect("conn-1")
+            await _drain()
+            return manager, queue
+
+        manager, queue = asyncio.run(scenario())
+        assert "conn-1" not in manager.send_queues
+        assert queue.closed
+        assert manager.get_project_connections(PROJECT_ID) == 0
@@ -0,0 +1,194 @@
+"""
+Unit Tests for WebSocket Subscriptions
+
+Tests server-side broadcast filters:
+- subscribe/unsubscribe control payloads and their validation
+- Subscriber indexes resolving recipients by type, execution and log level
+- ConnectionManager broadcasts and replays honouring subscriptions
+"""
+
+import asyncio
+import json
+from unittest.mock import Mock
+
+import pytest
+
+from api.v1.endpoints.websocket import ConnectionManager
+from core.websocket_subscriptions import SubscriberIndex, Subscription, apply_subscription_update
+
+
+PROJECT_ID = "customer-1-project-1"
+
+
+def _update(execution_id="exec-1", status="running"):
+    return {"type": "execution-update", "payload": {"execution_id": execution_id, "status": status}}
+
+
+def _log(level, execution_id="exec-1"):
+    return {"type": "execution-log", "payload": {"execution_id": execution_id, "level": level, "message": "line"}}
+
+
+class TestSubscriptionUpdates:
+    """Test suite for apply_subscription_update."""
+
+    def test_subscribe_replaces_given_filters_only(self):
+        """Filters missing from the payload keep their value."""
+        current = Subscription(execution_ids=frozenset({"exec-1"}))
+
+        updated = apply_subscription_update(current, "subscribe", {"types": ["execution-update"], "min_log_level": "warning"})
+
+        assert updated == Subscription(
+            types=frozenset({"execution-update"}), execution_ids=frozenset({"exec-1"}), min_log_level="WARNING"
+        )
+
+    def test_subscribe_null_resets_filter(self):
+        """A null filter means all again."""
+        current = Subscription(types=frozenset({"error"}))
+
+        assert apply_subscription_update(current, "subscribe", {"types": None}).is_default
+
+    def test_unsubscribe_removes_listed_values(self):
+        """unsubscribe narrows explicit filters."""
+        current = Subscription(types=frozenset({"error", "execution-log"}), execution_ids=frozenset({"a", "b"}))
+
+        updated = apply_subscription_update(current, "unsubscribe", {"types": ["execution-log"], "execution_ids": ["a"]})
+
+        assert updated.types == frozenset({"error"})
+        assert updated.execution_ids == frozenset({"b"})
+
+    def test_unsubscribe_without_filters_stops_broadcasts(self):
+        """An empty unsubscribe leaves no subscribed types."""
+        assert apply_subscription_update(Subscription(), "unsubscribe", {}).types == frozenset()
+
+    @pytest.mark.parametrize("action,payload", [
+        ("subscribe", {"types": "execution-log"}),
+        ("subscribe", {"execution_ids": [""]}),
+        ("subscribe", {"min_log_level": "LOUD"}),
+        ("unsubscribe", {"types": ["error"]}),
+        ("resubscribe", {}),
+    ])
+    def test_invalid_updates_are_rejected(self, action, payload):
+        """Malformed payloads raise ValueError."""
+        with pytest.raises(ValueError):
+            apply_subscription_update(Subscription(), action, payload)
+
+
+class TestSubscriberIndex:
+    """Test suite for SubscriberIndex."""
+
+    @pytest.fixture
+    def index(self):
+        """Index with one connection per kind of filter."""
+        index = SubscriberIndex()
+        index.add("all", Subscription())
+        index.add("badge", Subscription(types=frozenset({"execution-update", "completion"})))
+        index.add("exec-2", Subscription(execution_ids=frozenset({"exec-2"})))
+        index.add("warnings", Subscription(types=frozenset({"execution-log"}), min_log_level="WARNING"))
+        return index
+
+    def test_type_filter(self, index):
+        """Only subscribers of a type receive it."""
+        assert index.targets(_update()) == {"all", "badge"}
+        assert index.targets({"type": "error", "payload": {}}) == {"all", "exec-2"}
+
+    def test_execution_filter(self, index):
+        """Execution-filtered subscribers receive their executions and unscoped messages."""
+        assert index.targets(_update("exec-2")) == {"all", "badge", "exec-2"}
+        assert "exec-2" not in index.targets(_log("ERROR"))
+
+    def test_log_level_filter(self, index):
+        """Logs below a subscriber's minimum level are skipped."""
+        assert index.targets(_log("INFO")) == {"all"}
+        assert index.targets(_log("ERROR")) == {"all", "warnings"}
+        assert index.targets(_log("TRACE")) == {"all", "warnings"}
+
+    def test_targets_agree_with_matches(self, index):
+        """The index resolves the same recipients as per-connection matching."""
+        subscriptions = {
+            "all": Subscription(),
+            "badge": Subscription(types=frozenset({"execution-update", "completion"})),
+            "exec-2": Subscription(execution_ids=frozenset({"exec-2"})),
+            "warnings": Subscription(types=frozenset({"execution-log"}), min_log_level="WARNING"),
+        }
+        messages = [_update(), _update("exec-2"), _log("DEBUG", "exec-2"), _log("CRITICAL"), {"type": "completion"}]
+
+        for message in messages:
+            expected = {cid for cid, subscription in subscriptions.items() if subscription.matches(message)}
+            assert index.targets(message) == expected
+
+    def test_readding_and_removing(self, index):
+        """Re-registering replaces a connection's entries; removing drops them."""
+        index.add("badge", Subscription(types=frozenset({"error"})))
+        index.remove("all")
+
+        assert index.targets(_update()) == set()
+        assert index.targets({"type": "error", "payload": {}}) == {"badge", "exec-2"}
+        assert len(index) == 3
+
+
+class FakeWebSocket:
+    """WebSocket double recording frames."""
+
+    def __init__(self):
+        self.sent = []
+
+    async def accept(self, subprotocol=None):
+        pass
+
+    async def send_text(self, frame):
+        self.sent.append(frame)
+
+    async def close(self, code=1000, reason=""):
+        pass
+
+
+def _user():
+    user = Mock()
+    user.user_id = "user-1"
+    return user
+
+
+class TestSubscribedBroadcasts:
+    """Test suite for ConnectionManager subscriptions."""
+
+    def test_broadcast_reaches_subscribers_only(self):
+        """Filtered connections skip uninterested broadcasts; others get everything."""
+        async def scenario():
+            manager = ConnectionManager()
+            everything, badge = FakeWebSocket(), FakeWebSocket()
+            await manager.connect(everything, PROJECT_ID, _user(), connection_id="everything")
+            await manager.connect(badge, PROJECT_ID, _user(), connection_id="badge")
+            manager.update_subscription("badge", "subscribe", {"types": ["execution-update"]})
+            await manager.broadcast_to_project(_log("INFO"), PROJECT_ID)
+            await manager.broadcast_to_project(_update(status="completed"), PROJECT_ID)
+            for _ in range(10):
+                await asyncio.sleep(0)
+            info = manager.get_connection_info("badge")
+            manager.disconnect("everything")
+            manager.disconnect("badge")
+            return everything, badge, info, manager
+
+        everything, badge, info, manager = asyncio.run(scenario())
+
+        assert [json.loads(frame)["type"] for frame in everything.sent] == ["execution-log", "execution-update"]
+        assert [json.loads(frame)["type"] for frame in badge.sent] == ["execution-update"]
+        assert info["subscription"]["types"] == ["execution-update"]
+        assert manager.subscriber_indexes == {}
+
+    def test_replay_honours_subscription(self):
+        """Missed broadcasts outside the subscription are not replayed."""
+        async def scenario():
+            manager = ConnectionManager()
+            for seq, message in enumerate([_log("DEBUG"), _log("ERROR"), _update()], start=1):
+                await manager.broadcast_to_project({**message, "seq": seq}, PROJECT_ID)
+            websocket = FakeWebSocket()
+            connection_id = await manager.connect(
+                websocket, PROJECT_ID, _user(), subscription=Subscription(min_log_level="WARNING")
+            )
+            replayed = await manager.replay_missed(connection_id, 0)
+            for _ in range(10):
+                await asyncio.sleep(0)
+            manager.disconnect(connection_id)
+            return replayed, [json.loads(frame)["seq"] for frame in websocket.sent]
+
+        assert asyncio.run(scenario()) == (2, [2, 3])